@@ -0,0 +1,57 @@
+"""
+Measure how the throughput of get_map_realizations() scales with the number
+of worker processes, compared with a serial get_map_realization() loop.
+
+Usage: python benchmarks/bench_batch.py [--cup CUP] [--count N] [--chunksize N] [--workers 0,1,2,4]
+"""
+import argparse
+import os
+import time
+from gollyx_maps.maps import get_all_map_patterns, get_map_realization, get_map_realizations
+
+
+def main():
+    ncpus = os.cpu_count() or 1
+    default_workers = sorted(set([0, 1, 2, 4, ncpus]))
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--cup", default="hellmouth")
+    parser.add_argument("--count", type=int, default=200, help="number of realizations")
+    parser.add_argument("--chunksize", type=int, default=4)
+    parser.add_argument(
+        "--workers",
+        default=",".join(str(w) for w in default_workers),
+        help="comma-separated worker counts (0 = in-process)",
+    )
+    args = parser.parse_args()
+
+    patterns = get_all_map_patterns(args.cup)
+    requests = [(patterns[i % len(patterns)], None, None, i) for i in range(args.count)]
+
+    print(f"cup={args.cup} count={args.count} chunksize={args.chunksize} cpus={ncpus}")
+
+    t = time.perf_counter()
+    for (name, rows, columns, seed) in requests:
+        try:
+            get_map_realization(args.cup, name, rows, columns, seed=seed)
+        except Exception:
+            pass
+    serial = time.perf_counter() - t
+    print(f"{'serial loop':<12} {serial:>8.2f} s {args.count / serial:>8.1f} maps/s {1.0:>6.2f}x")
+
+    for workers in [int(w) for w in args.workers.split(",")]:
+        t = time.perf_counter()
+        nfailed = 0
+        for result in get_map_realizations(
+            args.cup, requests, workers=workers, chunksize=args.chunksize, ordered=False
+        ):
+            if result.error is not None:
+                nfailed += 1
+        elapsed = time.perf_counter() - t
+        print(
+            f"{'workers=' + str(workers):<12} {elapsed:>8.2f} s {args.count / elapsed:>8.1f} maps/s "
+            f"{serial / elapsed:>6.2f}x  ({nfailed} failed)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Compare the size and encode/decode time of the binary initial conditions
+(rle, bitpacked, and the default pick-the-smaller "binary") with listlife JSON,
+for every map of every cup at the default map size.
+
+Usage: python benchmarks/bench_encoding.py [--seeds N]
+"""
+import argparse
+import json
+import time
+from gollyx_maps.maps import get_all_map_patterns, get_map_realization
+from gollyx_maps.encoding import encode_listlife, decode_listlife
+
+
+CUPS = ["hellmouth", "pseudo", "toroidal", "dragon", "rainbow", "star", "klein", "ii", "starii"]
+METHODS = ["rle", "bitpacked", None]
+
+
+def get_initial_conditions(m):
+    keys = sorted(k for k in m if k.startswith("initialConditions"))
+    return [m[k] for k in keys]
+
+
+def bench_cup(cup, seeds):
+    # Sizes in bytes, times in seconds, summed over all maps
+    sizes = {"listlife": 0, "listlife+url": 0}
+    encode_times = {"listlife": 0.0}
+    decode_times = {"listlife": 0.0}
+    for method in METHODS:
+        sizes[method] = 0
+        encode_times[method] = 0.0
+        decode_times[method] = 0.0
+
+    nmaps = 0
+    for pattern in get_all_map_patterns(cup):
+        for seed in range(seeds):
+            try:
+                m = get_map_realization(cup, pattern, seed=seed)
+            except Exception:
+                continue
+            nmaps += 1
+            rows, columns = m["rows"], m["columns"]
+            conditions = get_initial_conditions(m)
+            for s in conditions:
+                sizes["listlife"] += len(s)
+                t = time.perf_counter()
+                json.loads(s)
+                decode_times["listlife"] += time.perf_counter() - t
+            sizes["listlife+url"] += sum(len(s) for s in conditions) + len(m["url"])
+
+            for method in METHODS:
+                for s in conditions:
+                    t = time.perf_counter()
+                    data = encode_listlife(s, rows, columns, method=method)
+                    encode_times[method] += time.perf_counter() - t
+                    t = time.perf_counter()
+                    decoded = decode_listlife(data)
+                    decode_times[method] += time.perf_counter() - t
+                    sizes[method] += len(data)
+                    assert decoded == s, (cup, pattern, method)
+
+    return nmaps, sizes, encode_times, decode_times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--seeds", type=int, default=3, help="number of seeds per map")
+    args = parser.parse_args()
+
+    header = f"{'cup':<10} {'maps':>5} {'method':<13} {'bytes/map':>10} {'ratio':>7} {'enc ms':>8} {'dec ms':>8}"
+    print(header)
+    print("-" * len(header))
+    for cup in CUPS:
+        nmaps, sizes, encode_times, decode_times = bench_cup(cup, args.seeds)
+        if nmaps == 0:
+            continue
+        base = sizes["listlife"]
+        print(f"{cup:<10} {nmaps:>5} {'listlife+url':<13} {sizes['listlife+url'] / nmaps:>10.0f}")
+        for method in ["listlife"] + METHODS:
+            label = method or "binary"
+            enc = encode_times[method] / nmaps * 1000 if method != "listlife" else float("nan")
+            dec = decode_times[method] / nmaps * 1000
+            print(
+                f"{cup:<10} {nmaps:>5} {label:<13} {sizes[method] / nmaps:>10.0f} "
+                f"{sizes[method] / base:>7.3f} {enc:>8.3f} {dec:>8.3f}"
+            )
+        print("")
+
+
+if __name__ == "__main__":
+    main()
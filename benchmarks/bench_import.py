@@ -0,0 +1,121 @@
+"""
+Measure the cold-start import time of gollyx_maps.maps with python -X importtime,
+and check it against a budget.
+
+Importing maps must not import any map generator module (or NumPy), and
+rendering a map of one cup must only import that cup's module(s).
+
+Usage: python benchmarks/bench_import.py [--runs N] [--budget-ms MS]
+
+The exit code is 1 if the median import time is over budget, or if
+maps imports modules it should not.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+
+MODULE = "gollyx_maps.maps"
+
+GENERATOR_MODULES = [
+    "gollyx_maps.hellmouth",
+    "gollyx_maps.pseudo",
+    "gollyx_maps.toroidal",
+    "gollyx_maps.dragon",
+    "gollyx_maps.rainbow",
+    "gollyx_maps.star",
+    "gollyx_maps.klein",
+    "gollyx_maps.ii",
+]
+
+# Cup -> gollyx_maps modules that rendering one map of the cup may import
+CUP_MODULES = {
+    "hellmouth": ["gollyx_maps.hellmouth"],
+    "pseudo": ["gollyx_maps.pseudo"],
+    "toroidal": ["gollyx_maps.toroidal"],
+    "dragon": ["gollyx_maps.dragon"],
+    "rainbow": ["gollyx_maps.rainbow"],
+    "star": ["gollyx_maps.star"],
+    "klein": ["gollyx_maps.klein", "gollyx_maps.hellmouth", "gollyx_maps.toroidal"],
+    "ii": ["gollyx_maps.ii", "gollyx_maps.hellmouth", "gollyx_maps.toroidal"],
+    "starii": ["gollyx_maps.star"],
+}
+
+LOADED_MODULES = """
+import sys
+import gollyx_maps.maps as maps
+cup = sys.argv[1]
+if cup:
+    maps.get_all_map_patterns(cup)
+print(__import__("json").dumps(sorted(m for m in sys.modules if m.startswith(("gollyx_maps", "numpy")))))
+"""
+
+
+def import_time_us(module):
+    """
+    Return {module name: cumulative import time in microseconds}
+    from one fresh interpreter importing module
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self_us, cumulative_us, name = [x.strip() for x in line[len("import time:"):].split("|")]
+        times[name] = int(cumulative_us)
+    return times
+
+
+def loaded_modules(cup=""):
+    proc = subprocess.run(
+        [sys.executable, "-c", LOADED_MODULES, cup], capture_output=True, text=True, check=True
+    )
+    return json.loads(proc.stdout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--runs", type=int, default=7, help="number of fresh interpreters")
+    parser.add_argument("--budget-ms", type=float, default=60.0, help="import time budget for maps")
+    args = parser.parse_args()
+
+    problems = []
+    runs = [import_time_us(MODULE) for _ in range(args.runs)]
+    median_ms = statistics.median(r[MODULE] for r in runs) / 1000
+    print(f"import {MODULE}: median {median_ms:.1f} ms over {args.runs} runs (budget {args.budget_ms:.1f} ms)")
+    if median_ms > args.budget_ms:
+        problems.append(f"import time {median_ms:.1f} ms is over budget")
+
+    # Slowest imports of the last run, for context
+    last = runs[-1]
+    print("slowest modules (cumulative ms):")
+    for name, us in sorted(last.items(), key=lambda x: -x[1])[:8]:
+        print(f"  {us / 1000:>7.1f}  {name}")
+
+    loaded = loaded_modules()
+    unwanted = [m for m in loaded if m in GENERATOR_MODULES or m == "numpy"]
+    print(f"modules loaded by import {MODULE}: {len([m for m in loaded if m.startswith('gollyx_maps')])}")
+    if unwanted:
+        problems.append(f"import {MODULE} loads {', '.join(unwanted)}")
+
+    for cup, allowed in CUP_MODULES.items():
+        extra = [m for m in loaded_modules(cup) if m in GENERATOR_MODULES and m not in allowed]
+        if extra:
+            problems.append(f"cup {cup} loads {', '.join(extra)}")
+
+    for problem in problems:
+        print(f"FAIL: {problem}")
+    if problems:
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""
+Benchmark every pattern function of every cup.
+
+For each cup, pattern, and scale (multiple of the cup's default map size),
+render N seeded realizations and report p50/p95/p99 latency, peak memory
+(tracemalloc, measured in a separate run so it does not skew the timings),
+output size (characters of listlife), failures, and retry_on_failure counts.
+
+Results can be saved as a JSON baseline, and compared against a baseline
+from an earlier run.
+
+Usage:
+    python benchmarks/bench_maps.py [--cups hellmouth,star] [--patterns random] [-n 5] [--scales 1,2,4]
+        [--save baseline.json] [--compare baseline.json] [--threshold 1.25]
+
+With --compare, the exit code is 1 if any p50 latency, peak memory, or output
+size grew by more than the threshold factor, or a pattern started failing.
+"""
+import argparse
+import json
+import math
+import platform
+import sys
+import time
+import tracemalloc
+from gollyx_maps import __version__
+from gollyx_maps.maps import (
+    get_default_dimensions,
+    get_pattern_function_map,
+    render_map,
+    render_dragon_map,
+)
+from gollyx_maps.utils import get_retry_counts, reset_retry_counts
+
+
+CUPS = ["hellmouth", "pseudo", "toroidal", "dragon", "rainbow", "star", "klein", "ii", "starii"]
+
+# Dragon Cup maps with partitions get between 1 and MAX_PARTS, use a fixed number here
+DRAGON_NPARTS = 3
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    k = max(0, math.ceil(p / 100 * len(sorted_values)) - 1)
+    return sorted_values[k]
+
+
+def render(cup, pattern, rows, columns, seed):
+    if cup == "dragon":
+        return render_dragon_map(pattern, rows, columns, DRAGON_NPARTS, seed=seed)
+    return render_map(cup, pattern, rows, columns, seed=seed)
+
+
+def bench_pattern(cup, pattern, rows, columns, n):
+    times = []
+    sizes = []
+    failures = 0
+    reset_retry_counts()
+    for seed in range(n):
+        t = time.perf_counter()
+        try:
+            result = render(cup, pattern, rows, columns, seed)
+            result = list(result)
+        except Exception:
+            failures += 1
+            continue
+        times.append(time.perf_counter() - t)
+        sizes.append(sum(len(s) for s in result))
+    retries = sum(c["retries"] for c in get_retry_counts().values())
+
+    # Peak memory of one realization, with tracemalloc on
+    tracemalloc.start()
+    try:
+        list(render(cup, pattern, rows, columns, 0))
+    except Exception:
+        pass
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    times.sort()
+    return {
+        "cup": cup,
+        "pattern": pattern,
+        "rows": rows,
+        "columns": columns,
+        "n": n,
+        "failures": failures,
+        "retries": retries,
+        "p50_ms": _ms(percentile(times, 50)),
+        "p95_ms": _ms(percentile(times, 95)),
+        "p99_ms": _ms(percentile(times, 99)),
+        "peak_kib": round(peak / 1024, 1),
+        "output_chars": round(sum(sizes) / len(sizes)) if sizes else None,
+    }
+
+
+def _ms(t):
+    return None if t is None else round(t * 1000, 3)
+
+
+def run(cups, patterns, scales, n):
+    results = {}
+    header = (
+        f"{'cup':<10} {'pattern':<24} {'size':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+        f"{'peak KiB':>9} {'chars':>8} {'retries':>7} {'fail':>4}"
+    )
+    print(header)
+    print("-" * len(header))
+    for cup in cups:
+        default_rows, default_columns = get_default_dimensions(cup)
+        for pattern in get_pattern_function_map(cup)():
+            if patterns and pattern not in patterns:
+                continue
+            for scale in scales:
+                rows = default_rows * scale
+                columns = default_columns * scale
+                r = bench_pattern(cup, pattern, rows, columns, n)
+                results[f"{cup}/{pattern}/x{scale}"] = r
+                print(
+                    f"{cup:<10} {pattern:<24} {f'{rows}x{columns}':>9} {_fmt(r['p50_ms'])} {_fmt(r['p95_ms'])} "
+                    f"{_fmt(r['p99_ms'])} {r['peak_kib']:>9.0f} {r['output_chars'] or 0:>8} "
+                    f"{r['retries']:>7} {r['failures']:>4}",
+                    flush=True,
+                )
+    return results
+
+
+def _fmt(v):
+    return f"{'-':>9}" if v is None else f"{v:>9.2f}"
+
+
+def compare(results, baseline, threshold):
+    """
+    Print the results that got worse than the baseline by more than threshold,
+    return the number of regressions
+    """
+    regressions = 0
+    checks = [("p50_ms", "p50 latency"), ("peak_kib", "peak memory"), ("output_chars", "output size")]
+    print("")
+    print(f"Comparing with baseline (threshold {threshold:.2f}x)")
+    for key, r in results.items():
+        b = baseline.get(key)
+        if b is None:
+            continue
+        if r["failures"] > b["failures"]:
+            print(f"  {key}: failures {b['failures']} -> {r['failures']}")
+            regressions += 1
+        for field, label in checks:
+            old, new = b.get(field), r.get(field)
+            if not old or new is None:
+                continue
+            if new > old * threshold:
+                print(f"  {key}: {label} {old} -> {new} ({new / old:.2f}x)")
+                regressions += 1
+    missing = sorted(set(baseline) - set(results))
+    if missing:
+        print(f"  ({len(missing)} baseline entries not run)")
+    print(f"{regressions} regressions")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--cups", default=",".join(CUPS), help="comma-separated cups")
+    parser.add_argument("--patterns", default="", help="comma-separated pattern names (default all)")
+    parser.add_argument("-n", type=int, default=5, help="seeded realizations per pattern and scale")
+    parser.add_argument("--scales", default="1,2,4", help="comma-separated multiples of the default map size")
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="compare the results with this JSON baseline")
+    parser.add_argument("--threshold", type=float, default=1.25, help="regression factor for --compare")
+    args = parser.parse_args()
+
+    cups = [c for c in args.cups.split(",") if c]
+    patterns = set(p for p in args.patterns.split(",") if p)
+    scales = [int(s) for s in args.scales.split(",")]
+    results = run(cups, patterns, scales, args.n)
+
+    if args.save:
+        out = {
+            "meta": {
+                "version": __version__,
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "n": args.n,
+                "scales": scales,
+                "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            },
+            "results": results,
+        }
+        with open(args.save, "w") as f:
+            json.dump(out, f, indent=1)
+
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)["results"]
+        if compare(results, baseline, args.threshold) > 0:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Compare request latency of a RealizationPool with calling get_map_realization()
+directly, for a stream of requests for a few heavy patterns with idle time
+between requests (as an API server would see them).
+
+Usage: python benchmarks/bench_pool.py [--requests N] [--gap-ms MS] [--high-water K] [--workers N] [--processes]
+"""
+import argparse
+import math
+import random
+import time
+from gollyx_maps.maps import get_map_realization
+from gollyx_maps.pool import RealizationPool
+
+
+# (cup, pattern, weight): weights are both the request mix and the pool weights
+PATTERNS = [
+    ("rainbow", "rainbowmath", 2),
+    ("rainbow", "quadgaussian", 1),
+    ("star", "gastank", 1),
+]
+
+
+def percentiles(times):
+    """Nearest-rank p50, p95 and p99 of times, in milliseconds"""
+    times = sorted(times)
+    return [1000 * times[max(0, math.ceil(p / 100 * len(times)) - 1)] for p in (50, 95, 99)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--gap-ms", type=float, default=40.0, help="idle time between requests")
+    parser.add_argument("--high-water", type=int, default=4)
+    parser.add_argument("--low-water", type=int, default=2)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--processes", action="store_true", help="refill in worker processes")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    stream = rng.choices(PATTERNS, weights=[w for (_, _, w) in PATTERNS], k=args.requests)
+
+    direct = []
+    for (cup, pattern, _) in stream:
+        t = time.perf_counter()
+        get_map_realization(cup, pattern)
+        direct.append(time.perf_counter() - t)
+        time.sleep(args.gap_ms / 1000)
+
+    pooled = []
+    with RealizationPool(
+        high_water=args.high_water, low_water=args.low_water, workers=args.workers, processes=args.processes
+    ) as pool:
+        for (cup, pattern, weight) in PATTERNS:
+            pool.add(cup, pattern, weight=weight)
+        pool.wait()
+        for (cup, pattern, _) in stream:
+            t = time.perf_counter()
+            pool.get(cup, pattern)
+            pooled.append(time.perf_counter() - t)
+            time.sleep(args.gap_ms / 1000)
+        stats = pool.stats()
+
+    print(f"requests={args.requests} gap={args.gap_ms} ms high_water={args.high_water} workers={args.workers}")
+    print(f"{'':<8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for label, times in [("direct", direct), ("pool", pooled)]:
+        print(f"{label:<8} " + " ".join(f"{p:>9.3f}" for p in percentiles(times)))
+    print(
+        f"pool hits={stats['hits']} misses={stats['misses']} refills={stats['refills']} "
+        f"refill mean={stats['refill_ms_mean']:.1f} ms max={stats['refill_ms_max']:.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -14,7 +14,7 @@ with open(os.path.join(this_directory, "Readme.md"), encoding="utf-8") as f:
 
 # Note: the _program variable is set in __init__.py.
 # it determines the name of the command line tool.
-from src import __version__
+from src import __version__, _program
 
 setup(
     name="gollyx-maps",
@@ -37,6 +37,9 @@ setup(
     install_requires=required,
     tests_require=required_dev,
     keywords=[],
+    entry_points={
+        "console_scripts": [f"{_program} = gollyx_maps.command:main"],
+    },
     zip_safe=False,
     long_description=long_description,
     long_description_content_type="text/markdown",
@@ -1 +1,2 @@
 __version__ = "299.0.0"
+_program = "gollyx-maps"
@@ -0,0 +1,162 @@
+import asyncio
+import functools
+import os
+import threading
+import weakref
+from .maps import (
+    RealizationResult,
+    check_encoding,
+    get_map_realization,
+    get_pattern_function_map,
+    _init_realization_worker,
+)
+from .error import GollyXMapsError
+
+
+EXECUTOR_KINDS = ["process", "thread"]
+
+# The executor shared by every call, see configure_executor()
+_executor = None
+_executor_config = {"kind": "process", "max_workers": None, "max_concurrency": None}
+_executor_lock = threading.Lock()
+
+# Event loop -> {cup: asyncio.Semaphore}
+_semaphores = weakref.WeakKeyDictionary()
+
+
+def configure_executor(kind="process", max_workers=None, max_concurrency=None):
+    """
+    Set up the executor that the async API runs map generation in.
+
+    kind is "process" (the default) or "thread". max_workers is the size of the pool
+    (default is the number of CPUs). max_concurrency is the number of realizations of
+    one cup that may run at once (default is max_workers); other calls for that cup
+    wait their turn.
+
+    The executor is created on first use and shared by every call until
+    shutdown_executor() or the next configure_executor().
+    """
+    if kind not in EXECUTOR_KINDS:
+        raise GollyXMapsError(f"Error: invalid executor kind {kind}, must be one of: {', '.join(EXECUTOR_KINDS)}")
+    if max_workers is not None and max_workers < 1:
+        raise GollyXMapsError(f"Error: invalid max_workers {max_workers}, must be a positive integer")
+    if max_concurrency is not None and max_concurrency < 1:
+        raise GollyXMapsError(f"Error: invalid max_concurrency {max_concurrency}, must be a positive integer")
+    shutdown_executor()
+    with _executor_lock:
+        _executor_config.update(kind=kind, max_workers=max_workers, max_concurrency=max_concurrency)
+
+
+def get_executor():
+    """
+    Return the shared executor, creating it if needed
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            max_workers = _executor_config["max_workers"] or os.cpu_count() or 1
+            if _executor_config["kind"] == "thread":
+                from concurrent.futures import ThreadPoolExecutor
+
+                _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="gollyx-maps")
+            else:
+                from concurrent.futures import ProcessPoolExecutor
+
+                _executor = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_realization_worker)
+        return _executor
+
+
+def shutdown_executor(wait=True):
+    """
+    Shut down the shared executor, a new one is created on next use
+    """
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+        _semaphores.clear()
+    if executor is not None:
+        executor.shutdown(wait=wait, cancel_futures=True)
+
+
+def _get_semaphore(cup):
+    loop = asyncio.get_running_loop()
+    cups = _semaphores.setdefault(loop, {})
+    if cup not in cups:
+        limit = _executor_config["max_concurrency"] or _executor_config["max_workers"] or os.cpu_count() or 1
+        cups[cup] = asyncio.Semaphore(limit)
+    return cups[cup]
+
+
+async def aget_map_realization(
+    cup, patternname, rows=None, columns=None, cell_size=None, encoding="listlife", seed=None, timeout=None
+):
+    """
+    Async version of maps.get_map_realization(): generate the map in the shared
+    executor (see configure_executor()) without blocking the event loop.
+
+    If the map is not ready within timeout seconds (including time spent waiting
+    for the cup's concurrency limit), raise asyncio.TimeoutError.
+    Cancelling the call (or a timeout) cancels the work if it has not started yet;
+    work that is already running in a worker is left to finish and discarded.
+    """
+    check_encoding(encoding)
+    get_pattern_function_map(cup)
+    return await asyncio.wait_for(
+        _run_map_realization(cup, patternname, rows, columns, cell_size, encoding, seed), timeout
+    )
+
+
+async def _run_map_realization(cup, patternname, rows, columns, cell_size, encoding, seed):
+    async with _get_semaphore(cup):
+        loop = asyncio.get_running_loop()
+        call = functools.partial(
+            get_map_realization, cup, patternname, rows, columns, cell_size=cell_size, encoding=encoding, seed=seed
+        )
+        return await loop.run_in_executor(get_executor(), call)
+
+
+async def aget_map_realizations(
+    cup, requests, ordered=True, encoding="listlife", cell_size=None, timeout=None
+):
+    """
+    Async version of maps.get_map_realizations(): an async generator of
+    RealizationResult(index, request, realization, error) namedtuples,
+    one per (patternname, rows, columns, seed) request.
+
+    If ordered is True, results come back in the same order as the requests,
+    otherwise they come back as they complete. A request that fails or takes
+    longer than timeout seconds does not abort the batch: its result has
+    realization None and the exception in error.
+    If the consumer stops early, the requests that are left are cancelled.
+
+        async for result in aget_map_realizations("hellmouth", requests):
+            ...
+    """
+    check_encoding(encoding)
+    get_pattern_function_map(cup)
+    requests = list(requests)
+
+    async def run(i, request):
+        try:
+            patternname, rows, columns, seed = request
+            m = await aget_map_realization(
+                cup, patternname, rows, columns, cell_size=cell_size, encoding=encoding, seed=seed, timeout=timeout
+            )
+            return RealizationResult(i, request, m, None)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            return RealizationResult(i, request, None, e)
+
+    tasks = [asyncio.ensure_future(run(i, request)) for i, request in enumerate(requests)]
+    try:
+        if ordered:
+            for task in tasks:
+                yield await task
+        else:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,243 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+from . import __version__
+from .patterns import get_pattern_filepaths
+
+
+# hashlib and shutil are imported where they are used, since maps imports
+# this module and most processes never turn the cache on.
+
+# Bump when the layout of cache entries changes, or when a seed draws a different map
+CACHE_FORMAT = 2
+
+# The cache used by maps.render_map() and maps.render_dragon_map(), see set_realization_cache()
+_realization_cache = None
+
+
+def get_pattern_digest():
+    """
+    Return a SHA-256 hex digest of the contents of every packaged pattern file
+    """
+    import hashlib
+
+    h = hashlib.sha256()
+    root = os.path.dirname(os.path.abspath(__file__))
+    for path in sorted(get_pattern_filepaths()):
+        h.update(os.path.relpath(path, root).encode("utf-8"))
+        with open(path, "rb") as f:
+            h.update(hashlib.sha256(f.read()).digest())
+    return h.hexdigest()
+
+
+def get_cache_version():
+    """
+    Return the version part of cache keys: the package version, the cache
+    format, and the pattern digest. Entries written under any other
+    version are never read.
+    """
+    return f"{__version__}-f{CACHE_FORMAT}-{get_pattern_digest()[:16]}"
+
+
+class TwoTierCache(object):
+    """
+    Two-tier store shared by RealizationCache and expression.MaskCatalog.
+
+    The first tier is an in-memory LRU that holds at most max_bytes of values.
+    If directory is specified, the second tier is one file per entry under
+    directory/<version>/, named by a digest of the JSON key, so that entries
+    written under another version are left alone. A disk hit is copied back
+    into memory. Subclasses define how values are sized and stored on disk
+    (_sizeof(), _load() and _dump(), and the suffix and binary attributes).
+    """
+
+    suffix = ""
+    binary = False
+
+    def __init__(self, max_bytes, directory, version):
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.version = version
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._counts = dict(memory_hits=0, disk_hits=0, misses=0, evictions=0, disk_errors=0)
+
+    def clear(self):
+        """
+        Remove every entry from memory and from this version's directory
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+        if self.directory is not None:
+            import shutil
+
+            shutil.rmtree(os.path.join(self.directory, self.version), ignore_errors=True)
+
+    def remove_stale(self):
+        """
+        Remove the on-disk entries of every other version
+        """
+        if self.directory is None or not os.path.isdir(self.directory):
+            return
+        import shutil
+
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name != self.version and os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+
+    def stats(self):
+        """
+        Return hit, miss, and eviction counts, and the size of the memory tier
+        """
+        with self._lock:
+            stats = dict(self._counts)
+            stats["hits"] = stats["memory_hits"] + stats["disk_hits"]
+            stats["entries"] = len(self._entries)
+            stats["bytes"] = self._bytes
+            return stats
+
+    def _lookup(self, key):
+        # Return the value for key from memory, then from disk, or None
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self._counts["memory_hits"] += 1
+                return value
+
+        value = self._read(key)
+        with self._lock:
+            if value is None:
+                self._counts["misses"] += 1
+            else:
+                self._counts["disk_hits"] += 1
+                self._insert(key, value)
+        return value
+
+    def _store(self, key, value):
+        with self._lock:
+            self._insert(key, value)
+        self._write(key, value)
+
+    def _insert(self, key, value):
+        # Call with the lock held
+        size = self._sizeof(value)
+        if size > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= self._sizeof(old)
+        self._entries[key] = value
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= self._sizeof(evicted)
+            self._counts["evictions"] += 1
+
+    def _path(self, key):
+        import hashlib
+
+        digest = hashlib.sha256(json.dumps(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, self.version, digest[:2], digest + self.suffix)
+
+    def _read(self, key):
+        if self.directory is None:
+            return None
+        try:
+            with open(self._path(key), "rb" if self.binary else "r") as f:
+                return self._load(f, key)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError):
+            with self._lock:
+                self._counts["disk_errors"] += 1
+            return None
+
+    def _write(self, key, value):
+        if self.directory is None:
+            return
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp, "wb" if self.binary else "w") as f:
+                self._dump(f, key, value)
+            os.replace(tmp, path)
+        except OSError:
+            with self._lock:
+                self._counts["disk_errors"] += 1
+
+    def _sizeof(self, value):
+        raise NotImplementedError
+
+    def _load(self, f, key):
+        # Return the value stored for key in the open file f, or None
+        raise NotImplementedError
+
+    def _dump(self, f, key, value):
+        raise NotImplementedError
+
+
+class RealizationCache(TwoTierCache):
+    """
+    Two-tier cache of rendered maps (the tuple of listlife strings from
+    render_map()), keyed by the render arguments, including the seed.
+
+    The first tier is an in-memory LRU that holds at most max_bytes of
+    listlife strings. If directory is specified, the second tier is an
+    on-disk store of one JSON file per entry under directory/<version>/,
+    where version is get_cache_version(), so that entries from another
+    package version or other pattern files are left alone.
+    A disk hit is copied back into memory.
+    """
+
+    suffix = ".json"
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, directory=None):
+        super().__init__(max_bytes, directory, get_cache_version())
+
+    def get(self, key):
+        """
+        Return the cached value for key, or None
+        """
+        return self._lookup(key)
+
+    def put(self, key, value):
+        """
+        Store value, a tuple of strings, for key
+        """
+        self._store(key, tuple(value))
+
+    def _sizeof(self, value):
+        return sum(len(s) for s in value)
+
+    def _load(self, f, key):
+        dat = json.load(f)
+        # Guard against digest collisions
+        if dat.get("key") != json.loads(json.dumps(key)):
+            return None
+        return tuple(dat["value"])
+
+    def _dump(self, f, key, value):
+        json.dump({"key": key, "value": value}, f)
+
+
+def get_realization_cache():
+    """
+    Return the cache used by maps.render_map() and maps.render_dragon_map(),
+    or None if caching is off (the default)
+    """
+    return _realization_cache
+
+
+def set_realization_cache(cache):
+    """
+    Set the cache used by maps.render_map() and maps.render_dragon_map()
+    (a RealizationCache, or None to turn caching off)
+    """
+    global _realization_cache
+    _realization_cache = cache
@@ -0,0 +1,353 @@
+import math
+import numpy as np
+from .patterns import get_pattern_orientation, get_placement_bounds
+from .error import GollyXPatternsError
+
+
+ALIVE = ord("o")
+DEAD = ord(".")
+
+# Lookup table turning a bitplane into the bytes of a .o diagram
+_DIAGRAM_BYTES = np.array([DEAD, ALIVE], dtype=np.uint8)
+
+# Number of points drawn in the first and the largest blocks of iter_gaussian_cells()
+_GAUSSIAN_BLOCK = 1024
+_GAUSSIAN_BLOCK_MAX = 65536
+
+# id(PatternOrientation) -> (PatternOrientation, boolean mask of the orientation)
+_mask_cache = {}
+
+
+def get_orientation_mask(orientation):
+    """
+    Return a read-only boolean array of the given PatternOrientation
+    (True = live cell), computed once per orientation.
+    """
+    entry = _mask_cache.get(id(orientation))
+    if entry is None or entry[0] is not orientation:
+        mask = grid_to_plane(orientation.diagram)
+        mask.setflags(write=False)
+        entry = (orientation, mask)
+        _mask_cache[id(orientation)] = entry
+    return entry[1]
+
+
+def grid_to_plane(pattern):
+    """
+    Convert a .o diagram (list of strings, or list of lists of one char)
+    into a boolean bitplane of shape (rows, cols)
+    """
+    rows = len(pattern)
+    cols = len(pattern[0])
+    buf = "".join("".join(row) for row in pattern).encode("ascii")
+    return np.frombuffer(buf, dtype=np.uint8).reshape(rows, cols) == ALIVE
+
+
+def plane_to_grid(plane, flatten=True):
+    """
+    Convert a boolean bitplane into a .o diagram.
+    If flatten is True, return a list of strings (one string = one row),
+    otherwise return a list of lists of one char.
+    """
+    diagram = _DIAGRAM_BYTES[plane.astype(np.uint8)]
+    rows = [row.tobytes().decode("ascii") for row in diagram]
+    if flatten:
+        return rows
+    return [list(row) for row in rows]
+
+
+def cells_to_plane(cells, rows, columns):
+    """
+    Return the (rows x columns) bitplane with the given flat cell indices
+    (row * columns + column) alive
+    """
+    plane = np.zeros(rows * columns, dtype=bool)
+    plane[cells] = True
+    return plane.reshape(rows, columns)
+
+
+def plane_union(planes):
+    """
+    Return the union (logical or) of a list of same-sized bitplanes
+    """
+    shapes = set(plane.shape for plane in planes)
+    if len(shapes) != 1:
+        err = "Error: plane_union() received planes of dissimilar size"
+        err += "\n"
+        for i, plane in enumerate(planes):
+            err += f"Plane {i+1}: rows = {plane.shape[0]}, cols = {plane.shape[1]}"
+            err += "\n"
+        raise GollyXPatternsError(err)
+    return np.logical_or.reduce(planes)
+
+
+def _get_stamp_window(pattern_name, rows, columns, xoffset, yoffset, hflip, vflip, rotdeg, check_overflow):
+    """
+    Return (y0, x0, mask): the part of the pattern's mask that lands on the grid
+    when placed like patterns.get_grid_pattern() does, and the grid cell of its
+    top left corner. Return None if no part of the pattern lands on the grid.
+    """
+    orientation = get_pattern_orientation(pattern_name, hflip=hflip, vflip=vflip, rotdeg=rotdeg)
+    (xstart, xend, ystart, yend) = get_placement_bounds(orientation, rows, columns, xoffset, yoffset, check_overflow)
+    mask = get_orientation_mask(orientation)
+
+    # get_grid_pattern() never copies cells into the first row or first column
+    y0 = max(ystart, 1)
+    y1 = min(yend, rows)
+    x0 = max(xstart, 1)
+    x1 = min(xend, columns)
+    if y0 >= y1 or x0 >= x1:
+        return None
+    return (y0, x0, mask[y0 - ystart:y1 - ystart, x0 - xstart:x1 - xstart])
+
+
+class Canvas:
+    """
+    A grid of size (rows x columns) holding one boolean bitplane per team.
+
+    Stamping a pattern onto a team's plane is a slice assignment,
+    so building a map does not allocate a full grid per placed pattern.
+    Use to_pattern() to get the .o diagram for the string API
+    (pattern_union, pattern2url, etc.).
+    """
+
+    def __init__(self, rows, columns, nteams=2):
+        if columns < 1 or rows < 1:
+            err = f"Error: invalid number of rows {rows} or columns {columns}, must be positive integers > 0"
+            raise GollyXPatternsError(err)
+        self.rows = rows
+        self.columns = columns
+        self.nteams = nteams
+        self.planes = np.zeros((nteams, rows, columns), dtype=bool)
+
+    def stamp(
+        self,
+        team,
+        pattern_name,
+        xoffset=0,
+        yoffset=0,
+        hflip=False,
+        vflip=False,
+        rotdeg=0,
+        check_overflow=True,
+    ):
+        """
+        Place the pattern on the given team's plane,
+        with the same semantics as patterns.get_grid_pattern().
+        """
+        window = _get_stamp_window(
+            pattern_name, self.rows, self.columns, xoffset, yoffset, hflip, vflip, rotdeg, check_overflow
+        )
+        if window is not None:
+            (y0, x0, mask) = window
+            self.planes[team, y0:y0 + mask.shape[0], x0:x0 + mask.shape[1]] |= mask
+
+    def stamp_grid(self, team, pattern):
+        """
+        Add a full-size .o diagram to the given team's plane
+        """
+        plane = grid_to_plane(pattern)
+        if plane.shape != (self.rows, self.columns):
+            raise GollyXPatternsError(
+                f"Error: cannot add pattern of size {plane.shape} to canvas of size {(self.rows, self.columns)}"
+            )
+        self.planes[team] |= plane
+
+    def to_pattern(self, team, flatten=True):
+        """
+        Return the .o diagram of the given team's plane
+        """
+        return plane_to_grid(self.planes[team], flatten=flatten)
+
+    def to_patterns(self, flatten=True):
+        """
+        Return a list with the .o diagram of each team's plane
+        """
+        return [self.to_pattern(team, flatten=flatten) for team in range(self.nteams)]
+
+
+class OccupancyIndex:
+    """
+    The occupied cells of a grid of size (rows x columns), for placing
+    patterns away from everything already on the grid.
+
+    A cell is free if no occupied cell is within radius cells of it
+    (in the (2 * radius + 1) square around it, wrapping around the edges).
+    The forbidden mask (the cells that are not free) is updated as cells
+    are added, so free cells are sampled directly, without rejection.
+    """
+
+    def __init__(self, rows, columns, radius=2):
+        if columns < 1 or rows < 1:
+            err = f"Error: invalid number of rows {rows} or columns {columns}, must be positive integers > 0"
+            raise GollyXPatternsError(err)
+        self.rows = rows
+        self.columns = columns
+        self.radius = radius
+        self.occupied = np.zeros((rows, columns), dtype=bool)
+        self.forbidden = np.zeros((rows, columns), dtype=bool)
+
+    def add_cells(self, ys, xs):
+        """
+        Mark the cells at the given row and column indexes as occupied
+        """
+        ys = np.asarray(ys, dtype=np.intp) % self.rows
+        xs = np.asarray(xs, dtype=np.intp) % self.columns
+        if ys.size == 0:
+            return
+        self.occupied[ys, xs] = True
+        # Dilate only the new cells into the forbidden mask
+        r = self.radius
+        for dy in range(-r, r + 1):
+            yy = (ys + dy) % self.rows
+            for dx in range(-r, r + 1):
+                self.forbidden[yy, (xs + dx) % self.columns] = True
+
+    def add_plane(self, plane):
+        """
+        Mark the live cells of a (rows x columns) bitplane as occupied
+        """
+        ys, xs = np.nonzero(plane)
+        self.add_cells(ys, xs)
+
+    def add_pattern(self, pattern):
+        """
+        Mark the live cells of a full-size .o diagram as occupied
+        """
+        self.add_plane(grid_to_plane(pattern))
+
+    def stamp(
+        self,
+        pattern_name,
+        xoffset=0,
+        yoffset=0,
+        hflip=False,
+        vflip=False,
+        rotdeg=0,
+        check_overflow=True,
+    ):
+        """
+        Mark the live cells of the pattern as occupied,
+        placed like Canvas.stamp() places it
+        """
+        window = _get_stamp_window(
+            pattern_name, self.rows, self.columns, xoffset, yoffset, hflip, vflip, rotdeg, check_overflow
+        )
+        if window is not None:
+            (y0, x0, mask) = window
+            ys, xs = np.nonzero(mask)
+            self.add_cells(ys + y0, xs + x0)
+
+    def is_free(self, x, y):
+        return not self.forbidden[y % self.rows, x % self.columns]
+
+    def count_free(self):
+        return int(self.forbidden.size - np.count_nonzero(self.forbidden))
+
+    def sample_uniform(self, rng, xlim=None, ylim=None):
+        """
+        Return a free (x, y) drawn uniformly from the free cells with
+        xlim[0] <= x < xlim[1] and ylim[0] <= y < ylim[1] (default: the whole grid).
+        Raise GollyXPatternsError if there is none.
+        """
+        (x0, x1) = xlim or (0, self.columns)
+        (y0, y1) = ylim or (0, self.rows)
+        free = np.flatnonzero(~self.forbidden[y0:y1, x0:x1])
+        if free.size == 0:
+            raise GollyXPatternsError("Error: no unoccupied point left on the grid")
+        k = int(free[rng.randrange(free.size)])
+        return (x0 + k % (x1 - x0), y0 + k // (x1 - x0))
+
+    def sample_gaussian(self, rng, center, std):
+        """
+        Return a free (x, y) drawn from the free cells, weighted by a Gaussian
+        centered at center = (x, y) with standard deviations std = (x, y),
+        wrapped around the edges of the grid.
+        Raise GollyXPatternsError if there is no free cell.
+        """
+        wx = _wrapped_gaussian(self.columns, center[0], std[0])
+        wy = _wrapped_gaussian(self.rows, center[1], std[1])
+        weights = np.outer(wy, wx)
+        weights[self.forbidden] = 0.0
+        cumulative = np.cumsum(weights, axis=None)
+        total = cumulative[-1]
+        if not total > 0:
+            raise GollyXPatternsError("Error: no unoccupied point left on the grid")
+        k = int(np.searchsorted(cumulative, rng.random() * total, side="right"))
+        # Guard against rounding at the end of the cumulative sum
+        k = min(k, cumulative.size - 1)
+        while weights.flat[k] == 0.0:
+            k -= 1
+        return (k % self.columns, k // self.columns)
+
+
+def _wrapped_gaussian(n, center, std):
+    """
+    Return the (unnormalized) weights of positions 0 .. n-1 under a Gaussian
+    centered at center, wrapped around a dimension of size n
+    """
+    x = np.arange(n, dtype=float)
+    wraps = int(np.ceil(4 * std / n)) + 1
+    weights = np.zeros(n)
+    for k in range(-wraps, wraps + 1):
+        weights += np.exp(-0.5 * ((x + k * n - center) / std) ** 2)
+    return weights
+
+
+def iter_gaussian_cells(rng, rows, columns, center, std, accept=None, occupied=None):
+    """
+    Yield arrays of distinct cells (flat indices, row * columns + column, in the
+    order they were drawn) of a (rows x columns) grid, at the int() of points
+    drawn from a Gaussian centered at center = (x, y) with standard deviations
+    std = (x, y).
+
+    Points off the grid, points for which accept(xs, ys) is False, cells that were
+    already yielded and cells set in the flat bitmap occupied are skipped.
+    Points are drawn in blocks, from a NumPy generator seeded from rng.
+    Raise GollyXPatternsError if a block of the largest size finds no new cell.
+    """
+    gen = np.random.default_rng(rng.getrandbits(64))
+    if occupied is None:
+        seen = np.zeros(rows * columns, dtype=bool)
+    else:
+        seen = occupied.copy()
+    size = _GAUSSIAN_BLOCK
+    while True:
+        # astype() truncates towards zero, like int()
+        xs = gen.normal(center[0], std[0], size).astype(np.intp)
+        ys = gen.normal(center[1], std[1], size).astype(np.intp)
+        ok = (xs >= 0) & (xs < columns) & (ys >= 0) & (ys < rows)
+        if accept is not None:
+            ok &= accept(xs, ys)
+        cells = ys[ok] * columns + xs[ok]
+
+        # Keep the first draw of each new cell, in draw order
+        cells, first = np.unique(cells, return_index=True)
+        cells = cells[np.argsort(first)]
+        cells = cells[~seen[cells]]
+        if cells.size == 0 and size == _GAUSSIAN_BLOCK_MAX:
+            raise GollyXPatternsError("Error: no more cells to draw from the Gaussian")
+        seen[cells] = True
+        yield cells
+        size = min(2 * size, _GAUSSIAN_BLOCK_MAX)
+
+
+def sample_gaussian_cells(rng, rows, columns, n, center, std, accept=None, occupied=None):
+    """
+    Return an array of n (rounded up) distinct cells drawn by iter_gaussian_cells(),
+    in draw order. If occupied (a flat bitmap of the grid) is given, the cells
+    drawn are skipped if set in it, and set in it.
+    """
+    n = math.ceil(n)
+    blocks = []
+    count = 0
+    if n > 0:
+        for cells in iter_gaussian_cells(rng, rows, columns, center, std, accept, occupied):
+            blocks.append(cells)
+            count += cells.size
+            if count >= n:
+                break
+    cells = np.concatenate(blocks)[:n] if blocks else np.zeros(0, dtype=np.intp)
+    if occupied is not None:
+        occupied[cells] = True
+    return cells
@@ -0,0 +1,232 @@
+"""
+The gollyx-maps command line tool: write map realizations as JSONL.
+
+    gollyx-maps list [CUP] [--rows R] [--columns C]
+    gollyx-maps render CUP PATTERN [--seed S] [--mask-dir DIRECTORY]
+    gollyx-maps pattern CUP PATTERN -n N [--seed S] [--mask-dir DIRECTORY]
+    gollyx-maps cup CUP [-n N] [--seed S] [--mask-dir DIRECTORY]
+    gollyx-maps masks DIRECTORY [--rows R] [--columns C]
+"""
+import argparse
+import json
+import sys
+import time
+from . import __version__, _program
+from .maps import (
+    CUP_MODULES,
+    get_all_map_patterns,
+    get_default_dimensions,
+    get_feasible_patterns,
+    get_map_realizations,
+)
+from .instrument import RealizationProfile
+
+
+def main(argv=None):
+    parser = get_parser()
+    args = parser.parse_args(argv)
+    if args.command is None:
+        parser.print_help(sys.stderr)
+        return 2
+    try:
+        return args.func(args)
+    except BrokenPipeError:
+        # Output piped to head, etc.
+        sys.stderr.close()
+        return 0
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(prog=_program, description="Generate GollyX map realizations as JSONL")
+    parser.add_argument("--version", action="version", version=f"{_program} {__version__}")
+    subparsers = parser.add_subparsers(dest="command")
+
+    p = subparsers.add_parser("list", help="list cups, or the patterns of a cup")
+    p.add_argument("cup", nargs="?", choices=list(CUP_MODULES))
+    p.add_argument("--rows", type=int, help="only list the patterns that fit on this many rows")
+    p.add_argument("--columns", type=int, help="only list the patterns that fit on this many columns")
+    p.set_defaults(func=list_command)
+
+    p = subparsers.add_parser("render", help="render one realization of a pattern")
+    p.add_argument("cup", choices=list(CUP_MODULES))
+    p.add_argument("pattern")
+    _add_realization_arguments(p)
+    p.set_defaults(func=render_command, n=1)
+
+    p = subparsers.add_parser("pattern", help="render N realizations of a pattern")
+    p.add_argument("cup", choices=list(CUP_MODULES))
+    p.add_argument("pattern")
+    p.add_argument("-n", type=int, default=1, help="number of realizations (seeds SEED, SEED+1, ...)")
+    _add_realization_arguments(p)
+    p.set_defaults(func=render_command)
+
+    p = subparsers.add_parser("cup", help="render realizations of every pattern of a cup")
+    p.add_argument("cup", choices=list(CUP_MODULES))
+    p.add_argument("-n", type=int, default=1, help="number of realizations of each pattern")
+    _add_realization_arguments(p)
+    p.set_defaults(func=render_command, pattern=None)
+
+    p = subparsers.add_parser("masks", help="build the on-disk catalog of math map masks")
+    p.add_argument("directory", help="catalog directory (see expression.MaskCatalog)")
+    p.add_argument("--rows", type=int, help="map rows (default: each cup's default size)")
+    p.add_argument("--columns", type=int, help="map columns (default: each cup's default size)")
+    p.set_defaults(func=masks_command)
+
+    return parser
+
+
+def _add_realization_arguments(p):
+    p.add_argument("--seed", type=int, help="seed of the first realization (default: unseeded)")
+    p.add_argument("--rows", type=int, help="map rows (default: the cup's default size)")
+    p.add_argument("--columns", type=int, help="map columns (default: the cup's default size)")
+    p.add_argument("--cell-size", type=int, help="cell size in pixels")
+    p.add_argument("-o", "--output", default="-", help="output JSONL file (default: stdout)")
+    p.add_argument("--workers", type=int, default=0, help="worker processes (default: 0, in this process)")
+    p.add_argument("--chunksize", type=int, default=1, help="realizations sent to a worker at a time")
+    p.add_argument("--mask-dir", help="directory of math map masks (see the masks command)")
+    p.add_argument(
+        "--profile",
+        action="store_true",
+        help="print per-phase timings to stderr (with pipeline spans if --workers is 0)",
+    )
+
+
+def _get_dimensions(cup, args):
+    """
+    Return the (rows, columns) of --rows and --columns, with a missing
+    dimension taken from the cup's default size
+    """
+    default_rows, default_columns = get_default_dimensions(cup)
+    rows = default_rows if args.rows is None else args.rows
+    columns = default_columns if args.columns is None else args.columns
+    return rows, columns
+
+
+def list_command(args):
+    if args.cup is None:
+        names = list(CUP_MODULES)
+    elif args.rows is None and args.columns is None:
+        names = get_all_map_patterns(args.cup)
+    else:
+        rows, columns = _get_dimensions(args.cup, args)
+        names = get_feasible_patterns(args.cup, rows, columns)
+    for name in names:
+        print(name)
+    return 0
+
+
+def render_command(args):
+    """
+    Write one line of JSON per realization, and report failed
+    realizations on stderr. Return 1 if any realization failed.
+    """
+    phases = dict(setup=0.0, generate=0.0, serialize=0.0, write=0.0)
+    start = time.perf_counter()
+
+    if args.n < 1:
+        print(f"{_program}: error: -n must be a positive integer", file=sys.stderr)
+        return 2
+    if args.pattern is None:
+        patterns = get_all_map_patterns(args.cup)
+    else:
+        if args.pattern not in get_all_map_patterns(args.cup):
+            print(f"{_program}: error: invalid pattern {args.pattern} for cup {args.cup}", file=sys.stderr)
+            return 2
+        patterns = [args.pattern]
+    if args.rows is None and args.columns is None:
+        rows, columns = None, None
+    else:
+        rows, columns = _get_dimensions(args.cup, args)
+    requests = [
+        (pattern, rows, columns, None if args.seed is None else args.seed + k)
+        for pattern in patterns
+        for k in range(args.n)
+    ]
+    if args.mask_dir is not None:
+        from .expression import MaskCatalog, set_mask_catalog
+
+        set_mask_catalog(MaskCatalog(directory=args.mask_dir))
+    results = get_map_realizations(
+        args.cup,
+        requests,
+        workers=args.workers,
+        chunksize=args.chunksize,
+        cell_size=args.cell_size,
+        mask_dir=args.mask_dir,
+    )
+    out = sys.stdout if args.output == "-" else open(args.output, "w")
+
+    # Spans are reported by the process generating the maps, so they are only
+    # collected when the maps are generated in this process
+    spans = RealizationProfile() if args.profile and args.workers == 0 else None
+    if spans is not None:
+        spans.start()
+
+    nfailed = 0
+    t = time.perf_counter()
+    phases["setup"] = t - start
+    try:
+        for result in results:
+            t2 = time.perf_counter()
+            phases["generate"] += t2 - t
+            if result.error is not None:
+                nfailed += 1
+                patternname, rows, columns, seed = result.request
+                print(
+                    f"{_program}: {args.cup} {patternname} (seed {seed}) failed: {result.error!r}",
+                    file=sys.stderr,
+                )
+                t = time.perf_counter()
+                continue
+            line = json.dumps(result.realization) + "\n"
+            t3 = time.perf_counter()
+            phases["serialize"] += t3 - t2
+            out.write(line)
+            t = time.perf_counter()
+            phases["write"] += t - t3
+        out.flush()
+    finally:
+        if spans is not None:
+            spans.stop()
+        if out is not sys.stdout:
+            out.close()
+
+    if args.profile:
+        total = time.perf_counter() - start
+        profile = {
+            "realizations": len(requests),
+            "failed": nfailed,
+            "workers": args.workers,
+            "total_s": round(total, 6),
+            "maps_per_s": round(len(requests) / total, 3) if total > 0 else None,
+            "phases_s": {k: round(v, 6) for k, v in phases.items()},
+        }
+        if spans is not None:
+            profile.update(spans.as_dict())
+        print(json.dumps(profile), file=sys.stderr)
+
+    return 1 if nfailed else 0
+
+
+def masks_command(args):
+    """
+    Warm an on-disk mask catalog with every expression of the math maps,
+    and print the number of masks computed for each cup
+    """
+    from .expression import MaskCatalog
+    from .toroidal import get_donutmath_catalog
+    from .rainbow import get_rainbowmath_catalog
+
+    catalog = MaskCatalog(directory=args.directory)
+    for cup, entries in [("toroidal", get_donutmath_catalog()), ("rainbow", get_rainbowmath_catalog())]:
+        rows, columns = _get_dimensions(cup, args)
+        ncomputed = catalog.warm(entries, rows, columns)
+        print(f"{cup}: {ncomputed} of {len(entries)} masks computed ({rows}x{columns})")
+    if catalog.stats()["disk_errors"]:
+        print(f"{_program}: error: could not write to {args.directory}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
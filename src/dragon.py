@@ -1,6 +1,5 @@
-from .utils import pattern2url
+from .utils import pattern2url, get_rng
 from .patterns import get_grid_empty
-import random
 
 
 ALIVE_DENSITY = 0.5
@@ -58,15 +57,14 @@ def dragon_pattern_url(patterns):
 # Two-Color Patterns
 
 
-def starfield(cols, nparts, seed=None):
+def starfield(cols, nparts, seed=None, rng=None):
     """
     Starfield: very sparse, one partition.
     This method does not use the nparts command,
     just there for consistent method signature.
     """
 
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
     nstars = nparts
 
@@ -75,22 +73,21 @@ def starfield(cols, nparts, seed=None):
     # For each color, for each star, turn on one cell
     for color in range(2):
         for star in range(nstars):
-            randloc = random.randint(0, cols - 1)
+            randloc = rng.randint(0, cols - 1)
             while patterns[0][randloc] == "o" or patterns[1][randloc] == "o":
-                randloc = random.randint(0, cols - 1)
+                randloc = rng.randint(0, cols - 1)
             patterns[color][randloc] = "o"
 
     return dragon_pattern_url(patterns)
 
 
-def waterfall(cols, nparts, seed=None):
+def waterfall(cols, nparts, seed=None, rng=None):
     """
     Waterfall: two-color random streaks.
     This method does not use the nparts command,
     just there for consistent method signature.
     """
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
     # Parameters:
     mean_size = MEAN_STREAK_SIZE
@@ -108,14 +105,14 @@ def waterfall(cols, nparts, seed=None):
             alivedeadsymbol = "."
 
         # Generate a new interval length
-        interval = round(random.expovariate(1.0 / mean_size))
+        interval = round(rng.expovariate(1.0 / mean_size))
         if interval == 0:
             interval = 1
 
         # Loop over the interval, incrementing ip
         # and making cells alive as we go.
         for j in range(interval):
-            color = random.choice([0, 1])
+            color = rng.choice([0, 1])
             patterns[color][ip] = alivedeadsymbol
             ip += 1
             if ip >= cols:
@@ -124,14 +121,13 @@ def waterfall(cols, nparts, seed=None):
     return dragon_pattern_url(patterns)
 
 
-def river(cols, nparts, seed=None):
+def river(cols, nparts, seed=None, rng=None):
     """
     River: two-color big streaks.
     This method does not use the nparts command,
     just there for consistent method signature.
     """
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
     # Parameters:
     mean_size = MEAN_STREAK_SIZE
@@ -140,7 +136,7 @@ def river(cols, nparts, seed=None):
 
     ip = 0
     alivedeadsymbol = "."
-    lastcolor = random.choice([0, 1])
+    lastcolor = rng.choice([0, 1])
     while ip < cols:
 
         # Flip the switch
@@ -151,7 +147,7 @@ def river(cols, nparts, seed=None):
             alivedeadsymbol = "."
 
         # Generate a new interval length
-        interval = round(random.expovariate(1.0 / mean_size))
+        interval = round(rng.expovariate(1.0 / mean_size))
         if interval == 0:
             interval = 1
 
@@ -166,34 +162,32 @@ def river(cols, nparts, seed=None):
     return dragon_pattern_url(patterns)
 
 
-def towers(cols, nparts, seed=None):
+def towers(cols, nparts, seed=None, rng=None):
     """
     Towers: two-color one cell.
     This method does not use the nparts command,
     just there for consistent method signature.
     """
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
     patterns = empty_dragon_patterns(cols)
 
     for color in [0, 1]:
-        loc = cols//2 + round(random.normalvariate(0, cols//6))
+        loc = cols//2 + round(rng.normalvariate(0, cols//6))
         while (patterns[0][loc] == "o" or patterns[1][loc] == "o"):
-            loc = cols//2 + round(random.normalvariate(0, cols//6))
+            loc = cols//2 + round(rng.normalvariate(0, cols//6))
         patterns[color][loc] = "o"
 
     return dragon_pattern_url(patterns)
 
 
-def supercritical(cols, nparts, seed=None):
+def supercritical(cols, nparts, seed=None, rng=None):
     """
     Supercritical: two-color sparse.
     Each live cell of color 1 or 2 occurs next to
     one cell of the opposite color.
     """
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
     # Parameters:
     nstars = nparts
@@ -201,10 +195,10 @@ def supercritical(cols, nparts, seed=None):
     patterns = empty_dragon_patterns(cols)
 
     for i in range(nstars):
-        loc = random.randint(0, cols-2)
+        loc = rng.randint(0, cols-2)
         while (patterns[0][loc] == "o" or patterns[1][loc] == "o" or patterns[0][loc+1] == "o" or patterns[1][loc+1] == "o"):
-            loc = random.randint(0, cols-2)
-        color = random.choice([0, 1])
+            loc = rng.randint(0, cols-2)
+        color = rng.choice([0, 1])
         patterns[color][loc] = "o"
         patterns[1-color][loc+1] = "o"
 
@@ -215,12 +209,11 @@ def supercritical(cols, nparts, seed=None):
 # One-Color Patterns
 
 
-def vector(cols, nparts, seed=None):
+def vector(cols, nparts, seed=None, rng=None):
     """
     Vector: one-color random split
     """
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
     assert nparts > 0
 
@@ -247,17 +240,17 @@ def vector(cols, nparts, seed=None):
         colorparts = [0,] * half + [
             1,
         ] * half
-        random.shuffle(colorparts)
+        rng.shuffle(colorparts)
 
     for i, color in enumerate(colorparts):
 
         for j in range(alive_cells_each_partition):
             # Adjust for partition boundaries
-            randloc = random.randint(
+            randloc = rng.randint(
                 i * partwidth, min((i + 1) * partwidth - 1, cols - 1)
             )
             while patterns[0][randloc] == "o" or patterns[1][randloc] == "o":
-                randloc = random.randint(
+                randloc = rng.randint(
                     i * partwidth, min((i + 1) * partwidth - 1, cols - 1)
                 )
             patterns[color][randloc] = "o"
@@ -265,12 +258,11 @@ def vector(cols, nparts, seed=None):
     return dragon_pattern_url(patterns)
 
 
-def matrix(cols, nparts, seed=None):
+def matrix(cols, nparts, seed=None, rng=None):
     """
     Matrix: two-color random split
     """
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
     # Parameters:
     alive_density = ALIVE_DENSITY
@@ -289,7 +281,7 @@ def matrix(cols, nparts, seed=None):
         alivedead = [0] + [
             1,
         ] * (nparts - 1)
-        random.shuffle(alivedead)
+        rng.shuffle(alivedead)
 
     else:
 
@@ -302,11 +294,11 @@ def matrix(cols, nparts, seed=None):
     for i, ald in enumerate(alivedead):
         if ald != 0:
             for j in range(alive_cells_each_partition):
-                randloc = random.randint(
+                randloc = rng.randint(
                     i * partwidth, min((i + 1) * partwidth - 1, cols - 1)
                 )
                 while patterns[0][randloc] == "o" or patterns[1][randloc] == "o":
-                    randloc = random.randint(
+                    randloc = rng.randint(
                         i * partwidth, min((i + 1) * partwidth - 1, cols - 1)
                     )
                 # Split 50/50 between colors
@@ -316,14 +308,13 @@ def matrix(cols, nparts, seed=None):
     return dragon_pattern_url(patterns)
 
 
-def lake(cols, nparts, seed=None):
+def lake(cols, nparts, seed=None, rng=None):
     """
     Lake: one-color streak
     This method does not use the nparts command,
     just there for consistent method signature.
     """
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
     if nparts % 2 == 1:
         nparts += 1
@@ -338,7 +329,7 @@ def lake(cols, nparts, seed=None):
     colorparts = [0,] * half + [
         1,
     ] * half
-    random.shuffle(colorparts)
+    rng.shuffle(colorparts)
 
     for i, color in enumerate(colorparts):
         pstart = i * partwidth
@@ -355,7 +346,7 @@ def lake(cols, nparts, seed=None):
                 alivedeadsymbol = "."
 
             # Generate a new interval length
-            interval = round(random.expovariate(1.0 / mean_size))
+            interval = round(rng.expovariate(1.0 / mean_size))
             if interval == 0:
                 interval = 1
 
@@ -370,12 +361,11 @@ def lake(cols, nparts, seed=None):
     return dragon_pattern_url(patterns)
 
 
-def lighthouse(cols, nparts, seed=None):
+def lighthouse(cols, nparts, seed=None, rng=None):
     """
     Lighthouse: one-color one cell.
     """
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
     assert nparts > 0
 
@@ -389,27 +379,26 @@ def lighthouse(cols, nparts, seed=None):
     colorparts = [0,] * half + [
         1,
     ] * half
-    random.shuffle(colorparts)
+    rng.shuffle(colorparts)
 
     for i, color in enumerate(colorparts):
         pstart = i * partwidth
         # end of partition (exclusive of the end)
         pend = min((i + 1) * partwidth, cols)
         pmid = pstart + (pend-pstart)//2
-        loc = pmid + round(random.normalvariate(0, partwidth//4))
+        loc = pmid + round(rng.normalvariate(0, partwidth//4))
         while (patterns[0][loc] == "o" or patterns[1][loc] == "o"):
-            loc = pmid + round(random.normalvariate(0, partwidth//4))
+            loc = pmid + round(rng.normalvariate(0, partwidth//4))
         patterns[color][loc] = "o"
 
     return dragon_pattern_url(patterns)
 
 
-def isotropic(cols, nparts, seed=None):
+def isotropic(cols, nparts, seed=None, rng=None):
     """
     Isotropic: one-color sparse.
     """
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
     assert nparts > 0
 
@@ -421,7 +410,7 @@ def isotropic(cols, nparts, seed=None):
     # Parameters:
     min_stars = MIN_STARS
     max_stars = MAX_STARS
-    nstars = random.randint(min_stars, max_stars)
+    nstars = rng.randint(min_stars, max_stars)
 
     patterns = empty_dragon_patterns(cols)
 
@@ -430,16 +419,16 @@ def isotropic(cols, nparts, seed=None):
     colorparts = [0,] * half + [
         1,
     ] * half
-    random.shuffle(colorparts)
+    rng.shuffle(colorparts)
 
     for i, color in enumerate(colorparts):
         pstart = i * partwidth
         pend = min((i + 1) * partwidth, cols)
 
         for j in range(nstars):
-            loc = random.randint(pstart, pend-1)
+            loc = rng.randint(pstart, pend-1)
             while (patterns[0][loc] == "o" or patterns[1][loc] == "o"):
-                loc = random.randint(pstart, pend-1)
+                loc = rng.randint(pstart, pend-1)
             patterns[color][loc] = "o"
 
     return dragon_pattern_url(patterns)
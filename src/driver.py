@@ -1,5 +1,5 @@
-from patterns import get_grid_pattern, pattern_union
-from maps import random_twocolor
+from .patterns import get_grid_pattern, pattern_union
+from .hellmouth import random_twocolor
 
 
 def print_acorns():
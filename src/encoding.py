@@ -0,0 +1,244 @@
+import json
+import numpy as np
+from .utils import rows2url
+from .error import GollyXMapsError
+
+
+# Every encoded team starts with MAGIC, the method byte,
+# then the varint number of rows and varint number of columns.
+MAGIC = 0x47
+
+# Rows with live cells, each coded as runs of live cells (delta-varint coded)
+RLE = 1
+
+# The full (rows x columns) bitplane, 8 cells per byte
+BITPACKED = 2
+
+METHODS = {
+    "rle": RLE,
+    "bitpacked": BITPACKED,
+}
+
+
+################
+# Varint helpers
+
+
+def _write_varint(buf, n):
+    """Append the non-negative integer n to buf as an unsigned LEB128 varint"""
+    while n > 0x7F:
+        buf.append((n & 0x7F) | 0x80)
+        n >>= 7
+    buf.append(n)
+
+
+def _read_varint(data, pos):
+    """Read an unsigned LEB128 varint from data at pos, return (value, new pos)"""
+    n = 0
+    shift = 0
+    while True:
+        try:
+            b = data[pos]
+        except IndexError:
+            raise GollyXMapsError("Error: truncated binary initial conditions")
+        pos += 1
+        n |= (b & 0x7F) << shift
+        if b < 0x80:
+            return n, pos
+        shift += 7
+
+
+##########
+# Listlife
+
+
+def url2rows(listlife):
+    """
+    Parse a listlife JSON string into a list of
+    (row index, list of live column indices), sorted by row
+    """
+    live_rows = []
+    for row in json.loads(listlife):
+        for k, v in row.items():
+            live_rows.append((int(k), sorted(v)))
+    live_rows.sort(key=lambda r: r[0])
+    return live_rows
+
+
+##########
+# Encoders
+
+
+def encode_listlife(listlife, rows, columns, method=None):
+    """
+    Encode one team's listlife JSON string (e.g. initialConditions1)
+    on a grid of size (rows x columns) as compact bytes.
+
+    method is "rle", "bitpacked", or None to use whichever is smaller.
+    """
+    return encode_rows(url2rows(listlife), rows, columns, method=method)
+
+
+def encode_rows(live_rows, rows, columns, method=None):
+    """
+    Encode a list of (row index, sorted list of live column indices)
+    on a grid of size (rows x columns) as compact bytes.
+    See encode_listlife() for method.
+    """
+    if columns < 1 or rows < 1:
+        err = f"Error: invalid number of rows {rows} or columns {columns}, must be positive integers > 0"
+        raise GollyXMapsError(err)
+    for i, cols in live_rows:
+        if not (0 <= i < rows) or (cols and not (0 <= cols[0] and cols[-1] < columns)):
+            raise GollyXMapsError(
+                f"Error: live cells in row {i} are outside of grid of size {(rows, columns)}"
+            )
+
+    if method is None:
+        rle = _encode_rle(live_rows, rows, columns)
+        # The bitplane size is known without building it
+        if len(rle) <= _header_size(rows, columns) + (rows * columns + 7) // 8:
+            return rle
+        return _encode_bitpacked(live_rows, rows, columns)
+
+    if method not in METHODS:
+        raise GollyXMapsError(
+            f"Error: invalid binary encoding method {method}, must be one of: {', '.join(METHODS)}"
+        )
+    if METHODS[method] == RLE:
+        return _encode_rle(live_rows, rows, columns)
+    return _encode_bitpacked(live_rows, rows, columns)
+
+
+def _header(method, rows, columns):
+    buf = bytearray([MAGIC, method])
+    _write_varint(buf, rows)
+    _write_varint(buf, columns)
+    return buf
+
+
+def _header_size(rows, columns):
+    return len(_header(0, rows, columns))
+
+
+def _encode_rle(live_rows, rows, columns):
+    """
+    Payload: number of live rows, then for each live row
+    the row gap from the previous live row, the number of runs,
+    and for each run the gap from the end of the previous run
+    and the run length minus one. All values are varints.
+    """
+    buf = _header(RLE, rows, columns)
+    live_rows = [(i, cols) for (i, cols) in live_rows if cols]
+    _write_varint(buf, len(live_rows))
+    prev_row = -1
+    for i, cols in live_rows:
+        runs = []
+        start = prev = cols[0]
+        for j in cols[1:]:
+            if j == prev:
+                continue
+            if j != prev + 1:
+                runs.append((start, prev))
+                start = j
+            prev = j
+        runs.append((start, prev))
+
+        _write_varint(buf, i - prev_row - 1)
+        _write_varint(buf, len(runs))
+        prev_end = 0
+        for start, end in runs:
+            _write_varint(buf, start - prev_end)
+            _write_varint(buf, end - start)
+            prev_end = end + 1
+        prev_row = i
+    return bytes(buf)
+
+
+def _encode_bitpacked(live_rows, rows, columns):
+    """
+    Payload: the bitplane in row-major order, 8 cells per byte,
+    most significant bit first
+    """
+    buf = _header(BITPACKED, rows, columns)
+    plane = np.zeros((rows, columns), dtype=bool)
+    for i, cols in live_rows:
+        plane[i, cols] = True
+    buf += np.packbits(plane, axis=None).tobytes()
+    return bytes(buf)
+
+
+##########
+# Decoders
+
+
+def decode_rows(data):
+    """
+    Decode bytes from encode_listlife()/encode_rows().
+    Return (rows, columns, list of (row index, list of live column indices)).
+    """
+    if len(data) < 2 or data[0] != MAGIC:
+        raise GollyXMapsError("Error: data is not binary initial conditions")
+    method = data[1]
+    rows, pos = _read_varint(data, 2)
+    columns, pos = _read_varint(data, pos)
+
+    if method == RLE:
+        live_rows = []
+        nrows, pos = _read_varint(data, pos)
+        i = -1
+        for _ in range(nrows):
+            gap, pos = _read_varint(data, pos)
+            i += gap + 1
+            nruns, pos = _read_varint(data, pos)
+            cols = []
+            prev_end = 0
+            for _ in range(nruns):
+                gap, pos = _read_varint(data, pos)
+                length, pos = _read_varint(data, pos)
+                start = prev_end + gap
+                prev_end = start + length + 1
+                cols.extend(range(start, prev_end))
+            live_rows.append((i, cols))
+        return rows, columns, live_rows
+
+    if method == BITPACKED:
+        plane = decode_plane(data)
+        live_rows = []
+        for i, row in enumerate(plane):
+            cols = row.nonzero()[0]
+            if len(cols) > 0:
+                live_rows.append((i, cols.tolist()))
+        return rows, columns, live_rows
+
+    raise GollyXMapsError(f"Error: unknown binary encoding method {method}")
+
+
+def decode_plane(data):
+    """
+    Decode bytes from encode_listlife()/encode_rows()
+    into a boolean bitplane of shape (rows, columns)
+    """
+    if len(data) < 2 or data[0] != MAGIC:
+        raise GollyXMapsError("Error: data is not binary initial conditions")
+    rows, pos = _read_varint(data, 2)
+    columns, pos = _read_varint(data, pos)
+    if data[1] == BITPACKED:
+        payload = np.frombuffer(data, dtype=np.uint8, offset=pos)
+        if len(payload) != (rows * columns + 7) // 8:
+            raise GollyXMapsError("Error: truncated binary initial conditions")
+        return np.unpackbits(payload, count=rows * columns).reshape(rows, columns).astype(bool)
+
+    rows, columns, live_rows = decode_rows(data)
+    plane = np.zeros((rows, columns), dtype=bool)
+    for i, cols in live_rows:
+        plane[i, cols] = True
+    return plane
+
+
+def decode_listlife(data):
+    """
+    Decode bytes from encode_listlife() back into the listlife JSON string
+    """
+    rows, columns, live_rows = decode_rows(data)
+    return rows2url(live_rows)
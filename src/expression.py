@@ -0,0 +1,219 @@
+"""
+Evaluate the expressions of the math maps (donutmath, rainbowmath) over
+whole grids at once.
+
+An expression is a function f(x, y) built from integer arithmetic, bitwise
+operators and the helpers below, so it works on NumPy arrays of coordinates
+as well as on single ints. A cell is alive where f(x, y) == 0.
+
+The mask of live cells only depends on the expression form, its parameters
+and the grid size, so get_expression_mask() looks masks up in a MaskCatalog:
+an in-memory LRU, optionally backed by a directory of mask files that can
+be built ahead of time (see MaskCatalog.warm()).
+"""
+import json
+import numpy as np
+from . import __version__
+from .cache import TwoTierCache
+
+
+# Bump when an expression form or the layout of mask files changes
+MASK_FORMAT = 2
+
+
+# Primality of 0, 1, 2, ... (grown as needed by get_prime_table)
+_prime_table = np.zeros(0, dtype=bool)
+
+
+def get_prime_table(n):
+    """
+    Return a boolean array of length at least n that is True at the primes
+    """
+    global _prime_table
+    table = _prime_table
+    if len(table) < n:
+        size = max(n, 1024)
+        table = np.ones(size, dtype=bool)
+        table[:2] = False
+        for k in range(2, int(size ** 0.5) + 1):
+            if table[k]:
+                table[k * k::k] = False
+        table.setflags(write=False)
+        _prime_table = table
+    return table
+
+
+def is_prime(n):
+    """
+    Return whether abs(n) is prime, elementwise for an array
+    """
+    n = np.abs(n)
+    return get_prime_table(int(np.max(n, initial=0)) + 1)[n]
+
+
+def is_not_prime(n):
+    return ~is_prime(n)
+
+
+def powmod(base, exponent, modulus):
+    """
+    Return (base ** exponent) % modulus, elementwise for an array of
+    non-negative exponents
+    """
+    exponent = np.asarray(exponent)
+    table = np.array([pow(base, k, modulus) for k in range(int(np.max(exponent, initial=0)) + 1)])
+    return table[exponent]
+
+
+def expression_mask(rows, columns, f_handle, xoffset=0, yoffset=0):
+    """
+    Return the (rows x columns) bitplane that is alive where
+    f_handle(x - xoffset, y - yoffset) == 0
+    """
+    ys, xs = np.indices((rows, columns))
+    return np.asarray(f_handle(xs - xoffset, ys - yoffset)) == 0
+
+
+def shuffle_cells(mask, rng):
+    """
+    Return the (xs, ys) of the live cells of mask, in the order that
+    rng.shuffle() puts the list of (x, y) for x in columns, for y in rows
+    """
+    xs, ys = np.nonzero(mask.T)
+    # rng.shuffle() swaps the same positions whatever the list holds
+    order = list(range(len(xs)))
+    rng.shuffle(order)
+    order = np.array(order, dtype=np.intp)
+    return xs[order], ys[order]
+
+
+def deal_cells(xs, ys, serpentine_pattern, nteams, rows, columns):
+    """
+    Deal the cells to the teams in turn, cell i going to team
+    serpentine_pattern[i % len(serpentine_pattern)]. Return a bitplane per team.
+    """
+    teams = np.asarray(serpentine_pattern, dtype=np.intp)[np.arange(len(xs)) % len(serpentine_pattern)]
+    planes = np.zeros((nteams, rows, columns), dtype=bool)
+    planes[teams, ys, xs] = True
+    return planes
+
+
+# name -> f(x, y, **params), the expression forms of the math maps
+EXPRESSION_FORMS = {
+    "and": lambda x, y, p: (x & y) % p,
+    "box_xor": lambda x, y, a, c, p: (x // a ^ y // a) * c % p,
+    "powmod_and": lambda x, y, a, b, p: powmod(a, x, p) & powmod(b, y, p),
+    "prime_and": lambda x, y, p: is_not_prime((x & y) % p),
+    "prime_xor": lambda x, y, p: is_not_prime((x ^ y) % p),
+    "prime_squares_and": lambda x, y, p: is_not_prime((x * x & y * y) % p),
+    "prime_scaled_and": lambda x, y, a, b, p: is_not_prime((a * x & b * y) % p),
+    "prime_div_xor": lambda x, y, p: is_not_prime((x // (y + 1) ^ y) % p),
+    "prime_square_div": lambda x, y, p: is_not_prime((x * x // (y + 1)) % p),
+}
+
+
+def get_mask_key(form, rows, columns, params, xoffset=0, yoffset=0):
+    """
+    Return the catalog key of a mask: a JSON-able list
+    """
+    if form not in EXPRESSION_FORMS:
+        raise KeyError(f"Unknown expression form {form}")
+    return [form, sorted(params.items()), rows, columns, xoffset, yoffset]
+
+
+def compute_expression_mask(form, rows, columns, params, xoffset=0, yoffset=0):
+    """
+    Return the (rows x columns) bitplane of the expression form with the given
+    parameters, alive where it is 0
+    """
+    f = EXPRESSION_FORMS[form]
+    return expression_mask(rows, columns, lambda x, y: f(x, y, **params), xoffset=xoffset, yoffset=yoffset)
+
+
+def get_expression_mask(form, rows, columns, params, xoffset=0, yoffset=0):
+    """
+    Return the read-only mask of compute_expression_mask(),
+    from the mask catalog if one is set
+    """
+    catalog = get_mask_catalog()
+    if catalog is None:
+        return compute_expression_mask(form, rows, columns, params, xoffset=xoffset, yoffset=yoffset)
+    return catalog.get(form, rows, columns, params, xoffset=xoffset, yoffset=yoffset)
+
+
+class MaskCatalog(TwoTierCache):
+    """
+    Two-tier catalog of expression masks, keyed by get_mask_key().
+
+    The first tier is an in-memory LRU that holds at most max_bytes of masks.
+    If directory is specified, the second tier is one bit-packed file per mask
+    under directory/<version>/, where version is the package version and
+    MASK_FORMAT. A mask missing from both tiers is computed and stored in both,
+    so the directory fills up on first use, or ahead of time with warm().
+    """
+
+    suffix = ".npz"
+    binary = True
+
+    def __init__(self, max_bytes=32 * 1024 * 1024, directory=None):
+        super().__init__(max_bytes, directory, f"{__version__}-m{MASK_FORMAT}")
+
+    def get(self, form, rows, columns, params, xoffset=0, yoffset=0):
+        """
+        Return the read-only mask of the expression form with the given parameters
+        """
+        skey = json.dumps(get_mask_key(form, rows, columns, params, xoffset=xoffset, yoffset=yoffset))
+        mask = self._lookup(skey)
+        if mask is None:
+            mask = compute_expression_mask(form, rows, columns, params, xoffset=xoffset, yoffset=yoffset)
+            mask.setflags(write=False)
+            self._store(skey, mask)
+        return mask
+
+    def warm(self, entries, rows, columns):
+        """
+        Compute and store the mask of each (form, params) in entries
+        for a (rows x columns) grid. Return the number of masks computed.
+        """
+        before = self.stats()["misses"]
+        for form, params in entries:
+            self.get(form, rows, columns, params)
+        return self.stats()["misses"] - before
+
+    def _sizeof(self, mask):
+        return mask.nbytes
+
+    def _load(self, f, skey):
+        with np.load(f) as dat:
+            # Guard against digest collisions
+            if str(dat["key"]) != skey:
+                return None
+            bits = dat["bits"]
+        _, _, rows, columns, _, _ = json.loads(skey)
+        mask = np.unpackbits(bits, count=rows * columns).astype(bool).reshape(rows, columns)
+        mask.setflags(write=False)
+        return mask
+
+    def _dump(self, f, skey, mask):
+        np.savez(f, key=np.array(skey), bits=np.packbits(mask))
+
+
+# The catalog used by get_expression_mask(), see set_mask_catalog()
+_mask_catalog = MaskCatalog()
+
+
+def get_mask_catalog():
+    """
+    Return the catalog used by get_expression_mask() (by default, a
+    memory-only MaskCatalog), or None if masks are not cached
+    """
+    return _mask_catalog
+
+
+def set_mask_catalog(catalog):
+    """
+    Set the catalog used by get_expression_mask()
+    (a MaskCatalog, or None to compute every mask)
+    """
+    global _mask_catalog
+    _mask_catalog = catalog
@@ -1,3 +1,6 @@
+from .error import GollyXGeomError
+
+
 def hflip_pattern(pattern):
     """Flip a pattern horizontally"""
     newpattern = ["".join(reversed(j)) for j in pattern]
@@ -19,5 +22,5 @@ def rot_pattern(pattern, deg):
             newpattern_tup = zip(*list(reversed(newpattern)))
             newpattern = ["".join(j) for j in newpattern_tup]
     else:
-        raise GollyXGeomError(f"Invalid degree specified, must be one of: {', '.join(valid_deg)}")
+        raise GollyXGeomError(f"Invalid degree specified, must be one of: {', '.join(str(d) for d in valid_deg)}")
     return newpattern
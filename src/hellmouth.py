@@ -2,7 +2,6 @@ import itertools
 from operator import itemgetter
 import json
 import os
-import random
 from .geom import hflip_pattern, vflip_pattern, rot_pattern
 from .patterns import (
     get_pattern_size,
@@ -12,8 +11,12 @@ from .patterns import (
     methuselah_quadrants_pattern,
     pattern_union,
     cloud_region,
+    get_offset_range,
+    draw_jitter,
+    get_min_safe_dimension,
 )
-from .utils import pattern2url, retry_on_failure
+from .sparse import SparsePattern, sparse_union
+from .utils import pattern2url, retry_on_failure, get_rng, min_dimensions, random_twocolor_urls
 
 
 ##############
@@ -48,7 +51,7 @@ def get_hellmouth_pattern_function_map():
 
 
 def hellmouth_methuselah_quadrants_pattern(
-    rows, cols, seed=None, methuselah_counts=None, fixed_methuselah=None
+    rows, cols, seed=None, methuselah_counts=None, fixed_methuselah=None, rng=None
 ):
     small_methuselah_names = [
         "bheptomino",
@@ -87,7 +90,7 @@ def hellmouth_methuselah_quadrants_pattern(
             mn = small_methuselah_names
 
     return methuselah_quadrants_pattern(
-        rows, cols, seed=None, methuselah_counts=mc, methuselah_names=mn
+        rows, cols, seed=None, methuselah_counts=mc, methuselah_names=mn, rng=rng
     )
 
 
@@ -95,7 +98,7 @@ def hellmouth_methuselah_quadrants_pattern(
 # Map methods
 
 
-def random_twocolor(rows, cols, seed=None):
+def random_twocolor(rows, cols, seed=None, rng=None):
     """
     Generate a random two-color list life initialization.
 
@@ -103,86 +106,47 @@ def random_twocolor(rows, cols, seed=None):
     with the random initializations.
     (12% of all cells are alive).
 
-    Strategy: generate a set of (x,y) tuples,
-    convert to list, split in half. Use those
-    point sets to create listLife URL strings.
+    Strategy: draw distinct cells without replacement,
+    and split them at random between the two teams.
     """
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
     ncells = rows * cols
     nlivecells = ncells * 0.12
-    points = set()
-    while len(points) < nlivecells:
-        randy = random.randint(0, rows - 1)
-        randx = random.randint(0, cols - 1)
-        points.add((randx, randy))
-
-    points = list(points)
-    points1 = set(points[: len(points) // 2])  # noqa
-    points2 = set(points[len(points) // 2 :])  # noqa
-    pattern1 = []
-    pattern2 = []
-    for y in range(rows):
-        row1 = []
-        row2 = []
-
-        # team 1 row
-        for x in range(cols):
-            if (x, y) in points1:
-                row1.append("o")
-            else:
-                row1.append(".")
-        row1str = "".join(row1)
-        pattern1.append(row1str)
-
-        # team 2 row
-        for x in range(cols):
-            if (x, y) in points2:
-                row2.append("o")
-            else:
-                row2.append(".")
-        row2str = "".join(row2)
-        pattern2.append(row2str)
-
-    pattern1_url = pattern2url(pattern1)
-    pattern2_url = pattern2url(pattern2)
-
-    return pattern1_url, pattern2_url
+    return random_twocolor_urls(rows, cols, nlivecells, rng)
 
 
-def randompartition_twocolor(rows, cols, seed=None):
+def randompartition_twocolor(rows, cols, seed=None, rng=None):
     """
     Generate a two-color random map, and assign points to colors
     after subdividing the grid into rectangles.
     """
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
     ncells = rows * cols
     nlivecells = int(ncells * 0.12)
 
     mindim = min(rows, cols)
     if mindim < 200:
-        nhpartitions = random.choice([1, 2, 4, 5])
-        nvpartitions = random.choice([2, 4, 8])
+        nhpartitions = rng.choice([1, 2, 4, 5])
+        nvpartitions = rng.choice([2, 4, 8])
     else:
-        nhpartitions = random.choice([1, 2, 4, 6, 8])
-        nvpartitions = random.choice([2, 4, 6, 8, 10])
+        nhpartitions = rng.choice([1, 2, 4, 6, 8])
+        nvpartitions = rng.choice([2, 4, 6, 8, 10])
 
     w_vpartition = cols // nvpartitions
     h_hpartition = rows // nhpartitions
 
     team1_points = set()
     while len(team1_points) < nlivecells // 2:
-        randy = random.randint(0, rows - 1)
-        randx = random.randint(0, cols - 1)
+        randy = rng.randint(0, rows - 1)
+        randx = rng.randint(0, cols - 1)
         if (randx // w_vpartition) % 2 == (randy // h_hpartition) % 2:
             team1_points.add((randx, randy))
 
     team2_points = set()
     while len(team2_points) < nlivecells // 2:
-        randy = random.randint(0, rows - 1)
-        randx = random.randint(0, cols - 1)
+        randy = rng.randint(0, rows - 1)
+        randx = rng.randint(0, cols - 1)
         if (randx // w_vpartition) % 2 != (randy // h_hpartition) % 2:
             team2_points.add((randx, randy))
 
@@ -214,21 +178,34 @@ def randompartition_twocolor(rows, cols, seed=None):
     return (s1, s2)
 
 
-def quadjustyna_twocolor(rows, cols, seed=None):
+def _quadjustyna_min_dimensions():
+    # Justynas are rotated at random, so either side can lie along either axis
+    extents = get_pattern_size("justyna")
+    rows = get_min_safe_dimension(
+        [(e, anchor, (-10, 10)) for e in extents for anchor in [lambda n: n // 4, lambda n: n // 2 + n // 4]]
+    )
+    columns = get_min_safe_dimension(
+        [(e, lambda n: n // 4, (-5, 30)) for e in extents]
+        + [(e, lambda n: n // 2 + n // 4, (-30, 5)) for e in extents]
+    )
+    return (rows, columns)
+
+
+@min_dimensions(_quadjustyna_min_dimensions)
+def quadjustyna_twocolor(rows, cols, seed=None, rng=None):
     """
     Four justyna methuselahs.
     """
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
     rotdegs = [0, 90, 180, 270]
 
     centerx1 = cols // 4
-    centerx1a = centerx1 + random.randint(-5, 30)
-    centerx1b = centerx1 + random.randint(-5, 30)
+    centerx1a = centerx1 + rng.randint(-5, 30)
+    centerx1b = centerx1 + rng.randint(-5, 30)
 
-    centery1a = rows // 4 + random.randint(-10, 10)
-    centery1b = rows // 2 + rows // 4 + random.randint(-10, 10)
+    centery1a = rows // 4 + rng.randint(-10, 10)
+    centery1b = rows // 2 + rows // 4 + rng.randint(-10, 10)
 
     j1a = get_grid_pattern(
         "justyna",
@@ -236,9 +213,9 @@ def quadjustyna_twocolor(rows, cols, seed=None):
         cols,
         xoffset=centerx1a,
         yoffset=centery1a,
-        hflip=(random.random() < 0.5),
-        vflip=(random.random() < 0.5),
-        rotdeg=random.choice(rotdegs),
+        hflip=(rng.random() < 0.5),
+        vflip=(rng.random() < 0.5),
+        rotdeg=rng.choice(rotdegs),
     )
     j1b = get_grid_pattern(
         "justyna",
@@ -246,18 +223,18 @@ def quadjustyna_twocolor(rows, cols, seed=None):
         cols,
         xoffset=centerx1b,
         yoffset=centery1b,
-        hflip=(random.random() < 0.5),
-        vflip=(random.random() < 0.5),
-        rotdeg=random.choice(rotdegs),
+        hflip=(rng.random() < 0.5),
+        vflip=(rng.random() < 0.5),
+        rotdeg=rng.choice(rotdegs),
     )
     j1_pattern = pattern_union([j1a, j1b])
 
     centerx2 = cols // 2 + cols // 4
-    centerx2a = centerx2 - random.randint(-5, 30)
-    centerx2b = centerx2 - random.randint(-5, 30)
+    centerx2a = centerx2 - rng.randint(-5, 30)
+    centerx2b = centerx2 - rng.randint(-5, 30)
 
-    centery2a = rows // 4 + random.randint(-10, 10)
-    centery2b = rows // 2 + rows // 4 + random.randint(-10, 10)
+    centery2a = rows // 4 + rng.randint(-10, 10)
+    centery2b = rows // 2 + rows // 4 + rng.randint(-10, 10)
 
     j2a = get_grid_pattern(
         "justyna",
@@ -265,9 +242,9 @@ def quadjustyna_twocolor(rows, cols, seed=None):
         cols,
         xoffset=centerx2a,
         yoffset=centery2a,
-        hflip=(random.random() < 0.5),
-        vflip=(random.random() < 0.5),
-        rotdeg=random.choice(rotdegs),
+        hflip=(rng.random() < 0.5),
+        vflip=(rng.random() < 0.5),
+        rotdeg=rng.choice(rotdegs),
     )
     j2b = get_grid_pattern(
         "justyna",
@@ -275,9 +252,9 @@ def quadjustyna_twocolor(rows, cols, seed=None):
         cols,
         xoffset=centerx2b,
         yoffset=centery2b,
-        hflip=(random.random() < 0.5),
-        vflip=(random.random() < 0.5),
-        rotdeg=random.choice(rotdegs),
+        hflip=(rng.random() < 0.5),
+        vflip=(rng.random() < 0.5),
+        rotdeg=rng.choice(rotdegs),
     )
     j2_pattern = pattern_union([j2a, j2b])
 
@@ -287,20 +264,19 @@ def quadjustyna_twocolor(rows, cols, seed=None):
     return (s1, s2)
 
 
-def spaceshipcrash_twocolor(rows, cols, seed=None):
+def spaceshipcrash_twocolor(rows, cols, seed=None, rng=None):
     """
     Clouds of spaceships in each quadrant crashing into each other at the origin.
     """
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
     # Decide on how to distribute shapes among quadrants
     ss_quadrant_assignments = [1, 2]
-    random.shuffle(ss_quadrant_assignments)
+    rng.shuffle(ss_quadrant_assignments)
     quadrant_clouds = []
 
     osc_quadrant_assignments = [1, 2]
-    random.shuffle(osc_quadrant_assignments)
+    rng.shuffle(osc_quadrant_assignments)
     quadrant_osc = []
 
     # Assemble parameters needed to create a cloud region
@@ -312,14 +288,14 @@ def spaceshipcrash_twocolor(rows, cols, seed=None):
     jitter = [3, 3]
 
     # This will turn better-spaced grids on/off
-    distancing = True  # random.getrandbits(1)
+    distancing = True  # rng.getrandbits(1)
 
     # Use margins to shift the cloud forward/backward (how depends on which quadrant)
     lo_value = 0
     hi_value = 3
 
-    slide = random.randint(0, hi_value)
-    slide_fwd = random.random() < 0.50
+    slide = rng.randint(0, hi_value)
+    slide_fwd = rng.random() < 0.50
 
     if slide_fwd:
         # Slide cloud forward by padding north and east
@@ -340,11 +316,12 @@ def spaceshipcrash_twocolor(rows, cols, seed=None):
             jitter,
             q1flip,
             distancing,
+            rng=rng,
         )
     )
 
     # quadrant 2
-    slide = random.randint(0, hi_value)
+    slide = rng.randint(0, hi_value)
     if not slide_fwd:
         # Slide cloud forward by padding north and west
         q2margin = [slide, 0, 0, slide]
@@ -364,6 +341,7 @@ def spaceshipcrash_twocolor(rows, cols, seed=None):
             jitter,
             q2flip,
             distancing,
+            rng=rng,
         )
     )
 
@@ -377,7 +355,7 @@ def spaceshipcrash_twocolor(rows, cols, seed=None):
         # bottom left oscillator
         quadrant_osc.append(
             get_grid_pattern(
-                random.choice(osc_names),
+                rng.choice(osc_names),
                 rows,
                 cols,
                 xoffset=cols // 4,
@@ -387,7 +365,7 @@ def spaceshipcrash_twocolor(rows, cols, seed=None):
         # bottom right oscillator
         quadrant_osc.append(
             get_grid_pattern(
-                random.choice(osc_names),
+                rng.choice(osc_names),
                 rows,
                 cols,
                 xoffset=cols // 2 + cols // 4,
@@ -400,19 +378,19 @@ def spaceshipcrash_twocolor(rows, cols, seed=None):
         left_oscillators = []
         left_oscillators.append(
             get_grid_pattern(
-                random.choice(osc_names),
+                rng.choice(osc_names),
                 rows,
                 cols,
-                xoffset=cols // 4 + random.randint(-osc_jitter, osc_jitter),
+                xoffset=cols // 4 + rng.randint(-osc_jitter, osc_jitter),
                 yoffset=rows // 2 + rows // 4 - rows // 8,
             )
         )
         left_oscillators.append(
             get_grid_pattern(
-                random.choice(osc_names),
+                rng.choice(osc_names),
                 rows,
                 cols,
-                xoffset=cols // 4 + random.randint(-osc_jitter, osc_jitter),
+                xoffset=cols // 4 + rng.randint(-osc_jitter, osc_jitter),
                 yoffset=rows // 2 + rows // 4 + rows // 6,
             )
         )
@@ -422,19 +400,19 @@ def spaceshipcrash_twocolor(rows, cols, seed=None):
         right_oscillators = []
         right_oscillators.append(
             get_grid_pattern(
-                random.choice(osc_names),
+                rng.choice(osc_names),
                 rows,
                 cols,
-                xoffset=cols // 2 + cols // 4 + random.randint(-osc_jitter, osc_jitter),
+                xoffset=cols // 2 + cols // 4 + rng.randint(-osc_jitter, osc_jitter),
                 yoffset=rows // 2 + rows // 4 - rows // 8,
             )
         )
         right_oscillators.append(
             get_grid_pattern(
-                random.choice(osc_names),
+                rng.choice(osc_names),
                 rows,
                 cols,
-                xoffset=cols // 2 + cols // 4 + random.randint(-osc_jitter, osc_jitter),
+                xoffset=cols // 2 + cols // 4 + rng.randint(-osc_jitter, osc_jitter),
                 yoffset=rows // 2 + rows // 4 + rows // 6,
             )
         )
@@ -467,16 +445,15 @@ def spaceshipcrash_twocolor(rows, cols, seed=None):
     return (s1, s2)
 
 
-def spaceshipcluster_twocolor(rows, cols, seed=None):
+def spaceshipcluster_twocolor(rows, cols, seed=None, rng=None):
     """
     Clouds of spaceships in the upper quadrants crashing into burloaferimeters below.
     """
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
     # Decide on how to distribute spaceships among quadrants
     quadrant_assignments = [1, 1, 2, 2]
-    random.shuffle(quadrant_assignments)
+    rng.shuffle(quadrant_assignments)
 
     # Assemble parameters needed to create a cloud region in each quadrant
     left_xlim = (0, cols // 2)
@@ -487,20 +464,20 @@ def spaceshipcluster_twocolor(rows, cols, seed=None):
     jitter = [3, 3]
 
     # This will turn better-spaced grids on/off
-    distancing = True  # random.getrandbits(1)
+    distancing = True  # rng.getrandbits(1)
 
     # Use margins to shift the cloud forward/backward (how depends on which quadrant)
     lo_value = 0
     hi_value = 3
 
     # decide whether to slide quadrant 1 and 2 forward/backward
-    slide_fwd = random.random() < 0.50
+    slide_fwd = rng.random() < 0.50
 
     # This will hold four items: one glider cloud pattern for each quadrant
     quadrant_clouds = []
 
     # quadrant 1
-    slide = random.randint(0, hi_value)
+    slide = rng.randint(0, hi_value)
     if slide_fwd:
         # Slide cloud forward by padding north and east
         q1margin = [slide, slide, 0, 0]
@@ -520,11 +497,12 @@ def spaceshipcluster_twocolor(rows, cols, seed=None):
             jitter,
             q1flip,
             distancing,
+            rng=rng,
         )
     )
 
     # quadrant 2
-    slide = random.randint(0, hi_value)
+    slide = rng.randint(0, hi_value)
     if not slide_fwd:
         # Slide cloud forward by padding north and west
         q2margin = [slide, 0, 0, slide]
@@ -544,14 +522,15 @@ def spaceshipcluster_twocolor(rows, cols, seed=None):
             jitter,
             q2flip,
             distancing,
+            rng=rng,
         )
     )
 
     # decide whether to slide quadrant 3 and 4 forward/backward
-    slide_fwd = random.random() < 0.50
+    slide_fwd = rng.random() < 0.50
 
     # quadrant 3
-    slide = random.randint(0, hi_value)
+    slide = rng.randint(0, hi_value)
     if slide_fwd:
         # Slide cloud forward by padding south and west
         q3margin = [0, 0, slide, slide]
@@ -571,11 +550,12 @@ def spaceshipcluster_twocolor(rows, cols, seed=None):
             jitter,
             q3flip,
             distancing,
+            rng=rng,
         )
     )
 
     # quadrant 4
-    slide = random.randint(0, hi_value)
+    slide = rng.randint(0, hi_value)
     if not slide_fwd:
         # Slide cloud forward by padding south and east
         q4margin = [0, slide, slide, 0]
@@ -595,6 +575,7 @@ def spaceshipcluster_twocolor(rows, cols, seed=None):
             jitter,
             q4flip,
             distancing,
+            rng=rng,
         )
     )
 
@@ -616,7 +597,7 @@ def spaceshipcluster_twocolor(rows, cols, seed=None):
     return (s1, s2)
 
 
-def twoacorn_twocolor(rows, cols, seed=None):
+def twoacorn_twocolor(rows, cols, seed=None, rng=None):
     """
     Generate a map wth an acorn on the top and an acorn on the bottom.
 
@@ -629,10 +610,9 @@ def twoacorn_twocolor(rows, cols, seed=None):
     - get size of acorn pattern
     - ask for acorn at particular offset
     """
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
-    die1 = random.randint(1, 3)
+    die1 = rng.randint(1, 3)
     if die1 == 1:
         # zone 1
         centerx1 = cols // 2 + cols // 4
@@ -646,9 +626,9 @@ def twoacorn_twocolor(rows, cols, seed=None):
         centerx1 = cols // 2
         centery1 = rows // 4
 
-    centerx1 += random.randint(-5, 5)
+    centerx1 += rng.randint(-5, 5)
 
-    die2 = random.randint(1, 3)
+    die2 = rng.randint(1, 3)
     if die2 == 1:
         # zone 3
         centerx2 = cols // 4
@@ -662,12 +642,12 @@ def twoacorn_twocolor(rows, cols, seed=None):
         centerx2 = cols // 2
         centery2 = rows // 2 + rows // 4
 
-    centerx2 += random.randint(-5, 5)
+    centerx2 += rng.randint(-5, 5)
 
-    pattern1 = get_grid_pattern(
+    pattern1 = SparsePattern.from_pattern_name(
         "acorn", rows, cols, xoffset=centerx1, yoffset=centery1, vflip=True
     )
-    pattern2 = get_grid_pattern("acorn", rows, cols, xoffset=centerx2, yoffset=centery2)
+    pattern2 = SparsePattern.from_pattern_name("acorn", rows, cols, xoffset=centerx2, yoffset=centery2)
 
     pattern1_url = pattern2url(pattern1)
     pattern2_url = pattern2url(pattern2)
@@ -675,18 +655,51 @@ def twoacorn_twocolor(rows, cols, seed=None):
     return pattern1_url, pattern2_url
 
 
-def timebomb_oscillators_twocolor(rows, cols, seed=None):
-    return _timebomb_oscillators_twocolor(rows, cols, revenge=False, seed=seed)
+def _timebomb_oscillators_min_dimensions(revenge):
+    # The geometry of _timebomb_oscillators_twocolor(): three oscillators and a
+    # timebomb on grids under 200, six oscillators and two timebombs above
+    L = 28
+    if revenge:
+        oscillators = ["airforce", "koksgalaxy", "dinnertable", "vring64", "harbor"]
+    else:
+        oscillators = ["quadrupleburloaferimeter"]
+    osc_sizes = [get_pattern_size(osc) for osc in oscillators]
+    # Timebombs may be rotated
+    bomb_extents = get_pattern_size("timebomb")
+
+    osc_columns = [(w, lambda n, k=k: n // 2 + k * L, (-(L // 8), L // 8)) for (h, w) in osc_sizes for k in [-1, 0, 1]]
+    bomb_columns = [(e, lambda n: n // 2, (-(L // 2), L // 2)) for e in bomb_extents]
+
+    rows = max(
+        get_min_safe_dimension(
+            [(h, lambda n: n // 2 - L // 2, (-(L // 4), 0)) for (h, w) in osc_sizes]
+            + [(e, lambda n: n // 2 + L // 2, (0, L // 8)) for e in bomb_extents]
+        ),
+        get_min_safe_dimension(
+            [(h, lambda n: n // 2 + 2 * L, (-(L // 4), 0)) for (h, w) in osc_sizes]
+            + [(h, lambda n: n // 2 - 2 * L, (0, L // 4)) for (h, w) in osc_sizes]
+            + [(e, lambda n: n // 2 + L, (0, L // 8)) for e in bomb_extents]
+            + [(e, lambda n: n // 2 - L, (-(L // 8), 0)) for e in bomb_extents],
+            start=200,
+        ),
+    )
+    columns = get_min_safe_dimension(osc_columns + bomb_columns)
+    return (rows, columns)
 
 
-def timebomb_randomoscillators_twocolor(rows, cols, seed=None):
-    return _timebomb_oscillators_twocolor(rows, cols, revenge=True, seed=seed)
+@min_dimensions(lambda: _timebomb_oscillators_min_dimensions(revenge=False))
+def timebomb_oscillators_twocolor(rows, cols, seed=None, rng=None):
+    return _timebomb_oscillators_twocolor(rows, cols, revenge=False, seed=seed, rng=rng)
 
 
-def _timebomb_oscillators_twocolor(rows, cols, revenge, seed=None):
+@min_dimensions(lambda: _timebomb_oscillators_min_dimensions(revenge=True))
+def timebomb_randomoscillators_twocolor(rows, cols, seed=None, rng=None):
+    return _timebomb_oscillators_twocolor(rows, cols, revenge=True, seed=seed, rng=rng)
 
-    if seed is not None:
-        random.seed(seed)
+
+def _timebomb_oscillators_twocolor(rows, cols, revenge, seed=None, rng=None):
+
+    rng = get_rng(seed, rng)
 
     mindim = min(rows, cols)
 
@@ -728,7 +741,7 @@ def _timebomb_oscillators_twocolor(rows, cols, revenge, seed=None):
     def _get_oscillator_name():
         if revenge:
             oscillators = ["airforce", "koksgalaxy", "dinnertable", "vring64", "harbor"]
-            which_oscillator = random.choice(oscillators)
+            which_oscillator = rng.choice(oscillators)
         else:
             which_oscillator = "quadrupleburloaferimeter"
         return which_oscillator
@@ -745,7 +758,7 @@ def _timebomb_oscillators_twocolor(rows, cols, revenge, seed=None):
 
     # Decide whether this is an even matchup (each team has 1 timebomb and 3 oscillators)
     # or a lopsided matchup (one team has both timebombs)
-    if random.random() < 0.25:
+    if rng.random() < 0.25:
         # Even
         osc_team_ass = [1, 1, 1, 2, 2, 2]
         timebomb_team_ass = [2, 1]
@@ -770,8 +783,8 @@ def _timebomb_oscillators_twocolor(rows, cols, revenge, seed=None):
             _get_oscillator_name(),
             rows,
             cols,
-            xoffset=oscxx + random.randint(-osc_jitter_x, osc_jitter_x),
-            yoffset=oscyy + parity * random.randint(0, osc_jitter_y),
+            xoffset=oscxx + rng.randint(-osc_jitter_x, osc_jitter_x),
+            yoffset=oscyy + parity * rng.randint(0, osc_jitter_y),
         )
         if team_ass == 1:
             team1_patterns.append(pattern)
@@ -782,8 +795,8 @@ def _timebomb_oscillators_twocolor(rows, cols, revenge, seed=None):
     for k, (timebombxx, timebombyy, team_ass, parity) in enumerate(
         zip(timebomb_x, timebomb_y, timebomb_team_ass, timebombparity)
     ):
-        do_rotate = random.random() < 0.5
-        do_hflip = bool(random.getrandbits(1))
+        do_rotate = rng.random() < 0.5
+        do_hflip = bool(rng.getrandbits(1))
 
         rotdeg = 0
         if do_rotate:
@@ -797,8 +810,8 @@ def _timebomb_oscillators_twocolor(rows, cols, revenge, seed=None):
             "timebomb",
             rows,
             cols,
-            xoffset=timebombxx + random.randint(-timebomb_jitter_x, timebomb_jitter_x),
-            yoffset=timebombyy + parity * random.randint(0, timebomb_jitter_y),
+            xoffset=timebombxx + rng.randint(-timebomb_jitter_x, timebomb_jitter_x),
+            yoffset=timebombyy + parity * rng.randint(0, timebomb_jitter_y),
             rotdeg=rotdeg,
         )
 
@@ -819,9 +832,8 @@ def _timebomb_oscillators_twocolor(rows, cols, revenge, seed=None):
     return pattern1_url, pattern2_url
 
 
-def fourrabbits_twocolor(rows, cols, seed=None):
-    if seed is not None:
-        random.seed(seed)
+def fourrabbits_twocolor(rows, cols, seed=None, rng=None):
+    rng = get_rng(seed, rng)
 
     mindim = min(rows, cols)
 
@@ -850,21 +862,21 @@ def fourrabbits_twocolor(rows, cols, seed=None):
     team_assignments += [
         2,
     ] * (npoints - npoints // 2)
-    random.shuffle(team_assignments)
+    rng.shuffle(team_assignments)
 
     team1_patterns = []
     team2_patterns = []
     for i, (x, y) in enumerate(itertools.product(rabbit_x_loc, rabbit_y_loc)):
-        do_vflip = bool(random.getrandbits(1))
-        do_hflip = bool(random.getrandbits(1))
+        do_vflip = bool(rng.getrandbits(1))
+        do_hflip = bool(rng.getrandbits(1))
         xjitter = 5
         yjitter = 5
         rabbit = get_grid_pattern(
             "rabbit",
             rows,
             cols,
-            xoffset=x + random.randint(-xjitter, xjitter),
-            yoffset=y + random.randint(-yjitter, yjitter),
+            xoffset=x + rng.randint(-xjitter, xjitter),
+            yoffset=y + rng.randint(-yjitter, yjitter),
             vflip=do_vflip,
             hflip=do_hflip,
         )
@@ -882,9 +894,28 @@ def fourrabbits_twocolor(rows, cols, seed=None):
     return pattern1_url, pattern2_url
 
 
-def twospaceshipgenerators_twocolor(rows, cols, seed=None):
-    if seed is not None:
-        random.seed(seed)
+def _twospaceshipgenerators_min_dimensions():
+    # twospaceshipgenerators_twocolor() calls the height of backrake2 xdim and its width ydim
+    (h, w) = get_pattern_size("backrake2")
+    (block_h, block_w) = get_pattern_size("block")
+    nboxes = 15
+    rows = get_min_safe_dimension(
+        [(h, lambda n: n - 1 - w, (0, 0))]
+        + [(block_h, lambda n, i=i: (i + 1) * (n // (nboxes + 1)), (-1, 1)) for i in range(nboxes)]
+    )
+    columns = get_min_safe_dimension(
+        [
+            (w, lambda n: n // 4, (-5, 5)),
+            (w, lambda n: n // 2 + n // 4, (-5, 5)),
+            (block_w, lambda n: n // 2, (-5, 5)),
+        ]
+    )
+    return (rows, columns)
+
+
+@min_dimensions(_twospaceshipgenerators_min_dimensions)
+def twospaceshipgenerators_twocolor(rows, cols, seed=None, rng=None):
+    rng = get_rng(seed, rng)
 
     # backrake 2 laying trail of glider ships
     # both backrakes start at very bottom
@@ -895,8 +926,8 @@ def twospaceshipgenerators_twocolor(rows, cols, seed=None):
     spaceship2x = cols // 2 + cols // 4
     spaceshipy = rows - 1 - ydim
 
-    spaceship1x += random.randint(-5, 5)
-    spaceship2x += random.randint(-5, 5)
+    spaceship1x += rng.randint(-5, 5)
+    spaceship2x += rng.randint(-5, 5)
 
     generator1 = get_grid_pattern(
         "backrake2", rows, cols, xoffset=spaceship1x, yoffset=spaceshipy, hflip=True
@@ -912,8 +943,8 @@ def twospaceshipgenerators_twocolor(rows, cols, seed=None):
         box_x = cols // 2
         box_y = (i + 1) * (rows // (nboxes + 1))
 
-        box_x += random.randint(-5, 5)
-        box_y += random.randint(-1, 1)
+        box_x += rng.randint(-5, 5)
+        box_y += rng.randint(-1, 1)
 
         box_pattern = get_grid_pattern(
             "block", rows, cols, xoffset=box_x, yoffset=box_y
@@ -932,10 +963,9 @@ def twospaceshipgenerators_twocolor(rows, cols, seed=None):
     return pattern1_url, pattern2_url
 
 
-def eightr_twocolor(rows, cols, seed=None):
+def eightr_twocolor(rows, cols, seed=None, rng=None):
 
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
     centerx = cols // 2
     centery = rows // 2
@@ -952,10 +982,10 @@ def eightr_twocolor(rows, cols, seed=None):
             "rpentomino",
             rows,
             cols,
-            xoffset=centerx - random.randint(start, end),
-            yoffset=centery + random.randint(-10, 10),
-            hflip=bool(random.getrandbits(1)),
-            vflip=bool(random.getrandbits(1)),
+            xoffset=centerx - rng.randint(start, end),
+            yoffset=centery + rng.randint(-10, 10),
+            hflip=bool(rng.getrandbits(1)),
+            vflip=bool(rng.getrandbits(1)),
         )
         c1patterns.append(pattern1)
 
@@ -963,10 +993,10 @@ def eightr_twocolor(rows, cols, seed=None):
             "rpentomino",
             rows,
             cols,
-            xoffset=centerx + random.randint(start, end),
-            yoffset=centery + random.randint(-10, 10),
-            hflip=bool(random.getrandbits(1)),
-            vflip=bool(random.getrandbits(1)),
+            xoffset=centerx + rng.randint(start, end),
+            yoffset=centery + rng.randint(-10, 10),
+            hflip=bool(rng.getrandbits(1)),
+            vflip=bool(rng.getrandbits(1)),
         )
         c2patterns.append(pattern2)
 
@@ -979,10 +1009,9 @@ def eightr_twocolor(rows, cols, seed=None):
     return pattern1_url, pattern2_url
 
 
-def eightpi_twocolor(rows, cols, seed=None):
+def eightpi_twocolor(rows, cols, seed=None, rng=None):
 
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
     centerx = cols // 2
     centery = rows // 2
@@ -999,10 +1028,10 @@ def eightpi_twocolor(rows, cols, seed=None):
             "piheptomino",
             rows,
             cols,
-            xoffset=centerx - random.randint(start, end),
-            yoffset=centery + random.randint(-10, 10),
-            hflip=bool(random.getrandbits(1)),
-            vflip=bool(random.getrandbits(1)),
+            xoffset=centerx - rng.randint(start, end),
+            yoffset=centery + rng.randint(-10, 10),
+            hflip=bool(rng.getrandbits(1)),
+            vflip=bool(rng.getrandbits(1)),
         )
         c1patterns.append(pattern1)
 
@@ -1010,10 +1039,10 @@ def eightpi_twocolor(rows, cols, seed=None):
             "piheptomino",
             rows,
             cols,
-            xoffset=centerx + random.randint(start, end),
-            yoffset=centery + random.randint(-10, 10),
-            hflip=bool(random.getrandbits(1)),
-            vflip=bool(random.getrandbits(1)),
+            xoffset=centerx + rng.randint(start, end),
+            yoffset=centery + rng.randint(-10, 10),
+            hflip=bool(rng.getrandbits(1)),
+            vflip=bool(rng.getrandbits(1)),
         )
         c2patterns.append(pattern2)
 
@@ -1026,10 +1055,24 @@ def eightpi_twocolor(rows, cols, seed=None):
     return pattern1_url, pattern2_url
 
 
-def twomultum_twocolor(rows, cols, seed=None):
+def _twomultum_min_dimensions():
+    # The geometry of twomultum_twocolor(): L is 15 on grids under 200, 25 above
+    (h, w) = get_pattern_size("multuminparvo")
+    rows = get_min_safe_dimension([(h, lambda n: n // 2, (-12, 12))])
+    columns = max(
+        get_min_safe_dimension(
+            [(w, lambda n, k=k, L=L: n // 2 + k * L, (-6, 6)) for k in [-2, -1, 1, 2]],
+            start=start,
+        )
+        for (L, start) in [(15, 1), (25, 200)]
+    )
+    return (rows, columns)
+
+
+@min_dimensions(_twomultum_min_dimensions)
+def twomultum_twocolor(rows, cols, seed=None, rng=None):
 
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
 
     mindim = min(rows, cols)
@@ -1054,7 +1097,7 @@ def twomultum_twocolor(rows, cols, seed=None):
     team_assignments += [
         2,
     ] * (npoints - npoints // 2)
-    random.shuffle(team_assignments)
+    rng.shuffle(team_assignments)
 
     jitterx = 6
     jittery = 12
@@ -1066,9 +1109,9 @@ def twomultum_twocolor(rows, cols, seed=None):
             "multuminparvo",
             rows,
             cols,
-            xoffset=x + random.randint(-jitterx, jitterx),
-            yoffset=y + random.randint(-jittery, jittery),
-            vflip=(y < rows // 2 or random.random() < 0.25),
+            xoffset=x + rng.randint(-jitterx, jitterx),
+            yoffset=y + rng.randint(-jittery, jittery),
+            vflip=(y < rows // 2 or rng.random() < 0.25),
         )
         if team_assignments[i] == 1:
             team1_patterns.append(m)
@@ -1084,10 +1127,9 @@ def twomultum_twocolor(rows, cols, seed=None):
     return pattern1_url, pattern2_url
 
 
-def bigsegment_twocolor(rows, cols, seed=None):
+def bigsegment_twocolor(rows, cols, seed=None, rng=None):
 
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
     if rows < 50:
         possible_nhseg = [0, 1]
@@ -1109,19 +1151,19 @@ def bigsegment_twocolor(rows, cols, seed=None):
 
     maxdim = max(rows, cols)
     if maxdim < 50:
-        gap_probability = random.random() * 0.03
+        gap_probability = rng.random() * 0.03
     elif maxdim < 150:
-        gap_probability = random.random() * 0.06
+        gap_probability = rng.random() * 0.06
     elif maxdim < 200:
-        gap_probability = random.random() * 0.12
+        gap_probability = rng.random() * 0.12
     else:
-        gap_probability = random.random() * 0.18
+        gap_probability = rng.random() * 0.18
 
     nhseg = 0
     nvseg = 0
     while (nhseg == 0 and nvseg == 0) or (nhseg % 2 != 0 and nvseg == 0):
-        nhseg = random.choice(possible_nhseg)
-        nvseg = random.choice(possible_nvseg)
+        nhseg = rng.choice(possible_nhseg)
+        nvseg = rng.choice(possible_nvseg)
 
     jitterx = 15
     jittery = 15
@@ -1136,6 +1178,7 @@ def bigsegment_twocolor(rows, cols, seed=None):
         jitterx=jitterx,
         jittery=jittery,
         gap_probability=gap_probability,
+        rng=rng,
     )
 
     pattern1_url = pattern2url(team1_pattern)
@@ -1144,21 +1187,20 @@ def bigsegment_twocolor(rows, cols, seed=None):
     return pattern1_url, pattern2_url
 
 
-def randomsegment_twocolor(rows, cols, seed=None):
+def randomsegment_twocolor(rows, cols, seed=None, rng=None):
 
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
     nhseg = 0
     nvseg = 0
     while nhseg == 0 and nvseg == 0:
-        nhseg = random.choice(list(range(4)))
-        nvseg = random.choice(list(range(4)))
+        nhseg = rng.choice(list(range(4)))
+        nvseg = rng.choice(list(range(4)))
 
     jitterx = 0
     jittery = 12
 
-    gap_probability = random.random() * 0.08
+    gap_probability = rng.random() * 0.08
 
     team1_pattern, team2_pattern = segment_pattern(
         rows,
@@ -1170,6 +1212,7 @@ def randomsegment_twocolor(rows, cols, seed=None):
         jitterx=jitterx,
         jittery=jittery,
         gap_probability=gap_probability,
+        rng=rng,
     )
 
     pattern1_url = pattern2url(team1_pattern)
@@ -1178,10 +1221,9 @@ def randomsegment_twocolor(rows, cols, seed=None):
     return pattern1_url, pattern2_url
 
 
-def spaceshipsegment_twocolor(rows, cols, seed=None):
+def spaceshipsegment_twocolor(rows, cols, seed=None, rng=None):
 
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
     nhseg = 1
     nvseg = 0
@@ -1189,7 +1231,7 @@ def spaceshipsegment_twocolor(rows, cols, seed=None):
     jitterx = 0
     jittery = 5
 
-    gap_probability = random.random() * 0.04
+    gap_probability = rng.random() * 0.04
 
     team1_segment, team2_segment = segment_pattern(
         rows,
@@ -1201,6 +1243,7 @@ def spaceshipsegment_twocolor(rows, cols, seed=None):
         jitterx=jitterx,
         jittery=jittery,
         gap_probability=gap_probability,
+        rng=rng,
     )
 
     ss_name = "lightweightspaceship"
@@ -1224,7 +1267,7 @@ def spaceshipsegment_twocolor(rows, cols, seed=None):
             - hbuff
             - 2 * i * (ssw)
             - ssw // 2
-            + random.randint(-ssjitterx, ssjitterx)
+            + rng.randint(-ssjitterx, ssjitterx)
         )
         p = get_grid_pattern(
             ss_name, rows, cols, xoffset=x, yoffset=y, check_overflow=True
@@ -1237,7 +1280,7 @@ def spaceshipsegment_twocolor(rows, cols, seed=None):
         # find center y, starting from bottom
         y = rows - vbuff - i * (ssh + vbuff) - ssh // 2
         # find center x, starting from far left
-        x = 0 + hbuff + 2 * i * ssw + ssw // 2 + random.randint(-ssjitterx, ssjitterx)
+        x = 0 + hbuff + 2 * i * ssw + ssw // 2 + rng.randint(-ssjitterx, ssjitterx)
         p = get_grid_pattern(
             ss_name, rows, cols, xoffset=x, yoffset=y, hflip=True, check_overflow=True
         )
@@ -1253,10 +1296,9 @@ def spaceshipsegment_twocolor(rows, cols, seed=None):
 
 
 @retry_on_failure
-def switchengines_twocolor(rows, cols, seed=None):
+def switchengines_twocolor(rows, cols, seed=None, rng=None):
 
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
     mindim = min(rows, cols)
     if mindim < 150:
@@ -1264,7 +1306,7 @@ def switchengines_twocolor(rows, cols, seed=None):
     else:
         mc = [3, 4, 9]
     team1_pattern, team2_pattern = hellmouth_methuselah_quadrants_pattern(
-        rows, cols, seed, methuselah_counts=mc, fixed_methuselah="switchengine"
+        rows, cols, seed, methuselah_counts=mc, fixed_methuselah="switchengine", rng=rng
     )
     pattern1_url = pattern2url(team1_pattern)
     pattern2_url = pattern2url(team2_pattern)
@@ -1272,10 +1314,9 @@ def switchengines_twocolor(rows, cols, seed=None):
 
 
 @retry_on_failure
-def orchard_twocolor(rows, cols, seed=None):
+def orchard_twocolor(rows, cols, seed=None, rng=None):
 
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
     mindim = min(rows, cols)
     if mindim < 150:
@@ -1283,9 +1324,9 @@ def orchard_twocolor(rows, cols, seed=None):
     else:
         mc = [4, 9, 16]
 
-    count = random.choice(mc)
+    count = rng.choice(mc)
     team1_pattern, team2_pattern = hellmouth_methuselah_quadrants_pattern(
-        rows, cols, seed, methuselah_counts=[count], fixed_methuselah="acorn"
+        rows, cols, seed, methuselah_counts=[count], fixed_methuselah="acorn", rng=rng
     )
     pattern1_url = pattern2url(team1_pattern)
     pattern2_url = pattern2url(team2_pattern)
@@ -1293,13 +1334,12 @@ def orchard_twocolor(rows, cols, seed=None):
 
 
 @retry_on_failure
-def randommethuselahs_twocolor(rows, cols, seed=None):
+def randommethuselahs_twocolor(rows, cols, seed=None, rng=None):
 
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
     team1_pattern, team2_pattern = hellmouth_methuselah_quadrants_pattern(
-        rows, cols, seed
+        rows, cols, seed, rng=rng
     )
     pattern1_url = pattern2url(team1_pattern)
     pattern2_url = pattern2url(team2_pattern)
@@ -1307,10 +1347,9 @@ def randommethuselahs_twocolor(rows, cols, seed=None):
 
 
 @retry_on_failure
-def rabbitfarm_twocolor(rows, cols, seed=None):
+def rabbitfarm_twocolor(rows, cols, seed=None, rng=None):
 
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
     # Make the wabbits
     # -----------------
@@ -1321,7 +1360,7 @@ def rabbitfarm_twocolor(rows, cols, seed=None):
         mc = [4, 9]
 
     team1_wabbits, team2_wabbits = hellmouth_methuselah_quadrants_pattern(
-        rows, cols, seed, methuselah_counts=mc, fixed_methuselah="rabbit"
+        rows, cols, seed, methuselah_counts=mc, fixed_methuselah="rabbit", rng=rng
     )
 
     # Make the fence
@@ -1329,7 +1368,7 @@ def rabbitfarm_twocolor(rows, cols, seed=None):
 
     # Always 1 horizontal segment, optional vertical segment
     nhseg = 1
-    if random.random() < 0.33:
+    if rng.random() < 0.33:
         nvseg = 0
     else:
         nvseg = 1
@@ -1339,7 +1378,7 @@ def rabbitfarm_twocolor(rows, cols, seed=None):
     jittery = 8
 
     # Color mode should be broken
-    if random.random() < 0.33:
+    if rng.random() < 0.33:
         colormode = "classicbroken"
     else:
         colormode = "randombroken"
@@ -1353,6 +1392,7 @@ def rabbitfarm_twocolor(rows, cols, seed=None):
         nvseg=nvseg,
         jitterx=jitterx,
         jittery=jittery,
+        rng=rng,
     )
 
     team1_pattern = pattern_union([team1_wabbits, team1_fence])
@@ -1364,11 +1404,54 @@ def rabbitfarm_twocolor(rows, cols, seed=None):
     return pattern1_url, pattern2_url
 
 
+def _spiders_min_dimensions():
+    # The geometry of spiders_twocolor(): the wickstretchers, then either a second
+    # pair of wickstretchers, a pair of crabs, or spaceship escorts
+    (wick_h, wick_w) = get_pattern_size("wickstretcher")
+    (crab_h, crab_w) = get_pattern_size("crabstretcher")
+    (top_ssh, top_ssw) = get_pattern_size("lightweightspaceship")
+    (bot_ssh, bot_ssw) = get_pattern_size("x66")
+    crab_margin = 15
+    xbuff_ss = max(top_ssw, bot_ssw)
+
+    def y_jitter(n, lo, hi):
+        # The vertical offset of both wickstretchers, in [-y_abs_jitter, y_abs_jitter], plus [lo, hi]
+        y_abs_jitter = n // 3 - 2 * wick_h
+        if y_abs_jitter < 0:
+            return (1, 0)
+        return (lo - y_abs_jitter, hi + y_abs_jitter)
+
+    y_rel_jitter = wick_h // 2 - 2
+    rows = get_min_safe_dimension(
+        [
+            (wick_h, lambda n: n // 2, lambda n: y_jitter(n, -y_rel_jitter, y_rel_jitter)),
+            # The crabs draw their jitter from the values that fit
+            (crab_h, lambda n: crab_margin, (0, 0)),
+            (crab_h, lambda n: n - crab_margin, (0, 0)),
+            (top_ssh, lambda n: n // 2 - wick_h - top_ssh, lambda n: y_jitter(n, -(top_ssh // 2) - 5, top_ssh // 2)),
+            (bot_ssh, lambda n: n // 2 + wick_h + bot_ssh, lambda n: y_jitter(n, -(bot_ssh // 2) - 5, bot_ssh // 2)),
+        ]
+    )
+    columns = get_min_safe_dimension(
+        [
+            (wick_w, lambda n: wick_w // 2, (2, 5)),
+            (wick_w, lambda n: n - wick_w // 2, (-5, -2)),
+            (crab_w, lambda n: crab_margin, (0, 0)),
+            (crab_w, lambda n: n - crab_margin, (0, 0)),
+            (top_ssw, lambda n: xbuff_ss, (0, top_ssw)),
+            (bot_ssw, lambda n: xbuff_ss, (0, bot_ssw)),
+            (top_ssw, lambda n: n - xbuff_ss, (-top_ssw, 0)),
+            (bot_ssw, lambda n: n - xbuff_ss, (-bot_ssw, 0)),
+        ]
+    )
+    return (rows, columns)
+
+
+@min_dimensions(_spiders_min_dimensions)
 @retry_on_failure
-def spiders_twocolor(rows, cols, seed=None):
+def spiders_twocolor(rows, cols, seed=None, rng=None):
 
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
     # Place two wickstretchers at edge of map, facing each other
     # Small amount of vertical jitter relative to each other,
@@ -1378,7 +1461,7 @@ def spiders_twocolor(rows, cols, seed=None):
 
     # Give ourselves a small margin on the edge of the map
     # (give the wickstretchers as much space as possible)
-    margin = random.randint(2, 5)
+    margin = rng.randint(2, 5)
     xbuff = wick_w // 2 + margin
 
     # Use this to jitter the vertical placement of both wickstretchers
@@ -1387,14 +1470,14 @@ def spiders_twocolor(rows, cols, seed=None):
     # Determine absolute y offset for both wickstretchers
     ybuff = y_rel_jitter
     y_abs_jitter = rows // 3 - 2 * wick_h
-    y_abs_offset = random.randint(-y_abs_jitter, y_abs_jitter)
+    y_abs_offset = rng.randint(-y_abs_jitter, y_abs_jitter)
 
     team1_pattern = []
     team2_pattern = []
 
     # Team 1 wickstretcher
-    team1_yjitter_val = random.randint(-y_rel_jitter, y_rel_jitter)
-    team1_wickstretcher = get_grid_pattern(
+    team1_yjitter_val = rng.randint(-y_rel_jitter, y_rel_jitter)
+    team1_wickstretcher = SparsePattern.from_pattern_name(
         "wickstretcher",
         rows,
         cols,
@@ -1403,24 +1486,24 @@ def spiders_twocolor(rows, cols, seed=None):
     )
 
     # Team 2 wickstretcher
-    team2_yjitter_val = random.randint(-y_rel_jitter, y_rel_jitter)
-    team2_wickstretcher = get_grid_pattern(
+    team2_yjitter_val = rng.randint(-y_rel_jitter, y_rel_jitter)
+    team2_wickstretcher = SparsePattern.from_pattern_name(
         "wickstretcher",
         rows,
         cols,
         xoffset=cols - xbuff,
         yoffset=rows // 2 + y_abs_offset + team2_yjitter_val,
         hflip=True,
-        vflip=bool(random.getrandbits(1)),
+        vflip=bool(rng.getrandbits(1)),
     )
 
-    roll = random.random()
+    roll = rng.random()
     if roll < 0.15 and abs(y_abs_offset > wick_h):
 
         # -----
         # Double wickstretchers
         # Team 1 second wickstretcher
-        team1_wickstretcher2 = get_grid_pattern(
+        team1_wickstretcher2 = SparsePattern.from_pattern_name(
             "wickstretcher",
             rows,
             cols,
@@ -1429,17 +1512,17 @@ def spiders_twocolor(rows, cols, seed=None):
         )
 
         # Team 2 second wickstretcher
-        team2_wickstretcher2 = get_grid_pattern(
+        team2_wickstretcher2 = SparsePattern.from_pattern_name(
             "wickstretcher",
             rows,
             cols,
             xoffset=cols - xbuff,
             yoffset=rows // 2 - y_abs_offset - team2_yjitter_val,
             hflip=True,
-            vflip=bool(random.getrandbits(1)),
+            vflip=bool(rng.getrandbits(1)),
         )
-        team1_pattern = pattern_union([team1_wickstretcher, team1_wickstretcher2])
-        team2_pattern = pattern_union([team2_wickstretcher, team2_wickstretcher2])
+        team1_pattern = sparse_union([team1_wickstretcher, team1_wickstretcher2])
+        team2_pattern = sparse_union([team2_wickstretcher, team2_wickstretcher2])
 
     elif roll < 0.40:
         # -----
@@ -1467,11 +1550,25 @@ def spiders_twocolor(rows, cols, seed=None):
             team2_xoffset = crab_margin
             team2_yoffset = rows - crab_margin
 
+        # Draw each crab's jitter from the values that keep it on the grid,
+        # instead of failing the whole map when a crab falls off the edge
         crab_jitter_max = 20
-        crab1jitter = random.randint(0, crab_jitter_max)
-        crab2jitter = random.randint(0, crab_jitter_max)
+        xmin, xmax, ymin, ymax = get_offset_range("crabstretcher", rows, cols, vflip=vflip_crabs)
+        crab1jitter = draw_jitter(
+            0,
+            crab_jitter_max,
+            (max(team1_xoffset - xmax, ymin - team1_yoffset), min(team1_xoffset - xmin, ymax - team1_yoffset)),
+            rng,
+        )
+        xmin, xmax, ymin, ymax = get_offset_range("crabstretcher", rows, cols, hflip=True, vflip=vflip_crabs)
+        crab2jitter = draw_jitter(
+            0,
+            crab_jitter_max,
+            (max(xmin - team2_xoffset, ymin - team2_yoffset), min(xmax - team2_xoffset, ymax - team2_yoffset)),
+            rng,
+        )
 
-        team1_crab = get_grid_pattern(
+        team1_crab = SparsePattern.from_pattern_name(
             "crabstretcher",
             rows,
             cols,
@@ -1479,9 +1576,9 @@ def spiders_twocolor(rows, cols, seed=None):
             yoffset=team1_yoffset + crab1jitter,
             vflip=vflip_crabs,
         )
-        team1_pattern = pattern_union([team1_wickstretcher, team1_crab])
+        team1_pattern = sparse_union([team1_wickstretcher, team1_crab])
 
-        team2_crab = get_grid_pattern(
+        team2_crab = SparsePattern.from_pattern_name(
             "crabstretcher",
             rows,
             cols,
@@ -1490,7 +1587,7 @@ def spiders_twocolor(rows, cols, seed=None):
             vflip=vflip_crabs,
             hflip=True,
         )
-        team2_pattern = pattern_union([team2_wickstretcher, team2_crab])
+        team2_pattern = sparse_union([team2_wickstretcher, team2_crab])
 
     else:
         # -----
@@ -1501,8 +1598,8 @@ def spiders_twocolor(rows, cols, seed=None):
             "heavyweightspaceship",
             "x66",
         ]
-        top_ss = "lightweightspaceship"  # random.choice(sschoices)
-        bot_ss = "x66"  # random.choice(sschoices)
+        top_ss = "lightweightspaceship"  # rng.choice(sschoices)
+        bot_ss = "x66"  # rng.choice(sschoices)
 
         top_ssh, top_ssw = get_pattern_size(top_ss)
         top_ssjitter = top_ssh // 2
@@ -1511,7 +1608,7 @@ def spiders_twocolor(rows, cols, seed=None):
             + y_abs_offset
             - wick_h
             - top_ssh
-            + random.randint(-top_ssjitter, top_ssjitter)
+            + rng.randint(-top_ssjitter, top_ssjitter)
         )
 
         bot_ssh, bot_ssw = get_pattern_size(bot_ss)
@@ -1521,46 +1618,46 @@ def spiders_twocolor(rows, cols, seed=None):
             + y_abs_offset
             + wick_h
             + bot_ssh
-            + random.randint(-bot_ssjitter, bot_ssjitter)
+            + rng.randint(-bot_ssjitter, bot_ssjitter)
         )
 
         xbuff_ss = max(top_ssw, bot_ssw)
 
-        team1_top_ss = get_grid_pattern(
+        team1_top_ss = SparsePattern.from_pattern_name(
             top_ss,
             rows,
             cols,
-            xoffset=xbuff_ss + random.randint(0, top_ssw),
-            yoffset=top_spaceship_y + random.randint(-5, 0),
+            xoffset=xbuff_ss + rng.randint(0, top_ssw),
+            yoffset=top_spaceship_y + rng.randint(-5, 0),
             hflip=True,
         )
-        team1_bot_ss = get_grid_pattern(
+        team1_bot_ss = SparsePattern.from_pattern_name(
             bot_ss,
             rows,
             cols,
-            xoffset=xbuff_ss + random.randint(0, bot_ssw),
-            yoffset=bot_spaceship_y + random.randint(-5, 0),
+            xoffset=xbuff_ss + rng.randint(0, bot_ssw),
+            yoffset=bot_spaceship_y + rng.randint(-5, 0),
             hflip=True,
         )
-        team1_pattern = pattern_union([team1_wickstretcher, team1_bot_ss, team1_top_ss])
-        # team1_pattern = pattern_union([team1_wickstretcher, team1_top_ss])
+        team1_pattern = sparse_union([team1_wickstretcher, team1_bot_ss, team1_top_ss])
+        # team1_pattern = sparse_union([team1_wickstretcher, team1_top_ss])
 
-        team2_top_ss = get_grid_pattern(
+        team2_top_ss = SparsePattern.from_pattern_name(
             top_ss,
             rows,
             cols,
-            xoffset=cols - xbuff_ss - random.randint(0, top_ssw),
-            yoffset=top_spaceship_y + random.randint(-5, 0),
+            xoffset=cols - xbuff_ss - rng.randint(0, top_ssw),
+            yoffset=top_spaceship_y + rng.randint(-5, 0),
         )
-        team2_bot_ss = get_grid_pattern(
+        team2_bot_ss = SparsePattern.from_pattern_name(
             bot_ss,
             rows,
             cols,
-            xoffset=cols - xbuff_ss - random.randint(0, bot_ssw),
-            yoffset=bot_spaceship_y + random.randint(-5, 0),
+            xoffset=cols - xbuff_ss - rng.randint(0, bot_ssw),
+            yoffset=bot_spaceship_y + rng.randint(-5, 0),
         )
-        team2_pattern = pattern_union([team2_wickstretcher, team2_bot_ss, team2_top_ss])
-        # team2_pattern = pattern_union([team2_wickstretcher, team2_top_ss])
+        team2_pattern = sparse_union([team2_wickstretcher, team2_bot_ss, team2_top_ss])
+        # team2_pattern = sparse_union([team2_wickstretcher, team2_top_ss])
 
     s1 = pattern2url(team1_pattern)
     s2 = pattern2url(team2_pattern)
@@ -1568,11 +1665,33 @@ def spiders_twocolor(rows, cols, seed=None):
     return (s1, s2)
 
 
+def _crabs_min_dimensions():
+    # One crab per quadrant on grids under 150, two or three above. Each crab's
+    # jitter is drawn from the values that keep it on the grid, and since the
+    # same jitter shifts it along x and y, it always fits where it fits with
+    # no jitter at all.
+    crab_extents = get_pattern_size("crabstretcher")
+    dims = []
+    for extent in crab_extents:
+        placements = [
+            (extent, lambda n, corner=corner: corner(n) + (n // 2) // 2, (0, 0))
+            for corner in [lambda n: 0, lambda n: n // 2]
+        ]
+        large_placements = [
+            (extent, lambda n, corner=corner, a=a, nslices=ncrabs + 1: corner(n) + a * ((n // 2) // nslices), (0, 0))
+            for corner in [lambda n: 0, lambda n: n // 2]
+            for ncrabs in [2, 3]
+            for a in range(1, ncrabs + 1)
+        ]
+        dims.append(max(get_min_safe_dimension(placements), get_min_safe_dimension(large_placements, start=150)))
+    return tuple(dims)
+
+
+@min_dimensions(_crabs_min_dimensions)
 @retry_on_failure
-def crabs_twocolor(rows, cols, seed=None):
+def crabs_twocolor(rows, cols, seed=None, rng=None):
 
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
     # By default, crabs go up and to the left
 
@@ -1582,7 +1701,7 @@ def crabs_twocolor(rows, cols, seed=None):
     else:
         poss_ncrabs = [2, 3]
 
-    ncrabs = random.choice(poss_ncrabs)
+    ncrabs = rng.choice(poss_ncrabs)
 
     # corners for quadrants 1 2 3 4
     quadrants = [
@@ -1615,10 +1734,15 @@ def crabs_twocolor(rows, cols, seed=None):
                     y = cornery + a * ((rows // 2) // nslices)
                     x = cornerx + b * ((cols // 2) // nslices)
 
-                    jitter = random.randint(-8, 8)
+                    # The same jitter shifts the crab along x and y,
+                    # so draw it from the values that keep both on the grid
+                    xmin, xmax, ymin, ymax = get_offset_range(
+                        "crabstretcher", rows, cols, hflip=do_hflip[k], vflip=do_vflip[k]
+                    )
+                    jitter = draw_jitter(-8, 8, (max(xmin - x, ymin - y), min(xmax - x, ymax - y)), rng)
 
                     quadrant_crabs.append(
-                        get_grid_pattern(
+                        SparsePattern.from_pattern_name(
                             "crabstretcher",
                             rows,
                             cols,
@@ -1629,12 +1753,12 @@ def crabs_twocolor(rows, cols, seed=None):
                         )
                     )
 
-        crabs.append(pattern_union(quadrant_crabs))
+        crabs.append(sparse_union(quadrant_crabs))
 
     # Use one quadrant to assemble the other quadrants
-    random.shuffle(crabs)
-    team1_pattern = pattern_union([crabs[0], crabs[1]])
-    team2_pattern = pattern_union([crabs[2], crabs[3]])
+    rng.shuffle(crabs)
+    team1_pattern = sparse_union([crabs[0], crabs[1]])
+    team2_pattern = sparse_union([crabs[2], crabs[3]])
 
     s1 = pattern2url(team1_pattern)
     s2 = pattern2url(team2_pattern)
@@ -0,0 +1,178 @@
+"""
+Lightweight instrumentation of the realization pipeline.
+
+Instrumented functions report span timings and counters to the registered
+collectors. A collector is a callback, collector(kind, name, value), called
+with kind "span" (value is seconds) or "count" (value is an increment):
+
+    def log(kind, name, value):
+        print(kind, name, value)
+
+    add_collector(log)
+
+RealizationProfile is a collector that sums up the spans and counters of
+the current thread, for example for one realization:
+
+    with RealizationProfile() as profile:
+        get_map_realization("hellmouth", "spiders")
+    print(profile.format())
+
+When no collector is registered, instrumented functions only pay
+for checking whether the collector list is empty.
+"""
+import functools
+import threading
+import time
+
+
+# The registered collectors, see add_collector()
+_collectors = []
+_collectors_lock = threading.Lock()
+
+
+def add_collector(collector):
+    """
+    Register collector(kind, name, value) to receive span timings and counters
+    """
+    global _collectors
+    with _collectors_lock:
+        # Replace the list, so emitting never sees a list being modified
+        _collectors = _collectors + [collector]
+
+
+def remove_collector(collector):
+    global _collectors
+    with _collectors_lock:
+        _collectors = [c for c in _collectors if c is not collector]
+
+
+def _emit(kind, name, value):
+    for collector in _collectors:
+        collector(kind, name, value)
+
+
+def record(name, seconds):
+    """
+    Report a span called name that took the given number of seconds
+    """
+    if _collectors:
+        _emit("span", name, seconds)
+
+
+def count(name, n=1):
+    """
+    Add n to the counter name
+    """
+    if _collectors:
+        _emit("count", name, n)
+
+
+class _Span(object):
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        _emit("span", self.name, time.perf_counter() - self.start)
+
+
+class _NullSpan(object):
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name):
+    """
+    Context manager that times the code it wraps as a span called name
+    """
+    if _collectors:
+        return _Span(name)
+    return _NULL_SPAN
+
+
+def timed(name):
+    """
+    Decorator that times every call of the function as a span called name
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrap(*args, **kwargs):
+            if not _collectors:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _emit("span", name, time.perf_counter() - start)
+
+        return wrap
+
+    return decorator
+
+
+class RealizationProfile(object):
+    """
+    A collector that sums the spans and counters reported by the thread that
+    created it, while it is registered (in a with block, or between start()
+    and stop()). spans is {name: [calls, seconds]}, counters is {name: n}.
+    Spans nest, so the time of an inner span is also part of its outer span.
+    """
+
+    def __init__(self):
+        self.thread = threading.get_ident()
+        self.spans = {}
+        self.counters = {}
+
+    def __call__(self, kind, name, value):
+        if threading.get_ident() != self.thread:
+            return
+        if kind == "span":
+            s = self.spans.setdefault(name, [0, 0.0])
+            s[0] += 1
+            s[1] += value
+        else:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def start(self):
+        add_collector(self)
+        return self
+
+    def stop(self):
+        remove_collector(self)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def as_dict(self):
+        return {
+            "spans": {name: {"calls": c, "seconds": round(t, 6)} for name, (c, t) in self.spans.items()},
+            "counters": dict(self.counters),
+        }
+
+    def format(self):
+        """
+        Return the profile as a table, slowest spans first
+        """
+        lines = [f"{'span':<28} {'calls':>7} {'ms':>10}"]
+        for name, (c, t) in sorted(self.spans.items(), key=lambda x: -x[1][1]):
+            lines.append(f"{name:<28} {c:>7} {1000 * t:>10.3f}")
+        for name, n in sorted(self.counters.items()):
+            lines.append(f"{name:<28} {n:>7}")
+        return "\n".join(lines)
@@ -1,9 +1,8 @@
-import roman
+import importlib
 import itertools
 from operator import itemgetter
-import json
-import os
 import random
+from collections import namedtuple
 from .geom import hflip_pattern, vflip_pattern, rot_pattern
 from .patterns import (
     get_pattern_size,
@@ -13,39 +12,73 @@ from .patterns import (
     methuselah_quadrants_pattern,
     pattern_union,
     cloud_region,
+    get_pattern_registry,
 )
-from .utils import pattern2url, retry_on_failure
+from .utils import get_rng
 from .error import GollyXMapsError
-from .hellmouth import get_hellmouth_pattern_function_map
-from .pseudo import get_pseudo_pattern_function_map
-from .toroidal import get_toroidal_pattern_function_map
-from .dragon import get_dragon_pattern_function_map, MAX_PARTS
-from .rainbow import get_rainbow_pattern_function_map
-from .star import get_star_pattern_function_map
-from .klein import get_klein_pattern_function_map
-from .ii import get_ii_pattern_function_map
-from .star import get_star_pattern_function_map as get_starii_pattern_function_map
+from .metadata import get_cup_metadata, get_season_maps
+from .cache import get_realization_cache
+from .instrument import timed
+
+
+# Cup -> (module, name of the function returning the cup's pattern function map).
+# Each cup module is imported the first time the cup is requested,
+# so importing maps does not import any map generators.
+CUP_MODULES = {
+    'hellmouth': ('.hellmouth', 'get_hellmouth_pattern_function_map'),
+    'pseudo': ('.pseudo', 'get_pseudo_pattern_function_map'),
+    'toroidal': ('.toroidal', 'get_toroidal_pattern_function_map'),
+    'dragon': ('.dragon', 'get_dragon_pattern_function_map'),
+    'rainbow': ('.rainbow', 'get_rainbow_pattern_function_map'),
+    'star': ('.star', 'get_star_pattern_function_map'),
+    'klein': ('.klein', 'get_klein_pattern_function_map'),
+    'ii': ('.ii', 'get_ii_pattern_function_map'),
+    'starii': ('.star', 'get_star_pattern_function_map'),
+}
 
 
 def get_pattern_function_map(cup):
-    m = {
-        'hellmouth': get_hellmouth_pattern_function_map,
-        'pseudo': get_pseudo_pattern_function_map,
-        'toroidal': get_toroidal_pattern_function_map,
-        'dragon': get_dragon_pattern_function_map,
-        'rainbow': get_rainbow_pattern_function_map,
-        'star': get_star_pattern_function_map,
-        'klein': get_klein_pattern_function_map,
-        'ii': get_ii_pattern_function_map,
-        'starii': get_starii_pattern_function_map
-    }
-    return m[cup]
+    modname, funcname = CUP_MODULES[cup]
+    module = importlib.import_module(modname, __package__)
+    return getattr(module, funcname)
+
+
+def get_dragon_max_parts():
+    """Get the maximum number of partitions of a Dragon Cup map"""
+    return importlib.import_module('.dragon', __package__).MAX_PARTS
+
+
+def __getattr__(name):
+    # Names this module used to import from the cup modules
+    # (get_hellmouth_pattern_function_map, etc., and MAX_PARTS)
+    if name == 'MAX_PARTS':
+        return get_dragon_max_parts()
+    for cup in CUP_MODULES:
+        if name == f'get_{cup}_pattern_function_map':
+            return get_pattern_function_map(cup)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 ########################
 # High-level API methods
 
 
+def get_default_dimensions(cup):
+    """Get the default (rows, columns) of maps for this cup"""
+    dims = {
+        'hellmouth': (100, 120),
+        'pseudo': (100, 120),
+        'toroidal': (40, 280),
+        'dragon': (500, 200),
+        'rainbow': (120, 180),
+        'star': (160, 240),
+        'klein': (100, 200),
+        'ii': (100, 200),
+        'starii': (150, 230),
+    }
+    return dims.get(cup, (None, None))
+
+
 def get_all_map_patterns(cup):
     """Get a list of all pattern names for this cup"""
     f = get_pattern_function_map(cup)
@@ -53,6 +86,83 @@ def get_all_map_patterns(cup):
     return list(pattern_map.keys())
 
 
+# Pattern function -> its (rows, columns) minimum, see get_min_dimensions()
+_min_dimensions = {}
+
+
+def get_min_dimensions(cup, patternname):
+    """
+    Get the smallest (rows, columns) a map of this pattern can be rendered at:
+    at or above it, the map generator places its patterns for every seed.
+    Generators that do not declare a minimum (see utils.min_dimensions) return (1, 1).
+    """
+    g = get_pattern_function_map(cup)()[patternname]
+    if g not in _min_dimensions:
+        get_min = getattr(g, "get_min_dimensions", None)
+        _min_dimensions[g] = (1, 1) if get_min is None else tuple(get_min())
+    return _min_dimensions[g]
+
+
+def check_dimensions(cup, patternname, rows, columns):
+    """
+    Raise GollyXMapsError if a map of this pattern cannot be rendered at rows x columns
+    """
+    if cup == "dragon":
+        return
+    min_rows, min_columns = get_min_dimensions(cup, patternname)
+    if rows < min_rows or columns < min_columns:
+        raise GollyXMapsError(
+            f"Error: {cup} map {patternname} needs at least {min_rows} rows and {min_columns} columns, "
+            f"got {rows} x {columns}"
+        )
+
+
+def get_feasible_patterns(cup, rows=None, columns=None):
+    """
+    Get the pattern names of this cup that can be rendered at rows x columns
+    (default is the cup's default size)
+    """
+    if rows is None and columns is None:
+        rows, columns = get_default_dimensions(cup)
+    if cup == "dragon":
+        return get_all_map_patterns(cup)
+    return [
+        name
+        for name in get_all_map_patterns(cup)
+        if all(d >= m for d, m in zip((rows, columns), get_min_dimensions(cup, name)))
+    ]
+
+
+ENCODINGS = ["listlife", "binary"]
+
+
+def check_encoding(encoding):
+    if encoding not in ENCODINGS:
+        raise GollyXMapsError(
+            f"Error: invalid encoding {encoding}, must be one of: {', '.join(ENCODINGS)}"
+        )
+
+
+def add_initial_conditions(mapdat, conditions, rows, columns, encoding="listlife"):
+    """
+    Add the initial conditions of each team to the map data.
+    listlife: initialConditions1, 2, ... are listlife JSON strings, repeated in url.
+    binary: initialConditions1, 2, ... are bytes from encoding.encode_listlife(),
+    and there is no url.
+    """
+    if encoding == "binary":
+        from .encoding import encode_listlife
+
+        for i, s in enumerate(conditions):
+            mapdat[f"initialConditions{i+1}"] = encode_listlife(s, rows, columns)
+        return mapdat
+
+    for i, s in enumerate(conditions):
+        mapdat[f"initialConditions{i+1}"] = s
+    mapdat["url"] = "?" + "&".join(f"s{i+1}={s}" for i, s in enumerate(conditions))
+    return mapdat
+
+
 def remove_extra_map_keys(mapdat):
     # Remove these keys before returning realization for the API to serve up
     remove_keys = ["mapSeasonStart", "mapSeasonEnd", "mapDescription"]
@@ -62,7 +172,10 @@ def remove_extra_map_keys(mapdat):
     return mapdat
 
 
-def get_map_realization(cup, patternname, rows=None, columns=None, cell_size=None):
+@timed("realization")
+def get_map_realization(
+    cup, patternname, rows=None, columns=None, cell_size=None, encoding="listlife", seed=None, rng=None
+):
     """
     Return a JSON map with map names, zone names, and initial conditions.
 
@@ -82,6 +195,13 @@ def get_map_realization(cup, patternname, rows=None, columns=None, cell_size=Non
         "cellSize:" k
     }
 
+    With encoding="binary", the initial conditions are compact bytes
+    (see the encoding module) and url is left out.
+
+    If seed is specified, the same seed always gives the same realization.
+    Otherwise the map is drawn from rng (a random.Random), if specified,
+    or from the global random generator.
+
     (Star Cup and Klein Cup leave out zone names)
 
     Dragon Cup returns:
@@ -97,34 +217,19 @@ def get_map_realization(cup, patternname, rows=None, columns=None, cell_size=Non
     }
     """
 
+    check_encoding(encoding)
+
     # Handle Dragon Cup differently
     if cup == "dragon":
-        return get_dragon_realization(patternname, rows, columns, cell_size)
+        return get_dragon_realization(patternname, rows, columns, cell_size, encoding=encoding, seed=seed, rng=rng)
 
     # Handle Rainbow Cup differently too
     if cup == "rainbow":
-        return get_rainbow_realization(patternname, rows, columns, cell_size)
+        return get_rainbow_realization(patternname, rows, columns, cell_size, encoding=encoding, seed=seed, rng=rng)
 
     # Set default sizes if none specified
     if rows is None and columns is None:
-        if cup=="hellmouth" or cup=="pseudo":
-            rows = 100
-            columns = 120
-        elif cup=="toroidal":
-            rows = 40
-            columns = 280
-        elif cup=="star":
-            rows = 160
-            columns = 240
-        elif cup=="klein":
-            rows = 100
-            columns = 200
-        elif cup=="ii":
-            rows = 100
-            columns = 200
-        elif cup=="starii":
-            rows = 150
-            columns = 230
+        rows, columns = get_default_dimensions(cup)
 
     # Get map data (pattern, name, zone names)
     zone_labels = True
@@ -133,11 +238,8 @@ def get_map_realization(cup, patternname, rows=None, columns=None, cell_size=Non
     mapdat = get_map_metadata(cup, patternname, zone_labels=zone_labels)
 
     # Get the initial conditions for this map
-    s1, s2 = render_map(cup, patternname, rows, columns)
-    url = f"?s1={s1}&s2={s2}"
-    mapdat["initialConditions1"] = s1
-    mapdat["initialConditions2"] = s2
-    mapdat["url"] = url
+    s1, s2 = render_map(cup, patternname, rows, columns, seed=seed, rng=rng)
+    add_initial_conditions(mapdat, [s1, s2], rows, columns, encoding)
 
     # Include geometry info
     maxdim = max(rows, columns)
@@ -187,27 +289,22 @@ def get_map_realization(cup, patternname, rows=None, columns=None, cell_size=Non
     return remove_extra_map_keys(mapdat)
 
 
-def get_rainbow_realization(patternname, rows=None, columns=None, cell_size=None):
+def get_rainbow_realization(
+    patternname, rows=None, columns=None, cell_size=None, encoding="listlife", seed=None, rng=None
+):
     """
     Assemble Rainbow Map
     """
     # Set default sizes if none specified
     if rows is None and columns is None:
-        rows = 120
-        columns = 180
+        rows, columns = get_default_dimensions('rainbow')
 
     # Get map data (pattern, name, zone names)
     mapdat = get_map_metadata('rainbow', patternname, zone_labels=True)
 
     # Get the initial condition strings
-    s1, s2, s3, s4 = render_map('rainbow', patternname, rows, columns)
-    url = f"?s1={s1}&s2={s2}&s3={s3}&s4={s4}"
-
-    mapdat['initialConditions1'] = s1
-    mapdat['initialConditions2'] = s2
-    mapdat['initialConditions3'] = s3
-    mapdat['initialConditions4'] = s4
-    mapdat['url'] = url
+    s1, s2, s3, s4 = render_map('rainbow', patternname, rows, columns, seed=seed, rng=rng)
+    add_initial_conditions(mapdat, [s1, s2, s3, s4], rows, columns, encoding)
 
     mapdat["rows"] = rows
     mapdat["columns"] = columns
@@ -216,7 +313,9 @@ def get_rainbow_realization(patternname, rows=None, columns=None, cell_size=None
     return remove_extra_map_keys(mapdat)
 
 
-def get_dragon_realization(patternname, rows=None, columns=None, cell_size=None):
+def get_dragon_realization(
+    patternname, rows=None, columns=None, cell_size=None, encoding="listlife", seed=None, rng=None
+):
     """
     Dragon Cup maps are assembled differently
     from Hellmouth, Toroidal, and Pseudo Cup maps.
@@ -224,8 +323,7 @@ def get_dragon_realization(patternname, rows=None, columns=None, cell_size=None)
 
     # Set default sizes if none specified
     if rows is None and columns is None:
-        rows = 500
-        columns = 200
+        rows, columns = get_default_dimensions('dragon')
 
     # Map data: patternName, name
 
@@ -236,9 +334,10 @@ def get_dragon_realization(patternname, rows=None, columns=None, cell_size=None)
     # Lighthouse
     # Isotropic
     chooseParts = ['starfield', 'supercritical', 'vector', 'matrix', 'lake', 'lighthouse', 'isotropic']
+    rng = get_rng(seed, rng)
     if patternname in chooseParts:
         # Select a number of partitions
-        nparts = random.randint(1, MAX_PARTS)
+        nparts = rng.randint(1, get_dragon_max_parts())
     else:
         nparts = 0
 
@@ -247,6 +346,8 @@ def get_dragon_realization(patternname, rows=None, columns=None, cell_size=None)
     # Add roman numeral suffix to map name if we specified partitions
     mapname = patternname.title()
     if nparts > 0:
+        import roman
+
         mapname += f" {roman.toRoman(nparts)}"
 
     m = {
@@ -255,11 +356,8 @@ def get_dragon_realization(patternname, rows=None, columns=None, cell_size=None)
     }
 
     # Get the strings containing the listlife states for each color
-    s1, s2 = render_dragon_map(patternname, rows, columns, nparts)
-    url = f"?s1={s1}&s2={s2}"
-    m['initialConditions1'] = s1
-    m['initialConditions2'] = s2
-    m['url'] = url
+    s1, s2 = render_dragon_map(patternname, rows, columns, nparts, seed=seed, rng=rng)
+    add_initial_conditions(m, [s1, s2], rows, columns, encoding)
 
     # Find optimal cellsize
     if cell_size is not None:
@@ -279,6 +377,104 @@ def get_dragon_realization(patternname, rows=None, columns=None, cell_size=None)
     return m
 
 
+##########################
+# Batch realization methods
+
+
+RealizationResult = namedtuple("RealizationResult", ["index", "request", "realization", "error"])
+
+
+def get_map_realizations(
+    cup, requests, workers=None, chunksize=1, ordered=True, encoding="listlife", cell_size=None, mask_dir=None
+):
+    """
+    Generate many map realizations for one cup, spread over a pool of worker processes.
+
+    requests is an iterable of (patternname, rows, columns, seed) tuples
+    (rows, columns, and seed may be None, as in get_map_realization).
+
+    This is a generator of RealizationResult(index, request, realization, error)
+    namedtuples, one per request. If ordered is True, results come back in the same
+    order as the requests, otherwise they come back as they complete. A request that
+    fails does not abort the batch: its result has realization None and the exception
+    in error.
+
+    workers is the number of worker processes (default is the number of CPUs),
+    workers=0 generates everything in this process. Requests are sent to workers
+    in chunks of chunksize requests. If mask_dir is specified, the workers look up
+    the masks of the math maps in a MaskCatalog on that directory
+    (see expression.set_mask_catalog(), which sets it for this process).
+    """
+    check_encoding(encoding)
+    if chunksize < 1:
+        raise GollyXMapsError(f"Error: invalid chunksize {chunksize}, must be a positive integer")
+    get_pattern_function_map(cup)
+    requests = list(requests)
+    chunks = [
+        [(i, requests[i]) for i in range(start, min(start + chunksize, len(requests)))]
+        for start in range(0, len(requests), chunksize)
+    ]
+    return _iter_map_realizations(cup, chunks, workers, ordered, encoding, cell_size, mask_dir)
+
+
+def _iter_map_realizations(cup, chunks, workers, ordered, encoding, cell_size, mask_dir):
+    if workers == 0:
+        for chunk in chunks:
+            yield from _get_map_realization_chunk(cup, chunk, encoding, cell_size)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    executor = ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_realization_worker, initargs=(cup, mask_dir)
+    )
+    try:
+        futures = [
+            executor.submit(_get_map_realization_chunk, cup, chunk, encoding, cell_size)
+            for chunk in chunks
+        ]
+        if ordered:
+            for future in futures:
+                yield from future.result()
+        else:
+            for future in as_completed(futures):
+                yield from future.result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _init_realization_worker(cup=None, mask_dir=None):
+    """
+    Runs once in each worker process: make sure forked workers do not
+    share the random state of the parent process, and if cup is specified,
+    load its pattern function map, the pattern registry, and the map metadata.
+    If mask_dir is specified, look up math map masks in a MaskCatalog on it.
+    """
+    random.seed()
+    if mask_dir is not None:
+        from .expression import MaskCatalog, set_mask_catalog
+
+        set_mask_catalog(MaskCatalog(directory=mask_dir))
+    if cup is not None:
+        get_pattern_function_map(cup)()
+        get_pattern_registry()
+        get_cup_metadata(cup)
+
+
+def _get_map_realization_chunk(cup, chunk, encoding, cell_size):
+    results = []
+    for i, request in chunk:
+        try:
+            patternname, rows, columns, seed = request
+            m = get_map_realization(
+                cup, patternname, rows, columns, cell_size=cell_size, encoding=encoding, seed=seed
+            )
+            results.append(RealizationResult(i, request, m, None))
+        except Exception as e:
+            results.append(RealizationResult(i, request, None, e))
+    return results
+
+
 ##################
 # Metadata methods
 
@@ -287,15 +483,15 @@ def get_map_metadata(cup, patternname, zone_labels=True):
     """
     Get map metadata for the specified cup and pattern
     """
-    all_metadata = get_all_map_metadata(cup)
-    for m in all_metadata:
-        if m['patternName'] == patternname:
-            if not zone_labels:
-                keys = [f'mapZone{i+1}Name' for i in range(4)]
-                for key in keys:
-                    if key in m:
-                        del m[key]
-            return m
+    view = get_cup_metadata(cup).by_pattern.get(patternname)
+    if view is not None:
+        m = dict(view)
+        if not zone_labels:
+            keys = [f'mapZone{i+1}Name' for i in range(4)]
+            for key in keys:
+                if key in m:
+                    del m[key]
+        return m
     # If we reach this point, we didn't find labels in data/<cupname>.json
     if zone_labels:
         m = {
@@ -318,46 +514,60 @@ def get_map_metadata(cup, patternname, zone_labels=True):
 def get_all_map_metadata(cup, season=None):
     """
     Get metadata for all maps for the specified cup and season.
+    A map is in a season if mapStartSeason <= season < mapEndSeason.
     """
-    map_data_file = os.path.join(
-        os.path.abspath(os.path.dirname(__file__)), "data", f"{cup}.json"
-    )
-    if not os.path.exists(map_data_file):
-        raise Exception(f"Could not find map metadata for specified cup: {cup}")
-    with open(map_data_file, "r") as f:
-        mapdat = json.load(f)
-
     # If the user does not specify a season, return every map's metadata
     if season is None:
-        return mapdat
+        return [dict(m) for m in get_cup_metadata(cup).maps]
 
     # If the user specifies a season, return only the maps for that specified season
-    keep_maps = []
-    for this_map in mapdat:
-        keep = False
-        if "mapStartSeason" in this_map:
-            if this_map["mapStartSeason"] <= season:
-                keep = True
-        if "mapEndSeason" in this_map:
-            if this_map["mapEndSeason"] <= season:
-                keep = False
-        if keep:
-            keep_maps.append(this_map)
-    return keep_maps
+    return [dict(m) for m in get_season_maps(cup, season)]
 
 
 ####################################
 # Render the map for the realization
 
 
-def render_map(cup, patternname, rows, columns, seed=None):
+@timed("render_map")
+def render_map(cup, patternname, rows, columns, seed=None, rng=None):
+    """
+    Render the tuple of initial condition strings of a map.
+    Seeded renders go through the realization cache, if one is set.
+    Raise GollyXMapsError if the map cannot be rendered at rows x columns.
+    """
+    check_dimensions(cup, patternname, rows, columns)
+    key = ("render", cup, patternname, rows, columns, seed)
+    cached = _get_cached_render(key, seed)
+    if cached is not None:
+        return cached
     f = get_pattern_function_map(cup)
     pattern_map = f()
     g = pattern_map[patternname]
-    return g(rows, columns, seed=seed)
+    # Some pattern functions return generators
+    return _put_cached_render(key, seed, tuple(g(rows, columns, seed=seed, rng=get_rng(seed, rng))))
 
 
-def render_dragon_map(patternname, rows, columns, nparts, seed=None):
-    dragon_map = get_dragon_pattern_function_map()
+@timed("render_map")
+def render_dragon_map(patternname, rows, columns, nparts, seed=None, rng=None):
+    key = ("dragon", patternname, rows, columns, nparts, seed)
+    cached = _get_cached_render(key, seed)
+    if cached is not None:
+        return cached
+    dragon_map = get_pattern_function_map('dragon')()
     g = dragon_map[patternname]
-    return g(columns, nparts, seed=seed)
+    return _put_cached_render(key, seed, tuple(g(columns, nparts, seed=seed, rng=get_rng(seed, rng))))
+
+
+def _get_cached_render(key, seed):
+    # Only seeded renders are a pure function of their arguments
+    cache = get_realization_cache()
+    if cache is None or seed is None:
+        return None
+    return cache.get(key)
+
+
+def _put_cached_render(key, seed, result):
+    cache = get_realization_cache()
+    if cache is not None and seed is not None:
+        cache.put(key, result)
+    return result
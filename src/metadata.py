@@ -0,0 +1,98 @@
+import json
+import os
+from bisect import bisect_right
+from collections import namedtuple
+from glob import glob
+from types import MappingProxyType
+
+
+# The metadata of one cup: every map (read-only views, in data file order),
+# the first map for each pattern name, and the season index.
+# A map is active in seasons mapStartSeason <= season < mapEndSeason.
+# season_bounds are the sorted seasons where the set of active maps changes,
+# season_maps[i] holds the maps active in season_bounds[i] <= season < season_bounds[i+1].
+CupMetadata = namedtuple("CupMetadata", ["maps", "by_pattern", "season_bounds", "season_maps"])
+
+# Process-wide metadata store, built on first use (see get_metadata_store())
+_metadata_store = None
+
+
+def get_metadata_filepaths():
+    p = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "*.json")
+    return glob(p)
+
+
+def get_metadata_store():
+    """
+    Return the metadata store, a read-only mapping of cup name to CupMetadata.
+
+    The store is built once per process, on first use,
+    by loading every data/<cup>.json file.
+    """
+    global _metadata_store
+    if _metadata_store is None:
+        store = {}
+        for datapath in get_metadata_filepaths():
+            cup = os.path.basename(os.path.splitext(datapath)[0])
+            with open(datapath, "r") as f:
+                store[cup] = _index_cup_metadata(json.load(f))
+        _metadata_store = MappingProxyType(store)
+    return _metadata_store
+
+
+def invalidate_metadata_store():
+    """
+    Drop the metadata store, so the data files are
+    loaded again on next use (useful when editing map data).
+    """
+    global _metadata_store
+    _metadata_store = None
+
+
+def _index_cup_metadata(mapdat):
+    maps = tuple(MappingProxyType(dict(m)) for m in mapdat)
+
+    by_pattern = {}
+    for m in maps:
+        by_pattern.setdefault(m["patternName"], m)
+
+    # Maps without a start season are never active
+    intervals = []
+    for i, m in enumerate(maps):
+        if "mapStartSeason" in m:
+            start = m["mapStartSeason"]
+            end = m.get("mapEndSeason")
+            if end is None or start < end:
+                intervals.append((i, start, end))
+
+    bounds = sorted(set([start for (_, start, _) in intervals] + [end for (_, _, end) in intervals if end is not None]))
+    season_maps = []
+    for season in bounds:
+        season_maps.append(
+            tuple(
+                maps[i] for (i, start, end) in intervals if start <= season and (end is None or season < end)
+            )
+        )
+
+    return CupMetadata(maps, MappingProxyType(by_pattern), tuple(bounds), tuple(season_maps))
+
+
+def get_cup_metadata(cup):
+    """
+    Return the CupMetadata of the specified cup
+    """
+    try:
+        return get_metadata_store()[cup]
+    except KeyError:
+        raise Exception(f"Could not find map metadata for specified cup: {cup}")
+
+
+def get_season_maps(cup, season):
+    """
+    Return a tuple of read-only views of the maps active in the specified season
+    """
+    cupdat = get_cup_metadata(cup)
+    i = bisect_right(cupdat.season_bounds, season) - 1
+    if i < 0:
+        return ()
+    return cupdat.season_maps[i]
@@ -1,11 +1,48 @@
 import math
+from collections import namedtuple
 from collections.abc import Iterable
+from contextlib import contextmanager
 from operator import itemgetter
+from types import MappingProxyType
 import random
 import os
+import threading
 from glob import glob
 from .geom import hflip_pattern, vflip_pattern, rot_pattern
 from .error import GollyXPatternNotFoundError, GollyXPatternsError
+from . import instrument
+from .instrument import timed
+
+
+# A parsed pattern file: the .o diagram (tuple of strings, one string = one row),
+# its dimensions, and its number of live cells
+PatternEntry = namedtuple("PatternEntry", ["name", "diagram", "height", "width", "livecount"])
+
+# One orientation of a pattern: the .o diagram (tuple of strings),
+# its dimensions, and the (row, col) coordinates of its live cells
+PatternOrientation = namedtuple("PatternOrientation", ["diagram", "height", "width", "cells"])
+
+# Every (hflip, vflip, rotdeg) combination accepted by get_pattern().
+# These 16 keys cover the 8 elements of the dihedral group D4.
+ORIENTATION_KEYS = tuple(
+    (hflip, vflip, rotdeg)
+    for hflip in (False, True)
+    for vflip in (False, True)
+    for rotdeg in (0, 90, 180, 270)
+)
+
+# Process-wide pattern registry, built on first use (see get_pattern_registry())
+_pattern_registry = None
+
+# Pattern name -> {orientation key: PatternOrientation}, filled in lazily
+_orientation_cache = {}
+
+# Map generator name -> {"resamples": n, "infeasible": n} for the placements
+# made by fit_placement() and draw_jitter(), see get_placement_counts()
+_placement_counts = {}
+
+# The name of the map generator running in this thread, set by placement_context()
+_placement_context = threading.local()
 
 
 def get_pattern_filepaths():
@@ -14,59 +51,147 @@ def get_pattern_filepaths():
     return patternfilepaths
 
 
-def get_patterns():
-    patternpaths = get_pattern_filepaths()
-    patternfiles = [os.path.basename(os.path.splitext(p)[0]) for p in patternpaths]
-    return patternfiles
+def get_pattern_registry():
+    """
+    Return the pattern registry, a read-only mapping of
+    pattern name to PatternEntry.
+
+    The registry is built once per process, on first use,
+    by parsing every packaged pattern file.
+    """
+    global _pattern_registry
+    if _pattern_registry is None:
+        registry = {}
+        for patternpath in get_pattern_filepaths():
+            pattern_name = os.path.basename(os.path.splitext(patternpath)[0])
+            with open(patternpath, "r") as f:
+                diagram = tuple(r.strip() for r in f.readlines())
+            registry[pattern_name] = PatternEntry(
+                pattern_name,
+                diagram,
+                len(diagram),
+                len(diagram[0]),
+                sum(row.count("o") for row in diagram),
+            )
+        _pattern_registry = MappingProxyType(registry)
+    return _pattern_registry
 
 
-def get_pattern(pattern_name, hflip=False, vflip=False, rotdeg=0):
+def invalidate_pattern_registry():
     """
-    For a given pattern, return the .o diagram
-    as a list of strings, one string = one row
+    Drop the pattern registry, so the pattern files are
+    parsed again on next use (useful when editing patterns).
     """
-    patternpaths = get_pattern_filepaths()
-    fpath = None
-    for patternpath in patternpaths:
-        if patternpath.endswith("/" + pattern_name+".txt"):
-            fpath = patternpath
+    global _pattern_registry
+    _pattern_registry = None
+    _orientation_cache.clear()
 
-    if fpath is None or not os.path.exists(fpath):
+
+def get_pattern_entry(pattern_name):
+    """
+    Return the PatternEntry for the given pattern name
+    """
+    try:
+        return get_pattern_registry()[pattern_name]
+    except KeyError:
         raise GollyXPatternNotFoundError(f"Error: pattern {pattern_name} does not exist!")
 
-    with open(fpath, "r") as f:
-        pattern = f.readlines()
 
-    pattern = [r.strip() for r in pattern]
-    if hflip:
-        pattern = hflip_pattern(pattern)
-    if vflip:
-        pattern = vflip_pattern(pattern)
-    if rotdeg:
-        pattern = rot_pattern(pattern, rotdeg)
+def get_patterns():
+    return list(get_pattern_registry().keys())
+
+
+def get_pattern_orientations(pattern_name):
+    """
+    Return a mapping of (hflip, vflip, rotdeg) to PatternOrientation
+    for the given pattern, covering all 8 dihedral variants.
+
+    The table is computed once per pattern. Keys that produce the
+    same .o diagram (symmetric patterns like block or star) share
+    a single PatternOrientation object.
+    """
+    orientations = _orientation_cache.get(pattern_name)
+    if orientations is None:
+        diagram = list(get_pattern_entry(pattern_name).diagram)
+        distinct = {}
+        orientations = {}
+        for key in ORIENTATION_KEYS:
+            hflip, vflip, rotdeg = key
+            pattern = diagram
+            if hflip:
+                pattern = hflip_pattern(pattern)
+            if vflip:
+                pattern = vflip_pattern(pattern)
+            if rotdeg:
+                pattern = rot_pattern(pattern, rotdeg)
+            pattern = tuple(pattern)
+            if pattern not in distinct:
+                cells = tuple(
+                    (iy, ix)
+                    for iy, row in enumerate(pattern)
+                    for ix, ch in enumerate(row)
+                    if ch == "o"
+                )
+                distinct[pattern] = PatternOrientation(
+                    pattern, len(pattern), len(pattern[0]), cells
+                )
+            orientations[key] = distinct[pattern]
+        _orientation_cache[pattern_name] = orientations
+    return orientations
+
 
-    return pattern
+@timed("load_pattern")
+def get_pattern_orientation(pattern_name, hflip=False, vflip=False, rotdeg=0):
+    """
+    Return the PatternOrientation of a pattern after applying
+    hflip, then vflip, then a rotation of rotdeg degrees
+    (the same order as get_pattern()).
+    """
+    orientations = get_pattern_orientations(pattern_name)
+    if rotdeg == 360:
+        rotdeg = 0
+    key = (bool(hflip), bool(vflip), rotdeg)
+    if key not in orientations:
+        # Let rot_pattern() raise the error for an invalid rotation
+        rot_pattern([], rotdeg)
+    return orientations[key]
+
+
+def get_distinct_pattern_orientations(pattern_name):
+    """
+    Return a tuple of the distinct PatternOrientations of a pattern,
+    so callers can pick uniformly among only the distinct orientations.
+    """
+    distinct = []
+    for orientation in get_pattern_orientations(pattern_name).values():
+        if orientation not in distinct:
+            distinct.append(orientation)
+    return tuple(distinct)
+
+
+def get_pattern(pattern_name, hflip=False, vflip=False, rotdeg=0):
+    """
+    For a given pattern, return the .o diagram
+    as a list of strings, one string = one row
+    """
+    orientation = get_pattern_orientation(pattern_name, hflip=hflip, vflip=vflip, rotdeg=rotdeg)
+    return list(orientation.diagram)
 
 
 def get_pattern_size(pattern_name, **kwargs):
     """
     Returns: (nrows, ncols)
     """
-    pattern = get_pattern(pattern_name, **kwargs)
-    return (len(pattern), len(pattern[0]))
+    orientation = get_pattern_orientation(pattern_name, **kwargs)
+    return (orientation.height, orientation.width)
 
 
 def get_pattern_livecount(pattern_name, **kwargs):
     """
     Returns: count of live cells in the given pattern
     """
-    pattern = get_pattern(pattern_name, **kwargs)
-    count = 0
-    for row in pattern:
-        for j in row:
-            if j == "o":
-                count += 1
-    return count
+    # Flips and rotations do not change the live cell count
+    return get_pattern_entry(pattern_name).livecount
 
 
 def get_grid_empty(rows, columns, flat=True):
@@ -83,6 +208,7 @@ def get_grid_empty(rows, columns, flat=True):
     return blank_grid
 
 
+@timed("get_grid_pattern")
 def get_grid_pattern(
     pattern_name,
     rows,
@@ -107,12 +233,218 @@ def get_grid_pattern(
         err = f"Error: invalid number of rows {rows} or columns {columns}, must be positive integers > 0"
         raise GollyXPatternsError(err)
 
-    # convert list of strings to list of lists (for convenience)
-    ogpattern = get_pattern(pattern_name, hflip=hflip, vflip=vflip, rotdeg=rotdeg)
-    ogpattern = [list(j) for j in ogpattern]
+    orientation = get_pattern_orientation(pattern_name, hflip=hflip, vflip=vflip, rotdeg=rotdeg)
     blank_row = ["."] * columns
     newpattern = [blank_row[:] for r in range(rows)]
-    (pattern_h, pattern_w) = (len(ogpattern), len(ogpattern[0]))
+
+    (xstart, xend, ystart, yend) = get_placement_bounds(
+        orientation, rows, columns, xoffset, yoffset, check_overflow
+    )
+
+    # iterate through the live cells of the pattern and copy over the ones that are in the final grid
+    for iy, ix in orientation.cells:
+        y = ystart + iy
+        x = xstart + ix
+        if y > 0 and y < rows and x > 0 and x < columns:
+            newpattern[y][x] = "o"
+
+    newpattern = ["".join(j) for j in newpattern]
+    return newpattern
+
+
+def check_grid_pattern(
+    pattern_name,
+    rows,
+    columns,
+    xoffset=0,
+    yoffset=0,
+    hflip=False,
+    vflip=False,
+    rotdeg=0,
+):
+    """
+    Raise the same error get_grid_pattern() would raise
+    if the pattern does not fit on the grid at the given offset,
+    without building the grid.
+    """
+    if columns < 1 or rows < 1:
+        err = f"Error: invalid number of rows {rows} or columns {columns}, must be positive integers > 0"
+        raise GollyXPatternsError(err)
+    orientation = get_pattern_orientation(pattern_name, hflip=hflip, vflip=vflip, rotdeg=rotdeg)
+    get_placement_bounds(orientation, rows, columns, xoffset, yoffset)
+
+
+def get_offset_range(pattern_name, rows, columns, hflip=False, vflip=False, rotdeg=0):
+    """
+    Return (xmin, xmax, ymin, ymax), the range of offsets at which
+    get_grid_pattern() can place the pattern on a grid of size (rows x columns).
+    The range is empty (xmin > xmax or ymin > ymax) if the pattern does not fit.
+    """
+    orientation = get_pattern_orientation(pattern_name, hflip=hflip, vflip=vflip, rotdeg=rotdeg)
+    (pattern_h, pattern_w) = (orientation.height, orientation.width)
+    # The inverse of the checks in get_placement_bounds()
+    xmin = pattern_w // 2
+    xmax = columns - 1 - pattern_w + pattern_w // 2
+    ymin = pattern_h // 2
+    ymax = rows - 1 - pattern_h + pattern_h // 2
+    return (xmin, xmax, ymin, ymax)
+
+
+def get_min_pattern_size(pattern_names, rotated=False):
+    """
+    Return the smallest (height, width) among the given patterns,
+    over all of their orientations if rotated is True
+    (the best case for fitting one of them on a grid).
+    """
+    heights = []
+    widths = []
+    for name in pattern_names:
+        orientation = get_pattern_orientation(name)
+        heights.append(orientation.height)
+        widths.append(orientation.width)
+        if rotated:
+            heights.append(orientation.width)
+            widths.append(orientation.height)
+    return (min(heights), min(widths))
+
+
+def get_min_fit_dimension(extent, anchor, jitter=(0, 0)):
+    """
+    Return the smallest grid dimension n (rows or columns) on which a pattern whose
+    height or width is extent fits at offset anchor(n) + j, for some jitter j with
+    jitter[0] <= j <= jitter[1]. On any smaller grid, the pattern cannot fit.
+    """
+    for n in range(max(extent, 1), 1 << 16):
+        offset = anchor(n)
+        lo = max(offset + jitter[0], extent // 2)
+        hi = min(offset + jitter[1], n - 1 - extent + extent // 2)
+        if lo <= hi:
+            return n
+    raise GollyXPatternsError(f"Error: a pattern of size {extent} cannot fit at the given offsets on any grid")
+
+
+def get_min_safe_dimension(placements, start=1, limit=1024):
+    """
+    Return the smallest grid dimension n (rows or columns) such that on every grid
+    dimension m with max(n, start) <= m < limit, every placement fits for every jitter.
+
+    Each placement is (extent, anchor, jitter): a pattern whose height or width is
+    extent, at offset anchor(m) + j for jitter[0] <= j <= jitter[1]. jitter is a
+    (min, max) pair, or a function of m that returns one (an empty range never fits).
+    Unlike get_min_fit_dimension(), this holds for every draw of every pattern, so a
+    map generator placing all of them never fails on a grid at least this large.
+    Return limit if some placement does not fit on a grid just under limit.
+    """
+    misfits = [0]
+    for m in range(start, limit):
+        for extent, anchor, jitter in placements:
+            lo, hi = jitter(m) if callable(jitter) else jitter
+            offset = anchor(m)
+            if lo > hi or offset + lo < extent // 2 or offset + hi > m - 1 - extent + extent // 2:
+                misfits.append(m)
+                break
+    return max(misfits) + 1
+
+
+def fit_placement(pattern_name, rows, columns, placement, xwindow, ywindow, rng=None):
+    """
+    Given a placement (keyword arguments of get_grid_pattern()) whose xoffset and yoffset
+    were drawn uniformly from the (min, max) windows xwindow and ywindow, return a
+    placement that fits on the grid: the same placement if it fits, otherwise one
+    with each overflowing offset drawn again from the part of its window where the
+    pattern fits. Raise GollyXPatternsError if there is no such part.
+
+    This is the same as drawing the offsets until the pattern fits, but only
+    redraws the offsets that overflow, and at most once.
+    """
+    if rng is None:
+        rng = random
+    xmin, xmax, ymin, ymax = get_offset_range(
+        pattern_name,
+        rows,
+        columns,
+        hflip=placement.get("hflip", False),
+        vflip=placement.get("vflip", False),
+        rotdeg=placement.get("rotdeg", 0),
+    )
+    xlo, xhi = max(xwindow[0], xmin), min(xwindow[1], xmax)
+    ylo, yhi = max(ywindow[0], ymin), min(ywindow[1], ymax)
+    if xlo > xhi or ylo > yhi:
+        _count_placement("infeasible")
+        raise GollyXPatternsError(f"Error: pattern {pattern_name} cannot fit on a grid of {rows} x {columns}")
+    placement = dict(placement)
+    if not xlo <= placement["xoffset"] <= xhi:
+        placement["xoffset"] = rng.randint(xlo, xhi)
+        _count_placement("resamples")
+    if not ylo <= placement["yoffset"] <= yhi:
+        placement["yoffset"] = rng.randint(ylo, yhi)
+        _count_placement("resamples")
+    return placement
+
+
+def draw_jitter(lo, hi, feasible, rng=None):
+    """
+    Draw a jitter value uniformly from [lo, hi], restricted to the feasible (min, max) range.
+
+    Check that the ranges overlap before drawing (raise GollyXPatternsError if not),
+    then draw from [lo, hi] as rng.randint(lo, hi) would, and only if that value is
+    not feasible, draw again from the overlap.
+    """
+    if rng is None:
+        rng = random
+    flo, fhi = max(lo, feasible[0]), min(hi, feasible[1])
+    if flo > fhi:
+        _count_placement("infeasible")
+        raise GollyXPatternsError(f"Error: no jitter in [{lo}, {hi}] is in the feasible range {feasible}")
+    j = rng.randint(lo, hi)
+    if flo <= j <= fhi:
+        return j
+    _count_placement("resamples")
+    return rng.randint(flo, fhi)
+
+
+def _count_placement(key):
+    instrument.count(f"placement_{key}")
+    name = getattr(_placement_context, "name", None)
+    if name is not None:
+        counts = _placement_counts.setdefault(name, {"resamples": 0, "infeasible": 0})
+        counts[key] += 1
+
+
+@contextmanager
+def placement_context(name):
+    """
+    Attribute the placements made in this thread to
+    the map generator called name (see get_placement_counts())
+    """
+    previous = getattr(_placement_context, "name", None)
+    _placement_context.name = name
+    try:
+        yield
+    finally:
+        _placement_context.name = previous
+
+
+def get_placement_counts():
+    """
+    Return {map generator name: {"resamples": n, "infeasible": n}}:
+    how many offsets fit_placement() and draw_jitter() drew again,
+    and how many placements could not fit at all
+    """
+    return {name: dict(counts) for name, counts in _placement_counts.items()}
+
+
+def reset_placement_counts():
+    _placement_counts.clear()
+
+
+def get_placement_bounds(orientation, rows, columns, xoffset, yoffset, check_overflow=True):
+    """
+    Given a PatternOrientation centered at (xoffset, yoffset) on a grid
+    of size (rows x columns), return (xstart, xend, ystart, yend).
+    If check_overflow is True, raise an error if the pattern does not fit.
+    """
+    (pattern_h, pattern_w) = (orientation.height, orientation.width)
 
     # given offset is offset for the center of the pattern,
     # so do some algebra to determine where we should start
@@ -140,17 +472,10 @@ def get_grid_pattern(
                 f"Error: specified number of rows {rows} was too small, need at least {yend+1}"
             )
 
-    # iterate through the pattern and copy over the cells that are in the final grid
-    for iy, y in enumerate(range(ystart, yend)):
-        if y > 0 and y < len(newpattern):
-            for ix, x in enumerate(range(xstart, xend)):
-                if x > 0 and x < len(newpattern[iy]):
-                    newpattern[y][x] = ogpattern[iy][ix]
-
-    newpattern = ["".join(j) for j in newpattern]
-    return newpattern
+    return (xstart, xend, ystart, yend)
 
 
+@timed("pattern_union")
 def pattern_union(patterns, flatten=True):
     for i in range(1, len(patterns)):
         axis0different = len(patterns[i - 1]) != len(patterns[i])
@@ -197,6 +522,7 @@ def segment_pattern(
     nhseg=0,
     nvseg=0,
     gap_probability=None,
+    rng=None,
 ):
     """
     Return a two-color pattern consisting of nhseg horizontal segments and nvseg vertical segments.
@@ -208,6 +534,8 @@ def segment_pattern(
 
     gap probability dictates how often gaps occur. If there are too many gaps, maps get boring!
     """
+    if rng is None:
+        rng = random
     valid_colormodes = ["classic", "classicbroken", "random", "randombroken"]
     if colormode not in valid_colormodes:
         raise GollyXPatternsError(
@@ -234,10 +562,10 @@ def segment_pattern(
 
     # Add jitter, and bookend with 0 and nrows/ncols
     hseglocs = (
-        [-1] + [k + random.randint(-jittery, jittery) for k in hsegcenters] + [rows]
+        [-1] + [k + rng.randint(-jittery, jittery) for k in hsegcenters] + [rows]
     )
     vseglocs = (
-        [-1] + [k + random.randint(-jitterx, jitterx) for k in vsegcenters] + [cols]
+        [-1] + [k + rng.randint(-jitterx, jitterx) for k in vsegcenters] + [cols]
     )
 
     loclenlist = []
@@ -285,7 +613,7 @@ def segment_pattern(
 
         from operator import itemgetter
 
-        random.shuffle(loclenlist)
+        rng.shuffle(loclenlist)
         loclenlist.sort(key=itemgetter(4), reverse=True)
 
         for i, (starty, endy, startx, endx, mag) in enumerate(loclenlist):
@@ -299,7 +627,7 @@ def segment_pattern(
             team_assignments = [serpteam,] * magon + [
                 0,
             ] * rem  # noqa
-            random.shuffle(team_assignments)
+            rng.shuffle(team_assignments)
 
             ta_ix = 0
             for y in range(starty, endy + 1):
@@ -343,7 +671,7 @@ def segment_pattern(
                 ]
                 * rem
             )  # noqa
-            random.shuffle(team_assignments)
+            rng.shuffle(team_assignments)
 
             ta_ix = 0
             for y in range(starty, endy + 1):
@@ -372,7 +700,7 @@ def segment_pattern(
 
 
 def methuselah_quadrants_pattern(
-    rows, cols, seed=None, methuselah_counts=None, methuselah_names=None
+    rows, cols, seed=None, methuselah_counts=None, methuselah_names=None, rng=None
 ):
     """
     Returns a map with a cluster of methuselahs in each quadrant.
@@ -393,7 +721,12 @@ def methuselah_quadrants_pattern(
     Next, place random methuselah patterns in each of the corners.
     """
     if seed is not None:
-        random.seed(seed)
+        if isinstance(rng, random.Random):
+            rng.seed(seed)
+        else:
+            rng = random.Random(seed)
+    elif rng is None:
+        rng = random
 
     # Basic checks
     BIGDIMLIMIT = 150
@@ -425,7 +758,7 @@ def methuselah_quadrants_pattern(
     ]
 
     # Shuffle quadrants, first two and second two are now paired up as buddies
-    random.shuffle(quadrants)
+    rng.shuffle(quadrants)
 
     rotdegs = [0, 90, 180, 270]
 
@@ -433,7 +766,7 @@ def methuselah_quadrants_pattern(
 
     for buddy_index in [[0, 1], [2, 3]]:
         # Decide how many methuselahs in this quad pair
-        count = random.choice(methuselah_counts)
+        count = rng.choice(methuselah_counts)
 
         if count == 1:
 
@@ -445,23 +778,31 @@ def methuselah_quadrants_pattern(
             for bi in buddy_index:
                 corner = quadrants[bi][1]
 
-                y = corner[0] + rows // 4 + random.randint(-jittery, jittery)
-                x = corner[1] + cols // 4 + random.randint(-jitterx, jitterx)
+                y0 = corner[0] + rows // 4
+                x0 = corner[1] + cols // 4
+                y = y0 + rng.randint(-jittery, jittery)
+                x = x0 + rng.randint(-jitterx, jitterx)
 
-                meth = random.choice(methuselah_names)
+                meth = rng.choice(methuselah_names)
 
-                pattern = get_grid_pattern(
+                placement = dict(
+                    xoffset=x,
+                    yoffset=y,
+                    hflip=bool(rng.getrandbits(1)),
+                    vflip=bool(rng.getrandbits(1)),
+                    rotdeg=rng.choice(rotdegs),
+                )
+                placement = fit_placement(
                     meth,
                     rows,
                     cols,
-                    xoffset=x,
-                    yoffset=y,
-                    hflip=bool(random.getrandbits(1)),
-                    vflip=bool(random.getrandbits(1)),
-                    rotdeg=random.choice(rotdegs),
+                    placement,
+                    (x0 - jitterx, x0 + jitterx),
+                    (y0 - jittery, y0 + jittery),
+                    rng,
                 )
                 livecount = get_pattern_livecount(meth)
-                all_methuselahs.append((livecount, pattern))
+                all_methuselahs.append((livecount, (meth, placement)))
 
         elif count == 2 or count == 4:
 
@@ -482,7 +823,7 @@ def methuselah_quadrants_pattern(
                 nslices = 2
                 nparts = nslices + 1
 
-                posdiag = bool(random.getrandbits(1))
+                posdiag = bool(rng.getrandbits(1))
 
                 for a in range(1, nparts):
                     for b in range(1, nparts):
@@ -497,28 +838,36 @@ def methuselah_quadrants_pattern(
                             proceed = True
 
                         if proceed:
-                            y = corner[0] + a * ((rows // 2) // nparts) + random.randint(-jittery, jittery)
-                            x = corner[1] + b * ((cols // 2) // nparts) + random.randint(-jitterx, jitterx)
+                            y0 = corner[0] + a * ((rows // 2) // nparts)
+                            x0 = corner[1] + b * ((cols // 2) // nparts)
+                            y = y0 + rng.randint(-jittery, jittery)
+                            x = x0 + rng.randint(-jitterx, jitterx)
 
-                            meth = random.choice(methuselah_names)
+                            meth = rng.choice(methuselah_names)
 
                             try:
-                                pattern = get_grid_pattern(
+                                placement = dict(
+                                    xoffset=x,
+                                    yoffset=y,
+                                    hflip=bool(rng.getrandbits(1)),
+                                    vflip=bool(rng.getrandbits(1)),
+                                    rotdeg=rng.choice(rotdegs),
+                                )
+                                placement = fit_placement(
                                     meth,
                                     rows,
                                     cols,
-                                    xoffset=x,
-                                    yoffset=y,
-                                    hflip=bool(random.getrandbits(1)),
-                                    vflip=bool(random.getrandbits(1)),
-                                    rotdeg=random.choice(rotdegs),
+                                    placement,
+                                    (x0 - jitterx, x0 + jitterx),
+                                    (y0 - jittery, y0 + jittery),
+                                    rng,
                                 )
                             except GollyXPatternsError:
                                 raise GollyXPatternsError(
                                     f"Error with methuselah {meth}: cannot fit"
                                 )
                             livecount = get_pattern_livecount(meth)
-                            all_methuselahs.append((livecount, pattern))
+                            all_methuselahs.append((livecount, (meth, placement)))
 
         elif count == 3 or count == 9:
 
@@ -547,28 +896,36 @@ def methuselah_quadrants_pattern(
                             proceed = True
 
                         if proceed:
-                            y = corner[0] + a * ((rows // 2) // nslices) + random.randint(-jittery, jittery) 
-                            x = corner[1] + b * ((cols // 2) // nslices) + random.randint(-jitterx, jitterx) 
+                            y0 = corner[0] + a * ((rows // 2) // nslices)
+                            x0 = corner[1] + b * ((cols // 2) // nslices)
+                            y = y0 + rng.randint(-jittery, jittery)
+                            x = x0 + rng.randint(-jitterx, jitterx)
 
-                            meth = random.choice(methuselah_names)
+                            meth = rng.choice(methuselah_names)
 
                             try:
-                                pattern = get_grid_pattern(
+                                placement = dict(
+                                    xoffset=x,
+                                    yoffset=y,
+                                    hflip=bool(rng.getrandbits(1)),
+                                    vflip=bool(rng.getrandbits(1)),
+                                    rotdeg=rng.choice(rotdegs),
+                                )
+                                placement = fit_placement(
                                     meth,
                                     rows,
                                     cols,
-                                    xoffset=x,
-                                    yoffset=y,
-                                    hflip=bool(random.getrandbits(1)),
-                                    vflip=bool(random.getrandbits(1)),
-                                    rotdeg=random.choice(rotdegs),
+                                    placement,
+                                    (x0 - jitterx, x0 + jitterx),
+                                    (y0 - jittery, y0 + jittery),
+                                    rng,
                                 )
                             except GollyXPatternsError:
                                 raise GollyXPatternsError(
                                     f"Error with methuselah {meth}: cannot fit"
                                 )
                             livecount = get_pattern_livecount(meth)
-                            all_methuselahs.append((livecount, pattern))
+                            all_methuselahs.append((livecount, (meth, placement)))
 
         elif count == 16:
 
@@ -584,52 +941,57 @@ def methuselah_quadrants_pattern(
                 for a in range(1, nslices):
                     for b in range(1, nslices):
 
-                        y = corner[0] + a * ((rows // 2) // nslices) + random.randint(-jittery, jittery)  
-                        x = corner[1] + b * ((cols // 2) // nslices) + random.randint(-jitterx, jitterx)  
+                        y0 = corner[0] + a * ((rows // 2) // nslices)
+                        x0 = corner[1] + b * ((cols // 2) // nslices)
+                        y = y0 + rng.randint(-jittery, jittery)
+                        x = x0 + rng.randint(-jitterx, jitterx)
 
-                        meth = random.choice(methuselah_names)
+                        meth = rng.choice(methuselah_names)
 
                         try:
-                            pattern = get_grid_pattern(
+                            placement = dict(
+                                xoffset=x,
+                                yoffset=y,
+                                hflip=bool(rng.getrandbits(1)),
+                                vflip=bool(rng.getrandbits(1)),
+                                rotdeg=rng.choice(rotdegs),
+                            )
+                            placement = fit_placement(
                                 meth,
                                 rows,
                                 cols,
-                                xoffset=x,
-                                yoffset=y,
-                                hflip=bool(random.getrandbits(1)),
-                                vflip=bool(random.getrandbits(1)),
-                                rotdeg=random.choice(rotdegs),
+                                placement,
+                                (x0 - jitterx, x0 + jitterx),
+                                (y0 - jittery, y0 + jittery),
+                                rng,
                             )
                         except GollyXPatternsError:
                             raise GollyXPatternsError(
                                 f"Error with methuselah {meth}: cannot fit"
                             )
                         livecount = get_pattern_livecount(meth)
-                        all_methuselahs.append((livecount, pattern))
+                        all_methuselahs.append((livecount, (meth, placement)))
 
-    random.shuffle(all_methuselahs)
+    rng.shuffle(all_methuselahs)
     all_methuselahs.sort(key=itemgetter(0), reverse=True)
 
-    team1_patterns = []
-    team2_patterns = []
+    from .canvas import Canvas
+
+    canvas = Canvas(rows, cols, nteams=2)
 
     serpentine_pattern = [1, 2, 2, 1]
-    for i, (_, methuselah_pattern) in enumerate(all_methuselahs):
+    for i, (_, (meth, placement)) in enumerate(all_methuselahs):
         serpix = i % len(serpentine_pattern)
         serpteam = serpentine_pattern[serpix]
-        if serpteam == 1:
-            team1_patterns.append(methuselah_pattern)
-        elif serpteam == 2:
-            team2_patterns.append(methuselah_pattern)
+        canvas.stamp(serpteam - 1, meth, **placement)
 
-    team1_pattern = pattern_union(team1_patterns)
-    team2_pattern = pattern_union(team2_patterns)
+    team1_pattern, team2_pattern = canvas.to_patterns()
 
     return team1_pattern, team2_pattern
 
 
 def cloud_region(
-    which_pattern, dims, xlim, ylim, margins, jitter, flip, distancing=True
+    which_pattern, dims, xlim, ylim, margins, jitter, flip, distancing=True, rng=None
 ):
     """
     Given a square region defined by the x and y limits, tile the region
@@ -646,6 +1008,8 @@ def cloud_region(
                     (eliminates overlap in starting positions)
                     (off is more chaotic, on is more ordered)
     """
+    if rng is None:
+        rng = random
     if len(dims) != 2:
         err = "Error: could not understand dimensions input, provide (rows, cols)"
         raise Exception(err)
@@ -714,7 +1078,9 @@ def cloud_region(
     tiling_nx = core_w // tile_w - 1
     tiling_ny = core_h // tile_h - 1
 
-    tileset = []
+    from .canvas import Canvas
+
+    tileset = Canvas(rows, cols, nteams=1)
     for i in range(tiling_nx):
         for j in range(tiling_ny):
 
@@ -725,18 +1091,15 @@ def cloud_region(
                 xoffset = core_xlim[0] + (tile_w // 2) + i * tile_w
                 yoffset = core_ylim[0] + (tile_h // 2) + j * tile_h
 
-            tileset.append(
-                get_grid_pattern(
-                    which_pattern,
-                    rows,
-                    cols,
-                    xoffset=xoffset + random.randint(-x_jitter, x_jitter),
-                    yoffset=yoffset + random.randint(-y_jitter, y_jitter),
-                    hflip=do_hflip,
-                    vflip=do_vflip,
-                    check_overflow=False,
-                )
+            tileset.stamp(
+                0,
+                which_pattern,
+                xoffset=xoffset + rng.randint(-x_jitter, x_jitter),
+                yoffset=yoffset + rng.randint(-y_jitter, y_jitter),
+                hflip=do_hflip,
+                vflip=do_vflip,
+                check_overflow=False,
             )
 
-    tileset_pattern = pattern_union(tileset)
+    tileset_pattern = tileset.to_pattern(0)
     return tileset_pattern
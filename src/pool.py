@@ -0,0 +1,312 @@
+import random
+import threading
+import time
+from collections import deque
+from .maps import (
+    check_dimensions,
+    check_encoding,
+    get_all_map_patterns,
+    get_default_dimensions,
+    get_map_realization,
+    get_pattern_function_map,
+    _init_realization_worker,
+)
+from .error import GollyXMapsError
+
+
+class _PoolEntry(object):
+    """
+    The ready realizations of one (cup, patternname, rows, columns) key,
+    and the water marks the pool keeps them between
+    """
+
+    def __init__(self, key, low_water, high_water):
+        self.key = key
+        self.low_water = low_water
+        self.high_water = high_water
+        self.ready = deque()
+        self.refilling = True
+        self.pending = 0
+        self.hits = 0
+        self.misses = 0
+
+    def wants_refill(self):
+        return self.refilling and len(self.ready) + self.pending < self.high_water
+
+
+class RealizationPool(object):
+    """
+    Keep pre-generated map realizations warm, so they can be served
+    without waiting for the map generators.
+
+    Each (cup, patternname, rows, columns) key added to the pool holds up to
+    high_water ready realizations. When a key drops to low_water or fewer,
+    background workers refill it back up to high_water. A pattern's weight
+    scales both water marks, so heavy or popular patterns can keep more maps
+    ready (a key always keeps at least one).
+
+    Every realization is generated from a new seed, and seeds are never reused
+    within a pool, so served maps do not repeat. Passing seed makes the sequence
+    of seeds (and so of maps served for each key) reproducible.
+
+    get() pops a ready realization (a hit), or generates one in the calling
+    thread if none is ready (a miss). Keys requested with get() that were not
+    added are added with weight 1.
+
+    workers is the number of background refill threads. With processes=True,
+    the threads hand the map generation to a pool of worker processes, so
+    refills run in parallel with each other and with the caller.
+    workers=0 does no background refill: call fill() to top up the pool.
+
+        with RealizationPool(high_water=8, low_water=2, workers=2) as pool:
+            pool.add("rainbow", "rainbowmath", weight=2)
+            m = pool.get("rainbow", "rainbowmath")
+    """
+
+    def __init__(
+        self,
+        high_water=4,
+        low_water=1,
+        workers=1,
+        processes=False,
+        encoding="listlife",
+        cell_size=None,
+        seed=None,
+    ):
+        if high_water < 1:
+            raise GollyXMapsError(f"Error: invalid high_water {high_water}, must be a positive integer")
+        if not 0 <= low_water < high_water:
+            raise GollyXMapsError(
+                f"Error: invalid low_water {low_water}, must be between 0 and high_water - 1"
+            )
+        if workers < 0:
+            raise GollyXMapsError(f"Error: invalid workers {workers}, must not be negative")
+        check_encoding(encoding)
+
+        self.high_water = high_water
+        self.low_water = low_water
+        self.encoding = encoding
+        self.cell_size = cell_size
+
+        # Seeds are consecutive integers from a random start, so they never repeat
+        self._next_seed = random.Random(seed).getrandbits(64)
+
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._idle = threading.Condition(self._lock)
+        self._closed = False
+
+        self._refills = 0
+        self._refill_errors = 0
+        self._refill_time = 0.0
+        self._refill_time_max = 0.0
+
+        self._executor = None
+        if processes and workers > 0:
+            from concurrent.futures import ProcessPoolExecutor
+
+            self._executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_realization_worker)
+
+        self._threads = [
+            threading.Thread(target=self._refill_loop, name=f"RealizationPool-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for t in self._threads:
+            t.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def add(self, cup, patternname, rows=None, columns=None, weight=1):
+        """
+        Add a key to the pool, background workers start filling it.
+        Return the key, (cup, patternname, rows, columns).
+        """
+        if patternname not in get_all_map_patterns(cup):
+            raise GollyXMapsError(f"Error: invalid pattern {patternname} for cup {cup}")
+        if weight <= 0:
+            raise GollyXMapsError(f"Error: invalid weight {weight}, must be positive")
+        key = self._key(cup, patternname, rows, columns)
+        check_dimensions(*key)
+        high_water = max(1, round(self.high_water * weight))
+        low_water = min(round(self.low_water * weight), high_water - 1)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._entries[key] = _PoolEntry(key, low_water, high_water)
+            else:
+                entry.low_water = low_water
+                entry.high_water = high_water
+                entry.refilling = True
+            self._wakeup.notify_all()
+        return key
+
+    def get(self, cup, patternname, rows=None, columns=None):
+        """
+        Return a realization for this key, as from maps.get_map_realization()
+        """
+        key = self._key(cup, patternname, rows, columns)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            self.add(*key)
+            with self._lock:
+                entry = self._entries[key]
+
+        with self._lock:
+            if entry.ready:
+                entry.hits += 1
+                m = entry.ready.popleft()
+            else:
+                entry.misses += 1
+                m = None
+            if len(entry.ready) <= entry.low_water:
+                entry.refilling = True
+                self._wakeup.notify()
+            seed = self._take_seed() if m is None else None
+
+        if m is None:
+            m = self._generate(key, seed)
+        return m
+
+    def fill(self):
+        """
+        Top up every key to its high water mark in the calling thread
+        """
+        while True:
+            with self._lock:
+                job = self._next_job()
+            if job is None:
+                return
+            self._run_job(*job)
+
+    def wait(self, timeout=None):
+        """
+        Wait until no key needs refilling, return False on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            while any(e.wants_refill() or e.pending for e in self._entries.values()):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._idle.wait(remaining)
+        return True
+
+    def stats(self):
+        """
+        Return hits, misses, ready counts, and refill latency,
+        in total and for each key
+        """
+        with self._lock:
+            keys = {
+                key: {
+                    "ready": len(e.ready),
+                    "low_water": e.low_water,
+                    "high_water": e.high_water,
+                    "hits": e.hits,
+                    "misses": e.misses,
+                }
+                for key, e in self._entries.items()
+            }
+            return {
+                "hits": sum(k["hits"] for k in keys.values()),
+                "misses": sum(k["misses"] for k in keys.values()),
+                "ready": sum(k["ready"] for k in keys.values()),
+                "refills": self._refills,
+                "refill_errors": self._refill_errors,
+                "refill_ms_mean": 1000 * self._refill_time / self._refills if self._refills else None,
+                "refill_ms_max": 1000 * self._refill_time_max if self._refills else None,
+                "keys": keys,
+            }
+
+    def close(self):
+        """
+        Stop the background workers and drop every ready realization
+        """
+        with self._lock:
+            self._closed = True
+            self._wakeup.notify_all()
+        for t in self._threads:
+            t.join()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+        with self._lock:
+            for e in self._entries.values():
+                e.ready.clear()
+
+    def _key(self, cup, patternname, rows, columns):
+        get_pattern_function_map(cup)
+        if rows is None and columns is None:
+            rows, columns = get_default_dimensions(cup)
+        return (cup, patternname, rows, columns)
+
+    def _take_seed(self):
+        # Call with the lock held
+        seed = self._next_seed
+        self._next_seed += 1
+        return seed
+
+    def _next_job(self):
+        """
+        With the lock held, pick the key that is emptiest relative to its
+        high water mark and reserve a seed for it, or return None
+        """
+        best = None
+        for e in self._entries.values():
+            if e.refilling and not e.wants_refill() and e.pending == 0:
+                e.refilling = False
+            if e.wants_refill():
+                fill = (len(e.ready) + e.pending) / e.high_water
+                if best is None or fill < best[0]:
+                    best = (fill, e)
+        if best is None:
+            return None
+        entry = best[1]
+        entry.pending += 1
+        return (entry, self._take_seed())
+
+    def _run_job(self, entry, seed):
+        t = time.perf_counter()
+        try:
+            m = self._generate(entry.key, seed)
+        except Exception:
+            m = None
+        elapsed = time.perf_counter() - t
+        with self._lock:
+            entry.pending -= 1
+            if m is None:
+                # Stop refilling this key until the next get(), instead of retrying forever
+                self._refill_errors += 1
+                entry.refilling = False
+            else:
+                self._refills += 1
+                self._refill_time += elapsed
+                self._refill_time_max = max(self._refill_time_max, elapsed)
+                if not self._closed:
+                    entry.ready.append(m)
+            self._idle.notify_all()
+
+    def _refill_loop(self):
+        while True:
+            with self._lock:
+                job = None
+                while not self._closed:
+                    job = self._next_job()
+                    if job is not None:
+                        break
+                    self._wakeup.wait()
+                if job is None:
+                    return
+            self._run_job(*job)
+
+    def _generate(self, key, seed):
+        cup, patternname, rows, columns = key
+        kwargs = dict(cell_size=self.cell_size, encoding=self.encoding, seed=seed)
+        if self._executor is not None and threading.current_thread() in self._threads:
+            return self._executor.submit(get_map_realization, cup, patternname, rows, columns, **kwargs).result()
+        return get_map_realization(cup, patternname, rows, columns, **kwargs)
@@ -1,4 +1,5 @@
-from .utils import pattern2url
+import numpy as np
+from .utils import pattern2url, get_rng, random_twocolor_urls, split_twocolor_urls
 from .patterns import (
     get_grid_empty,
     get_grid_pattern,
@@ -6,8 +7,7 @@ from .patterns import (
     pattern_union,
     segment_pattern,
 )
-from .geom import hflip_pattern, vflip_pattern
-import random
+from .canvas import sample_gaussian_cells, iter_gaussian_cells, cells_to_plane
 import itertools
 
 
@@ -38,25 +38,24 @@ def get_pseudo_pattern_function_map():
 # Map methods
 
 
-def bigsegment_twocolor(rows, cols, seed=None):
+def bigsegment_twocolor(rows, cols, seed=None, rng=None):
     """
     Form a map from intersecting line segments.
     """
 
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
     possible_nhseg = [3,5]
     possible_nvseg = [1,3,5]
-    gap_probability = random.random() * 0.10
+    gap_probability = rng.random() * 0.10
 
     maxdim = max(rows, cols)
 
     nhseg = 0
     nvseg = 0
     while (nhseg == 0 and nvseg == 0) or (nhseg % 2 != 0 and nvseg == 0):
-        nhseg = random.choice(possible_nhseg)
-        nvseg = random.choice(possible_nvseg)
+        nhseg = rng.choice(possible_nhseg)
+        nvseg = rng.choice(possible_nvseg)
 
     jitterx = 15
     jittery = 15
@@ -71,6 +70,7 @@ def bigsegment_twocolor(rows, cols, seed=None):
         jitterx=jitterx,
         jittery=jittery,
         gap_probability=gap_probability,
+        rng=rng,
     )
 
     pattern1_url = pattern2url(team1_pattern)
@@ -79,62 +79,28 @@ def bigsegment_twocolor(rows, cols, seed=None):
     return pattern1_url, pattern2_url
 
 
-def gaussian_twocolor(rows, cols, seed=None):
-
-    if seed is not None:
-        random.seed(seed)
+def gaussian_twocolor(rows, cols, seed=None, rng=None):
+    """
+    Make 15% of cells come alive, Gaussian normal distributed
+    about the center. Split them evenly between two colors.
+    """
+    rng = get_rng(seed, rng)
     ncells = rows * cols
-    points = set()
     nlivecells = ncells * 0.15
     centerx = cols//2
     centery = rows//2
-    while len(points) < nlivecells:
-        randx = int(random.gauss(centerx, centerx//2))
-        randy = int(random.gauss(centery, centery//2))
-        # Should be >= 0, bug
-        if (randx >= 0 and randx < cols) and (randy >= 0 and randy < rows):
-            points.add((randx, randy))
-
-    points = list(points)
-    points1 = set(points[: len(points) // 2])  # noqa
-    points2 = set(points[len(points) // 2 :])  # noqa
-    pattern1 = []
-    pattern2 = []
-    for y in range(rows):
-        row1 = []
-        row2 = []
-
-        # team 1 row
-        for x in range(cols):
-            if (x, y) in points1:
-                row1.append("o")
-            else:
-                row1.append(".")
-        row1str = "".join(row1)
-        pattern1.append(row1str)
-
-        # team 2 row
-        for x in range(cols):
-            if (x, y) in points2:
-                row2.append("o")
-            else:
-                row2.append(".")
-        row2str = "".join(row2)
-        pattern2.append(row2str)
-
-    pattern1_url = pattern2url(pattern1)
-    pattern2_url = pattern2url(pattern2)
-
-    return pattern1_url, pattern2_url
+    cells = sample_gaussian_cells(
+        rng, rows, cols, nlivecells, (centerx, centery), (centerx//2, centery//2)
+    )
+    return split_twocolor_urls(cells, cols, rng)
 
 
-def lockpickfence_twocolor(rows, cols, seed=None):
+def lockpickfence_twocolor(rows, cols, seed=None, rng=None):
     """
     Add 3 lockpick methuselahs in each corner, and separate them with line segments
     """
 
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
 
     # Make the lockpicks
@@ -142,7 +108,7 @@ def lockpickfence_twocolor(rows, cols, seed=None):
     mc = [4]
 
     team1_lockpicks, team2_lockpicks = methuselah_quadrants_pattern(
-        rows, cols, seed, methuselah_counts=mc, methuselah_names=["pseudo_lockpick_heptomino"]
+        rows, cols, seed, methuselah_counts=mc, methuselah_names=["pseudo_lockpick_heptomino"], rng=rng
     )
 
     # Make the fence
@@ -168,6 +134,7 @@ def lockpickfence_twocolor(rows, cols, seed=None):
         nvseg=nvseg,
         jitterx=jitterx,
         jittery=jittery,
+        rng=rng,
     )
 
     team1_pattern = pattern_union([team1_lockpicks, team1_fence])
@@ -179,10 +146,9 @@ def lockpickfence_twocolor(rows, cols, seed=None):
     return pattern1_url, pattern2_url
 
 
-def _methuselahgrid_twocolor(rows, cols, seed=None, dense=False):
+def _methuselahgrid_twocolor(rows, cols, seed=None, dense=False, rng=None):
 
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
     if dense:
         mc = [9, 16]
@@ -220,39 +186,38 @@ def _methuselahgrid_twocolor(rows, cols, seed=None, dense=False):
             "pseudo_t_heptomino",
         ]
 
-    if random.random() < 0.05:
+    if rng.random() < 0.05:
         # Infrequently, we pick a single methuselah pattern for every spot
-        all_meths = [random.choice(all_meths)]
+        all_meths = [rng.choice(all_meths)]
 
     team1_pattern, team2_pattern = methuselah_quadrants_pattern(
-        rows, cols, seed, methuselah_counts=mc, methuselah_names=all_meths
+        rows, cols, seed, methuselah_counts=mc, methuselah_names=all_meths, rng=rng
     )
     pattern1_url = pattern2url(team1_pattern)
     pattern2_url = pattern2url(team2_pattern)
     return pattern1_url, pattern2_url
 
 
-def methuselahdense_twocolor(rows, cols, seed=None):
+def methuselahdense_twocolor(rows, cols, seed=None, rng=None):
     """
     Create a densely-packed grid of methuselah patterns
     """
-    return _methuselahgrid_twocolor(rows, cols, seed, dense=True)
+    return _methuselahgrid_twocolor(rows, cols, seed, dense=True, rng=rng)
 
 
-def methuselahsparse_twocolor(rows, cols, seed=None):
+def methuselahsparse_twocolor(rows, cols, seed=None, rng=None):
     """
     Create a sparsely-packed grid of methuselah patterns
     """
-    return _methuselahgrid_twocolor(rows, cols, seed, dense=True)
+    return _methuselahgrid_twocolor(rows, cols, seed, dense=True, rng=rng)
 
 
-def nastynonominos_twocolor(rows, cols, seed=None):
+def nastynonominos_twocolor(rows, cols, seed=None, rng=None):
     """
     A row of nasty nonominos, with jitter and randomly oriented.
     """
 
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
     centerx = cols // 2
     centery = rows // 2
@@ -272,10 +237,10 @@ def nastynonominos_twocolor(rows, cols, seed=None):
             "pseudo_nasty_nonomino",
             rows,
             cols,
-            xoffset=centerx - random.randint(start, end),
-            yoffset=centery + random.randint(-yjitter, yjitter),
-            hflip=bool(random.getrandbits(1)),
-            vflip=bool(random.getrandbits(1)),
+            xoffset=centerx - rng.randint(start, end),
+            yoffset=centery + rng.randint(-yjitter, yjitter),
+            hflip=bool(rng.getrandbits(1)),
+            vflip=bool(rng.getrandbits(1)),
         )
         c1patterns.append(pattern1)
 
@@ -284,10 +249,10 @@ def nastynonominos_twocolor(rows, cols, seed=None):
             "pseudo_nasty_nonomino",
             rows,
             cols,
-            xoffset=centerx + random.randint(start, end),
-            yoffset=centery + random.randint(-yjitter, yjitter),
-            hflip=bool(random.getrandbits(1)),
-            vflip=bool(random.getrandbits(1)),
+            xoffset=centerx + rng.randint(start, end),
+            yoffset=centery + rng.randint(-yjitter, yjitter),
+            hflip=bool(rng.getrandbits(1)),
+            vflip=bool(rng.getrandbits(1)),
         )
         c2patterns.append(pattern2)
 
@@ -300,13 +265,12 @@ def nastynonominos_twocolor(rows, cols, seed=None):
     return pattern1_url, pattern2_url
 
 
-def stickyheptominos_twocolor(rows, cols, seed=None):
+def stickyheptominos_twocolor(rows, cols, seed=None, rng=None):
     """
     A row sticky heptominos, with jitter and randomly oriented.
     """
 
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
     centerx = cols // 2
     centery = rows // 2
@@ -325,10 +289,10 @@ def stickyheptominos_twocolor(rows, cols, seed=None):
             "pseudo_sticky_heptomino",
             rows,
             cols,
-            xoffset=centerx - random.randint(start, end),
-            yoffset=centery + random.randint(-yjitter, yjitter),
-            hflip=bool(random.getrandbits(1)),
-            vflip=bool(random.getrandbits(1)),
+            xoffset=centerx - rng.randint(start, end),
+            yoffset=centery + rng.randint(-yjitter, yjitter),
+            hflip=bool(rng.getrandbits(1)),
+            vflip=bool(rng.getrandbits(1)),
         )
         c1patterns.append(pattern1)
 
@@ -336,10 +300,10 @@ def stickyheptominos_twocolor(rows, cols, seed=None):
             "pseudo_sticky_heptomino",
             rows,
             cols,
-            xoffset=centerx + random.randint(start, end),
-            yoffset=centery + random.randint(-yjitter, yjitter),
-            hflip=bool(random.getrandbits(1)),
-            vflip=bool(random.getrandbits(1)),
+            xoffset=centerx + rng.randint(start, end),
+            yoffset=centery + rng.randint(-yjitter, yjitter),
+            hflip=bool(rng.getrandbits(1)),
+            vflip=bool(rng.getrandbits(1)),
         )
         c2patterns.append(pattern2)
 
@@ -352,24 +316,23 @@ def stickyheptominos_twocolor(rows, cols, seed=None):
     return pattern1_url, pattern2_url
 
 
-def patiolights_twocolor(rows, cols, seed=None):
+def patiolights_twocolor(rows, cols, seed=None, rng=None):
     """
     Patio lights pattern is a line segments with boxes placed randomly along the segment, like a string of lights
     """
 
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
     nsegments = 2
-    thickness = random.randint(1, 3)
+    thickness = rng.randint(1, 3)
 
     team1_pattern = get_grid_empty(rows, cols, flat=False)
     team2_pattern = get_grid_empty(rows, cols, flat=False)
 
     jitterx = 4
     jittery = 10
-    intersectys = [(j+1)*rows//(nsegments+1) + random.randint(-jittery, jittery) for j in range(nsegments)]
-    random.shuffle(intersectys)
+    intersectys = [(j+1)*rows//(nsegments+1) + rng.randint(-jittery, jittery) for j in range(nsegments)]
+    rng.shuffle(intersectys)
 
     def _get_bounds(z, dim):
         zstart = z - dim//2
@@ -395,11 +358,11 @@ def patiolights_twocolor(rows, cols, seed=None):
         b = _get_bounds(y1, thickness)
         maxy = max(b)
         miny = min(b)
-        ylightstop = miny - random.randint(2, 3)
-        ylightsbot = maxy + random.randint(2, 3)
-        ix = random.randint(4, 12)
+        ylightstop = miny - rng.randint(2, 3)
+        ylightsbot = maxy + rng.randint(2, 3)
+        ix = rng.randint(4, 12)
         while ix < cols-1:
-            if random.random() < 0.50:
+            if rng.random() < 0.50:
                 team1_pattern[ylightsbot][ix] = 'o'
                 team1_pattern[ylightsbot][ix+1] = 'o'
                 team1_pattern[ylightsbot+1][ix] = 'o'
@@ -409,17 +372,17 @@ def patiolights_twocolor(rows, cols, seed=None):
                 team1_pattern[ylightstop][ix+1] = 'o'
                 team1_pattern[ylightstop-1][ix] = 'o'
                 team1_pattern[ylightstop-1][ix+1] = 'o'
-            ix += random.randint(10, 12) + random.randint(-jitterx, jitterx)
+            ix += rng.randint(10, 12) + rng.randint(-jitterx, jitterx)
 
     for y2 in y2s:
         b = _get_bounds(y2, thickness)
         maxy = max(b)
         miny = min(b)
-        ylightstop = miny - random.randint(2, 3)
-        ylightsbot = maxy + random.randint(2, 3)
-        ix = random.randint(4, 12)
+        ylightstop = miny - rng.randint(2, 3)
+        ylightsbot = maxy + rng.randint(2, 3)
+        ix = rng.randint(4, 12)
         while ix < cols-1:
-            if random.random() < 0.50:
+            if rng.random() < 0.50:
                 team2_pattern[ylightsbot][ix] = 'o'
                 team2_pattern[ylightsbot][ix+1] = 'o'
                 team2_pattern[ylightsbot+1][ix] = 'o'
@@ -429,7 +392,7 @@ def patiolights_twocolor(rows, cols, seed=None):
                 team2_pattern[ylightstop][ix+1] = 'o'
                 team2_pattern[ylightstop-1][ix] = 'o'
                 team2_pattern[ylightstop-1][ix+1] = 'o'
-            ix += random.randint(10, 12) + random.randint(-jitterx, jitterx)
+            ix += rng.randint(10, 12) + rng.randint(-jitterx, jitterx)
 
     pattern1_url = pattern2url(team1_pattern)
     pattern2_url = pattern2url(team2_pattern)
@@ -437,84 +400,44 @@ def patiolights_twocolor(rows, cols, seed=None):
     return pattern1_url, pattern2_url
 
 
-def random_twocolor(rows, cols, seed=None):
+def random_twocolor(rows, cols, seed=None, rng=None):
     """
     Make 15% of cells come alive.
     Split them evenly between two colors.
     """
 
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
     ncells = rows * cols
     nlivecells = ncells * 0.15
-    points = set()
-    centerx = rows//2
-    centery = cols//2
-    while len(points) < nlivecells:
-        randy = random.randint(0, rows - 1)
-        randx = random.randint(0, cols - 1)
-        points.add((randx, randy))
-
-    points = list(points)
-    points1 = set(points[: len(points) // 2])  # noqa
-    points2 = set(points[len(points) // 2 :])  # noqa
-    pattern1 = []
-    pattern2 = []
-    for y in range(rows):
-        row1 = []
-        row2 = []
-
-        # team 1 row
-        for x in range(cols):
-            if (x, y) in points1:
-                row1.append("o")
-            else:
-                row1.append(".")
-        row1str = "".join(row1)
-        pattern1.append(row1str)
-
-        # team 2 row
-        for x in range(cols):
-            if (x, y) in points2:
-                row2.append("o")
-            else:
-                row2.append(".")
-        row2str = "".join(row2)
-        pattern2.append(row2str)
-
-    pattern1_url = pattern2url(pattern1)
-    pattern2_url = pattern2url(pattern2)
-
-    return pattern1_url, pattern2_url
+    return random_twocolor_urls(rows, cols, nlivecells, rng)
 
 
-def randompartition_twocolor(rows, cols, seed=None):
+def randompartition_twocolor(rows, cols, seed=None, rng=None):
 
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
     ncells = rows * cols
     nlivecells = int(ncells * 0.15)
 
     mindim = min(rows, cols)
-    nhpartitions = random.choice([1, 2, 4, 6])
-    nvpartitions = random.choice([2, 4, 8])
+    nhpartitions = rng.choice([1, 2, 4, 6])
+    nvpartitions = rng.choice([2, 4, 8])
 
     w_vpartition = cols // nvpartitions
     h_hpartition = rows // nhpartitions
 
     team1_points = set()
     while len(team1_points) < nlivecells // 2:
-        randy = random.randint(0, rows - 1)
-        randx = random.randint(0, cols - 1)
+        randy = rng.randint(0, rows - 1)
+        randx = rng.randint(0, cols - 1)
         if (randx // w_vpartition) % 2 == (randy // h_hpartition) % 2:
             team1_points.add((randx, randy))
 
     team2_points = set()
     while len(team2_points) < nlivecells // 2:
-        randy = random.randint(0, rows - 1)
-        randx = random.randint(0, cols - 1)
+        randy = rng.randint(0, rows - 1)
+        randx = rng.randint(0, cols - 1)
         if (randx // w_vpartition) % 2 != (randy // h_hpartition) % 2:
             team2_points.add((randx, randy))
 
@@ -546,22 +469,21 @@ def randompartition_twocolor(rows, cols, seed=None):
     return pattern1_url, pattern2_url
 
 
-def randomsegment_twocolor(rows, cols, seed=None):
+def randomsegment_twocolor(rows, cols, seed=None, rng=None):
 
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
     possible_nhseg = [3,5]
     possible_nvseg = [1,3,5]
-    gap_probability = random.random() * 0.10
+    gap_probability = rng.random() * 0.10
 
     maxdim = max(rows, cols)
 
     nhseg = 0
     nvseg = 0
     while (nhseg == 0 and nvseg == 0) or (nhseg % 2 != 0 and nvseg == 0):
-        nhseg = random.choice(possible_nhseg)
-        nvseg = random.choice(possible_nvseg)
+        nhseg = rng.choice(possible_nhseg)
+        nvseg = rng.choice(possible_nvseg)
 
     jitterx = 15
     jittery = 15
@@ -576,6 +498,7 @@ def randomsegment_twocolor(rows, cols, seed=None):
         jitterx=jitterx,
         jittery=jittery,
         gap_probability=gap_probability,
+        rng=rng,
     )
 
     pattern1_url = pattern2url(team1_pattern)
@@ -584,18 +507,17 @@ def randomsegment_twocolor(rows, cols, seed=None):
     return pattern1_url, pattern2_url
 
 
-def stretchydog_twocolor(rows, cols, seed=None):
+def stretchydog_twocolor(rows, cols, seed=None, rng=None):
     """
     Create a methuselah grid with 3 stretchydogs in each corner
     """
 
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
     mc = [3]
 
     team1_pattern, team2_pattern = methuselah_quadrants_pattern(
-        rows, cols, seed, methuselah_counts=mc, methuselah_names=["pseudo_stretchydog_octomino"]
+        rows, cols, seed, methuselah_counts=mc, methuselah_names=["pseudo_stretchydog_octomino"], rng=rng
     )
 
     pattern1_url = pattern2url(team1_pattern)
@@ -603,18 +525,16 @@ def stretchydog_twocolor(rows, cols, seed=None):
     return pattern1_url, pattern2_url
 
 
-def sunburst_twocolor(rows, cols, seed=None):
+def sunburst_twocolor(rows, cols, seed=None, rng=None):
     """
     Populate the grid with points that are Gaussian normal distributed
     about the center, but only if slope is positive, and with color
     determined by slope. We then reflect the points of one color,
     which creates a nice sunburst shape.
     """
-
     SMOL = 1e-12
 
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
     ncells = rows * cols
     nlivecells = ncells * 0.10
@@ -622,82 +542,72 @@ def sunburst_twocolor(rows, cols, seed=None):
     centerx = cols // 2
     centery = rows // 2
 
-    team1_points = set()
-    team2_points = set()
-
-    while (
-        len(team1_points) < nlivecells // 2
-        and
-        len(team2_points) < nlivecells // 2
-    ):
-        randx = int(random.gauss(centerx, centerx//2))
-        randy = int(random.gauss(centery, centery//2))
-
-        g = 2.5
+    g = 2.5
 
-        slope = (randy - centery)/(randx - centerx + SMOL)
+    def _slope(xs, ys):
+        return (ys - centery)/(xs - centerx + SMOL)
 
-        if slope > 0:
-
-            if slope < 1/g:
-                team2_points.add((randx, randy))
-            elif slope < 1:
-                team1_points.add((randx, randy))
-            elif slope < g:
-                team2_points.add((randx, randy))
-            else:
-                team1_points.add((randx, randy))
-
-    team1_pattern = []
-    team2_pattern = []
-    for y in range(rows):
-        team1_row = []
-        team2_row = []
-
-        for x in range(cols):
-            if (x, y) in team1_points:
-                team1_row.append("o")
-            else:
-                team1_row.append(".")
-
-            if (x, y) in team2_points:
-                team2_row.append("o")
-            else:
-                team2_row.append(".")
-
-        team1_row_str = "".join(team1_row)
-        team2_row_str = "".join(team2_row)
-        team1_pattern.append(team1_row_str)
-        team2_pattern.append(team2_row_str)
-
-    if bool(random.getrandbits(1)):
+    team1_cells = []
+    team2_cells = []
+    n1 = 0
+    n2 = 0
+    cells_iter = iter_gaussian_cells(
+        rng,
+        rows,
+        cols,
+        (centerx, centery),
+        (centerx//2, centery//2),
+        accept=lambda xs, ys: _slope(xs, ys) > 0,
+    )
+    for cells in cells_iter:
+        slope = _slope(cells % cols, cells // cols)
+        is_team1 = ((slope >= 1/g) & (slope < 1)) | (slope >= g)
+
+        # Stop at the first cell that brings either team to its share
+        c1 = n1 + np.cumsum(is_team1)
+        c2 = n2 + np.cumsum(~is_team1)
+        done = np.flatnonzero((c1 >= nlivecells // 2) | (c2 >= nlivecells // 2))
+        if done.size > 0:
+            cells = cells[:done[0] + 1]
+            is_team1 = is_team1[:done[0] + 1]
+
+        team1_cells.append(cells[is_team1])
+        team2_cells.append(cells[~is_team1])
+        n1 += team1_cells[-1].size
+        n2 += team2_cells[-1].size
+        if done.size > 0:
+            break
+
+    team1_pattern = cells_to_plane(np.concatenate(team1_cells), rows, cols)
+    team2_pattern = cells_to_plane(np.concatenate(team2_cells), rows, cols)
+
+    if bool(rng.getrandbits(1)):
         # swap
         temp = team1_pattern
         team1_pattern = team2_pattern
         team2_pattern = temp
 
-    if bool(random.getrandbits(1)):
-        team1_pattern = vflip_pattern(team1_pattern)
-        team2_pattern = vflip_pattern(team2_pattern)
+    if bool(rng.getrandbits(1)):
+        team1_pattern = team1_pattern[::-1]
+        team2_pattern = team2_pattern[::-1]
 
-    s1 = pattern2url(hflip_pattern(team1_pattern))
+    s1 = pattern2url(team1_pattern[:, ::-1])
     s2 = pattern2url(team2_pattern)
 
     return (s1, s2)
 
 
-def tripledouble_twocolor(rows, cols, seed=None):
+def tripledouble_twocolor(rows, cols, seed=None, rng=None):
     """
     Create intersecting segments that are 2-3 cells thick.
     Punch out the middle. Keep them all solid. Makes very
     interesting patterns.
     """
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
-    thickness = random.randint(2, 4)
+    thickness = rng.randint(2, 4)
 
-    if random.random() < 0.33:
+    if rng.random() < 0.33:
         nsegments = 4
         jitterx = 6
         jittery = 6
@@ -706,11 +616,11 @@ def tripledouble_twocolor(rows, cols, seed=None):
         jitterx = 15
         jittery = 15
 
-    intersectxs = [(i+1)*cols//(nsegments+1) + random.randint(-jitterx, jitterx) for i in range(nsegments)]
-    intersectys = [(j+1)*rows//(nsegments+1) + random.randint(-jittery, jittery) for j in range(nsegments)]
+    intersectxs = [(i+1)*cols//(nsegments+1) + rng.randint(-jitterx, jitterx) for i in range(nsegments)]
+    intersectys = [(j+1)*rows//(nsegments+1) + rng.randint(-jittery, jittery) for j in range(nsegments)]
 
-    random.shuffle(intersectxs)
-    random.shuffle(intersectys)
+    rng.shuffle(intersectxs)
+    rng.shuffle(intersectys)
 
     team1_pattern = get_grid_empty(rows, cols, flat=False)
     team2_pattern = get_grid_empty(rows, cols, flat=False)
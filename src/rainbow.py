@@ -3,8 +3,8 @@ import itertools
 from operator import itemgetter
 import json
 import os
-import random
-from .geom import hflip_pattern, vflip_pattern, rot_pattern
+import numpy as np
+from .geom import hflip_pattern, rot_pattern
 from .patterns import (
     get_pattern_size,
     get_pattern_livecount,
@@ -14,9 +14,12 @@ from .patterns import (
     methuselah_quadrants_pattern,
     pattern_union,
     cloud_region,
+    get_min_safe_dimension,
 )
-from .utils import pattern2url, retry_on_failure
+from .utils import pattern2url, retry_on_failure, get_rng, min_dimensions
 from .error import GollyXPatternsError, GollyXMapsError
+from .canvas import sample_gaussian_cells, cells_to_plane
+from .expression import get_expression_mask, shuffle_cells, deal_cells
 
 
 ##############
@@ -44,10 +47,9 @@ def get_rainbow_pattern_function_map():
     }
 
 
-def rainbow_jitteryrow_pattern(rows, cols, seed=None, methuselah=None, spacing=None):
+def rainbow_jitteryrow_pattern(rows, cols, seed=None, methuselah=None, spacing=None, rng=None):
 
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
     # L is a characteristic length scale
     if spacing is None:
@@ -69,7 +71,7 @@ def rainbow_jitteryrow_pattern(rows, cols, seed=None, methuselah=None, spacing=N
     maxshapes = 4 * maxshapesperteam
 
     team_assignments = [0, 1, 2, 3]
-    random.shuffle(team_assignments)
+    rng.shuffle(team_assignments)
 
     rotdegs = [0, 90, 180, 270]
 
@@ -93,11 +95,11 @@ def rainbow_jitteryrow_pattern(rows, cols, seed=None, methuselah=None, spacing=N
             methuselah,
             rows,
             cols,
-            xoffset=centerx - centerx // 2 - random.randint(start, end),
-            yoffset=centery + random.randint(-L, L),
-            hflip=bool(random.getrandbits(1)),
-            vflip=bool(random.getrandbits(1)),
-            rotdeg=random.choice(rotdegs),
+            xoffset=centerx - centerx // 2 - rng.randint(start, end),
+            yoffset=centery + rng.randint(-L, L),
+            hflip=bool(rng.getrandbits(1)),
+            vflip=bool(rng.getrandbits(1)),
+            rotdeg=rng.choice(rotdegs),
         )
         team_ix = team_assignments[0]
 
@@ -110,11 +112,11 @@ def rainbow_jitteryrow_pattern(rows, cols, seed=None, methuselah=None, spacing=N
             methuselah,
             rows,
             cols,
-            xoffset=centerx - random.randint(start, end),
-            yoffset=centery + random.randint(-L, L),
-            hflip=bool(random.getrandbits(1)),
-            vflip=bool(random.getrandbits(1)),
-            rotdeg=random.choice(rotdegs),
+            xoffset=centerx - rng.randint(start, end),
+            yoffset=centery + rng.randint(-L, L),
+            hflip=bool(rng.getrandbits(1)),
+            vflip=bool(rng.getrandbits(1)),
+            rotdeg=rng.choice(rotdegs),
         )
         team_ix = team_assignments[1]
 
@@ -127,11 +129,11 @@ def rainbow_jitteryrow_pattern(rows, cols, seed=None, methuselah=None, spacing=N
             methuselah,
             rows,
             cols,
-            xoffset=centerx + random.randint(start, end),
-            yoffset=centery + random.randint(-L, L),
-            hflip=bool(random.getrandbits(1)),
-            vflip=bool(random.getrandbits(1)),
-            rotdeg=random.choice(rotdegs),
+            xoffset=centerx + rng.randint(start, end),
+            yoffset=centery + rng.randint(-L, L),
+            hflip=bool(rng.getrandbits(1)),
+            vflip=bool(rng.getrandbits(1)),
+            rotdeg=rng.choice(rotdegs),
         )
         team_ix = team_assignments[2]
 
@@ -144,11 +146,11 @@ def rainbow_jitteryrow_pattern(rows, cols, seed=None, methuselah=None, spacing=N
             methuselah,
             rows,
             cols,
-            xoffset=centerx + centerx // 2 + random.randint(start, end),
-            yoffset=centery + random.randint(-L, L),
-            hflip=bool(random.getrandbits(1)),
-            vflip=bool(random.getrandbits(1)),
-            rotdeg=random.choice(rotdegs),
+            xoffset=centerx + centerx // 2 + rng.randint(start, end),
+            yoffset=centery + rng.randint(-L, L),
+            hflip=bool(rng.getrandbits(1)),
+            vflip=bool(rng.getrandbits(1)),
+            rotdeg=rng.choice(rotdegs),
         )
         team_ix = team_assignments[3]
 
@@ -161,7 +163,7 @@ def rainbow_jitteryrow_pattern(rows, cols, seed=None, methuselah=None, spacing=N
 
 
 def rainbow_methuselah_quadrants_pattern(
-    rows, cols, seed=None, methuselah_counts=None, fixed_methuselah=None
+    rows, cols, seed=None, methuselah_counts=None, fixed_methuselah=None, rng=None
 ):
     """
     Add methuselahs to each quadrant.
@@ -175,8 +177,7 @@ def rainbow_methuselah_quadrants_pattern(
     can specify 1 methuselah per quadrant, etc.
     """
     # set rng seed (optional)
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
     small_methuselah_names = [
         "bheptomino",
@@ -239,7 +240,7 @@ def rainbow_methuselah_quadrants_pattern(
     all_methuselahs = []
 
     for iq, quad in enumerate(quadrants):
-        count = random.choice(methuselah_counts)
+        count = rng.choice(methuselah_counts)
 
         if count == 1:
 
@@ -250,10 +251,10 @@ def rainbow_methuselah_quadrants_pattern(
 
             corner = quadrants[iq][1]
 
-            y = corner[0] + rows // 4 + random.randint(-jittery, jittery)
-            x = corner[1] + cols // 4 + random.randint(-jitterx, jitterx)
+            y = corner[0] + rows // 4 + rng.randint(-jittery, jittery)
+            x = corner[1] + cols // 4 + rng.randint(-jitterx, jitterx)
 
-            meth = random.choice(methuselah_names)
+            meth = rng.choice(methuselah_names)
 
             pattern = get_grid_pattern(
                 meth,
@@ -261,9 +262,9 @@ def rainbow_methuselah_quadrants_pattern(
                 cols,
                 xoffset=x,
                 yoffset=y,
-                hflip=bool(random.getrandbits(1)),
-                vflip=bool(random.getrandbits(1)),
-                rotdeg=random.choice(rotdegs),
+                hflip=bool(rng.getrandbits(1)),
+                vflip=bool(rng.getrandbits(1)),
+                rotdeg=rng.choice(rotdegs),
             )
             livecount = get_pattern_livecount(meth)
             all_methuselahs.append((livecount, pattern))
@@ -286,7 +287,7 @@ def rainbow_methuselah_quadrants_pattern(
             nslices = 2
             nparts = nslices + 1
 
-            posdiag = bool(random.getrandbits(1))
+            posdiag = bool(rng.getrandbits(1))
 
             for a in range(1, nparts):
                 for b in range(1, nparts):
@@ -304,15 +305,15 @@ def rainbow_methuselah_quadrants_pattern(
                         y = (
                             corner[0]
                             + a * ((rows // 2) // nparts)
-                            + random.randint(-jittery, jittery)
+                            + rng.randint(-jittery, jittery)
                         )
                         x = (
                             corner[1]
                             + b * ((cols // 2) // nparts)
-                            + random.randint(-jitterx, jitterx)
+                            + rng.randint(-jitterx, jitterx)
                         )
 
-                        meth = random.choice(methuselah_names)
+                        meth = rng.choice(methuselah_names)
 
                         try:
                             pattern = get_grid_pattern(
@@ -321,9 +322,9 @@ def rainbow_methuselah_quadrants_pattern(
                                 cols,
                                 xoffset=x,
                                 yoffset=y,
-                                hflip=bool(random.getrandbits(1)),
-                                vflip=bool(random.getrandbits(1)),
-                                rotdeg=random.choice(rotdegs),
+                                hflip=bool(rng.getrandbits(1)),
+                                vflip=bool(rng.getrandbits(1)),
+                                rotdeg=rng.choice(rotdegs),
                             )
                         except GollyXPatternsError:
                             raise GollyXPatternsError(
@@ -361,15 +362,15 @@ def rainbow_methuselah_quadrants_pattern(
                         y = (
                             corner[0]
                             + a * ((rows // 2) // nslices)
-                            + random.randint(-jittery, jittery)
+                            + rng.randint(-jittery, jittery)
                         )
                         x = (
                             corner[1]
                             + b * ((cols // 2) // nslices)
-                            + random.randint(-jitterx, jitterx)
+                            + rng.randint(-jitterx, jitterx)
                         )
 
-                        meth = random.choice(methuselah_names)
+                        meth = rng.choice(methuselah_names)
 
                         try:
                             pattern = get_grid_pattern(
@@ -378,9 +379,9 @@ def rainbow_methuselah_quadrants_pattern(
                                 cols,
                                 xoffset=x,
                                 yoffset=y,
-                                hflip=bool(random.getrandbits(1)),
-                                vflip=bool(random.getrandbits(1)),
-                                rotdeg=random.choice(rotdegs),
+                                hflip=bool(rng.getrandbits(1)),
+                                vflip=bool(rng.getrandbits(1)),
+                                rotdeg=rng.choice(rotdegs),
                             )
                         except GollyXPatternsError:
                             raise GollyXPatternsError(
@@ -405,15 +406,15 @@ def rainbow_methuselah_quadrants_pattern(
                     y = (
                         corner[0]
                         + a * ((rows // 2) // nslices)
-                        + random.randint(-jittery, jittery)
+                        + rng.randint(-jittery, jittery)
                     )
                     x = (
                         corner[1]
                         + b * ((cols // 2) // nslices)
-                        + random.randint(-jitterx, jitterx)
+                        + rng.randint(-jitterx, jitterx)
                     )
 
-                    meth = random.choice(methuselah_names)
+                    meth = rng.choice(methuselah_names)
 
                     try:
                         pattern = get_grid_pattern(
@@ -422,9 +423,9 @@ def rainbow_methuselah_quadrants_pattern(
                             cols,
                             xoffset=x,
                             yoffset=y,
-                            hflip=bool(random.getrandbits(1)),
-                            vflip=bool(random.getrandbits(1)),
-                            rotdeg=random.choice(rotdegs),
+                            hflip=bool(rng.getrandbits(1)),
+                            vflip=bool(rng.getrandbits(1)),
+                            rotdeg=rng.choice(rotdegs),
                         )
                     except GollyXPatternsError:
                         raise GollyXPatternsError(
@@ -433,7 +434,7 @@ def rainbow_methuselah_quadrants_pattern(
                     livecount = get_pattern_livecount(meth)
                     all_methuselahs.append((livecount, pattern))
 
-    random.shuffle(all_methuselahs)
+    rng.shuffle(all_methuselahs)
 
     # Sort by number of live cells
     all_methuselahs.sort(key=itemgetter(0), reverse=True)
@@ -471,7 +472,7 @@ def rainbow_methuselah_quadrants_pattern(
 # Map methods
 
 
-def random_fourcolor(rows, cols, seed=None):
+def random_fourcolor(rows, cols, seed=None, rng=None):
     """
     Generate a random four-color list life initialization.
 
@@ -483,18 +484,17 @@ def random_fourcolor(rows, cols, seed=None):
     convert to list, split in four. Use those
     point sets to create listLife URL strings.
     """
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
-    density = random.randint(8, 18) / 100.0
+    density = rng.randint(8, 18) / 100.0
 
     ncells = rows * cols
     nlivecells = 4 * ((density * ncells) // 4)
 
     points = set()
     while len(points) < nlivecells:
-        randy = random.randint(0, rows - 1)
-        randx = random.randint(0, cols - 1)
+        randy = rng.randint(0, rows - 1)
+        randx = rng.randint(0, cols - 1)
         points.add((randx, randy))
 
     points = list(points)
@@ -529,21 +529,19 @@ def random_fourcolor(rows, cols, seed=None):
 
 
 @retry_on_failure
-def randommethuselahs_fourcolor(rows, cols, seed=None):
+def randommethuselahs_fourcolor(rows, cols, seed=None, rng=None):
 
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
-    patterns = rainbow_methuselah_quadrants_pattern(rows, cols, seed)
+    patterns = rainbow_methuselah_quadrants_pattern(rows, cols, seed, rng=rng)
     result = (pattern2url(pat) for pat in patterns)
     return result
 
 
 @retry_on_failure
-def orchard_fourcolor(rows, cols, seed=None):
+def orchard_fourcolor(rows, cols, seed=None, rng=None):
 
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
     mindim = min(rows, cols)
     if mindim < 150:
@@ -551,35 +549,33 @@ def orchard_fourcolor(rows, cols, seed=None):
     else:
         mc = [4, 9, 16]
 
-    count = random.choice(mc)
+    count = rng.choice(mc)
     patterns = rainbow_methuselah_quadrants_pattern(
-        rows, cols, seed, methuselah_counts=[count], fixed_methuselah="acorn"
+        rows, cols, seed, methuselah_counts=[count], fixed_methuselah="acorn", rng=rng
     )
     urls = (pattern2url(p) for p in patterns)
     return urls
 
 
 @retry_on_failure
-def justyna_fourcolor(rows, cols, seed=None):
+def justyna_fourcolor(rows, cols, seed=None, rng=None):
 
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
     mc = [1]
 
-    count = random.choice(mc)
+    count = rng.choice(mc)
     patterns = rainbow_methuselah_quadrants_pattern(
-        rows, cols, seed, methuselah_counts=[count], fixed_methuselah="justyna"
+        rows, cols, seed, methuselah_counts=[count], fixed_methuselah="justyna", rng=rng
     )
     urls = (pattern2url(p) for p in patterns)
     return urls
 
 
 @retry_on_failure
-def rabbits_fourcolor(rows, cols, seed=None):
+def rabbits_fourcolor(rows, cols, seed=None, rng=None):
 
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
     mindim = min(rows, cols)
     if mindim < 150:
@@ -587,35 +583,35 @@ def rabbits_fourcolor(rows, cols, seed=None):
     else:
         mc = [1, 2, 3]
 
-    count = random.choice(mc)
+    count = rng.choice(mc)
     patterns = rainbow_methuselah_quadrants_pattern(
-        rows, cols, seed, methuselah_counts=[count], fixed_methuselah="rabbit"
+        rows, cols, seed, methuselah_counts=[count], fixed_methuselah="rabbit", rng=rng
     )
     urls = (pattern2url(p) for p in patterns)
     return urls
 
 
 @retry_on_failure
-def multum_fourcolor(rows, cols, seed=None):
+def multum_fourcolor(rows, cols, seed=None, rng=None):
 
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
     mindim = min(rows, cols)
     if mindim < 150:
         mc = [1, 2]
     else:
         mc = [2, 3, 4]
-    count = random.choice(mc)
+    count = rng.choice(mc)
     patterns = rainbow_methuselah_quadrants_pattern(
-        rows, cols, seed, methuselah_counts=[count], fixed_methuselah="multuminparvo"
+        rows, cols, seed, methuselah_counts=[count], fixed_methuselah="multuminparvo", rng=rng
     )
     urls = (pattern2url(p) for p in patterns)
     return urls
 
 
 @retry_on_failure
-def eightx_fourcolor(rows, cols, seed=None):
+def eightx_fourcolor(rows, cols, seed=None, rng=None):
+    rng = get_rng(seed, rng)
     fmap = {
         "eightb": _eightb_fourcolor,
         "eightc": _eightc_fourcolor,
@@ -623,72 +619,66 @@ def eightx_fourcolor(rows, cols, seed=None):
         "eightr": _eightr_fourcolor,
         "eightpi": _eightpi_fourcolor,
     }
-    k = random.choice(list(fmap.keys()))
-    return fmap[k](rows, cols, seed)
+    k = rng.choice(list(fmap.keys()))
+    return fmap[k](rows, cols, seed, rng=rng)
 
 
-def _eightb_fourcolor(rows, cols, seed=None):
+def _eightb_fourcolor(rows, cols, seed=None, rng=None):
 
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
-    patterns = rainbow_jitteryrow_pattern(rows, cols, seed, "bheptomino")
+    patterns = rainbow_jitteryrow_pattern(rows, cols, seed, "bheptomino", rng=rng)
     urls = (pattern2url(p) for p in patterns)
     return urls
 
 
-def _eightc_fourcolor(rows, cols, seed=None):
+def _eightc_fourcolor(rows, cols, seed=None, rng=None):
 
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
-    patterns = rainbow_jitteryrow_pattern(rows, cols, seed, "cheptomino")
+    patterns = rainbow_jitteryrow_pattern(rows, cols, seed, "cheptomino", rng=rng)
     urls = (pattern2url(p) for p in patterns)
     return urls
 
 
-def _eighte_fourcolor(rows, cols, seed=None):
+def _eighte_fourcolor(rows, cols, seed=None, rng=None):
 
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
-    patterns = rainbow_jitteryrow_pattern(rows, cols, seed, "eheptomino", spacing=7)
+    patterns = rainbow_jitteryrow_pattern(rows, cols, seed, "eheptomino", spacing=7, rng=rng)
     urls = (pattern2url(p) for p in patterns)
     return urls
 
 
-def _eightpi_fourcolor(rows, cols, seed=None):
+def _eightpi_fourcolor(rows, cols, seed=None, rng=None):
 
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
-    patterns = rainbow_jitteryrow_pattern(rows, cols, seed, "piheptomino")
+    patterns = rainbow_jitteryrow_pattern(rows, cols, seed, "piheptomino", rng=rng)
     urls = (pattern2url(p) for p in patterns)
     return urls
 
 
-def _eightr_fourcolor(rows, cols, seed=None):
+def _eightr_fourcolor(rows, cols, seed=None, rng=None):
 
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
-    patterns = rainbow_jitteryrow_pattern(rows, cols, seed, "rpentomino")
+    patterns = rainbow_jitteryrow_pattern(rows, cols, seed, "rpentomino", rng=rng)
     urls = (pattern2url(p) for p in patterns)
     return urls
 
 
 @retry_on_failure
-def patiolights_fourcolor(rows, cols, seed=None):
+def patiolights_fourcolor(rows, cols, seed=None, rng=None):
     """
     Patio lights pattern is a line segments with boxes placed randomly along the segment, like a string of lights
     """
 
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
     urls = []
 
-    thickness = random.randint(2, 3)
+    thickness = rng.randint(2, 3)
 
     nteams = 4
 
@@ -697,12 +687,12 @@ def patiolights_fourcolor(rows, cols, seed=None):
     # Place the light strings at the slices
     jittery = 5
     lightstring_ys = [
-        ((i + 1) * rows) // (nteams + 1) + random.randint(-jittery, jittery)
+        ((i + 1) * rows) // (nteams + 1) + rng.randint(-jittery, jittery)
         for i in range(nteams)
     ]
 
     # Randomize order of light string team assignments
-    random.shuffle(lightstring_ys)
+    rng.shuffle(lightstring_ys)
 
     # I dunno
     def _get_bounds(z, dim):
@@ -731,11 +721,11 @@ def patiolights_fourcolor(rows, cols, seed=None):
         bounds = (lightstring_y - 1, lightstring_y + thickness)
         maxy = max(bounds)
         miny = min(bounds)
-        ylightstop = miny - random.randint(2, 3)
-        ylightsbot = maxy + random.randint(2, 3)
-        ix = random.randint(4, 12)
+        ylightstop = miny - rng.randint(2, 3)
+        ylightsbot = maxy + rng.randint(2, 3)
+        ix = rng.randint(4, 12)
         while ix < cols - 1:
-            if random.random() < 0.50:
+            if rng.random() < 0.50:
                 team_pattern[ylightsbot][ix] = "o"
                 team_pattern[ylightsbot][ix + 1] = "o"
                 team_pattern[ylightsbot + 1][ix] = "o"
@@ -745,7 +735,7 @@ def patiolights_fourcolor(rows, cols, seed=None):
                 team_pattern[ylightstop][ix + 1] = "o"
                 team_pattern[ylightstop - 1][ix] = "o"
                 team_pattern[ylightstop - 1][ix + 1] = "o"
-            ix += random.randint(10, 12) + random.randint(-jitterx, jitterx)
+            ix += rng.randint(10, 12) + rng.randint(-jitterx, jitterx)
 
         pattern_url = pattern2url(team_pattern)
         urls.append(pattern_url)
@@ -754,24 +744,23 @@ def patiolights_fourcolor(rows, cols, seed=None):
 
 
 @retry_on_failure
-def rainbow_fourcolor(rows, cols, seed=None):
-    return _rainburst_fourcolor(rows, cols, seed, sunburst=False)
+def rainbow_fourcolor(rows, cols, seed=None, rng=None):
+    return _rainburst_fourcolor(rows, cols, seed, sunburst=False, rng=rng)
 
 
 @retry_on_failure
-def sunburst_fourcolor(rows, cols, seed=None):
-    return _rainburst_fourcolor(rows, cols, seed, sunburst=True)
+def sunburst_fourcolor(rows, cols, seed=None, rng=None):
+    return _rainburst_fourcolor(rows, cols, seed, sunburst=True, rng=rng)
 
 
-def _rainburst_fourcolor(rows, cols, seed=None, sunburst=False):
+def _rainburst_fourcolor(rows, cols, seed=None, sunburst=False, rng=None):
     """
     Create a Gaussian normal distribution in the top left and bottom right quadrants,
     then slice it into radial pieces, which makes a nice rainbow shape.
     """
     SMOL = 1e-12
 
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
     # Algorithm:
     # set the slope
@@ -781,7 +770,7 @@ def _rainburst_fourcolor(rows, cols, seed=None, sunburst=False):
     # if slope < g: C
     # else: D
 
-    density = random.randint(8, 18)/100.0
+    density = rng.randint(8, 18)/100.0
 
     nteams = 4
     ncells = rows * cols
@@ -802,67 +791,71 @@ def _rainburst_fourcolor(rows, cols, seed=None, sunburst=False):
         g,
     ]
 
+    # Slope bounds of each team's wedge (the last one is unbounded)
+    wedges = [
+        (slope_checks[0], slope_checks[1]),
+        (slope_checks[1], slope_checks[2]),
+        (slope_checks[2], slope_checks[3]),
+        (slope_checks[3], math.inf),
+    ]
+
     urls = []
-        
+
     for iteam in range(nteams):
-        team_points = set()
-
-        while len(team_points) < npointsperteam:
-            randx = int(random.gauss(centerx, centerx // 2))
-            randy = int(random.gauss(centery, centery // 2))
-
-            slope = (randy - centery) / (randx - centerx + SMOL)
-
-            if iteam==0:
-                if slope > slope_checks[iteam] and slope < slope_checks[iteam+1]:
-                    team_points.add((randx, randy))
-            elif iteam==1:
-                if slope > slope_checks[iteam] and slope < slope_checks[iteam+1]:
-                    team_points.add((randx, randy))
-            elif iteam==2:
-                if slope > slope_checks[iteam] and slope < slope_checks[iteam+1]:
-                    team_points.add((randx, randy))
-            elif iteam==3:
-                if slope > slope_checks[iteam]:
-                    team_points.add((randx, randy))
-
-        team_pattern = []
-        for y in range(rows):
-            team_row = []
-            for x in range(cols):
-                if (x, y) in team_points:
-                    team_row.append("o")
-                else:
-                    team_row.append(".")
+        lo, hi = wedges[iteam]
 
-            team_row_str = "".join(team_row)
-            team_pattern.append(team_row_str)
+        def _in_wedge(xs, ys):
+            slope = (ys - centery) / (xs - centerx + SMOL)
+            return (slope > lo) & (slope < hi)
+
+        team_cells = sample_gaussian_cells(
+            rng, rows, cols, npointsperteam, (centerx, centery), (centerx // 2, centery // 2), accept=_in_wedge
+        )
+        team_pattern = cells_to_plane(team_cells, rows, cols)
 
         if sunburst and iteam%2==0:
-            team_pattern = vflip_pattern(team_pattern)
+            team_pattern = team_pattern[::-1]
 
         team_url = pattern2url(team_pattern)
         urls.append(team_url)
 
-    random.shuffle(urls)
+    rng.shuffle(urls)
 
     return tuple(urls)
 
 
+def _timebomb_fourcolor_min_dimensions(revenge):
+    # The geometry of _timebomb_fourcolor(): oscillators at L, timebombs at 2L from the center.
+    # Both are rotated at random, so either side can lie along either axis.
+    L = 20
+    if revenge:
+        oscillators = ["airforce", "koksgalaxy", "dinnertable", "vring64", "harbor"]
+    else:
+        oscillators = ["quadrupleburloaferimeter"]
+    osc_extents = [e for osc in oscillators for e in get_pattern_size(osc)]
+    bomb_extents = get_pattern_size("timebomb")
+    dimension = get_min_safe_dimension(
+        [(e, lambda n, a=a: n // 2 + a * L, (-3, 3)) for e in osc_extents for a in [-1, 1]]
+        + [(e, lambda n, a=a: n // 2 + 2 * a * L, (-6, 6)) for e in bomb_extents for a in [-1, 1]]
+    )
+    return (dimension, dimension)
+
+
+@min_dimensions(lambda: _timebomb_fourcolor_min_dimensions(revenge=False))
 @retry_on_failure
-def timebomb_fourcolor(rows, cols, seed=None):
-    return _timebomb_fourcolor(rows, cols, revenge=False, seed=seed)
+def timebomb_fourcolor(rows, cols, seed=None, rng=None):
+    return _timebomb_fourcolor(rows, cols, revenge=False, seed=seed, rng=rng)
 
 
+@min_dimensions(lambda: _timebomb_fourcolor_min_dimensions(revenge=True))
 @retry_on_failure
-def timebomb2_fourcolor(rows, cols, seed=None):
-    return _timebomb_fourcolor(rows, cols, revenge=True, seed=seed)
+def timebomb2_fourcolor(rows, cols, seed=None, rng=None):
+    return _timebomb_fourcolor(rows, cols, revenge=True, seed=seed, rng=rng)
 
 
-def _timebomb_fourcolor(rows, cols, revenge, seed=None):
+def _timebomb_fourcolor(rows, cols, revenge, seed=None, rng=None):
 
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
     mindim = min(rows, cols)
 
@@ -875,12 +868,12 @@ def _timebomb_fourcolor(rows, cols, revenge, seed=None):
     # Each team gets one oscillator and one timebomb
     nteams = 4
     team_assignments = list(range(nteams))
-    random.shuffle(team_assignments)
+    rng.shuffle(team_assignments)
 
     def _get_oscillator_name():
         if revenge:
             oscillators = ["airforce", "koksgalaxy", "dinnertable", "vring64", "harbor"]
-            which_oscillator = random.choice(oscillators)
+            which_oscillator = rng.choice(oscillators)
         else:
             which_oscillator = "quadrupleburloaferimeter"
         return which_oscillator
@@ -924,18 +917,18 @@ def _timebomb_fourcolor(rows, cols, revenge, seed=None):
             _get_oscillator_name(),
             rows,
             cols,
-            xoffset=osc_x + random.randint(-osc_jitter_x, osc_jitter_x),
-            yoffset=osc_y + random.randint(-osc_jitter_y, osc_jitter_y),
-            rotdeg=random.choice(rotdegs),
+            xoffset=osc_x + rng.randint(-osc_jitter_x, osc_jitter_x),
+            yoffset=osc_y + rng.randint(-osc_jitter_y, osc_jitter_y),
+            rotdeg=rng.choice(rotdegs),
         )
 
         bomb_pattern = get_grid_pattern(
             "timebomb",
             rows,
             cols,
-            xoffset=bomb_x + random.randint(-timebomb_jitter_x, timebomb_jitter_x),
-            yoffset=bomb_y + random.randint(-timebomb_jitter_y, timebomb_jitter_y),
-            rotdeg=random.choice(rotdegs),
+            xoffset=bomb_x + rng.randint(-timebomb_jitter_x, timebomb_jitter_x),
+            yoffset=bomb_y + rng.randint(-timebomb_jitter_y, timebomb_jitter_y),
+            rotdeg=rng.choice(rotdegs),
         )
 
         team_pattern = pattern_union([osc_pattern, bomb_pattern])
@@ -947,10 +940,23 @@ def _timebomb_fourcolor(rows, cols, revenge, seed=None):
     return tuple(urls)
 
 
-def crabs_fourcolor(rows, cols, seed=None):
+def _crabs_fourcolor_min_dimensions():
+    # Crabs are rotated at random, so either side can lie along either axis
+    extents = get_pattern_size("crabstretcher")
+    jitter = 1
+    rows = get_min_safe_dimension(
+        [(e, lambda n, k=k: k * n // 4, (-jitter, jitter)) for e in extents for k in [1, 3]]
+    )
+    columns = get_min_safe_dimension(
+        [(e, lambda n, k=k: k * n // 5, (-jitter, jitter)) for e in extents for k in range(1, 5)]
+    )
+    return (rows, columns)
+
 
-    if seed is not None:
-        random.seed(seed)
+@min_dimensions(_crabs_fourcolor_min_dimensions)
+def crabs_fourcolor(rows, cols, seed=None, rng=None):
+
+    rng = get_rng(seed, rng)
 
     rotdegs = [0, 90, 180, 270]
 
@@ -962,15 +968,15 @@ def crabs_fourcolor(rows, cols, seed=None):
 
     nteams = 4
     team_assignments = list(range(nteams))
-    random.shuffle(team_assignments)
+    rng.shuffle(team_assignments)
 
     crab_patterns = [[], [], [], []]
 
     for i, (centerx, centery) in enumerate(itertools.product(centerxs, centerys)):
         imod4 = i%4
 
-        crabcenterx = centerx + random.randint(-jitter, jitter)
-        crabcentery = centery + random.randint(-jitter, jitter)
+        crabcenterx = centerx + rng.randint(-jitter, jitter)
+        crabcentery = centery + rng.randint(-jitter, jitter)
 
         crab = get_grid_pattern(
             "crabstretcher",
@@ -978,9 +984,9 @@ def crabs_fourcolor(rows, cols, seed=None):
             cols,
             xoffset=crabcenterx,
             yoffset=crabcentery,
-            hflip=(random.random() < 0.5),
-            vflip=(random.random() < 0.5),
-            rotdeg=random.choice(rotdegs),
+            hflip=(rng.random() < 0.5),
+            vflip=(rng.random() < 0.5),
+            rotdeg=rng.choice(rotdegs),
         )
         team_ix = team_assignments[imod4]
         team_pattern = crab_patterns[team_ix]
@@ -991,170 +997,135 @@ def crabs_fourcolor(rows, cols, seed=None):
     urls = [pattern2url(pu) for pu in pattern_unions]
     return tuple(urls)
 
-def quadgaussian_fourcolor(rows, cols, seed=None):
 
-    if seed is not None:
-        random.seed(seed)
+def quadgaussian_fourcolor(rows, cols, seed=None, rng=None):
+    rng = get_rng(seed, rng)
 
     # Lower bound of 0.10, upper bound of 0.15
-    density = 0.10 + random.random() * 0.05
+    density = 0.10 + rng.random() * 0.05
 
     ncells = rows * cols
     nlivecells = ((ncells * density)//4)*4
     nlivecellspt = nlivecells // 4
 
     # Variable blobbiness
-    stdx = cols// random.randint(8, 16)
-    stdy = rows// random.randint(8, 16)
+    stdx = cols // rng.randint(8, 16)
+    stdy = rows // rng.randint(8, 16)
 
     jitter = 5
 
     nteams = 4
     team_assignments = list(range(nteams))
-    random.shuffle(team_assignments)
+    rng.shuffle(team_assignments)
 
     centerxs = [cols//4, 3*cols//4] 
     centerys = [rows//4, 3*rows//4]
 
     urls = [None, None, None, None]
 
-    master_points = set()
+    # Flat bitmap of the cells taken by any team
+    master_cells = np.zeros(rows * cols, dtype=bool)
     for i, (centerx, centery) in enumerate(itertools.product(centerxs, centerys)):
 
         team_ix = team_assignments[i]
 
-        cx = centerx + random.randint(-jitter, jitter)
-        cy = centery + random.randint(-jitter, jitter)
+        cx = centerx + rng.randint(-jitter, jitter)
+        cy = centery + rng.randint(-jitter, jitter)
 
-        team_points = set()
-        while len(team_points) < nlivecellspt:
-            randx = int(random.gauss(cx, stdx))
-            randy = int(random.gauss(cy, stdy))
-            if (randx >= 0 and randx < cols) and (randy >= 0 and randy < rows):
-                if (randx, randy) not in master_points:
-                    team_points.add((randx, randy))
-                    master_points.add((randx, randy))
+        team_cells = sample_gaussian_cells(
+            rng, rows, cols, nlivecellspt, (cx, cy), (stdx, stdy), occupied=master_cells
+        )
+        urls[team_ix] = pattern2url(cells_to_plane(team_cells, rows, cols))
 
-        # Assemble the circle dot diagram for team
-        team_pattern = []
-        for y in range(rows):
-            this_row = []
-            for x in range(cols):
-                if (x, y) in team_points:
-                    this_row.append("o")
-                else:
-                    this_row.append(".")
-            this_rowstr = "".join(this_row)
-            team_pattern.append(this_rowstr)
+    return tuple(urls)
 
-        team_url = pattern2url(team_pattern)
-        urls[team_ix] = team_url
 
-    return tuple(urls)
+# The parameters that rainbowmath_fourcolor draws each expression form with
+RAINBOWMATH_SQUARES_PS = [k*k for k in [5, 7, 9, 11]]
+RAINBOWMATH_BOX_AS = [3, 4, 5]
+RAINBOWMATH_LARGE_BOX_AS = [9, 10, 11]
+RAINBOWMATH_BOX_CS = [16, 18, 20, 22]
+RAINBOWMATH_AND_PS = [7, 11, 13, 15, 35, 37]
+RAINBOWMATH_DIV_XOR_PS = [81, 83, 85, 87, 89, 91, 93, 95, 97, 99]
+RAINBOWMATH_SQUARE_DIV_PS = [69, 99, 299, 699, 999]
+
+
+def get_rainbowmath_catalog():
+    """
+    Return every (form, params) of expression that rainbowmath_fourcolor can draw
+    """
+    entries = [("prime_squares_and", dict(p=p)) for p in RAINBOWMATH_SQUARES_PS]
+    entries += [
+        ("box_xor", dict(a=a, c=c, p=7))
+        for a in RAINBOWMATH_BOX_AS + RAINBOWMATH_LARGE_BOX_AS
+        for c in RAINBOWMATH_BOX_CS
+    ]
+    entries += [("and", dict(p=p)) for p in RAINBOWMATH_AND_PS]
+    entries += [("powmod_and", dict(a=3, b=3, p=99))]
+    entries += [("prime_scaled_and", dict(a=a, b=b, p=99)) for a in range(1, 11) for b in range(1, 11)]
+    entries += [("prime_div_xor", dict(p=p)) for p in RAINBOWMATH_DIV_XOR_PS]
+    entries += [("prime_square_div", dict(p=p)) for p in RAINBOWMATH_SQUARE_DIV_PS]
+    return entries
 
 
 #@retry_on_failure
-def rainbowmath_fourcolor(rows, cols, seed=None):
-
-    if seed is not None:
-        random.seed(seed)
-
-    def is_prime(n):
-        n = abs(n)
-        if n == 2 or n == 3: return True
-        if n < 2 or n%2 == 0: return False
-        if n < 9: return True
-        if n%3 == 0: return False
-        r = int(n**0.5)
-        # since all primes > 3 are of the form 6n ± 1
-        # start with f=5 (which is prime)
-        # and test f, f+2 for being prime
-        # then loop by 6.
-        f = 5
-        while f <= r:
-            if n % f == 0: return False
-            if n % (f+2) == 0: return False
-            f += 6
-        return True
-
-    def is_not_prime(n):
-        return not is_prime(n)
+def rainbowmath_fourcolor(rows, cols, seed=None, rng=None):
+    rng = get_rng(seed, rng)
 
     # Random choice of which form to use
-    coin = random.randint(1,8)
+    coin = rng.randint(1, 8)
 
     if coin == 1:
-        p = random.choice([k*k for k in [5, 7, 9, 11]])
-        f = lambda x, y: int(is_not_prime((x*x & y*y) % p))
+        form = "prime_squares_and"
+        params = dict(p=rng.choice(RAINBOWMATH_SQUARES_PS))
 
     elif coin == 2:
 
         # Linked diagonals of boxes
-        ab = [3, 4, 5]
-        a = random.choice(ab)
-        b = random.choice(ab)
-
-        cs = [16, 18, 20, 22]
-        c = random.choice(cs)
-
-        p = 7
-
-        f = lambda x, y: int((x//a ^ y//a)*c % p)
+        # (b is drawn but unused, which keeps the draws of older maps)
+        a = rng.choice(RAINBOWMATH_BOX_AS)
+        b = rng.choice(RAINBOWMATH_BOX_AS)
+        c = rng.choice(RAINBOWMATH_BOX_CS)
+        form = "box_xor"
+        params = dict(a=a, c=c, p=7)
 
     elif coin == 3:
 
         # Linked diagonals of very large boxes
-        ab = [9, 10, 11]
-        a = random.choice(ab)
-        b = random.choice(ab)
-
-        cs = [16, 18, 20, 22]
-        c = random.choice(cs)
-
-        p = 7
-
-        f = lambda x, y: int((x//a ^ y//a)*c % p)
-
+        a = rng.choice(RAINBOWMATH_LARGE_BOX_AS)
+        b = rng.choice(RAINBOWMATH_LARGE_BOX_AS)
+        c = rng.choice(RAINBOWMATH_BOX_CS)
+        form = "box_xor"
+        params = dict(a=a, c=c, p=7)
 
     elif coin == 4:
 
         # Sterpinsky triangles
-        ps = [7, 11, 13, 15, 35, 37]
-        p = random.choice(ps)
-        f = lambda x, y: int((x & y) % p)
+        form = "and"
+        params = dict(p=rng.choice(RAINBOWMATH_AND_PS))
 
     elif coin == 5:
 
         # This is a one-off that's in perfect sync and makes wild patterns
-        a = 3
-        b = 3
-        p = 99
-        f = lambda x, y: int((a**x)%p & (b**y)%p)
+        form = "powmod_and"
+        params = dict(a=3, b=3, p=99)
 
     elif coin == 6:
 
-        a = random.randint(1,10)
-        b = random.randint(1,10)
-        p = 99
-
-        f = lambda x, y: int(is_not_prime((a*x & b*y) % p))
-
+        a = rng.randint(1, 10)
+        b = rng.randint(1, 10)
+        form = "prime_scaled_and"
+        params = dict(a=a, b=b, p=99)
 
     elif coin == 7:
 
-        ps = [81, 83, 85, 87, 89, 91, 93, 95, 97, 99]
-
-        p = random.choice(ps)
-
-        f = lambda x, y: int(is_not_prime((x//(y+1) ^ y) % p))
-
+        form = "prime_div_xor"
+        params = dict(p=rng.choice(RAINBOWMATH_DIV_XOR_PS))
 
     elif coin == 8:
 
-        ps = [69, 99, 299, 699, 999]
-        p = random.choice(ps)
-
-        f = lambda x, y: int(is_not_prime((x*x//(y+1)) % p))
+        form = "prime_square_div"
+        params = dict(p=rng.choice(RAINBOWMATH_SQUARE_DIV_PS))
 
 
     xoffset = 0
@@ -1164,9 +1135,11 @@ def rainbowmath_fourcolor(rows, cols, seed=None):
         rows,
         cols,
         seed,
-        f,
+        form,
+        params,
         xoffset=xoffset,
         yoffset=yoffset,
+        rng=rng,
     )
 
     urls = [pattern2url(pat) for pat in team_patterns]
@@ -1182,42 +1155,27 @@ def _expression_pattern(
     rows,
     cols,
     seed,
-    f_handle,
+    form,
+    params,
     xoffset=0,
     yoffset=0,
+    rng=None,
 ):
+    """
+    Return the bitplanes of the four teams, with the cells alive at the roots
+    of the expression form (where it is 0) dealt to the teams in a shuffled,
+    serpentine order. The mask of live cells comes from the mask catalog.
+    """
+    rng = get_rng(rng=rng)
     nteams = 4
 
-    # These store the the .o diagrams (flat=False means these are lists of lists of one char)
-    team_patterns = []
-    for i in range(nteams):
-        tp = get_grid_empty(rows,cols,flat=False)
-        team_patterns.append(tp)
-
-    # Assemble a list of cells that are alive at the roots of f (if f returns 0)
-    coordinates = []
-    for xtrue in range(0, cols):
-        for ytrue in range(0, rows):
-            xtransform = xtrue - xoffset
-            ytransform = ytrue - yoffset
-            if f_handle(xtransform, ytransform) == 0:
-                coordinates.append((xtrue, ytrue))
-
-    # Shuffle live cell cordinates
-    random.shuffle(coordinates)
+    # Live cell coordinates, shuffled
+    mask = get_expression_mask(form, rows, cols, params, xoffset=xoffset, yoffset=yoffset)
+    xs, ys = shuffle_cells(mask, rng)
 
     # Assign live cell coordinates to teams using serpentine pattern
     team_order = list(range(nteams))
-    random.shuffle(team_order)
+    rng.shuffle(team_order)
     serpentine_pattern = list(team_order) + list(reversed(team_order))
 
-    for i, (x, y) in enumerate(coordinates):
-        serp_ix = i % len(serpentine_pattern)
-        team_ix = serpentine_pattern[serp_ix]
-        team_patterns[team_ix][y][x] = "o"
-
-    return team_patterns
-
-
-
-
+    return list(deal_cells(xs, ys, serpentine_pattern, nteams, rows, cols))
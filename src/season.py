@@ -0,0 +1,300 @@
+import hashlib
+import json
+import os
+import time
+from collections import deque, namedtuple
+from .maps import (
+    get_all_map_metadata,
+    get_map_realization,
+    get_pattern_function_map,
+    _init_realization_worker,
+)
+from .error import GollyXMapsError
+
+
+# One map to generate: a game id, the cup, the pattern name, and (optionally) the map size
+ScheduleItem = namedtuple("ScheduleItem", ["id", "cup", "patternname", "rows", "columns"])
+
+# Passed to the progress callback of generate_season() after each item
+SeasonProgress = namedtuple("SeasonProgress", ["done", "total", "failed", "elapsed", "rate", "eta"])
+
+# Returned by generate_season(): items in the schedule, items generated by this run,
+# items skipped because an earlier run had generated them, failed items, seconds, and items/s
+SeasonReport = namedtuple("SeasonReport", ["total", "generated", "skipped", "failed", "elapsed", "rate"])
+
+
+def make_season_schedule(season, cups, ngames):
+    """
+    Make a schedule of ngames games for each cup in the specified season.
+    Game g of a cup plays the g-th map active in the season (cycling through them).
+    """
+    schedule = []
+    for cup in cups:
+        maps = get_all_map_metadata(cup, season)
+        if not maps:
+            raise GollyXMapsError(f"Error: no maps for cup {cup} in season {season}")
+        for g in range(ngames):
+            patternname = maps[g % len(maps)]["patternName"]
+            schedule.append(ScheduleItem(f"season{season}-{cup}-{g:04d}", cup, patternname, None, None))
+    return schedule
+
+
+def load_schedule(path):
+    """
+    Load a schedule manifest: a JSON list (or a JSONL file) of items like
+    {"id": "game-1", "cup": "hellmouth", "patternName": "random", "rows": 100, "columns": 120}
+    (rows and columns are optional)
+    """
+    with open(path, "r") as f:
+        if path.endswith(".jsonl"):
+            items = [json.loads(line) for line in f if line.strip()]
+        else:
+            items = json.load(f)
+    schedule = [
+        ScheduleItem(str(d["id"]), d["cup"], d["patternName"], d.get("rows"), d.get("columns")) for d in items
+    ]
+    check_schedule(schedule)
+    return schedule
+
+
+def save_schedule(schedule, path):
+    """
+    Save a schedule as a JSONL manifest (see load_schedule())
+    """
+    with open(path, "w") as f:
+        for item in schedule:
+            d = {"id": item.id, "cup": item.cup, "patternName": item.patternname}
+            if item.rows is not None or item.columns is not None:
+                d.update(rows=item.rows, columns=item.columns)
+            f.write(json.dumps(d) + "\n")
+
+
+def check_schedule(schedule):
+    ids = set()
+    for item in schedule:
+        if item.id in ids:
+            raise GollyXMapsError(f"Error: duplicate schedule item id {item.id}")
+        ids.add(item.id)
+        try:
+            get_pattern_function_map(item.cup)
+        except KeyError:
+            raise GollyXMapsError(f"Error: invalid cup {item.cup} for schedule item {item.id}")
+
+
+def get_item_seed(season_seed, item_id):
+    """
+    Return the seed of one schedule item, derived from the season seed and the item id
+    (so it does not depend on the order items are generated in)
+    """
+    digest = hashlib.sha256(f"{season_seed}/{item_id}".encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+def generate_season(
+    schedule, output, season_seed, workers=None, chunksize=4, shard_size=None, progress=None
+):
+    """
+    Generate a realization of every item of the schedule, and write one JSON record
+    per line: {"index", "id", "cup", "patternName", "seed", "realization"}, or "error"
+    in place of "realization" if the item failed.
+
+    Each item's seed comes from season_seed and the item id (see get_item_seed()),
+    and records are written in schedule order, so the output is the same no matter
+    how many workers are used, or how many times the job was interrupted and resumed.
+
+    If output ends with .jsonl, records are appended to that file, which is also the
+    checkpoint: running again with the same schedule and seed skips the items already
+    written (a partly written last line is dropped). Otherwise, output is a directory
+    of shards of shard_size items (default 1000), shard-00000.jsonl, etc., each written
+    in one piece once complete; a rerun skips the complete shards.
+
+    workers is the number of worker processes (default is the number of CPUs),
+    workers=0 generates everything in this process. progress, if specified, is called
+    with a SeasonProgress after each item. Returns a SeasonReport.
+    """
+    schedule = list(schedule)
+    check_schedule(schedule)
+    if chunksize < 1:
+        raise GollyXMapsError(f"Error: invalid chunksize {chunksize}, must be a positive integer")
+    jobs = [(i, item, get_item_seed(season_seed, item.id)) for i, item in enumerate(schedule)]
+
+    if output.endswith(".jsonl"):
+        writer = _JsonlWriter(output)
+    else:
+        writer = _ShardWriter(output, shard_size or 1000, len(jobs))
+    try:
+        done = writer.load(jobs)
+        todo = [job for job in jobs if job[0] not in done]
+        chunks = [todo[k:k + chunksize] for k in range(0, len(todo), chunksize)]
+
+        start = time.perf_counter()
+        generated = failed = 0
+        for record in _iter_season_records(chunks, workers):
+            writer.write(record)
+            generated += 1
+            if "error" in record:
+                failed += 1
+            if progress is not None:
+                elapsed = time.perf_counter() - start
+                rate = generated / elapsed if elapsed > 0 else None
+                eta = (len(todo) - generated) / rate if rate else None
+                progress(SeasonProgress(len(done) + generated, len(jobs), failed, elapsed, rate, eta))
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - start
+    rate = generated / elapsed if elapsed > 0 else None
+    return SeasonReport(len(jobs), generated, len(done), failed, elapsed, rate)
+
+
+def format_progress(p):
+    """
+    Format a SeasonProgress as one line of text
+    """
+    rate = "-" if p.rate is None else f"{p.rate:.1f}"
+    eta = "-" if p.eta is None else f"{p.eta:.0f} s"
+    return f"{p.done}/{p.total} maps ({p.failed} failed), {rate} maps/s, ETA {eta}"
+
+
+def _iter_season_records(chunks, workers):
+    """
+    Generate the records of every chunk, in order
+    """
+    if workers == 0:
+        for chunk in chunks:
+            yield from _generate_season_chunk(chunk)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_realization_worker)
+    try:
+        # Keep a bounded number of chunks in flight, so a large season does not
+        # sit in memory waiting to be written
+        window = 4 * (workers or os.cpu_count() or 1)
+        pending = deque()
+        chunks = iter(chunks)
+        while True:
+            while len(pending) < window:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    break
+                pending.append(executor.submit(_generate_season_chunk, chunk))
+            if not pending:
+                return
+            yield from pending.popleft().result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _generate_season_chunk(chunk):
+    records = []
+    for i, item, seed in chunk:
+        record = {"index": i, "id": item.id, "cup": item.cup, "patternName": item.patternname, "seed": seed}
+        try:
+            record["realization"] = get_map_realization(
+                item.cup, item.patternname, item.rows, item.columns, seed=seed
+            )
+        except Exception as e:
+            record["error"] = f"{type(e).__name__}: {e}"
+        records.append(record)
+    return records
+
+
+def _check_record(record, jobs):
+    i = record.get("index")
+    if not isinstance(i, int) or not 0 <= i < len(jobs):
+        raise GollyXMapsError(f"Error: season output has a record for item {i}, which is not in the schedule")
+    _, item, seed = jobs[i]
+    if record.get("id") != item.id or record.get("seed") != seed:
+        raise GollyXMapsError(
+            "Error: season output was generated with a different schedule or season seed, "
+            "use a new output path"
+        )
+    return i
+
+
+class _JsonlWriter(object):
+    """
+    Append records to one JSONL file
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.f = None
+
+    def load(self, jobs):
+        """
+        Return the indexes of the records already in the file,
+        after dropping a partly written last line
+        """
+        done = set()
+        if os.path.exists(self.path):
+            with open(self.path, "rb") as f:
+                data = f.read()
+            end = data.rfind(b"\n") + 1
+            for line in data[:end].splitlines():
+                if line.strip():
+                    done.add(_check_record(json.loads(line), jobs))
+            if end < len(data):
+                with open(self.path, "r+b") as f:
+                    f.truncate(end)
+        else:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.f = open(self.path, "a")
+        return done
+
+    def write(self, record):
+        self.f.write(json.dumps(record) + "\n")
+        self.f.flush()
+
+    def close(self):
+        if self.f is not None:
+            self.f.close()
+            self.f = None
+
+
+class _ShardWriter(object):
+    """
+    Write records to a directory of JSONL shards of shard_size items,
+    each shard written in one piece once all of its records are in
+    """
+
+    def __init__(self, directory, shard_size, total):
+        if shard_size < 1:
+            raise GollyXMapsError(f"Error: invalid shard_size {shard_size}, must be a positive integer")
+        self.directory = directory
+        self.shard_size = shard_size
+        self.total = total
+        self.lines = {}
+
+    def shard_path(self, k):
+        return os.path.join(self.directory, f"shard-{k:05d}.jsonl")
+
+    def load(self, jobs):
+        """
+        Return the indexes of the records in complete shards
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        done = set()
+        for k in range((self.total + self.shard_size - 1) // self.shard_size):
+            path = self.shard_path(k)
+            if os.path.exists(path):
+                with open(path, "r") as f:
+                    for line in f:
+                        done.add(_check_record(json.loads(line), jobs))
+        return done
+
+    def write(self, record):
+        i = record["index"]
+        k = i // self.shard_size
+        self.lines.setdefault(k, []).append(json.dumps(record) + "\n")
+        if i == min(self.total, (k + 1) * self.shard_size) - 1:
+            path = self.shard_path(k)
+            with open(path + ".tmp", "w") as f:
+                f.writelines(self.lines.pop(k))
+            os.replace(path + ".tmp", path)
+
+    def close(self):
+        # Records of incomplete shards are dropped, and generated again on the next run
+        self.lines.clear()
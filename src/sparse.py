@@ -0,0 +1,210 @@
+from .patterns import get_pattern_orientation, get_placement_bounds
+from .error import GollyXPatternsError
+
+
+class SparsePattern:
+    """
+    A sparse pattern: the set of live cells (y, x) of one team
+    on a grid of size (rows x columns).
+
+    Translation, flips/rotations, union, toroidal wrapping and
+    clipping all cost O(live cells). The dense .o diagram is only
+    built when a caller asks for it with to_grid().
+    """
+
+    __slots__ = ("rows", "columns", "cells", "_bbox", "_sorted")
+
+    def __init__(self, rows, columns, cells=()):
+        if columns < 1 or rows < 1:
+            err = f"Error: invalid number of rows {rows} or columns {columns}, must be positive integers > 0"
+            raise GollyXPatternsError(err)
+        self.rows = rows
+        self.columns = columns
+        self.cells = frozenset(cells)
+        self._bbox = None
+        self._sorted = None
+
+    @classmethod
+    def from_pattern_name(
+        cls,
+        pattern_name,
+        rows,
+        columns,
+        xoffset=0,
+        yoffset=0,
+        hflip=False,
+        vflip=False,
+        rotdeg=0,
+        check_overflow=True,
+    ):
+        """
+        Place the pattern on a grid of size (rows x columns) at the given offset,
+        with the same semantics as patterns.get_grid_pattern().
+        """
+        if columns < 1 or rows < 1:
+            err = f"Error: invalid number of rows {rows} or columns {columns}, must be positive integers > 0"
+            raise GollyXPatternsError(err)
+        orientation = get_pattern_orientation(pattern_name, hflip=hflip, vflip=vflip, rotdeg=rotdeg)
+        (xstart, xend, ystart, yend) = get_placement_bounds(
+            orientation, rows, columns, xoffset, yoffset, check_overflow
+        )
+        # get_grid_pattern() never copies cells into the first row or first column
+        cells = []
+        for iy, ix in orientation.cells:
+            y = ystart + iy
+            x = xstart + ix
+            if y > 0 and y < rows and x > 0 and x < columns:
+                cells.append((y, x))
+        return cls(rows, columns, cells)
+
+    @classmethod
+    def from_grid(cls, pattern):
+        """
+        Create a sparse pattern from a .o diagram
+        """
+        rows = len(pattern)
+        columns = len(pattern[0])
+        cells = [
+            (iy, ix)
+            for iy, row in enumerate(pattern)
+            for ix, ch in enumerate(row)
+            if ch == "o"
+        ]
+        return cls(rows, columns, cells)
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __iter__(self):
+        return iter(self.sorted_cells())
+
+    def __contains__(self, cell):
+        return cell in self.cells
+
+    def __eq__(self, other):
+        if not isinstance(other, SparsePattern):
+            return NotImplemented
+        return (self.rows, self.columns, self.cells) == (other.rows, other.columns, other.cells)
+
+    def __hash__(self):
+        return hash((self.rows, self.columns, self.cells))
+
+    def __repr__(self):
+        return f"SparsePattern(rows={self.rows}, columns={self.columns}, livecount={len(self.cells)})"
+
+    @property
+    def bbox(self):
+        """
+        Bounding box of the live cells, (ymin, xmin, ymax, xmax) inclusive,
+        or None if there are no live cells
+        """
+        if self._bbox is None and self.cells:
+            ys = [y for (y, x) in self.cells]
+            xs = [x for (y, x) in self.cells]
+            self._bbox = (min(ys), min(xs), max(ys), max(xs))
+        return self._bbox
+
+    def sorted_cells(self):
+        """
+        Return the live cells as a list of (y, x), sorted by row then column
+        """
+        if self._sorted is None:
+            self._sorted = sorted(self.cells)
+        return self._sorted
+
+    def _new(self, cells):
+        return SparsePattern(self.rows, self.columns, cells)
+
+    def translate(self, dy, dx):
+        """
+        Shift every live cell by (dy, dx). Cells may end up off the grid,
+        use wrap() or clip() to bring them back.
+        """
+        return self._new((y + dy, x + dx) for (y, x) in self.cells)
+
+    def transform(self, hflip=False, vflip=False, rotdeg=0):
+        """
+        Flip and rotate the live cells within their bounding box,
+        keeping the top left corner of the bounding box in place.
+        Operations are applied in the same order as patterns.get_pattern():
+        hflip, then vflip, then a clockwise rotation of rotdeg degrees.
+        """
+        valid_deg = [0, 90, 180, 270, 360]
+        if rotdeg not in valid_deg:
+            raise GollyXPatternsError(
+                f"Invalid degree specified, must be one of: {', '.join(str(d) for d in valid_deg)}"
+            )
+        if not self.cells:
+            return self
+        (ymin, xmin, ymax, xmax) = self.bbox
+        h = ymax - ymin + 1
+        w = xmax - xmin + 1
+        local = [(y - ymin, x - xmin) for (y, x) in self.cells]
+        if hflip:
+            local = [(ly, w - 1 - lx) for (ly, lx) in local]
+        if vflip:
+            local = [(h - 1 - ly, lx) for (ly, lx) in local]
+        for _ in range((rotdeg // 90) % 4):
+            local = [(lx, h - 1 - ly) for (ly, lx) in local]
+            h, w = w, h
+        return self._new((ly + ymin, lx + xmin) for (ly, lx) in local)
+
+    def union(self, *others):
+        """
+        Return the union of this pattern and the other patterns
+        (all patterns must have the same grid size)
+        """
+        cells = set(self.cells)
+        for other in others:
+            if (other.rows, other.columns) != (self.rows, self.columns):
+                err = "Error: union() received patterns of dissimilar size"
+                err += "\n"
+                err += f"Pattern 1: rows = {self.rows}, cols = {self.columns}"
+                err += "\n"
+                err += f"Pattern 2: rows = {other.rows}, cols = {other.columns}"
+                raise GollyXPatternsError(err)
+            cells.update(other.cells)
+        return self._new(cells)
+
+    def wrap(self):
+        """
+        Wrap live cells that are off the grid back onto it (toroidal boundaries)
+        """
+        rows = self.rows
+        cols = self.columns
+        return self._new((y % rows, x % cols) for (y, x) in self.cells)
+
+    def clip(self, ymin=0, xmin=0, ymax=None, xmax=None):
+        """
+        Drop live cells outside of the box [ymin, ymax) x [xmin, xmax),
+        which defaults to the whole grid
+        """
+        if ymax is None:
+            ymax = self.rows
+        if xmax is None:
+            xmax = self.columns
+        return self._new(
+            (y, x) for (y, x) in self.cells if ymin <= y < ymax and xmin <= x < xmax
+        )
+
+    def to_grid(self, flatten=True):
+        """
+        Materialize the dense .o diagram. Live cells off the grid are dropped.
+        If flatten is True, return a list of strings (one string = one row),
+        otherwise return a list of lists of one char.
+        """
+        blank_row = ["."] * self.columns
+        grid = [blank_row[:] for r in range(self.rows)]
+        for (y, x) in self.cells:
+            if 0 <= y < self.rows and 0 <= x < self.columns:
+                grid[y][x] = "o"
+        if flatten:
+            grid = ["".join(row) for row in grid]
+        return grid
+
+
+def sparse_union(patterns):
+    """
+    Return the union of a list of sparse patterns
+    """
+    return patterns[0].union(*patterns[1:])
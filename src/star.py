@@ -1,10 +1,13 @@
 import json
 import os
-import random
-from .geom import hflip_pattern, vflip_pattern
+from .geom import hflip_pattern
 from .utils import pattern2url
-from .patterns import get_grid_empty, pattern_union, get_pattern, get_grid_pattern
-from .utils import pattern2url, retry_on_failure
+from .patterns import (
+    get_grid_empty,
+    get_grid_pattern,
+)
+from .utils import get_rng, random_twocolor_urls
+from .canvas import Canvas, OccupancyIndex
 
 
 def get_star_pattern_function_map():
@@ -33,71 +36,31 @@ def get_star_pattern_function_map():
     }
 
 
-def random_2color(rows, cols, seed=None):
+def random_2color(rows, cols, seed=None, rng=None):
     """
     Generate a random two-color list life initialization.
 
     Returns: two listlife strings, state1 and state2,
     with the random initializations.
 
-    Strategy: generate a set of (x,y) tuples,
-    convert to list, split in half. Use those
-    point sets to create listLife URL strings.
+    Strategy: draw distinct cells without replacement,
+    and split them at random between the two teams.
     """
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
     ncells = rows * cols
-    nlivecells = ncells * (random.randint(10, 17)/100)
-    points = set()
-    while len(points) < nlivecells:
-        randy = random.randint(0, rows - 1)
-        randx = random.randint(0, cols - 1)
-        points.add((randx, randy))
-
-    points = list(points)
-    points1 = set(points[: len(points) // 2])  # noqa
-    points2 = set(points[len(points) // 2 :])  # noqa
-    pattern1 = []
-    pattern2 = []
-    for y in range(rows):
-        row1 = []
-        row2 = []
-
-        # team 1 row
-        for x in range(cols):
-            if (x, y) in points1:
-                row1.append("o")
-            else:
-                row1.append(".")
-        row1str = "".join(row1)
-        pattern1.append(row1str)
-
-        # team 2 row
-        for x in range(cols):
-            if (x, y) in points2:
-                row2.append("o")
-            else:
-                row2.append(".")
-        row2str = "".join(row2)
-        pattern2.append(row2str)
-
-    pattern1_url = pattern2url(pattern1)
-    pattern2_url = pattern2url(pattern2)
+    nlivecells = ncells * (rng.randint(10, 17)/100)
+    return random_twocolor_urls(rows, cols, nlivecells, rng)
 
-    return pattern1_url, pattern2_url
 
-
-def flyingv1(rows, cols, seed=None):
-    if seed is not None:
-        random.seed(seed)
+def flyingv1(rows, cols, seed=None, rng=None):
+    rng = get_rng(seed, rng)
     return _flyingv(
-        rows, cols, seed=seed, dx=3, dy=3, kill_count=10, kill_prob=0.20, valign=True
+        rows, cols, seed=seed, dx=3, dy=3, kill_count=10, kill_prob=0.20, valign=True, rng=rng
     )
 
 
-def flyingv2(rows, cols, seed=None):
-    if seed is not None:
-        random.seed(seed)
+def flyingv2(rows, cols, seed=None, rng=None):
+    rng = get_rng(seed, rng)
     return _flyingv(
         rows,
         cols,
@@ -106,14 +69,14 @@ def flyingv2(rows, cols, seed=None):
         dy=8,
         kill_count=40,
         kill_prob=0.40,
-        valign=random.random() < 0.50,
+        valign=rng.random() < 0.50,
+        rng=rng,
     )
 
 
-def stlouis(rows, cols, seed=None):
-    if seed is not None:
-        random.seed(seed)
-    if random.random() < 0.50:
+def stlouis(rows, cols, seed=None, rng=None):
+    rng = get_rng(seed, rng)
+    if rng.random() < 0.50:
         # chicago style
         return _bars(
             rows,
@@ -123,21 +86,20 @@ def stlouis(rows, cols, seed=None):
             tmargin_lim=[3, 4],
             bmargin_lim=[5, 6],
             thickness_lim=[8, 10],
+            rng=rng,
         )
     else:
         # ny style
-        return _bars(rows, cols, seed=seed, st_louis_style=True, thickness_lim=[2, 4])
+        return _bars(rows, cols, seed=seed, st_louis_style=True, thickness_lim=[2, 4], rng=rng)
 
 
-def newyork(rows, cols, seed=None):
-    if seed is not None:
-        random.seed(seed)
-    return _bars(rows, cols, seed=seed, thickness_lim=[2, 4])
+def newyork(rows, cols, seed=None, rng=None):
+    rng = get_rng(seed, rng)
+    return _bars(rows, cols, seed=seed, thickness_lim=[2, 4], rng=rng)
 
 
-def chicago(rows, cols, seed=None):
-    if seed is not None:
-        random.seed(seed)
+def chicago(rows, cols, seed=None, rng=None):
+    rng = get_rng(seed, rng)
     return _bars(
         rows,
         cols,
@@ -145,52 +107,52 @@ def chicago(rows, cols, seed=None):
         tmargin_lim=[3, 4],
         bmargin_lim=[5, 6],
         thickness_lim=[8, 10],
+        rng=rng,
     )
 
 
-def precipitation(rows, cols, seed=None):
-    if seed is not None:
-        random.seed(seed)
+def precipitation(rows, cols, seed=None, rng=None):
+    rng = get_rng(seed, rng)
     stamp_names = ["solarsail", "backedupsink", "squarevariation3"]
     return _containment_lines(
         rows,
         cols,
         seed=seed,
-        stamp_name=random.choice(stamp_names),
+        stamp_name=rng.choice(stamp_names),
         peel_off=False,
+        rng=rng,
     )
 
 
-def evaporation(rows, cols, seed=None):
-    if seed is not None:
-        random.seed(seed)
+def evaporation(rows, cols, seed=None, rng=None):
+    rng = get_rng(seed, rng)
     stamp_names = ["solarsail", "backedupsink", "squarevariation3"]
     return _containment_lines(
         rows,
         cols,
         seed=seed,
-        stamp_name=random.choice(stamp_names),
+        stamp_name=rng.choice(stamp_names),
         peel_off=True,
+        rng=rng,
     )
 
 
-def denaturation(rows, cols, seed=None):
-    if seed is not None:
-        random.seed(seed)
+def denaturation(rows, cols, seed=None, rng=None):
+    rng = get_rng(seed, rng)
     return _containment_lines(
         rows,
         cols,
         seed=seed,
         stamp_name="arrow",
         stamps_per_team_lim=[1, 2],
-        vertical_stamp_orientation=random.random() < 0.5,
+        vertical_stamp_orientation=rng.random() < 0.5,
         peel_off=True,
+        rng=rng,
     )
 
 
-def gastank(rows, cols, seed=None):
-    if seed is not None:
-        random.seed(seed)
+def gastank(rows, cols, seed=None, rng=None):
+    rng = get_rng(seed, rng)
     return _containment_rectangle(
         rows,
         cols,
@@ -201,13 +163,13 @@ def gastank(rows, cols, seed=None):
         xlocs_right_lim=[6, 7],
         fill_style="random",
         thickness=2,
-        fill_density=random.randint(3, 10) / 100,
+        fill_density=rng.randint(3, 10) / 100,
+        rng=rng,
     )
 
 
-def rustytank(rows, cols, seed=None):
-    if seed is not None:
-        random.seed(seed)
+def rustytank(rows, cols, seed=None, rng=None):
+    rng = get_rng(seed, rng)
     return _containment_rectangle(
         rows,
         cols,
@@ -218,13 +180,13 @@ def rustytank(rows, cols, seed=None):
         xlocs_right_lim=[6, 9],
         fill_style="bumps",
         thickness=2,
-        fill_density=random.randint(10, 45) / 100,
+        fill_density=rng.randint(10, 45) / 100,
+        rng=rng,
     )
 
 
-def dinnerplate(rows, cols, seed=None):
-    if seed is not None:
-        random.seed(seed)
+def dinnerplate(rows, cols, seed=None, rng=None):
+    rng = get_rng(seed, rng)
     return _containment_rectangle(
         rows,
         cols,
@@ -232,12 +194,12 @@ def dinnerplate(rows, cols, seed=None):
         fill_style="squares",
         thickness=2,
         stamps_per_team_lim=[1, 4],
+        rng=rng,
     )
 
 
-def dessertplate(rows, cols, seed=None):
-    if seed is not None:
-        random.seed(seed)
+def dessertplate(rows, cols, seed=None, rng=None):
+    rng = get_rng(seed, rng)
     return _containment_rectangle(
         rows,
         cols,
@@ -245,12 +207,12 @@ def dessertplate(rows, cols, seed=None):
         fill_style="splitsquares",
         thickness=2,
         stamps_per_team_lim=[2, 5],
+        rng=rng,
     )
 
 
-def squarestar(rows, cols, seed=None):
-    if seed is not None:
-        random.seed(seed)
+def squarestar(rows, cols, seed=None, rng=None):
+    rng = get_rng(seed, rng)
     stamp_name = "squarepair"
     return _stamps(
         rows,
@@ -259,12 +221,12 @@ def squarestar(rows, cols, seed=None):
         stamp_name=stamp_name,
         stamps_per_team=1,
         stars_per_stamp_lim=[5, 23],
+        rng=rng,
     )
 
 
-def kitchensink(rows, cols, seed=None):
-    if seed is not None:
-        random.seed(seed)
+def kitchensink(rows, cols, seed=None, rng=None):
+    rng = get_rng(seed, rng)
     stamp_name = "backedupsink"
     return _stamps(
         rows,
@@ -274,12 +236,12 @@ def kitchensink(rows, cols, seed=None):
         stamps_per_team=2,
         stars_per_stamp_lim=[2, 8],
         stars_strategy="neighbors",
+        rng=rng,
     )
 
 
-def ricepudding(rows, cols, seed=None):
-    if seed is not None:
-        random.seed(seed)
+def ricepudding(rows, cols, seed=None, rng=None):
+    rng = get_rng(seed, rng)
     stamp_name = "squarevariation3"
     return _stamps(
         rows,
@@ -290,12 +252,12 @@ def ricepudding(rows, cols, seed=None):
         stamps_per_team=2,
         stars_per_stamp_lim=[2, 4],
         stars_strategy="unfriendly_neighbors",
+        rng=rng,
     )
 
 
-def fishsoup(rows, cols, seed=None):
-    if seed is not None:
-        random.seed(seed)
+def fishsoup(rows, cols, seed=None, rng=None):
+    rng = get_rng(seed, rng)
     stamp_name = "spaceship2platform"
     return _stamps(
         rows,
@@ -306,6 +268,7 @@ def fishsoup(rows, cols, seed=None):
         stamps_per_team=2,
         stars_per_stamp_lim=[2, 5],
         stars_strategy="random",
+        rng=rng,
     )
 
 
@@ -321,9 +284,9 @@ def _flyingv(
     kill_count=0,
     kill_prob=0.5,
     valign=True,
+    rng=None,
 ):
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
     # These store the the .o diagrams (flat=False means these are lists of lists of one char)
     team1_pattern = get_grid_empty(rows, cols, flat=False)
@@ -358,11 +321,11 @@ def _flyingv(
     # grid numbers, to ensure the diagonal formation does
     # something interesting, hence the times 2/divided by 2 operation.
 
-    starty = int(tmargin * rows) + 2 * random.randint(0, jittery)
-    endy = int(bmargin * rows) - random.randint(0, jittery)
+    starty = int(tmargin * rows) + 2 * rng.randint(0, jittery)
+    endy = int(bmargin * rows) - rng.randint(0, jittery)
 
-    startx = int(lmargin * cols) + (random.randint(0, jitterx) // 2) * 2
-    endx = (45 * cols) // 100 - (random.randint(0, jitterx) // 2) * 2
+    startx = int(lmargin * cols) + (rng.randint(0, jitterx) // 2) * 2
+    endx = (45 * cols) // 100 - (rng.randint(0, jitterx) // 2) * 2
 
     # -------------
     # color 1
@@ -373,12 +336,12 @@ def _flyingv(
         starty1 = starty
         endy1 = endy
     else:
-        offset = (random.randint(-jittery, jittery) // 2) * 2
+        offset = (rng.randint(-jittery, jittery) // 2) * 2
         starty1 = starty + offset
         endy1 = endy + offset
     yy = starty1
 
-    offset = (random.randint(-jitterx, jitterx) // 2) * 2
+    offset = (rng.randint(-jitterx, jitterx) // 2) * 2
     startx1 = startx + offset + 1
     endx1 = endx + offset
     xx = startx1
@@ -393,7 +356,7 @@ def _flyingv(
                 else:
                     if xx_ % 2 == yy_ % 2:
                         if (
-                            random.random() < maxkillprob
+                            rng.random() < maxkillprob
                             and killcounter != maxkillcounter
                         ):
                             killcounter += 1
@@ -411,12 +374,12 @@ def _flyingv(
         starty2 = starty
         endy2 = endy
     else:
-        offset = (random.randint(-jittery, jittery) // 2) * 2
+        offset = (rng.randint(-jittery, jittery) // 2) * 2
         starty2 = starty + offset
         endy2 = endy + offset
     yy = starty2
 
-    offset = (random.randint(-jitterx, jitterx) // 2) * 2
+    offset = (rng.randint(-jitterx, jitterx) // 2) * 2
     startx2 = startx + offset + 1
     endx2 = endx + offset
     xx = startx2
@@ -431,7 +394,7 @@ def _flyingv(
                 else:
                     if xx_ % 2 == yy_ % 2:
                         if (
-                            random.random() < maxkillprob
+                            rng.random() < maxkillprob
                             and killcounter != maxkillcounter
                         ):
                             killcounter += 1
@@ -463,11 +426,11 @@ def _bars(
     st_louis_style=False,
     st_louis_gap=5,
     seed=None,
+    rng=None,
 ):
 
     # set rng seed (optional)
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
     # These store the the .o diagrams (flat=False means these are lists of lists of one char)
     team1_pattern = get_grid_empty(rows, cols, flat=False)
@@ -479,18 +442,18 @@ def _bars(
     jitterx = 4
     jittery = 10
 
-    tmargin = random.randint(tmargin_lim[0], tmargin_lim[1]) / 10
-    bmargin = random.randint(bmargin_lim[0], bmargin_lim[1]) / 10
+    tmargin = rng.randint(tmargin_lim[0], tmargin_lim[1]) / 10
+    bmargin = rng.randint(bmargin_lim[0], bmargin_lim[1]) / 10
 
     xlocs = [0.2, 0.4, 0.6, 0.8]
-    random.shuffle(xlocs)
+    rng.shuffle(xlocs)
 
     xlocs1 = [xlocs[0], xlocs[1]]
     xlocs2 = [xlocs[2], xlocs[3]]
 
-    gap_prob = random.randint(gap_prob_lim[0], gap_prob_lim[1]) / 10
+    gap_prob = rng.randint(gap_prob_lim[0], gap_prob_lim[1]) / 10
 
-    thickness = random.randint(*thickness_lim)
+    thickness = rng.randint(*thickness_lim)
 
     # -------------
     # color 1
@@ -498,24 +461,24 @@ def _bars(
     starty0 = int(tmargin * rows)
     endy0 = int(bmargin * rows)
 
-    jit = random.randint(-jittery, jittery)
+    jit = rng.randint(-jittery, jittery)
     starty = starty0 + jit
     endy = endy0 + jit
 
-    startx = int(xlocs1[0] * cols) + random.randint(-jitterx, jitterx)
+    startx = int(xlocs1[0] * cols) + rng.randint(-jitterx, jitterx)
     endx = startx + thickness
 
     for y in range(starty, endy + 1):
         for x in range(startx, endx + 1):
-            if random.random() > gap_prob:
+            if rng.random() > gap_prob:
                 team1_pattern[y][x] = "o"
 
-    startx = int(xlocs1[1] * cols) + random.randint(-jitterx, jitterx)
+    startx = int(xlocs1[1] * cols) + rng.randint(-jitterx, jitterx)
     endx = startx + thickness
 
     for y in range(starty, endy + 1):
         for x in range(startx, endx + 1):
-            if random.random() > gap_prob:
+            if rng.random() > gap_prob:
                 team1_pattern[y][x] = "o"
 
     # -------------
@@ -524,24 +487,24 @@ def _bars(
     starty0 = int(tmargin * rows)
     endy0 = int(bmargin * rows)
 
-    jit = random.randint(-jittery, jittery)
+    jit = rng.randint(-jittery, jittery)
     starty = starty0 + jit
     endy = endy0 + jit
 
-    startx = int(xlocs2[0] * cols) + random.randint(-jitterx, jitterx)
+    startx = int(xlocs2[0] * cols) + rng.randint(-jitterx, jitterx)
     endx = startx + thickness
 
     for y in range(starty, endy + 1):
         for x in range(startx, endx + 1):
-            if random.random() > gap_prob:
+            if rng.random() > gap_prob:
                 team2_pattern[y][x] = "o"
 
-    startx = int(xlocs2[1] * cols) + random.randint(-jitterx, jitterx)
+    startx = int(xlocs2[1] * cols) + rng.randint(-jitterx, jitterx)
     endx = startx + thickness
 
     for y in range(starty, endy + 1):
         for x in range(startx, endx + 1):
-            if random.random() > gap_prob:
+            if rng.random() > gap_prob:
                 team2_pattern[y][x] = "o"
 
     # ------------------
@@ -588,13 +551,12 @@ def _bars(
     return s1, s2
 
 
-def combs(rows, cols, seed=None):
+def combs(rows, cols, seed=None, rng=None):
     """
     Make horizontal rows of thick lines with criss-cross hole punches
     """
     # set rng seed (optional)
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
     # --------------
     # Parameters
@@ -602,21 +564,21 @@ def combs(rows, cols, seed=None):
     jitterx = 8
     jittery = 8
 
-    thickness = random.randint(3, 5)
+    thickness = rng.randint(3, 5)
 
-    ylocations = [random.randint(20, 45) / 100, random.randint(55, 80) / 100]
+    ylocations = [rng.randint(20, 45) / 100, rng.randint(55, 80) / 100]
     yloc_swap_prob = 0.3
 
-    xstart = random.randint(10, 25) / 100
-    xwidth = random.randint(45, 65) / 100
+    xstart = rng.randint(10, 25) / 100
+    xwidth = rng.randint(45, 65) / 100
 
-    bumps_prob = random.randint(10, 50) / 100
+    bumps_prob = rng.randint(10, 50) / 100
 
     # -----------------
     # Algorithm:
 
-    if random.random() < yloc_swap_prob:
-        random.shuffle(ylocations)
+    if rng.random() < yloc_swap_prob:
+        rng.shuffle(ylocations)
 
     # These store the the .o diagrams (flat=False means these are lists of lists of one char)
     team1_pattern = get_grid_empty(rows, cols, flat=False)
@@ -625,10 +587,10 @@ def combs(rows, cols, seed=None):
     # -------------
     # color 1
 
-    starty1 = int(ylocations[0] * rows) + random.randint(-jittery, jittery)
+    starty1 = int(ylocations[0] * rows) + rng.randint(-jittery, jittery)
     endy1 = starty1 + thickness
 
-    startx = int(xstart * cols) + random.randint(-jitterx, jitterx)
+    startx = int(xstart * cols) + rng.randint(-jitterx, jitterx)
     endx = startx + int(xwidth * cols)
 
     for y in range(starty1, endy1 + 1):
@@ -641,16 +603,16 @@ def combs(rows, cols, seed=None):
                 team1_pattern[y][x] = "o"
 
     for x in range(startx, endx + 1):
-        if random.random() < bumps_prob:
+        if rng.random() < bumps_prob:
             team1_pattern[starty1 - 1][x] = "o"
 
     # -------------
     # color 2
 
-    starty2 = int(ylocations[1] * rows) + random.randint(-jittery, jittery)
+    starty2 = int(ylocations[1] * rows) + rng.randint(-jittery, jittery)
     endy2 = starty2 + thickness
 
-    startx = int(xstart * cols) + random.randint(-jitterx, jitterx)
+    startx = int(xstart * cols) + rng.randint(-jitterx, jitterx)
     endx = startx + int(xwidth * cols)
 
     for y in range(endy2, starty2 - 1, -1):
@@ -663,7 +625,7 @@ def combs(rows, cols, seed=None):
                 team2_pattern[y][x] = "o"
 
     for x in range(startx, endx + 1):
-        if random.random() < bumps_prob:
+        if rng.random() < bumps_prob:
             team2_pattern[endy2 + 1][x] = "o"
 
     team1_pattern = ["".join(pattrow) for pattrow in team1_pattern]
@@ -676,6 +638,11 @@ def combs(rows, cols, seed=None):
 
 
 def get_gridstamp(pattern, rows, cols, yoffset, xoffset, flatten=True):
+    """
+    Return a (rows x cols) grid with the .o diagram pattern centered at
+    (xoffset, yoffset). To add many patterns to one grid, stamp them onto
+    a Canvas with check_overflow=False instead, which places them the same way.
+    """
 
     ogpattern = [list(j) for j in pattern if len(j) > 0]
     blank_row = ["."] * cols
@@ -713,13 +680,13 @@ def _containment_lines(
     stamps_per_team_lim=[3, 6],
     vertical_stamp_orientation=None,
     seed=None,
+    rng=None,
 ):
     """
     Create a map with lines forming a rectangle.
     This requires a source of randomness.
     """
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
     # --------------
     # Parameters:
@@ -727,10 +694,10 @@ def _containment_lines(
     # Thickness of >= 2 is impenetrable
     # If peel_off set to true, leave a crack to allow lines to peel off
 
-    stamps_per_team = random.randint(stamps_per_team_lim[0], stamps_per_team_lim[1])
+    stamps_per_team = rng.randint(stamps_per_team_lim[0], stamps_per_team_lim[1])
 
     if vertical_stamp_orientation is None:
-        vertical_stamp_orientation = random.random() < 0.50
+        vertical_stamp_orientation = rng.random() < 0.50
         # vertical_stamp_orientation = True
 
     if stamp_name is None:
@@ -742,8 +709,8 @@ def _containment_lines(
     # ---------------
     # Algorithm:
 
-    team1_patterns = []
-    team2_patterns = []
+    # Lines and stamps are added to one plane per team as they are made
+    canvas = _get_canvas(rows, cols)
 
     # ----------------
     # Lines:
@@ -753,16 +720,16 @@ def _containment_lines(
         zend = z + (dim - dim // 2)
         return zstart, zend
 
-    line_ylocs_top = random.randint(1, 4) / 10
-    line_ylocs_bot = random.randint(6, 9) / 10
+    line_ylocs_top = rng.randint(1, 4) / 10
+    line_ylocs_bot = rng.randint(6, 9) / 10
 
     line_ylocs = [int(line_ylocs_top * rows), int(line_ylocs_bot * rows)]
 
     team1_lines = get_grid_empty(rows, cols, flat=False)
     team2_lines = get_grid_empty(rows, cols, flat=False)
 
-    y1 = line_ylocs[0] + random.randint(0, jittery)
-    y2 = line_ylocs[1] - random.randint(0, jittery)
+    y1 = line_ylocs[0] + rng.randint(0, jittery)
+    y2 = line_ylocs[1] - rng.randint(0, jittery)
 
     if peel_off:
         start = 1
@@ -779,7 +746,7 @@ def _containment_lines(
             team2_lines[iy][ix] = "o"
 
     # Vertical flip
-    if random.random() < 0.50:
+    if rng.random() < 0.50:
         team1_lines = [j for j in team1_lines[::-1]]
         team2_lines = [j for j in team2_lines[::-1]]
         old_y1 = y1
@@ -787,8 +754,8 @@ def _containment_lines(
         y1 = rows - old_y2
         y2 = rows - old_y1
 
-    team1_patterns.append(team1_lines)
-    team2_patterns.append(team2_lines)
+    canvas.stamp_grid(0, team1_lines)
+    canvas.stamp_grid(1, team2_lines)
 
     # ----------------
     # Stamps:
@@ -796,7 +763,7 @@ def _containment_lines(
     team_assignments = [1,] * stamps_per_team + [
         2,
     ] * stamps_per_team
-    random.shuffle(team_assignments)
+    rng.shuffle(team_assignments)
 
     # approximately evenly spaced in x dir
     if vertical_stamp_orientation:
@@ -815,59 +782,31 @@ def _containment_lines(
     for i, xloc in enumerate(xlocs):
 
         if vertical_stamp_orientation:
-            yy1 = y1 + int((1 / 3) * dy) + random.randint(-jittery, jittery)
-            yy2 = y1 + int((2 / 3) * dy) + random.randint(-jittery, jittery)
+            yy1 = y1 + int((1 / 3) * dy) + rng.randint(-jittery, jittery)
+            yy2 = y1 + int((2 / 3) * dy) + rng.randint(-jittery, jittery)
 
             yy1 = min(max(yy1, y1 + thickness // 2), y2 - thickness // 2)
             yy2 = min(max(yy2, y1 + thickness // 2), y2 - thickness // 2)
 
-            stamp1 = get_pattern(
-                stamp_name,
-                hflip=random.random() < 0.50,
-                vflip=random.random() < 0.50,
-            )
+            flips1 = dict(hflip=rng.random() < 0.50, vflip=rng.random() < 0.50)
+            xx = xloc + rng.randint(-jitterx, jitterx)
+            _stamp(canvas, 0, stamp_name, xx, yy1, **flips1)
 
-            xx = xloc + random.randint(-jitterx, jitterx)
-            gridstamp = get_gridstamp(stamp1, rows, cols, yoffset=yy1, xoffset=xx)
-
-            team1_patterns.append(gridstamp)
-
-            stamp2 = get_pattern(
-                stamp_name,
-                hflip=random.random() < 0.50,
-                vflip=random.random() < 0.50,
-            )
-
-            xx = xloc + random.randint(-jitterx, jitterx)
-            gridstamp = get_gridstamp(stamp2, rows, cols, yoffset=yy2, xoffset=xx)
-
-            team2_patterns.append(gridstamp)
+            flips2 = dict(hflip=rng.random() < 0.50, vflip=rng.random() < 0.50)
+            xx = xloc + rng.randint(-jitterx, jitterx)
+            _stamp(canvas, 1, stamp_name, xx, yy2, **flips2)
 
         else:
 
-            stamp = get_pattern(
-                stamp_name,
-                hflip=random.random() < 0.50,
-                vflip=random.random() < 0.50,
-            )
-
-            xx = xloc + random.randint(-jitterx, jitterx)
-            yy = y1 + int(0.5 * dy) + random.randint(-jittery, jittery)
-            gridstamp = get_gridstamp(stamp, rows, cols, yoffset=yy, xoffset=xx)
-
-            if team_assignments[i] == 1:
-                team1_patterns.append(gridstamp)
-            elif team_assignments[i] == 2:
-                team2_patterns.append(gridstamp)
+            flips = dict(hflip=rng.random() < 0.50, vflip=rng.random() < 0.50)
+            xx = xloc + rng.randint(-jitterx, jitterx)
+            yy = y1 + int(0.5 * dy) + rng.randint(-jittery, jittery)
+            _stamp(canvas, team_assignments[i] - 1, stamp_name, xx, yy, **flips)
 
     # --------------------
     # Final assembly:
 
-    team1_pattern = pattern_union(team1_patterns)
-    team2_pattern = pattern_union(team2_patterns)
-
-    s1 = pattern2url(team1_pattern)
-    s2 = pattern2url(team2_pattern)
+    s1, s2 = [pattern2url(plane) for plane in canvas.planes]
 
     return s1, s2
 
@@ -884,10 +823,10 @@ def _containment_rectangle(
     xlocs_right_lim=[6, 9],
     thickness=2,
     fill_density=None,
+    rng=None,
 ):
 
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
     valid_fill_styles = ["random", "bumps", "squares", "splitsquares"]
 
@@ -896,19 +835,19 @@ def _containment_rectangle(
 
     # Thickness of >= 2 is impenetrable
 
-    # ylocs_top = random.randint(10, 40) / 100
-    ylocs_top = random.randint(ylocs_top_lim[0], ylocs_top_lim[1]) / 10
-    # ylocs_bot = random.randint(60, 90) / 100
-    ylocs_bot = random.randint(ylocs_bot_lim[0], ylocs_bot_lim[1]) / 10
+    # ylocs_top = rng.randint(10, 40) / 100
+    ylocs_top = rng.randint(ylocs_top_lim[0], ylocs_top_lim[1]) / 10
+    # ylocs_bot = rng.randint(60, 90) / 100
+    ylocs_bot = rng.randint(ylocs_bot_lim[0], ylocs_bot_lim[1]) / 10
 
-    xlocs_left = random.randint(10, 30) / 100
-    xlocs_right = random.randint(70, 90) / 100
+    xlocs_left = rng.randint(10, 30) / 100
+    xlocs_right = rng.randint(70, 90) / 100
 
     jitterx = 10
     jittery = 10
 
     if fill_style is None:
-        fill_style = random.choice(valid_fill_styles)
+        fill_style = rng.choice(valid_fill_styles)
     elif fill_style not in valid_fill_styles:
         raise Exception(
             f"Invalid fill style specified for containment rectangle: {fill_style}"
@@ -920,15 +859,15 @@ def _containment_rectangle(
     # fill_style = 'splitsquares'
 
     if fill_density is None:
-        fill_density = random.randint(5, 30) / 100
+        fill_density = rng.randint(5, 30) / 100
 
-    stamps_per_team = random.randint(stamps_per_team_lim[0], stamps_per_team_lim[1])
+    stamps_per_team = rng.randint(stamps_per_team_lim[0], stamps_per_team_lim[1])
 
     # ---------------
     # Algorithm:
 
-    team1_patterns = []
-    team2_patterns = []
+    # Lines and fill are added to one plane per team as they are made
+    canvas = _get_canvas(rows, cols)
 
     # ---------------
     # Lines:
@@ -948,11 +887,11 @@ def _containment_rectangle(
     team2_vlines = get_grid_empty(rows, cols, flat=False)
 
     # Add the line
-    y1 = ylocs[0] - random.randint(0, jittery)
-    y2 = ylocs[1] + random.randint(0, jittery)
+    y1 = ylocs[0] - rng.randint(0, jittery)
+    y2 = ylocs[1] + rng.randint(0, jittery)
 
-    x1 = xlocs[0] + random.randint(0, jitterx)
-    x2 = xlocs[1] - random.randint(0, jitterx)
+    x1 = xlocs[0] + rng.randint(0, jitterx)
+    x2 = xlocs[1] - rng.randint(0, jitterx)
 
     # If fill style is bumps, handle it
     bumps = False
@@ -970,7 +909,7 @@ def _containment_rectangle(
             team1_hlines[iy][ix] = "o"
         if bumps:
             if t1bumps < fill_points:
-                if random.random() < fill_density:
+                if rng.random() < fill_density:
                     # add a random bump
                     team1_hlines[bounds[-1]][ix] = "o"
                     t1bumps += 1
@@ -981,7 +920,7 @@ def _containment_rectangle(
             team2_hlines[iy][ix] = "o"
         if bumps:
             if t2bumps < fill_points:
-                if random.random() < fill_density:
+                if rng.random() < fill_density:
                     # add a random bump
                     team2_hlines[bounds[0] - 1][ix] = "o"
                     t2bumps += 1
@@ -999,7 +938,7 @@ def _containment_rectangle(
             team1_vlines[iy][ix] = "o"
         if bumps:
             if t1bumps < fill_points:
-                if random.random() < fill_density:
+                if rng.random() < fill_density:
                     # add a random bump
                     team1_vlines[iy][bounds[-1]] = "o"
                     t1bumps += 1
@@ -1010,26 +949,26 @@ def _containment_rectangle(
             team2_vlines[iy][ix] = "o"
         if bumps:
             if t2bumps < fill_points:
-                if random.random() < fill_density:
+                if rng.random() < fill_density:
                     # add a random bump
                     team2_vlines[iy][bounds[0] - 1] = "o"
                     t2bumps += 1
 
     # swap top/bottom and left/right colors randomly
-    if random.random() < 0.50:
+    if rng.random() < 0.50:
         temp = team2_hlines[:]
         team2_hlines = team1_hlines[:]
         team1_hlines = temp
-    if random.random() < 0.50:
+    if rng.random() < 0.50:
         temp = team2_vlines[:]
         team2_vlines = team1_vlines[:]
         team1_vlines = temp
 
-    team1_patterns.append(team1_hlines)
-    team1_patterns.append(team1_vlines)
+    canvas.stamp_grid(0, team1_hlines)
+    canvas.stamp_grid(0, team1_vlines)
 
-    team2_patterns.append(team2_hlines)
-    team2_patterns.append(team2_vlines)
+    canvas.stamp_grid(1, team2_hlines)
+    canvas.stamp_grid(1, team2_vlines)
 
     # --------------------
     # Fill:
@@ -1037,8 +976,8 @@ def _containment_rectangle(
     # (bumps handled in line construction)
 
     def _get_rand_xy(x1, y1, x2, y2, thickness):
-        x_ = x1 + thickness + random.randint(0, x2 - x1 - 2 * thickness)
-        y_ = y1 + thickness + random.randint(0, y2 - y1 - 2 * thickness)
+        x_ = x1 + thickness + rng.randint(0, x2 - x1 - 2 * thickness)
+        y_ = y1 + thickness + rng.randint(0, y2 - y1 - 2 * thickness)
         return x_, y_
 
     if fill_style == "random":
@@ -1061,8 +1000,8 @@ def _containment_rectangle(
                 elif team == 2:
                     team2_pts[yy][xx] = "o"
 
-        team1_patterns.append(team1_pts)
-        team2_patterns.append(team2_pts)
+        canvas.stamp_grid(0, team1_pts)
+        canvas.stamp_grid(1, team2_pts)
 
     elif fill_style in ["squares", "splitsquares"]:
 
@@ -1098,17 +1037,13 @@ def _containment_rectangle(
                     team2_pts[yy + 1][xx + 1] = "o"
                     team2_pts[yy + 1][xx] = "o"
 
-        team1_patterns.append(team1_pts)
-        team2_patterns.append(team2_pts)
+        canvas.stamp_grid(0, team1_pts)
+        canvas.stamp_grid(1, team2_pts)
 
     # --------------------
     # Final assembly:
 
-    team1_pattern = pattern_union(team1_patterns)
-    team2_pattern = pattern_union(team2_patterns)
-
-    s1 = pattern2url(team1_pattern)
-    s2 = pattern2url(team2_pattern)
+    s1, s2 = [pattern2url(plane) for plane in canvas.planes]
 
     return s1, s2
 
@@ -1122,10 +1057,10 @@ def _stamps(
     stamps_per_team=1,
     stars_per_stamp_lim=[5, 10],
     stars_strategy=None,
+    rng=None,
 ):
     # set rng seed (optional)
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
     valid_stars_strategies = [
         "random",
@@ -1142,10 +1077,10 @@ def _stamps(
     # ---------------
     # Parameters:
 
-    stars_per_stamp = random.randint(*stars_per_stamp_lim)
+    stars_per_stamp = rng.randint(*stars_per_stamp_lim)
 
     if stars_strategy is None:
-        stars_strategy = random.choice(valid_stars_strategies)
+        stars_strategy = rng.choice(valid_stars_strategies)
     if stars_strategy not in valid_stars_strategies:
         raise Exception(f"Invalid stars strategy specified: {stars_strategy}")
 
@@ -1165,69 +1100,43 @@ def _stamps(
 
     # xlocs = [int(0.25*cols), int(0.75*cols)]
     xlocs = [
-        int(random.randint(10, 40) / 100 * cols),
-        int(random.randint(60, 90) / 100 * cols),
+        int(rng.randint(10, 40) / 100 * cols),
+        int(rng.randint(60, 90) / 100 * cols),
     ]
     ylocs = [
         int(((j + 1) / (stamps_per_team + 1)) * rows) for j in range(stamps_per_team)
     ]
 
-    team1_patterns = []
-    team2_patterns = []
+    # Stamps and stars are added to one plane per team as they are placed
+    canvas = _get_canvas(rows, cols)
 
     for yy_ in ylocs:
 
-        yy = yy_ + random.randint(-jittery, jittery)
-        xx = xlocs[0] + random.randint(-jitterx, jitterx)
-        stamp1 = get_pattern(stamp_name)
+        yy = yy_ + rng.randint(-jittery, jittery)
+        xx = xlocs[0] + rng.randint(-jitterx, jitterx)
+        flips1 = dict(hflip=rng.random() < 0.50, vflip=rng.random() < 0.50)
+        _stamp(canvas, 0, stamp_name, xx, yy, **flips1)
 
-        if random.random() < 0.50:
-            stamp1 = hflip_pattern(stamp1)
-        if random.random() < 0.50:
-            stamp1 = vflip_pattern(stamp1)
+        yy = yy_ + rng.randint(-jittery, jittery)
+        xx = xlocs[1] + rng.randint(-jitterx, jitterx)
+        flips2 = dict(hflip=rng.random() < 0.50, vflip=rng.random() < 0.50)
+        _stamp(canvas, 1, stamp_name, xx, yy, **flips2)
 
-        gridstamp = get_gridstamp(stamp1, rows, cols, yoffset=yy, xoffset=xx)
-        team1_patterns.append(gridstamp)
+    # Index the occupied cells, and add each star as it is placed,
+    # so stars are placed away from the stamps and from each other
+    occupancy = _get_occupancy_index(canvas.planes, rows, cols)
 
-        yy = yy_ + random.randint(-jittery, jittery)
-        xx = xlocs[1] + random.randint(-jitterx, jitterx)
-        stamp2 = get_pattern(stamp_name)
-
-        if random.random() < 0.50:
-            stamp2 = hflip_pattern(stamp2)
-        if random.random() < 0.50:
-            stamp2 = vflip_pattern(stamp2)
-
-        gridstamp = get_gridstamp(stamp2, rows, cols, yoffset=yy, xoffset=xx)
-        team2_patterns.append(gridstamp)
-
-    team1_pattern = pattern_union(team1_patterns)
-    team2_pattern = pattern_union(team2_patterns)
+    def _add_star(team, xx, yy, vflip=False):
+        _stamp(canvas, team, stars_name, xx, yy, vflip=vflip)
+        occupancy.stamp(stars_name, xoffset=xx, yoffset=yy, vflip=vflip, check_overflow=False)
 
     if stars_strategy == "random":
         for _ in range(stars_per_stamp * stamps_per_team):
-            xx, yy = get_random_unoccupied_point(
-                team1_pattern, team2_pattern, rows, cols
-            )
-            team1_patterns.append(
-                get_gridstamp(
-                    get_pattern(stars_name), rows, cols, yoffset=yy, xoffset=xx
-                )
-            )
-
-            xx, yy = get_random_unoccupied_point(
-                team1_pattern, team2_pattern, rows, cols
-            )
-            team2_patterns.append(
-                get_gridstamp(
-                    get_pattern(stars_name), rows, cols, yoffset=yy, xoffset=xx
-                )
-            )
-
-            ## Update the patterns we're using so we don't
-            ## have colliding points
-            # team1_pattern = pattern_union(team1_patterns)
-            # team2_pattern = pattern_union(team2_patterns)
+            xx, yy = occupancy.sample_uniform(rng, xlim=(1, cols - 1), ylim=(1, rows - 1))
+            _add_star(0, xx, yy)
+
+            xx, yy = occupancy.sample_uniform(rng, xlim=(1, cols - 1), ylim=(1, rows - 1))
+            _add_star(1, xx, yy)
 
     elif stars_strategy in ["neighbors", "friendly_neighbors", "unfriendly_neighbors"]:
 
@@ -1243,126 +1152,79 @@ def _stamps(
                 center2 = (xlocs[0], yloc)
             else:
                 # dealer's choice
-                k = random.randint(0, 1)
+                k = rng.randint(0, 1)
                 center1 = (xlocs[k], yloc)
                 center2 = (xlocs[1 - k], yloc)
 
             for _ in range(stars_per_stamp):
 
-                xx, yy = get_gaussian_unoccupied_point(
-                    team1_pattern, team2_pattern, rows, cols, center1
-                )
-                stamp1 = get_pattern(stars_name)
-                if random.random() < 0.50:
-                    stamp1 = vflip_pattern(stamp1)
-                gridstamp = get_gridstamp(
-                    stamp1,
-                    rows,
-                    cols,
-                    yoffset=yy,
-                    xoffset=xx,
-                )
-                team1_patterns.append(gridstamp)
-
-                xx, yy = get_gaussian_unoccupied_point(
-                    team1_pattern, team2_pattern, rows, cols, center2
-                )
-                stamp2 = get_pattern(stars_name)
-                if random.random() < 0.50:
-                    stamp2 = vflip_pattern(stamp2)
-                gridstamp = get_gridstamp(
-                    stamp2,
-                    rows,
-                    cols,
-                    yoffset=yy,
-                    xoffset=xx,
-                )
-                team2_patterns.append(gridstamp)
-
-                ## Update the patterns we're using so we don't
-                ## have colliding points
-                # team1_pattern = pattern_union(team1_patterns)
-                # team2_pattern = pattern_union(team2_patterns)
+                xx, yy = occupancy.sample_gaussian(rng, center1, GAUSSIAN_POINT_STD)
+                _add_star(0, xx, yy, vflip=rng.random() < 0.50)
+
+                xx, yy = occupancy.sample_gaussian(rng, center2, GAUSSIAN_POINT_STD)
+                _add_star(1, xx, yy, vflip=rng.random() < 0.50)
 
     else:
         raise Exception(f"Error: Invalid stars strategy specified: {stars_strategy}")
 
-    team1_pattern = pattern_union(team1_patterns)
-    team2_pattern = pattern_union(team2_patterns)
-
-    s1 = pattern2url(team1_pattern)
-    s2 = pattern2url(team2_pattern)
+    s1, s2 = [pattern2url(plane) for plane in canvas.planes]
 
     return s1, s2
 
 
-def get_random_unoccupied_point(team1_pattern, team2_pattern, rows, cols):
-    x, y = random.randint(1, cols - 2), random.randint(1, rows - 2)
-
-    tries = 0
-    finished = False
-    while not finished:
-        # Check if this randomly-chosen point has neighbors
-        okay = True
-        for ix in [-2, -1, 0, 1, 2]:
-            for iy in [-2, -1, 0, 1, 2]:
-                ix = (ix + cols) % cols
-                iy = (iy + rows) % rows
-                if y + iy < rows - 1 and x + ix < cols - 1:
-                    if (
-                        team1_pattern[y + iy][x + ix] == "o"
-                        or team2_pattern[y + iy][x + ix] == "o"
-                    ):
-                        okay = False
-                        break
-        if not okay:
-            # Try another point
-            x, y = random.randint(1, cols - 2), random.randint(0, rows - 2)
-            tries += 1
-            if tries > 10:
-                raise Exception(
-                    f"Error: Failed to find unoccupied x,y point in 10 tries"
-                )
-        else:
-            return x, y
-
-
-def get_gaussian_unoccupied_point(team1_pattern, team2_pattern, rows, cols, center):
-    cx, cy = center
-    stdx, stdy = [25, 25]
-
-    def _getxy(rows, cols):
-        randx = int(random.gauss(cx, stdx))
-        randx = (randx + cols) % cols
-
-        randy = int(random.gauss(cy, stdy))
-        randy = (randy + rows) % rows
-
-        return randx, randy
-
-    x, y = _getxy(rows, cols)
-
-    tries = 0
-    finished = False
-    while not finished:
-        # Check if this randomly-chosen point has neighbors
-        okay = True
-        for ix in [-2, -1, 0, 1, 2]:
-            for iy in [-2, -1, 0, 1, 2]:
-                if y + iy < rows and x + ix < cols:
-                    if (
-                        team1_pattern[y + iy][x + ix] == "o"
-                        or team2_pattern[y + iy][x + ix] == "o"
-                    ):
-                        okay = False
-                        break
-        if not okay:
-            # Try another point
-            x, y = _getxy(rows, cols)
-            tries += 1
-            if tries > 100:
-                raise Exception(
-                    f"Error: Failed to find unoccupied x,y point in 10 tries"
-                )
+def _get_canvas(rows, cols):
+    return Canvas(rows, cols, nteams=2)
+
+
+def _stamp(canvas, team, pattern_name, xoffset, yoffset, hflip=False, vflip=False):
+    """
+    Add the pattern to the given team's plane of the canvas, centered at
+    (xoffset, yoffset) and clipped to the grid like get_gridstamp()
+    """
+    canvas.stamp(
+        team,
+        pattern_name,
+        xoffset=xoffset,
+        yoffset=yoffset,
+        hflip=hflip,
+        vflip=vflip,
+        check_overflow=False,
+    )
+
+
+# Standard deviations (x, y) of get_gaussian_unoccupied_point()
+GAUSSIAN_POINT_STD = (25, 25)
+
+
+def _get_occupancy_index(patterns, rows, cols):
+    """
+    Return an OccupancyIndex of the live cells of the given patterns
+    (.o diagrams or bitplanes)
+    """
+    occupancy = OccupancyIndex(rows, cols, radius=2)
+    for pattern in patterns:
+        if isinstance(pattern, list):
+            occupancy.add_pattern(pattern)
         else:
-            return x, y
+            occupancy.add_plane(pattern)
+    return occupancy
+
+
+def get_random_unoccupied_point(team1_pattern, team2_pattern, rows, cols, rng=None):
+    """
+    Return a random (x, y), away from the edges of the grid,
+    with no live cell of either team within 2 cells of it
+    """
+    rng = get_rng(rng=rng)
+    occupancy = _get_occupancy_index([team1_pattern, team2_pattern], rows, cols)
+    return occupancy.sample_uniform(rng, xlim=(1, cols - 1), ylim=(1, rows - 1))
+
+
+def get_gaussian_unoccupied_point(team1_pattern, team2_pattern, rows, cols, center, rng=None):
+    """
+    Return a random (x, y), Gaussian distributed around center = (x, y),
+    with no live cell of either team within 2 cells of it
+    """
+    rng = get_rng(rng=rng)
+    occupancy = _get_occupancy_index([team1_pattern, team2_pattern], rows, cols)
+    return occupancy.sample_gaussian(rng, center, GAUSSIAN_POINT_STD)
@@ -2,7 +2,6 @@ import itertools
 from operator import itemgetter
 import json
 import os
-import random
 from .geom import hflip_pattern, vflip_pattern, rot_pattern
 from .patterns import (
     get_pattern_size,
@@ -13,9 +12,12 @@ from .patterns import (
     methuselah_quadrants_pattern,
     pattern_union,
     cloud_region,
+    get_min_safe_dimension,
 )
-from .utils import pattern2url, retry_on_failure
+from .utils import pattern2url, get_rng, min_dimensions, random_twocolor_urls
 from .error import GollyXPatternsError, GollyXMapsError
+from .canvas import sample_gaussian_cells, cells_to_plane
+from .expression import get_expression_mask, shuffle_cells, deal_cells
 
 
 ##############
@@ -44,8 +46,9 @@ def get_toroidal_pattern_function_map():
 
 
 def toroidal_methuselah_quadrants_pattern(
-    rows, cols, seed=None, hmc=None, fixed_methuselah=None
+    rows, cols, seed=None, hmc=None, fixed_methuselah=None, rng=None
 ):
+    rng = get_rng(seed, rng)
     methuselah_names = [
         "bheptomino",
         "cheptomino",
@@ -72,7 +75,7 @@ def toroidal_methuselah_quadrants_pattern(
     ]
 
     # Shuffle quadrants, first two and second two are now paired up as buddies
-    random.shuffle(quadrants)
+    rng.shuffle(quadrants)
 
     rotdegs = [0, 90, 180, 270]
 
@@ -80,7 +83,7 @@ def toroidal_methuselah_quadrants_pattern(
 
     for buddy_index in [[0, 1], [2, 3]]:
         # Decide how many methuselahs in this quad pair
-        hmcount = random.choice(hmcs)
+        hmcount = rng.choice(hmcs)
 
         jitterx = 3 + (10 - hmcount)
         jittery = 3
@@ -94,17 +97,17 @@ def toroidal_methuselah_quadrants_pattern(
 
             for a in range(1, nparts):
 
-                y = corner[0] + (rows // 4) + random.randint(-jittery, jittery)
+                y = corner[0] + (rows // 4) + rng.randint(-jittery, jittery)
                 x = (
                     corner[1]
                     + a * ((cols // 2) // nparts)
-                    + random.randint(-jitterx, jitterx)
+                    + rng.randint(-jitterx, jitterx)
                 )
 
                 if fixed_methuselah:
                     meth = fixed_methuselah
                 else:
-                    meth = random.choice(methuselah_names)
+                    meth = rng.choice(methuselah_names)
 
                 try:
                     pattern = get_grid_pattern(
@@ -113,9 +116,9 @@ def toroidal_methuselah_quadrants_pattern(
                         cols,
                         xoffset=x,
                         yoffset=y,
-                        hflip=bool(random.getrandbits(1)),
-                        vflip=bool(random.getrandbits(1)),
-                        rotdeg=random.choice(rotdegs),
+                        hflip=bool(rng.getrandbits(1)),
+                        vflip=bool(rng.getrandbits(1)),
+                        rotdeg=rng.choice(rotdegs),
                     )
                 except GollyXPatternsError:
                     raise GollyXPatternsError(
@@ -124,7 +127,7 @@ def toroidal_methuselah_quadrants_pattern(
                 livecount = get_pattern_livecount(meth)
                 all_methuselahs.append((livecount, pattern))
 
-    random.shuffle(all_methuselahs)
+    rng.shuffle(all_methuselahs)
     all_methuselahs.sort(key=itemgetter(0), reverse=True)
 
     team1_patterns = []
@@ -149,12 +152,11 @@ def toroidal_methuselah_quadrants_pattern(
 # Map methods
 
 
-def donutpi_twocolor(rows, cols, seed=None):
+def donutpi_twocolor(rows, cols, seed=None, rng=None):
     """
     Fill a row with pi heptominos
     """
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
     centerx = cols // 2
     centery = rows // 2
@@ -171,10 +173,10 @@ def donutpi_twocolor(rows, cols, seed=None):
             "piheptomino",
             rows,
             cols,
-            xoffset=centerx - random.randint(start, end),
-            yoffset=centery + random.randint(-10, 10),
-            hflip=bool(random.getrandbits(1)),
-            vflip=bool(random.getrandbits(1)),
+            xoffset=centerx - rng.randint(start, end),
+            yoffset=centery + rng.randint(-10, 10),
+            hflip=bool(rng.getrandbits(1)),
+            vflip=bool(rng.getrandbits(1)),
         )
         c1patterns.append(pattern1)
 
@@ -182,10 +184,10 @@ def donutpi_twocolor(rows, cols, seed=None):
             "piheptomino",
             rows,
             cols,
-            xoffset=centerx + random.randint(start, end),
-            yoffset=centery + random.randint(-10, 10),
-            hflip=bool(random.getrandbits(1)),
-            vflip=bool(random.getrandbits(1)),
+            xoffset=centerx + rng.randint(start, end),
+            yoffset=centery + rng.randint(-10, 10),
+            hflip=bool(rng.getrandbits(1)),
+            vflip=bool(rng.getrandbits(1)),
         )
         c2patterns.append(pattern2)
 
@@ -198,93 +200,66 @@ def donutpi_twocolor(rows, cols, seed=None):
     return pattern1_url, pattern2_url
 
 
-def doublegaussian_twocolor(rows, cols, seed=None):
-
-    if seed is not None:
-        random.seed(seed)
+def doublegaussian_twocolor(rows, cols, seed=None, rng=None):
+    rng = get_rng(seed, rng)
 
     # Lower bound of 0.10, upper bound of 0.18
-    density = 0.10 + random.random() * 0.08
+    density = 0.10 + rng.random() * 0.08
 
     ncells = rows * cols
     nlivecells = ncells * density
     nlivecellspt = nlivecells // 2
 
-    stdx = cols // random.randint(10, 16)
-    stdy = rows // random.randint(3, 8)
+    stdx = cols // rng.randint(10, 16)
+    stdy = rows // rng.randint(3, 8)
 
     # Left gaussian
-    centerx = cols // 3
-    centery = rows // 2
-    left_points = set()
-    while len(left_points) < nlivecellspt:
-        randx = int(random.gauss(centerx, stdx))
-        randy = int(random.gauss(centery, stdy))
-        if (randx >= 0 and randx < cols) and (randy >= 0 and randy < rows):
-            left_points.add((randx, randy))
+    left_cells = sample_gaussian_cells(
+        rng, rows, cols, nlivecellspt, (cols // 3, rows // 2), (stdx, stdy)
+    )
 
     # Right gaussian
-    centerx = 2 * cols // 3
-    centery = rows // 2
-    right_points = set()
-    while len(right_points) < nlivecellspt:
-        randx = int(random.gauss(centerx, stdx))
-        randy = int(random.gauss(centery, stdy))
-        if (randx >= 0 and randx < cols) and (randy >= 0 and randy < rows):
-            right_points.add((randx, randy))
+    right_cells = sample_gaussian_cells(
+        rng, rows, cols, nlivecellspt, (2 * cols // 3, rows // 2), (stdx, stdy)
+    )
 
     # Assign teams left/right side
-    if random.random() < 0.50:
-        points1 = left_points
-        points2 = right_points
+    if rng.random() < 0.50:
+        cells1 = left_cells
+        cells2 = right_cells
     else:
-        points1 = right_points
-        points2 = left_points
-
-    # Assemble the circle dot diagram
-    pattern1 = []
-    pattern2 = []
-    for y in range(rows):
-        row1 = []
-        row2 = []
-
-        # team 1 row
-        for x in range(cols):
-            if (x, y) in points1:
-                row1.append("o")
-            else:
-                row1.append(".")
-        row1str = "".join(row1)
-        pattern1.append(row1str)
-
-        # team 2 row
-        for x in range(cols):
-            if (x, y) in points2:
-                row2.append("o")
-            else:
-                row2.append(".")
-        row2str = "".join(row2)
-        pattern2.append(row2str)
+        cells1 = right_cells
+        cells2 = left_cells
 
-    pattern1_url = pattern2url(pattern1)
-    pattern2_url = pattern2url(pattern2)
+    pattern1_url = pattern2url(cells_to_plane(cells1, rows, cols))
+    pattern2_url = pattern2url(cells_to_plane(cells2, rows, cols))
 
     return pattern1_url, pattern2_url
 
 
-def donutengine_twocolor(rows, cols, seed=None):
+def donutengine_twocolor(rows, cols, seed=None, rng=None):
     team1_pattern, team2_pattern = toroidal_methuselah_quadrants_pattern(
-        rows, cols, seed=seed, fixed_methuselah="switchengine"
+        rows, cols, seed=seed, fixed_methuselah="switchengine", rng=rng
     )
     pattern1_url = pattern2url(team1_pattern)
     pattern2_url = pattern2url(team2_pattern)
     return pattern1_url, pattern2_url
 
 
-def donutquadjustyna_twocolor(rows, cols, seed=None):
+def _donutquadjustyna_min_dimensions():
+    # Justynas are rotated at random, so either side can lie along either axis
+    extents = get_pattern_size("justyna")
+    rows = get_min_safe_dimension([(e, lambda n: n // 2, (-8, 8)) for e in extents])
+    columns = get_min_safe_dimension(
+        [(e, lambda n, k=k: k * n // 5, (-8, 8)) for e in extents for k in range(1, 5)]
+    )
+    return (rows, columns)
+
 
-    if seed is not None:
-        random.seed(seed)
+@min_dimensions(_donutquadjustyna_min_dimensions)
+def donutquadjustyna_twocolor(rows, cols, seed=None, rng=None):
+
+    rng = get_rng(seed, rng)
 
     rotdegs = [0, 90, 180, 270]
 
@@ -294,8 +269,8 @@ def donutquadjustyna_twocolor(rows, cols, seed=None):
     justynas = []
     for centerx in centerxs:
 
-        justcenterx = centerx + random.randint(-8, 8)
-        justcentery = centery + random.randint(-8, 8)
+        justcenterx = centerx + rng.randint(-8, 8)
+        justcentery = centery + rng.randint(-8, 8)
 
         just = get_grid_pattern(
             "justyna",
@@ -303,13 +278,13 @@ def donutquadjustyna_twocolor(rows, cols, seed=None):
             cols,
             xoffset=justcenterx,
             yoffset=justcentery,
-            hflip=(random.random() < 0.5),
-            vflip=(random.random() < 0.5),
-            rotdeg=random.choice(rotdegs),
+            hflip=(rng.random() < 0.5),
+            vflip=(rng.random() < 0.5),
+            rotdeg=rng.choice(rotdegs),
         )
         justynas.append(just)
 
-    random.shuffle(justynas)
+    rng.shuffle(justynas)
 
     team1_pattern = pattern_union([justynas[0], justynas[1]])
     team2_pattern = pattern_union([justynas[2], justynas[3]])
@@ -320,68 +295,30 @@ def donutquadjustyna_twocolor(rows, cols, seed=None):
     return (s1, s2)
 
 
-def donutrandom_twocolor(rows, cols, seed=None):
+def donutrandom_twocolor(rows, cols, seed=None, rng=None):
     """
     Generate random two-color initial grid
     """
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
     ncells = rows * cols
     nlivecells = ncells * 0.12
-    points = set()
-    while len(points) < nlivecells:
-        randy = random.randint(0, rows - 1)
-        randx = random.randint(0, cols - 1)
-        points.add((randx, randy))
-
-    points = list(points)
-    points1 = set(points[: len(points) // 2])  # noqa
-    points2 = set(points[len(points) // 2 :])  # noqa
-    pattern1 = []
-    pattern2 = []
-    for y in range(rows):
-        row1 = []
-        row2 = []
-
-        # team 1 row
-        for x in range(cols):
-            if (x, y) in points1:
-                row1.append("o")
-            else:
-                row1.append(".")
-        row1str = "".join(row1)
-        pattern1.append(row1str)
-
-        # team 2 row
-        for x in range(cols):
-            if (x, y) in points2:
-                row2.append("o")
-            else:
-                row2.append(".")
-        row2str = "".join(row2)
-        pattern2.append(row2str)
-
-    pattern1_url = pattern2url(pattern1)
-    pattern2_url = pattern2url(pattern2)
-
-    return pattern1_url, pattern2_url
+    return random_twocolor_urls(rows, cols, nlivecells, rng)
 
 
-def donutrandompartition_twocolor(rows, cols, seed=None):
+def donutrandompartition_twocolor(rows, cols, seed=None, rng=None):
     """
     Generate a two-color random map, and assign points to colors
     after subdividing the grid into rectangles.
     """
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
     ncells = rows * cols
-    density = 0.10 + random.random() * 0.05
+    density = 0.10 + rng.random() * 0.05
     nlivecells = int(ncells * density)
 
     mindim = min(rows, cols)
-    nhpartitions = random.choice([1, 2, 4])
-    nvpartitions = random.choice([8, 10, 12, 14, 16])
+    nhpartitions = rng.choice([1, 2, 4])
+    nvpartitions = rng.choice([8, 10, 12, 14, 16])
 
     w_vpartition = cols // nvpartitions
     h_hpartition = rows // nhpartitions
@@ -390,15 +327,15 @@ def donutrandompartition_twocolor(rows, cols, seed=None):
 
     team1_points = set()
     while len(team1_points) < nlivecells // 2:
-        randy = random.randint(0, rows - 1)
-        randx = random.randint(0, cols - 1)
+        randy = rng.randint(0, rows - 1)
+        randx = rng.randint(0, cols - 1)
         if (randx // w_vpartition) % 2 == (randy // h_hpartition) % 2:
             team1_points.add((randx, randy))
 
     team2_points = set()
     while len(team2_points) < nlivecells // 2:
-        randy = random.randint(0, rows - 1)
-        randx = random.randint(0, cols - 1)
+        randy = rng.randint(0, rows - 1)
+        randx = rng.randint(0, cols - 1)
         if (randx // w_vpartition) % 2 != (randy // h_hpartition) % 2:
             team2_points.add((randx, randy))
 
@@ -430,18 +367,39 @@ def donutrandompartition_twocolor(rows, cols, seed=None):
     return (s1, s2)
 
 
-def donuttimebomb_twocolor(rows, cols, seed=None):
-    return _timebomb_oscillators_twocolor(rows, cols, revenge=False, seed=seed)
+def _donuttimebomb_min_dimensions(revenge):
+    # The geometry of _timebomb_oscillators_twocolor()
+    if revenge:
+        oscillators = ["airforce", "koksgalaxy", "dinnertable", "vring64", "harbor"]
+    else:
+        oscillators = ["quadrupleburloaferimeter"]
+    osc_sizes = [get_pattern_size(osc) for osc in oscillators]
+    # Timebombs may be rotated
+    bomb_extents = get_pattern_size("timebomb")
+    rows = get_min_safe_dimension(
+        [(h, lambda n: n // 2, (-1, 1)) for (h, w) in osc_sizes]
+        + [(e, lambda n: n // 2, (-1, 1)) for e in bomb_extents]
+    )
+    columns = get_min_safe_dimension(
+        [(w, lambda n, k=k: k * n // 9, (-1, 1)) for (h, w) in osc_sizes for k in [1, 2, 3, 5, 6, 7]]
+        + [(e, lambda n, k=k: k * n // 9, (-1, 1)) for e in bomb_extents for k in [4, 8]]
+    )
+    return (rows, columns)
+
 
+@min_dimensions(lambda: _donuttimebomb_min_dimensions(revenge=False))
+def donuttimebomb_twocolor(rows, cols, seed=None, rng=None):
+    return _timebomb_oscillators_twocolor(rows, cols, revenge=False, seed=seed, rng=rng)
 
-def donuttimebombredux_twocolor(rows, cols, seed=None):
-    return _timebomb_oscillators_twocolor(rows, cols, revenge=True, seed=seed)
 
+@min_dimensions(lambda: _donuttimebomb_min_dimensions(revenge=True))
+def donuttimebombredux_twocolor(rows, cols, seed=None, rng=None):
+    return _timebomb_oscillators_twocolor(rows, cols, revenge=True, seed=seed, rng=rng)
 
-def _timebomb_oscillators_twocolor(rows, cols, revenge, seed=None):
 
-    if seed is not None:
-        random.seed(seed)
+def _timebomb_oscillators_twocolor(rows, cols, revenge, seed=None, rng=None):
+
+    rng = get_rng(seed, rng)
 
     centerx = cols // 2
     centery = rows // 2
@@ -469,7 +427,7 @@ def _timebomb_oscillators_twocolor(rows, cols, revenge, seed=None):
     def _get_oscillator_name():
         if revenge:
             oscillators = ["airforce", "koksgalaxy", "dinnertable", "vring64", "harbor"]
-            which_oscillator = random.choice(oscillators)
+            which_oscillator = rng.choice(oscillators)
         else:
             which_oscillator = "quadrupleburloaferimeter"
         return which_oscillator
@@ -484,14 +442,14 @@ def _timebomb_oscillators_twocolor(rows, cols, revenge, seed=None):
     osc_team_ass = [1, 1, 1, 2, 2, 2]
     timebomb_team_ass = [2, 1]
 
-    if random.random() < 0.50:
+    if rng.random() < 0.50:
         osc_team_ass.reverse()
 
-    if random.random() < 0.50:
+    if rng.random() < 0.50:
         timebomb_team_ass.reverse()
 
-    if random.random() < 0.50:
-        random.shuffle(osc_team_ass)
+    if rng.random() < 0.50:
+        rng.shuffle(osc_team_ass)
 
     # Assemble the team patterns
     team1_patterns = []
@@ -503,8 +461,8 @@ def _timebomb_oscillators_twocolor(rows, cols, revenge, seed=None):
             _get_oscillator_name(),
             rows,
             cols,
-            xoffset=oscxx + random.randint(-osc_jitter_x, osc_jitter_x),
-            yoffset=oscyy + random.randint(-osc_jitter_y, osc_jitter_y),
+            xoffset=oscxx + rng.randint(-osc_jitter_x, osc_jitter_x),
+            yoffset=oscyy + rng.randint(-osc_jitter_y, osc_jitter_y),
         )
         if team_ass == 1:
             team1_patterns.append(pattern)
@@ -515,8 +473,8 @@ def _timebomb_oscillators_twocolor(rows, cols, revenge, seed=None):
     for k, (timebombxx, timebombyy, team_ass) in enumerate(
         zip(timebomb_x, timebomb_y, timebomb_team_ass)
     ):
-        do_rotate = random.random() < 0.5
-        do_vflip = bool(random.getrandbits(1))
+        do_rotate = rng.random() < 0.5
+        do_vflip = bool(rng.getrandbits(1))
 
         rotdeg = 0
         if do_rotate:
@@ -530,8 +488,8 @@ def _timebomb_oscillators_twocolor(rows, cols, revenge, seed=None):
             "timebomb",
             rows,
             cols,
-            xoffset=timebombxx + random.randint(-timebomb_jitter_x, timebomb_jitter_x),
-            yoffset=timebombyy + random.randint(-timebomb_jitter_y, timebomb_jitter_y),
+            xoffset=timebombxx + rng.randint(-timebomb_jitter_x, timebomb_jitter_x),
+            yoffset=timebombyy + rng.randint(-timebomb_jitter_y, timebomb_jitter_y),
             rotdeg=rotdeg,
         )
 
@@ -552,12 +510,22 @@ def _timebomb_oscillators_twocolor(rows, cols, revenge, seed=None):
     return pattern1_url, pattern2_url
 
 
-def donutmultums_twocolor(rows, cols, seed=None):
+def _donutmultums_min_dimensions():
+    L = 17
+    (h, w) = get_pattern_size("multuminparvo")
+    rows = get_min_safe_dimension([(h, lambda n: n // 2, (-8, 8))])
+    columns = get_min_safe_dimension(
+        [(w, lambda n, k=k: n // 2 + k * L, (-10, 10)) for k in [-4, -3, -2, -1, 1, 2, 3, 4]]
+    )
+    return (rows, columns)
+
+
+@min_dimensions(_donutmultums_min_dimensions)
+def donutmultums_twocolor(rows, cols, seed=None, rng=None):
     """
     Scattered multums across the map
     """
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
     L = 17
 
@@ -581,7 +549,7 @@ def donutmultums_twocolor(rows, cols, seed=None):
     team_assignments += [
         2,
     ] * (npoints - npoints // 2)
-    random.shuffle(team_assignments)
+    rng.shuffle(team_assignments)
 
     jitterx = 10
     jittery = 8
@@ -589,15 +557,15 @@ def donutmultums_twocolor(rows, cols, seed=None):
     team1_patterns = []
     team2_patterns = []
     for i, (x, y) in enumerate(itertools.product(multum_x_loc, multum_y_loc)):
-        xoff = x + random.randint(-jitterx, jitterx)
-        yoff = y + random.randint(-jittery, jittery)
+        xoff = x + rng.randint(-jitterx, jitterx)
+        yoff = y + rng.randint(-jittery, jittery)
         m = get_grid_pattern(
             "multuminparvo",
             rows,
             cols,
             xoffset=xoff,
             yoffset=yoff,
-            vflip=(y < rows // 2 or random.random() < 0.25),
+            vflip=(y < rows // 2 or rng.random() < 0.25),
         )
         if team_assignments[i] == 1:
             team1_patterns.append(m)
@@ -613,20 +581,19 @@ def donutmultums_twocolor(rows, cols, seed=None):
     return pattern1_url, pattern2_url
 
 
-def donutsegment_twocolor(rows, cols, seed=None):
+def donutsegment_twocolor(rows, cols, seed=None, rng=None):
 
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
     possible_nhseg = [1, 3]
 
     possible_nvseg = [1, 3, 5, 7, 9]
 
     maxdim = max(rows, cols)
-    gap_probability = random.random() * 0.04
+    gap_probability = rng.random() * 0.04
 
-    nhseg = random.choice(possible_nhseg)
-    nvseg = random.choice(possible_nvseg)
+    nhseg = rng.choice(possible_nhseg)
+    nvseg = rng.choice(possible_nvseg)
 
     jitterx = 8
     jittery = 5
@@ -641,6 +608,7 @@ def donutsegment_twocolor(rows, cols, seed=None):
         jitterx=jitterx,
         jittery=jittery,
         gap_probability=gap_probability,
+        rng=rng,
     )
 
     pattern1_url = pattern2url(team1_pattern)
@@ -649,18 +617,17 @@ def donutsegment_twocolor(rows, cols, seed=None):
     return pattern1_url, pattern2_url
 
 
-def donutrandomsegment_twocolor(rows, cols, seed=None):
+def donutrandomsegment_twocolor(rows, cols, seed=None, rng=None):
 
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
-    nhseg = random.randint(1, 3)
-    nvseg = random.randint(1, 7)
+    nhseg = rng.randint(1, 3)
+    nvseg = rng.randint(1, 7)
 
     jitterx = 5
     jittery = 5
 
-    gap_probability = random.random() * 0.06
+    gap_probability = rng.random() * 0.06
 
     team1_pattern, team2_pattern = segment_pattern(
         rows,
@@ -672,6 +639,7 @@ def donutrandomsegment_twocolor(rows, cols, seed=None):
         jitterx=jitterx,
         jittery=jittery,
         gap_probability=gap_probability,
+        rng=rng,
     )
 
     pattern1_url = pattern2url(team1_pattern)
@@ -680,53 +648,43 @@ def donutrandomsegment_twocolor(rows, cols, seed=None):
     return pattern1_url, pattern2_url
 
 
-def donutmethuselahs_twocolor(rows, cols, seed=None):
+def donutmethuselahs_twocolor(rows, cols, seed=None, rng=None):
     team1_pattern, team2_pattern = toroidal_methuselah_quadrants_pattern(
-        rows, cols, seed=seed
+        rows, cols, seed=seed, rng=rng
     )
     pattern1_url = pattern2url(team1_pattern)
     pattern2_url = pattern2url(team2_pattern)
     return pattern1_url, pattern2_url
 
 
-def donutmath_twocolor(rows, cols, seed=None):
+# The expression forms of donutmath_twocolor, with the moduli p each is drawn with
+DONUTMATH_FORMS = [
+    ("prime_squares_and", [7, 11, 13, 19, 23, 25, 27, 32, 37, 47, 57, 77, 99]),
+    ("prime_and", [7, 11, 13, 19, 23, 25, 27, 32, 37, 47, 57, 77, 99]),
+    ("prime_xor", [27, 32, 37, 47, 57, 77, 99]),
+]
+
 
-    def is_prime(n):
-        n = abs(n)
-        if n == 2 or n == 3: return True
-        if n < 2 or n%2 == 0: return False
-        if n < 9: return True
-        if n%3 == 0: return False
-        r = int(n**0.5)
-        # since all primes > 3 are of the form 6n ± 1
-        # start with f=5 (which is prime)
-        # and test f, f+2 for being prime
-        # then loop by 6.
-        f = 5
-        while f <= r:
-            if n % f == 0: return False
-            if n % (f+2) == 0: return False
-            f += 6
-        return True
+def get_donutmath_catalog():
+    """
+    Return every (form, params) of expression that donutmath_twocolor can draw
+    """
+    return [(form, dict(p=p)) for form, ps in DONUTMATH_FORMS for p in ps]
 
-    def is_not_prime(n):
-        return not is_prime(n)
 
+def donutmath_twocolor(rows, cols, seed=None, rng=None):
+    rng = get_rng(seed, rng)
 
     # Random choice of which form to use
-    coin = random.random()
+    coin = rng.random()
 
     if coin < 0.33:
-        p = random.choice([7, 11, 13, 19, 23, 25, 27, 32, 37, 47, 57, 77, 99])
-        f = lambda x, y: int(is_not_prime((x*x & y*y) % p))
-
+        form, ps = DONUTMATH_FORMS[0]
     elif coin < 0.66:
-        p = random.choice([7, 11, 13, 19, 23, 25, 27, 32, 37, 47, 57, 77, 99])
-        f = lambda x, y: int(is_not_prime((x & y) % p))
-
+        form, ps = DONUTMATH_FORMS[1]
     else:
-        p = random.choice([27, 32, 37, 47, 57, 77, 99])
-        f = lambda x, y: int(is_not_prime((x ^ y) % p))
+        form, ps = DONUTMATH_FORMS[2]
+    params = dict(p=rng.choice(ps))
 
     xoffset = 0
     yoffset = 0
@@ -735,9 +693,11 @@ def donutmath_twocolor(rows, cols, seed=None):
         rows,
         cols,
         seed,
-        f,
+        form,
+        params,
         xoffset=xoffset,
         yoffset=yoffset,
+        rng=rng,
     )
 
     pattern1_url = pattern2url(team1_pattern)
@@ -753,44 +713,32 @@ def _expression_pattern(
     rows,
     cols,
     seed,
-    f_handle,
+    form,
+    params,
     xoffset=0,
     yoffset=0,
+    rng=None,
 ):
-    # These store the the .o diagrams (flat=False means these are lists of lists of one char)
-    team1_pattern = get_grid_empty(rows, cols, flat=False)
-    team2_pattern = get_grid_empty(rows, cols, flat=False)
-
-    # Not the most efficient way, but the lazy way
-
-    # Assemble a list of live cell coordinates
-    coordinates = []
-    for xtrue in range(0, cols):
-        for ytrue in range(0, rows):
-            xtransform = xtrue - xoffset
-            ytransform = ytrue - yoffset
-            if f_handle(xtransform, ytransform) == 0:
-                coordinates.append((xtrue, ytrue))
+    """
+    Return the bitplanes of the two teams, with the cells alive at the roots
+    of the expression form (where it is 0) dealt to the teams in a shuffled,
+    serpentine order. The mask of live cells comes from the mask catalog.
+    """
+    rng = get_rng(rng=rng)
 
-    # Shuffle live cell cordinates
-    random.shuffle(coordinates)
+    # Live cell coordinates, shuffled
+    mask = get_expression_mask(form, rows, cols, params, xoffset=xoffset, yoffset=yoffset)
+    xs, ys = shuffle_cells(mask, rng)
 
     # Assign live cell coordinates to team 1/2 using serpentine pattern
-    serpentine_pattern = [1, 2, 2, 1]
-    for i, (x, y) in enumerate(coordinates):
-        serpix = i % len(serpentine_pattern)
-        serp_team = serpentine_pattern[serpix]
-        if serp_team == 1:
-            team1_pattern[y][x] = "o"
-        elif serp_team == 2:
-            team2_pattern[y][x] = "o"
+    serpentine_pattern = [0, 1, 1, 0]
+    team1_pattern, team2_pattern = deal_cells(xs, ys, serpentine_pattern, 2, rows, cols)
 
     return team1_pattern, team2_pattern
 
 
-def randys_twocolor(rows, cols, seed=None):
-    if seed is not None:
-        random.seed(seed)
+def randys_twocolor(rows, cols, seed=None, rng=None):
+    rng = get_rng(seed, rng)
 
     centerx = cols // 2
     centery = rows // 2
@@ -807,10 +755,10 @@ def randys_twocolor(rows, cols, seed=None):
             "rpentomino",
             rows,
             cols,
-            xoffset=centerx - random.randint(start, end),
-            yoffset=centery + random.randint(-12, 12),
-            hflip=bool(random.getrandbits(1)),
-            vflip=bool(random.getrandbits(1)),
+            xoffset=centerx - rng.randint(start, end),
+            yoffset=centery + rng.randint(-12, 12),
+            hflip=bool(rng.getrandbits(1)),
+            vflip=bool(rng.getrandbits(1)),
         )
         c1patterns.append(pattern1)
 
@@ -818,10 +766,10 @@ def randys_twocolor(rows, cols, seed=None):
             "rpentomino",
             rows,
             cols,
-            xoffset=centerx + random.randint(start, end),
-            yoffset=centery + random.randint(-12, 12),
-            hflip=bool(random.getrandbits(1)),
-            vflip=bool(random.getrandbits(1)),
+            xoffset=centerx + rng.randint(start, end),
+            yoffset=centery + rng.randint(-12, 12),
+            hflip=bool(rng.getrandbits(1)),
+            vflip=bool(rng.getrandbits(1)),
         )
         c2patterns.append(pattern2)
 
@@ -834,12 +782,11 @@ def randys_twocolor(rows, cols, seed=None):
     return pattern1_url, pattern2_url
 
 
-def porchlights_twocolor(rows, cols, seed=None):
-    if seed is not None:
-        random.seed(seed)
+def porchlights_twocolor(rows, cols, seed=None, rng=None):
+    rng = get_rng(seed, rng)
 
     nsegments = 2
-    thickness = random.randint(1, 3)
+    thickness = rng.randint(1, 3)
 
     team1_pattern = get_grid_empty(rows, cols, flat=False)
     team2_pattern = get_grid_empty(rows, cols, flat=False)
@@ -847,10 +794,10 @@ def porchlights_twocolor(rows, cols, seed=None):
     jitterx = 4
     jittery = 4
     intersectys = [
-        (j + 1) * rows // (nsegments + 1) + random.randint(-jittery, jittery)
+        (j + 1) * rows // (nsegments + 1) + rng.randint(-jittery, jittery)
         for j in range(nsegments)
     ]
-    random.shuffle(intersectys)
+    rng.shuffle(intersectys)
 
     def _get_bounds(z, dim):
         zstart = z - dim // 2
@@ -876,11 +823,11 @@ def porchlights_twocolor(rows, cols, seed=None):
         b = _get_bounds(y1, thickness)
         maxy = max(b)
         miny = min(b)
-        ylightstop = miny - random.randint(2, 3)
-        ylightsbot = maxy + random.randint(2, 3)
-        ix = random.randint(4, 12)
+        ylightstop = miny - rng.randint(2, 3)
+        ylightsbot = maxy + rng.randint(2, 3)
+        ix = rng.randint(4, 12)
         while ix < cols - 1:
-            if random.random() < 0.50:
+            if rng.random() < 0.50:
                 team1_pattern[ylightsbot][ix] = "o"
                 team1_pattern[ylightsbot][ix + 1] = "o"
                 team1_pattern[ylightsbot + 1][ix] = "o"
@@ -890,17 +837,17 @@ def porchlights_twocolor(rows, cols, seed=None):
                 team1_pattern[ylightstop][ix + 1] = "o"
                 team1_pattern[ylightstop - 1][ix] = "o"
                 team1_pattern[ylightstop - 1][ix + 1] = "o"
-            ix += random.randint(10, 12) + random.randint(-jitterx, jitterx)
+            ix += rng.randint(10, 12) + rng.randint(-jitterx, jitterx)
 
     for y2 in y2s:
         b = _get_bounds(y2, thickness)
         maxy = max(b)
         miny = min(b)
-        ylightstop = miny - random.randint(2, 3)
-        ylightsbot = maxy + random.randint(2, 3)
-        ix = random.randint(4, 12)
+        ylightstop = miny - rng.randint(2, 3)
+        ylightsbot = maxy + rng.randint(2, 3)
+        ix = rng.randint(4, 12)
         while ix < cols - 1:
-            if random.random() < 0.50:
+            if rng.random() < 0.50:
                 team2_pattern[ylightsbot][ix] = "o"
                 team2_pattern[ylightsbot][ix + 1] = "o"
                 team2_pattern[ylightsbot + 1][ix] = "o"
@@ -910,7 +857,7 @@ def porchlights_twocolor(rows, cols, seed=None):
                 team2_pattern[ylightstop][ix + 1] = "o"
                 team2_pattern[ylightstop - 1][ix] = "o"
                 team2_pattern[ylightstop - 1][ix + 1] = "o"
-            ix += random.randint(10, 12) + random.randint(-jitterx, jitterx)
+            ix += rng.randint(10, 12) + rng.randint(-jitterx, jitterx)
 
     pattern1_url = pattern2url(team1_pattern)
     pattern2_url = pattern2url(team2_pattern)
@@ -918,10 +865,20 @@ def porchlights_twocolor(rows, cols, seed=None):
     return pattern1_url, pattern2_url
 
 
-def crabdonuts_twocolor(rows, cols, seed=None):
+def _crabdonuts_min_dimensions():
+    # Crabs are rotated at random, so either side can lie along either axis
+    extents = get_pattern_size("crabstretcher")
+    rows = get_min_safe_dimension([(e, lambda n: n // 2, (-8, 8)) for e in extents])
+    columns = get_min_safe_dimension(
+        [(e, lambda n, k=k: k * n // 5, (-8, 8)) for e in extents for k in range(1, 5)]
+    )
+    return (rows, columns)
+
+
+@min_dimensions(_crabdonuts_min_dimensions)
+def crabdonuts_twocolor(rows, cols, seed=None, rng=None):
 
-    if seed is not None:
-        random.seed(seed)
+    rng = get_rng(seed, rng)
 
     rotdegs = [0, 90, 180, 270]
 
@@ -931,8 +888,8 @@ def crabdonuts_twocolor(rows, cols, seed=None):
     crabs = []
     for centerx in centerxs:
 
-        crabcenterx = centerx + random.randint(-8, 8)
-        crabcentery = centery + random.randint(-8, 8)
+        crabcenterx = centerx + rng.randint(-8, 8)
+        crabcentery = centery + rng.randint(-8, 8)
 
         crab = get_grid_pattern(
             "crabstretcher",
@@ -940,13 +897,13 @@ def crabdonuts_twocolor(rows, cols, seed=None):
             cols,
             xoffset=crabcenterx,
             yoffset=crabcentery,
-            hflip=(random.random() < 0.5),
-            vflip=(random.random() < 0.5),
-            rotdeg=random.choice(rotdegs),
+            hflip=(rng.random() < 0.5),
+            vflip=(rng.random() < 0.5),
+            rotdeg=rng.choice(rotdegs),
         )
         crabs.append(crab)
 
-    random.shuffle(crabs)
+    rng.shuffle(crabs)
 
     team1_pattern = pattern_union([crabs[0], crabs[1]])
     team2_pattern = pattern_union([crabs[2], crabs[3]])
@@ -1,30 +1,90 @@
-import re
-from .patterns import get_pattern
+import functools
+import io
+import math
+import random
+import time
+from itertools import groupby
+from operator import itemgetter
+from .patterns import get_pattern, placement_context
+from .sparse import SparsePattern
 from .error import GollyXMapsError, GollyXPatternsError
+from . import instrument
 
 
+@instrument.timed("pattern2url")
 def pattern2url(pattern, xoffset=0, yoffset=0):
-    rows = len(pattern)
-    cols = len(pattern[0])
-    listLife = []
-    for i in range(rows):
-        listLifeRow = {}
-        for j in range(cols):
-            if pattern[i][j] == "o":
-                y = str(i + yoffset)
-                x = j + xoffset
-                if y in listLifeRow.keys():
-                    listLifeRow[y].append(x)
-                else:
-                    listLifeRow[y] = [x]
-        if len(listLifeRow.keys()) > 0:
-            listLife.append(listLifeRow)
-
-    s = str(listLife)
-    s = s.split(" ")
-    listLife = "".join(s)
-    listLife = re.sub("'", '"', listLife)
-    return listLife
+    """
+    Encode a pattern as a listlife JSON string, e.g. [{"3":[4,5]},{"7":[1]}]
+    (one object per row with live cells, mapping row index to column indices).
+
+    The pattern may be a .o diagram (list of strings, or list of lists of
+    one char), a boolean NumPy bitplane, or a SparsePattern. The string is
+    written in a single pass, with xoffset/yoffset added to each coordinate.
+    """
+    return rows2url(_iter_live_rows(pattern), xoffset=xoffset, yoffset=yoffset)
+
+
+def rows2url(live_rows, xoffset=0, yoffset=0):
+    """
+    Write a listlife JSON string from an iterable of
+    (row index, list of live column indices), in row order
+    """
+    out = io.StringIO()
+    out.write("[")
+    first = True
+    for i, cols in live_rows:
+        if first:
+            first = False
+        else:
+            out.write(",")
+        out.write('{"')
+        out.write(str(i + yoffset))
+        out.write('":[')
+        if xoffset:
+            out.write(",".join([str(j + xoffset) for j in cols]))
+        else:
+            out.write(",".join(map(str, cols)))
+        out.write("]}")
+    out.write("]")
+    return out.getvalue()
+
+
+@instrument.timed("pattern2url")
+def cells2url(cells, columns):
+    """
+    Write a listlife JSON string from an iterable of flat cell indices
+    (row * columns + column), in increasing order
+    """
+    return rows2url(
+        (i, [cell - i * columns for cell in row_cells])
+        for i, row_cells in groupby(cells, key=lambda cell: cell // columns)
+    )
+
+
+def _iter_live_rows(pattern):
+    """
+    Yield (row index, list of live column indices) for each row of the pattern
+    that has live cells, in row order
+    """
+    if isinstance(pattern, SparsePattern):
+        # Only live cells on the grid are encoded, same as the dense .o diagram
+        cells = pattern.clip().sorted_cells()
+        for i, row_cells in groupby(cells, key=itemgetter(0)):
+            yield i, [j for (_, j) in row_cells]
+
+    elif getattr(pattern, "ndim", None) == 2:
+        # NumPy bitplane
+        for i, row in enumerate(pattern):
+            cols = row.nonzero()[0]
+            if len(cols) > 0:
+                yield i, cols.tolist()
+
+    else:
+        # .o diagram
+        for i, row in enumerate(pattern):
+            cols = [j for j, ch in enumerate(row) if ch == "o"]
+            if len(cols) > 0:
+                yield i, cols
 
 
 def print_pattern_url(
@@ -60,17 +120,132 @@ def print_pattern_url(
     print(url)
 
 
+def get_rng(seed=None, rng=None):
+    """
+    Return the random number generator a map generator should draw from.
+
+    If a seed is given, the generator is (re)seeded with it: the rng passed in
+    by the caller if it is a random.Random, otherwise a new random.Random(seed).
+    The same seed then reproduces the same map no matter what else is using
+    random. Without a seed, use the rng passed in by the caller, or the random
+    module itself (the shared global generator) if there is none.
+    """
+    if seed is not None:
+        if isinstance(rng, random.Random):
+            rng.seed(seed)
+            return rng
+        return random.Random(seed)
+    if rng is not None:
+        return rng
+    return random
+
+
+def sample_cells(ncells, k, rng):
+    """
+    Return a set of k distinct indices drawn uniformly from range(ncells).
+    Uses Floyd's algorithm: exactly k draws, no rejection, O(k) memory.
+    """
+    chosen = set()
+    for j in range(ncells - k, ncells):
+        t = rng.randrange(j + 1)
+        chosen.add(j if t in chosen else t)
+    return chosen
+
+
+def random_twocolor_urls(rows, cols, nlivecells, rng):
+    """
+    Return listlife strings (s1, s2) of nlivecells (rounded up) distinct cells
+    drawn uniformly from a (rows x cols) grid, split at random between the
+    two teams (the first team gets half of them, rounded down).
+    """
+    ncells = rows * cols
+    k = min(math.ceil(nlivecells), ncells)
+    return split_twocolor_urls(sample_cells(ncells, k, rng), cols, rng)
+
+
+def split_twocolor_urls(cells, cols, rng):
+    """
+    Split distinct flat cell indices at random between two teams (the first
+    team gets half of them, rounded down), and return their listlife strings
+    """
+    cells = sorted(int(cell) for cell in cells)
+    k = len(cells)
+    team1 = sample_cells(k, k // 2, rng)
+    cells1 = [cell for i, cell in enumerate(cells) if i in team1]
+    cells2 = [cell for i, cell in enumerate(cells) if i not in team1]
+    return cells2url(cells1, cols), cells2url(cells2, cols)
+
+
+# Calls, failed attempts, and exhausted calls of each function
+# decorated with retry_on_failure, by function name
+_retry_counts = {}
+
+
+def get_retry_counts():
+    """
+    Return {function name: {"calls": n, "retries": n, "failures": n}}
+    for the functions decorated with retry_on_failure. retries counts
+    the attempts that raised, failures counts the calls that gave up.
+    """
+    return {name: dict(counts) for name, counts in _retry_counts.items()}
+
+
+def reset_retry_counts():
+    _retry_counts.clear()
+
+
+def min_dimensions(get_min):
+    """
+    Declare the smallest (rows, columns) a map generator can place its patterns on:
+    get_min() returns (rows, columns), derived from the sizes of the patterns the
+    generator uses and their offsets, such that every pattern fits for every jitter
+    and orientation drawn (see patterns.get_min_safe_dimension()). It is called the
+    first time the minimum is needed (see maps.get_min_dimensions()), not when the
+    module is imported.
+    """
+
+    def decorator(func):
+        func.get_min_dimensions = get_min
+        return func
+
+    return decorator
+
+
 def retry_on_failure(func, *args, **kwargs):
+    """
+    Call func again (up to 10 times) when it raises GollyXPatternsError.
+
+    A call with a seed draws the same map on every attempt, so it is
+    only attempted once: seeded map generators must place their
+    patterns so that they fit (see patterns.fit_placement()).
+    """
+    code = func.__code__
+    argnames = code.co_varnames[: code.co_argcount]
+    seed_index = argnames.index("seed") if "seed" in argnames else None
+
+    @functools.wraps(func)
     def wrap(*args, **kwargs):
+        counts = _retry_counts.setdefault(func.__name__, {"calls": 0, "retries": 0, "failures": 0})
+        counts["calls"] += 1
+        seed = kwargs.get("seed")
+        if seed is None and seed_index is not None and seed_index < len(args):
+            seed = args[seed_index]
         done = False
-        maxcount = 10
+        maxcount = 1 if seed is not None else 10
         count = 0
         while not done and count < maxcount:
+            start = time.perf_counter()
             try:
-                return func(*args, **kwargs)
+                with placement_context(func.__name__):
+                    return func(*args, **kwargs)
             except GollyXPatternsError:
                 count += 1
+                counts["retries"] += 1
+                instrument.count("retries")
+                instrument.record("failed_attempts", time.perf_counter() - start)
                 continue
+        counts["failures"] += 1
+        instrument.count("retry_failures")
         raise GollyXMapsError(f"Error: retry failure for function {func.__name__}, tried {maxcount} times!")
 
     return wrap
@@ -0,0 +1,80 @@
+import asyncio
+import unittest
+from gollyx_maps import aio
+from gollyx_maps.maps import get_map_realization
+from gollyx_maps.error import GollyXMapsError
+
+
+class AsyncRealizationTest(unittest.TestCase):
+    """
+    Test the asyncio realization API in gollyx_maps
+    """
+
+    def tearDown(self):
+        aio.configure_executor()
+
+    def test_aget_map_realization(self):
+        """
+        Async realizations match get_map_realization, with one shared executor
+        """
+        for kind in ["thread", "process"]:
+            aio.configure_executor(kind, max_workers=2)
+
+            async def main():
+                m1 = await aio.aget_map_realization("hellmouth", "random", seed=3)
+                m2 = await aio.aget_map_realization("dragon", "vector", seed=4, encoding="binary")
+                return m1, m2, aio.get_executor()
+
+            m1, m2, executor = asyncio.run(main())
+            self.assertEqual(m1, get_map_realization("hellmouth", "random", seed=3))
+            self.assertEqual(m2, get_map_realization("dragon", "vector", seed=4, encoding="binary"))
+            self.assertIs(aio.get_executor(), executor)
+
+    def test_aget_map_realizations(self):
+        aio.configure_executor("thread", max_workers=2, max_concurrency=1)
+        requests = [("random", None, None, seed) for seed in range(4)] + [("notamap", None, None, 1)]
+        expected = [get_map_realization("hellmouth", "random", seed=seed) for seed in range(4)]
+
+        async def main(ordered):
+            return [r async for r in aio.aget_map_realizations("hellmouth", requests, ordered=ordered)]
+
+        for ordered in [True, False]:
+            results = asyncio.run(main(ordered))
+            if ordered:
+                self.assertEqual([r.index for r in results], list(range(5)))
+            results = sorted(results, key=lambda r: r.index)
+            self.assertEqual([r.realization for r in results[:4]], expected)
+            self.assertIsNone(results[4].realization)
+            self.assertIsInstance(results[4].error, KeyError)
+
+    def test_timeout_and_cancel(self):
+        aio.configure_executor("thread", max_workers=1)
+
+        async def main():
+            with self.assertRaises(asyncio.TimeoutError):
+                await aio.aget_map_realization("star", "gastank", timeout=0.001)
+
+            # Requests waiting for the cup's concurrency limit are cancelled with the task
+            task = asyncio.ensure_future(aio.aget_map_realization("star", "gastank", seed=1))
+            await asyncio.sleep(0)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+            # Stopping a batch early cancels the rest of it
+            batch = aio.aget_map_realizations("star", [("gastank", None, None, s) for s in range(10)])
+            async for result in batch:
+                break
+            await batch.aclose()
+            return result
+
+        result = asyncio.run(main())
+        self.assertEqual(result.realization, get_map_realization("star", "gastank", seed=0))
+
+    def test_aio_errors(self):
+        with self.assertRaises(GollyXMapsError):
+            aio.configure_executor("fiber")
+        with self.assertRaises(GollyXMapsError):
+            aio.configure_executor(max_workers=0)
+        with self.assertRaises(GollyXMapsError):
+            asyncio.run(aio.aget_map_realization("hellmouth", "random", encoding="base64"))
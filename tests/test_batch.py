@@ -0,0 +1,48 @@
+import unittest
+from gollyx_maps.maps import get_map_realization, get_map_realizations
+from gollyx_maps.error import GollyXMapsError
+
+
+class BatchRealizationTest(unittest.TestCase):
+    """
+    Test the batch realization API in gollyx_maps
+    """
+
+    def test_batch_matches_serial(self):
+        """
+        Seeded requests give the same realizations in worker processes,
+        in order or as they complete, and failures come back per request
+        """
+        requests = [("random", None, None, seed) for seed in range(5)]
+        requests += [("spaceshipcrash", 80, 100, 3), ("notamap", None, None, 1), ("eightr", None, None, 9)]
+        expected = [
+            get_map_realization("hellmouth", name, rows, columns, seed=seed)
+            for (name, rows, columns, seed) in requests
+            if name != "notamap"
+        ]
+
+        for workers, chunksize, ordered in [(0, 1, True), (2, 1, True), (2, 3, False)]:
+            results = list(
+                get_map_realizations(
+                    "hellmouth", requests, workers=workers, chunksize=chunksize, ordered=ordered
+                )
+            )
+            self.assertEqual(len(results), len(requests))
+            if ordered:
+                self.assertEqual([r.index for r in results], list(range(len(requests))))
+            results = sorted(results, key=lambda r: r.index)
+
+            failed = [r for r in results if r.error is not None]
+            self.assertEqual(len(failed), 1)
+            self.assertEqual(failed[0].request, ("notamap", None, None, 1))
+            self.assertIsNone(failed[0].realization)
+
+            realizations = [r.realization for r in results if r.error is None]
+            self.assertEqual(realizations, expected)
+
+    def test_batch_errors(self):
+        with self.assertRaises(GollyXMapsError):
+            get_map_realizations("hellmouth", [], chunksize=0)
+        with self.assertRaises(GollyXMapsError):
+            get_map_realizations("hellmouth", [], encoding="base64")
+        self.assertEqual(list(get_map_realizations("hellmouth", [], workers=1)), [])
@@ -0,0 +1,83 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+from gollyx_maps import cache
+from gollyx_maps.cache import RealizationCache, set_realization_cache
+from gollyx_maps.maps import get_map_realization, render_map
+
+
+class RealizationCacheTest(unittest.TestCase):
+    """
+    Test the two-tier realization cache in gollyx_maps
+    """
+
+    def tearDown(self):
+        set_realization_cache(None)
+
+    def test_lru(self):
+        c = RealizationCache(max_bytes=10)
+        c.put(("a",), ("1234",))
+        c.put(("b",), ("12", "34"))
+        self.assertEqual(c.get(("a",)), ("1234",))
+        c.put(("c",), ("1234",))
+        # b was least recently used
+        self.assertIsNone(c.get(("b",)))
+        self.assertEqual(c.get(("c",)), ("1234",))
+        c.put(("d",), ("x" * 11,))
+        self.assertIsNone(c.get(("d",)))
+        stats = c.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["evictions"]), (2, 2, 1))
+        self.assertEqual((stats["entries"], stats["bytes"]), (2, 8))
+
+    def test_seeded_renders_are_cached(self):
+        """
+        Seeded realizations are served from the cache, unseeded ones are not,
+        and cached realizations are the same as uncached ones
+        """
+        expected = [get_map_realization("hellmouth", "random", seed=seed) for seed in range(3)]
+        expected.append(get_map_realization("dragon", "vector", seed=5))
+        expected.append(get_map_realization("rainbow", "orchard", seed=5))
+        with tempfile.TemporaryDirectory() as d:
+            c = RealizationCache(directory=d)
+            set_realization_cache(c)
+            for _ in range(2):
+                got = [get_map_realization("hellmouth", "random", seed=seed) for seed in range(3)]
+                got.append(get_map_realization("dragon", "vector", seed=5))
+                got.append(get_map_realization("rainbow", "orchard", seed=5))
+                self.assertEqual(got, expected)
+            get_map_realization("hellmouth", "random")
+            stats = c.stats()
+            self.assertEqual((stats["memory_hits"], stats["disk_hits"], stats["misses"]), (5, 0, 5))
+
+            # A new cache on the same directory reads the disk tier
+            c = RealizationCache(directory=d)
+            set_realization_cache(c)
+            self.assertEqual(get_map_realization("hellmouth", "random", seed=1), expected[1])
+            self.assertEqual(c.stats()["disk_hits"], 1)
+            self.assertEqual(
+                render_map("hellmouth", "random", 100, 120, seed=1), render_map("hellmouth", "random", 100, 120, seed=1)
+            )
+            self.assertEqual(c.stats()["memory_hits"], 2)
+
+    def test_versioned_directory(self):
+        """
+        Entries written under another package version or other pattern files are not read
+        """
+        with tempfile.TemporaryDirectory() as d:
+            c = RealizationCache(directory=d)
+            c.put(("a",), ("x",))
+            with mock.patch.object(cache, "__version__", "0.0.0"):
+                other = RealizationCache(directory=d)
+            self.assertNotEqual(other.version, c.version)
+            self.assertIsNone(other.get(("a",)))
+            self.assertEqual(RealizationCache(directory=d).get(("a",)), ("x",))
+
+            with mock.patch.object(cache, "get_pattern_digest", return_value="0" * 64):
+                self.assertNotEqual(RealizationCache(directory=d).version, c.version)
+
+            other.put(("a",), ("y",))
+            c.remove_stale()
+            self.assertEqual(os.listdir(d), [c.version])
+            c.clear()
+            self.assertIsNone(c.get(("a",)))
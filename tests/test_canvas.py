@@ -0,0 +1,239 @@
+import os
+import random
+import unittest
+import numpy as np
+from gollyx_maps.canvas import (
+    Canvas,
+    OccupancyIndex,
+    grid_to_plane,
+    plane_to_grid,
+    plane_union,
+    cells_to_plane,
+    iter_gaussian_cells,
+    sample_gaussian_cells,
+)
+from gollyx_maps.patterns import get_grid_pattern, get_grid_empty, get_pattern, pattern_union
+from gollyx_maps.star import _stamps, get_gridstamp, get_random_unoccupied_point, get_gaussian_unoccupied_point
+from gollyx_maps.error import GollyXPatternsError
+
+
+HERE = os.path.split(os.path.abspath(__file__))[0]
+
+
+PATTERN_NAMES = ["acorn", "block", "justyna", "rabbit", "crabstretcher", "x66"]
+
+
+class CanvasTest(unittest.TestCase):
+    """
+    Test the bitplane canvas backend in gollyx_maps
+    """
+
+    def test_grid_plane_roundtrip(self):
+        pattern = ["o..o", ".oo.", "...."]
+        plane = grid_to_plane(pattern)
+        self.assertEqual(plane.shape, (3, 4))
+        self.assertEqual(int(plane.sum()), 4)
+        self.assertEqual(plane_to_grid(plane), pattern)
+        self.assertEqual(plane_to_grid(plane, flatten=False), [list(row) for row in pattern])
+
+    def test_stamp_matches_get_grid_pattern(self):
+        """
+        Stamping onto a canvas must give the same .o diagram
+        as get_grid_pattern(), including patterns hanging off the edges.
+        """
+        rng = random.Random(42)
+        rows, cols = 40, 50
+        for pattern_name in PATTERN_NAMES:
+            for _ in range(50):
+                kwargs = dict(
+                    xoffset=rng.randint(-5, cols + 5),
+                    yoffset=rng.randint(-5, rows + 5),
+                    hflip=bool(rng.getrandbits(1)),
+                    vflip=bool(rng.getrandbits(1)),
+                    rotdeg=rng.choice([0, 90, 180, 270]),
+                    check_overflow=False,
+                )
+                canvas = Canvas(rows, cols, nteams=1)
+                canvas.stamp(0, pattern_name, **kwargs)
+                expected = get_grid_pattern(pattern_name, rows, cols, **kwargs)
+                self.assertEqual(canvas.to_pattern(0), expected)
+
+    def test_stamps_match_get_gridstamp(self):
+        """
+        Stamping many patterns onto one plane must give the union
+        of their get_gridstamp() grids
+        """
+        rng = random.Random(7)
+        rows, cols = 40, 50
+        canvas = Canvas(rows, cols, nteams=1)
+        gridstamps = []
+        for _ in range(30):
+            pattern_name = rng.choice(PATTERN_NAMES)
+            xoffset = rng.randint(-5, cols + 5)
+            yoffset = rng.randint(-5, rows + 5)
+            hflip = bool(rng.getrandbits(1))
+            vflip = bool(rng.getrandbits(1))
+            canvas.stamp(
+                0, pattern_name, xoffset=xoffset, yoffset=yoffset, hflip=hflip, vflip=vflip, check_overflow=False
+            )
+            pattern = get_pattern(pattern_name, hflip=hflip, vflip=vflip)
+            gridstamps.append(get_gridstamp(pattern, rows, cols, yoffset=yoffset, xoffset=xoffset))
+        self.assertEqual(canvas.to_pattern(0), pattern_union(gridstamps))
+
+    def test_stamp_overflow(self):
+        canvas = Canvas(20, 20)
+        with self.assertRaises(GollyXPatternsError):
+            canvas.stamp(0, "justyna", xoffset=10, yoffset=10)
+        with self.assertRaises(GollyXPatternsError):
+            Canvas(0, 10)
+
+    def test_union(self):
+        pattern1 = [".......ooo", ".......ooo", "...ooooooo", "...ooooooo"]
+        pattern2 = ["ooooooo...", "ooooooo...", "ooo.......", "ooo......."]
+        union = plane_union([grid_to_plane(pattern1), grid_to_plane(pattern2)])
+        self.assertEqual(plane_to_grid(union), pattern_union([pattern1, pattern2]))
+
+        canvas = Canvas(4, 10, nteams=2)
+        canvas.stamp_grid(1, pattern1)
+        canvas.stamp_grid(1, pattern2)
+        self.assertEqual(canvas.to_pattern(0), get_grid_empty(4, 10))
+        self.assertEqual(canvas.to_pattern(1), pattern_union([pattern1, pattern2]))
+
+        with self.assertRaises(GollyXPatternsError):
+            plane_union([grid_to_plane(pattern1), grid_to_plane(["o"])])
+
+
+class OccupancyIndexTest(unittest.TestCase):
+    """
+    Test sampling unoccupied points from an OccupancyIndex
+    """
+
+    def test_forbidden(self):
+        index = OccupancyIndex(10, 12, radius=2)
+        index.add_cells([0], [11])
+        # The 5 x 5 square around (x=11, y=0), wrapping around the edges
+        expected = set((y % 10, x % 12) for y in range(-2, 3) for x in range(9, 14))
+        forbidden = set(zip(*[a.tolist() for a in index.forbidden.nonzero()]))
+        self.assertEqual(forbidden, expected)
+        self.assertEqual(index.count_free(), 120 - 25)
+        self.assertFalse(index.is_free(0, 9))
+        self.assertTrue(index.is_free(5, 5))
+
+    def test_stamp(self):
+        rng = random.Random(5)
+        index = OccupancyIndex(30, 40)
+        canvas = Canvas(30, 40, nteams=1)
+        for _ in range(10):
+            kwargs = dict(
+                xoffset=rng.randint(-5, 45),
+                yoffset=rng.randint(-5, 35),
+                vflip=bool(rng.getrandbits(1)),
+                check_overflow=False,
+            )
+            index.stamp("rabbit", **kwargs)
+            canvas.stamp(0, "rabbit", **kwargs)
+        self.assertTrue((index.occupied == canvas.planes[0]).all())
+
+    def test_sample_uniform(self):
+        rng = random.Random(1)
+        index = OccupancyIndex(8, 8, radius=1)
+        index.add_pattern(
+            ["........", "..o.....", "........", "........", "......o.", "........", "........", "........"]
+        )
+        free = set((x, y) for y in range(1, 7) for x in range(1, 7) if index.is_free(x, y))
+        seen = set(index.sample_uniform(rng, xlim=(1, 7), ylim=(1, 7)) for _ in range(500))
+        self.assertEqual(seen, free)
+
+        # Fill the grid point by point: every draw is free until none is left
+        while index.count_free():
+            x, y = index.sample_uniform(rng)
+            self.assertTrue(index.is_free(x, y))
+            index.add_cells([y], [x])
+        with self.assertRaises(GollyXPatternsError):
+            index.sample_uniform(rng)
+        with self.assertRaises(GollyXPatternsError):
+            index.sample_gaussian(rng, (4, 4), (2, 2))
+
+    def test_sample_gaussian(self):
+        rng = random.Random(2)
+        index = OccupancyIndex(100, 100)
+        index.add_cells(range(40, 60), [50] * 20)
+        points = [index.sample_gaussian(rng, (50, 50), (5, 5)) for _ in range(400)]
+        for x, y in points:
+            self.assertTrue(index.is_free(x, y))
+        mean_y = sum(y for x, y in points) / len(points)
+        self.assertLess(abs(mean_y - 50), 2)
+        self.assertTrue(all(abs(x - 50) < 30 for x, y in points))
+
+    def test_unoccupied_points(self):
+        rng = random.Random(3)
+        team1 = get_grid_pattern("rabbit", 30, 40, xoffset=10, yoffset=10)
+        team2 = get_grid_pattern("acorn", 30, 40, xoffset=30, yoffset=20)
+        for _ in range(50):
+            for x, y in [
+                get_random_unoccupied_point(team1, team2, 30, 40, rng=rng),
+                get_gaussian_unoccupied_point(team1, team2, 30, 40, (10, 10), rng=rng),
+            ]:
+                for dy in range(-2, 3):
+                    for dx in range(-2, 3):
+                        self.assertEqual(team1[(y + dy) % 30][(x + dx) % 40], ".")
+                        self.assertEqual(team2[(y + dy) % 30][(x + dx) % 40], ".")
+
+    def test_many_stars(self):
+        for strategy in ["random", "neighbors"]:
+            s1, s2 = _stamps(
+                160, 240, seed=1, stamp_name="squarepair", stars_per_stamp_lim=[100, 100], stars_strategy=strategy
+            )
+            self.assertTrue(s1 and s2)
+
+
+class GaussianCellsTest(unittest.TestCase):
+    """
+    Test drawing distinct Gaussian distributed cells
+    """
+
+    def test_sample(self):
+        rows, cols = 100, 120
+        cells = sample_gaussian_cells(random.Random(1), rows, cols, 1500.5, (60, 50), (15, 10))
+        self.assertEqual(len(cells), 1501)
+        self.assertEqual(len(set(cells.tolist())), 1501)
+        self.assertTrue(((cells >= 0) & (cells < rows * cols)).all())
+        ys, xs = np.divmod(cells, cols)
+        self.assertLess(abs(xs.mean() - 60), 3)
+        self.assertLess(abs(ys.mean() - 50), 3)
+        self.assertGreater(xs.std(), ys.std())
+
+        # The same rng state gives the same cells
+        again = sample_gaussian_cells(random.Random(1), rows, cols, 1500.5, (60, 50), (15, 10))
+        self.assertEqual(cells.tolist(), again.tolist())
+
+    def test_bounds(self):
+        # Most points fall off this grid, the cells drawn are still on it
+        plane = cells_to_plane(sample_gaussian_cells(random.Random(2), 10, 10, 50, (0, 0), (20, 20)), 10, 10)
+        self.assertEqual(plane.shape, (10, 10))
+        self.assertEqual(int(plane.sum()), 50)
+
+    def test_accept_and_occupied(self):
+        rng = random.Random(3)
+        occupied = np.zeros(40 * 50, dtype=bool)
+        occupied[: 50 * 20] = True
+        cells = sample_gaussian_cells(
+            rng, 40, 50, 300, (25, 20), (10, 10), accept=lambda xs, ys: xs < 25, occupied=occupied
+        )
+        ys, xs = np.divmod(cells, 50)
+        self.assertTrue((xs < 25).all())
+        self.assertTrue((ys >= 20).all())
+        self.assertTrue(occupied[cells].all())
+        self.assertEqual(int(occupied.sum()), 50 * 20 + 300)
+
+        # Blocks never repeat a cell
+        seen = set()
+        for i, block in enumerate(iter_gaussian_cells(rng, 40, 50, (25, 20), (5, 5))):
+            self.assertFalse(seen & set(block.tolist()))
+            seen.update(block.tolist())
+            if i == 5:
+                break
+
+    def test_exhausted(self):
+        with self.assertRaises(GollyXPatternsError):
+            sample_gaussian_cells(random.Random(4), 2, 2, 5, (1, 1), (1, 1))
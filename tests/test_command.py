@@ -0,0 +1,97 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from gollyx_maps.command import main
+from gollyx_maps.expression import MaskCatalog, get_mask_catalog, set_mask_catalog
+from gollyx_maps.maps import get_all_map_patterns, get_map_realization
+
+
+def run(argv):
+    out, err = io.StringIO(), io.StringIO()
+    with redirect_stdout(out), redirect_stderr(err):
+        status = main(argv)
+    return status, out.getvalue(), err.getvalue()
+
+
+class CommandTest(unittest.TestCase):
+    """
+    Test the gollyx-maps command line tool
+    """
+
+    def tearDown(self):
+        set_mask_catalog(MaskCatalog())
+
+    def test_list(self):
+        status, out, _ = run(["list"])
+        self.assertEqual(status, 0)
+        self.assertIn("starii", out.split())
+        status, out, _ = run(["list", "dragon"])
+        self.assertEqual(out.split(), get_all_map_patterns("dragon"))
+        status, out, _ = run(["list", "hellmouth", "--rows", "60"])
+        self.assertNotIn("spiders", out.split())
+        self.assertIn("random", out.split())
+
+    def test_render(self):
+        status, out, _ = run(["render", "hellmouth", "random", "--seed", "3"])
+        self.assertEqual(status, 0)
+        self.assertEqual(json.loads(out), get_map_realization("hellmouth", "random", seed=3))
+
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "star.jsonl")
+            argv = ["pattern", "star", "random", "-n", "3", "--seed", "10", "--workers", "2", "-o", path, "--profile"]
+            status, out, err = run(argv)
+            self.assertEqual((status, out), (0, ""))
+            with open(path) as f:
+                lines = [json.loads(line) for line in f]
+            self.assertEqual(lines, [get_map_realization("star", "random", seed=s) for s in [10, 11, 12]])
+            profile = json.loads(err)
+            self.assertEqual((profile["realizations"], profile["failed"]), (3, 0))
+            self.assertEqual(set(profile["phases_s"]), {"setup", "generate", "serialize", "write"})
+
+        # The missing dimension comes from the cup's default size
+        status, out, err = run(["render", "hellmouth", "random", "--rows", "80", "--seed", "1"])
+        self.assertEqual((status, err), (0, ""))
+        self.assertEqual(json.loads(out), get_map_realization("hellmouth", "random", 80, 120, seed=1))
+
+        status, out, _ = run(["cup", "dragon", "--seed", "1"])
+        self.assertEqual(status, 0)
+        self.assertEqual([json.loads(line)["patternName"] for line in out.splitlines()], get_all_map_patterns("dragon"))
+
+    def test_failures(self):
+        # Some pseudo maps do not fit on a small map
+        status, out, err = run(["cup", "pseudo", "--rows", "20", "--columns", "20", "--seed", "1"])
+        self.assertEqual(status, 1)
+        self.assertIn("failed", err)
+        self.assertLess(len(out.splitlines()), len(get_all_map_patterns("pseudo")))
+
+        status, _, err = run(["render", "hellmouth", "notamap"])
+        self.assertEqual(status, 2)
+        with self.assertRaises(SystemExit):
+            run(["render", "notacup", "random"])
+
+    def test_masks(self):
+        with tempfile.TemporaryDirectory() as d:
+            argv = ["masks", d, "--rows", "20", "--columns", "30"]
+            status, out, _ = run(argv)
+            self.assertEqual(status, 0)
+            self.assertEqual([line.split(":")[0] for line in out.splitlines()], ["toroidal", "rainbow"])
+            self.assertNotIn(" 0 of", out)
+            # A second run reads every mask back from the directory
+            status, out, _ = run(argv)
+            self.assertEqual(status, 0)
+            self.assertEqual(out.count(" 0 of"), 2)
+
+            # The render commands read the masks from the directory, in this process and in workers
+            expected = [get_map_realization("toroidal", "donutmath", 20, 30, seed=s) for s in range(4)]
+            for workers in ["0", "2"]:
+                argv = ["pattern", "toroidal", "donutmath", "-n", "4", "--seed", "0", "--rows", "20", "--columns", "30"]
+                status, out, _ = run(argv + ["--mask-dir", d, "--workers", workers])
+                self.assertEqual(status, 0)
+                self.assertEqual([json.loads(line) for line in out.splitlines()], expected)
+                if workers == "0":
+                    stats = get_mask_catalog().stats()
+                    self.assertEqual((get_mask_catalog().directory, stats["misses"]), (d, 0))
+                    self.assertGreater(stats["disk_hits"], 0)
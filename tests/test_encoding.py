@@ -0,0 +1,97 @@
+import random
+import unittest
+from gollyx_maps.encoding import (
+    encode_listlife,
+    decode_listlife,
+    decode_rows,
+    decode_plane,
+    RLE,
+    BITPACKED,
+)
+from gollyx_maps.canvas import grid_to_plane
+from gollyx_maps.maps import get_map_realization
+from gollyx_maps.utils import pattern2url
+from gollyx_maps.error import GollyXMapsError
+
+
+CUP_PATTERNS = {
+    "hellmouth": ["random", "spaceshipcrash"],
+    "pseudo": ["random", "gaussian"],
+    "toroidal": ["donutrandompartition"],
+    "dragon": ["starfield", "towers"],
+    "rainbow": ["random"],
+    "star": ["random"],
+    "klein": ["randomsegment"],
+    "ii": ["randomsegment"],
+    "starii": ["random"],
+}
+
+
+class EncodingTest(unittest.TestCase):
+    """
+    Test the binary initial conditions encoding in gollyx_maps
+    """
+
+    def test_roundtrip(self):
+        """
+        Both binary methods must decode back to the same listlife string and bitplane
+        """
+        rng = random.Random(5)
+        for _ in range(50):
+            rows = rng.randint(1, 40)
+            cols = rng.randint(1, 70)
+            density = rng.random()
+            pattern = [
+                "".join("o" if rng.random() < density else "." for j in range(cols))
+                for i in range(rows)
+            ]
+            listlife = pattern2url(pattern)
+            for method in ["rle", "bitpacked", None]:
+                data = encode_listlife(listlife, rows, cols, method=method)
+                self.assertEqual(decode_listlife(data), listlife)
+                self.assertEqual(decode_plane(data).tolist(), grid_to_plane(pattern).tolist())
+                self.assertEqual(decode_rows(data)[:2], (rows, cols))
+
+            # None picks the smaller of the two
+            rle = encode_listlife(listlife, rows, cols, method="rle")
+            bitpacked = encode_listlife(listlife, rows, cols, method="bitpacked")
+            self.assertEqual(rle[1], RLE)
+            self.assertEqual(bitpacked[1], BITPACKED)
+            self.assertEqual(len(encode_listlife(listlife, rows, cols)), min(len(rle), len(bitpacked)))
+
+        self.assertEqual(decode_listlife(encode_listlife("[]", 3, 3)), "[]")
+
+    def test_errors(self):
+        with self.assertRaises(GollyXMapsError):
+            encode_listlife('[{"3":[1]}]', 3, 3)
+        with self.assertRaises(GollyXMapsError):
+            encode_listlife('[{"0":[3]}]', 3, 3)
+        with self.assertRaises(GollyXMapsError):
+            encode_listlife("[]", 3, 3, method="gzip")
+        with self.assertRaises(GollyXMapsError):
+            decode_listlife(b"not a map")
+        data = encode_listlife('[{"0":[1]},{"2":[0,2]}]', 3, 3, method="rle")
+        with self.assertRaises(GollyXMapsError):
+            decode_listlife(data[:-1])
+
+    def test_map_realization(self):
+        """
+        Binary realizations decode to the same initial conditions as listlife realizations
+        """
+        for cup, patterns in CUP_PATTERNS.items():
+            for pattern in patterns:
+                random.seed(17)
+                expected = get_map_realization(cup, pattern)
+                random.seed(17)
+                binary = get_map_realization(cup, pattern, encoding="binary")
+                self.assertNotIn("url", binary)
+                nteams = 4 if cup == "rainbow" else 2
+                for i in range(nteams):
+                    key = f"initialConditions{i+1}"
+                    self.assertIsInstance(binary[key], bytes)
+                    self.assertEqual(decode_listlife(binary[key]), expected[key])
+                    rows, cols, _ = decode_rows(binary[key])
+                    self.assertEqual((rows, cols), (expected["rows"], expected["columns"]))
+
+        with self.assertRaises(GollyXMapsError):
+            get_map_realization("hellmouth", "random", encoding="base64")
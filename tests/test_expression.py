@@ -0,0 +1,212 @@
+import functools
+import random
+import tempfile
+import unittest
+import numpy as np
+from gollyx_maps.expression import (
+    get_prime_table,
+    is_prime,
+    is_not_prime,
+    powmod,
+    shuffle_cells,
+    deal_cells,
+    compute_expression_mask,
+    EXPRESSION_FORMS,
+    MaskCatalog,
+    set_mask_catalog,
+)
+from gollyx_maps.patterns import get_grid_empty
+from gollyx_maps.canvas import grid_to_plane
+from gollyx_maps import toroidal, rainbow
+
+
+def reference_is_prime(n):
+    """
+    The original trial division primality test of the math maps
+    """
+    n = abs(n)
+    if n == 2 or n == 3:
+        return True
+    if n < 2 or n % 2 == 0:
+        return False
+    if n < 9:
+        return True
+    if n % 3 == 0:
+        return False
+    r = int(n**0.5)
+    f = 5
+    while f <= r:
+        if n % f == 0:
+            return False
+        if n % (f + 2) == 0:
+            return False
+        f += 6
+    return True
+
+
+def reference_is_not_prime(n):
+    return int(not reference_is_prime(n))
+
+
+def reference_expression_pattern(rows, cols, f_handle, serpentine_pattern, nteams, rng):
+    """
+    The original cell by cell expression map: evaluate f_handle on each cell,
+    shuffle the live cells, and deal them to the teams
+    """
+    team_patterns = [get_grid_empty(rows, cols, flat=False) for _ in range(nteams)]
+    coordinates = []
+    for x in range(cols):
+        for y in range(rows):
+            if f_handle(x, y) == 0:
+                coordinates.append((x, y))
+    rng.shuffle(coordinates)
+    for i, (x, y) in enumerate(coordinates):
+        team_patterns[serpentine_pattern[i % len(serpentine_pattern)]][y][x] = "o"
+    return [grid_to_plane(pattern) for pattern in team_patterns]
+
+
+# name -> scalar f(x, y, **params), the original cell by cell expressions of the math maps
+REFERENCE_FORMS = {
+    "and": lambda x, y, p: int((x & y) % p),
+    "box_xor": lambda x, y, a, c, p: int((x//a ^ y//a)*c % p),
+    "powmod_and": lambda x, y, a, b, p: int((a**x) % p & (b**y) % p),
+    "prime_and": lambda x, y, p: reference_is_not_prime((x & y) % p),
+    "prime_xor": lambda x, y, p: reference_is_not_prime((x ^ y) % p),
+    "prime_squares_and": lambda x, y, p: reference_is_not_prime((x*x & y*y) % p),
+    "prime_scaled_and": lambda x, y, a, b, p: reference_is_not_prime((a*x & b*y) % p),
+    "prime_div_xor": lambda x, y, p: reference_is_not_prime((x//(y+1) ^ y) % p),
+    "prime_square_div": lambda x, y, p: reference_is_not_prime((x*x//(y+1)) % p),
+}
+
+
+def reference_forms():
+    """
+    Yield (form, params) of every expression that donutmath and rainbowmath can draw
+    """
+    yield from toroidal.get_donutmath_catalog()
+    yield from rainbow.get_rainbowmath_catalog()
+
+
+def reference_form(form, params):
+    """
+    Return the scalar f(x, y) of the expression form with the given parameters
+    """
+    return functools.partial(REFERENCE_FORMS[form], **params)
+
+
+class ExpressionTest(unittest.TestCase):
+    """
+    Test the vectorized expression evaluator of the math maps
+    """
+
+    def test_primes(self):
+        table = get_prime_table(2000)
+        self.assertGreaterEqual(len(table), 2000)
+        self.assertEqual([n for n in range(2000) if table[n]], [n for n in range(2000) if reference_is_prime(n)])
+        self.assertTrue(is_prime(-7))
+        self.assertFalse(is_not_prime(13))
+        self.assertEqual(is_prime(np.array([0, 1, 2, 9, 4099])).tolist(), [False, False, True, False, True])
+
+    def test_powmod(self):
+        self.assertEqual(powmod(3, np.arange(300), 99).tolist(), [(3**k) % 99 for k in range(300)])
+        self.assertEqual(int(powmod(3, 5, 99)), 3**5 % 99)
+
+    def test_forms(self):
+        """
+        Every form must give the same live cells as the scalar path, cell for cell
+        """
+        rows, cols = 30, 70
+        forms = set()
+        for form, params in reference_forms():
+            scalar_form = reference_form(form, params)
+            expected = np.array([[scalar_form(x, y) == 0 for x in range(cols)] for y in range(rows)])
+            self.assertEqual(compute_expression_mask(form, rows, cols, params).tolist(), expected.tolist())
+            # The array forms also work on single ints
+            self.assertEqual(bool(EXPRESSION_FORMS[form](17, 5, **params) == 0), bool(scalar_form(17, 5) == 0))
+            forms.add(form)
+        self.assertEqual(forms, set(EXPRESSION_FORMS))
+
+    def test_shuffle_and_deal(self):
+        rows, cols = 25, 40
+        for seed, (form, params) in enumerate(reference_forms()):
+            for serpentine_pattern, nteams in [([0, 1, 1, 0], 2), ([2, 0, 3, 1, 1, 3, 0, 2], 4)]:
+                expected = reference_expression_pattern(
+                    rows, cols, reference_form(form, params), serpentine_pattern, nteams, random.Random(seed)
+                )
+                mask = compute_expression_mask(form, rows, cols, params)
+                xs, ys = shuffle_cells(mask, random.Random(seed))
+                planes = deal_cells(xs, ys, serpentine_pattern, nteams, rows, cols)
+                for plane, expected_plane in zip(planes, expected):
+                    self.assertEqual(plane.tolist(), expected_plane.tolist())
+
+    def test_maps(self):
+        for seed in range(30):
+            for s in toroidal.donutmath_twocolor(80, 120, seed=seed):
+                self.assertNotEqual(s, "[]")
+            for s in rainbow.rainbowmath_fourcolor(80, 120, seed=seed):
+                self.assertNotEqual(s, "[]")
+
+
+class MaskCatalogTest(unittest.TestCase):
+    """
+    Test the catalog of expression masks
+    """
+
+    def tearDown(self):
+        set_mask_catalog(MaskCatalog())
+
+    def test_memo(self):
+        catalog = MaskCatalog()
+        mask = catalog.get("prime_and", 30, 40, dict(p=13))
+        self.assertEqual(mask.tolist(), compute_expression_mask("prime_and", 30, 40, dict(p=13)).tolist())
+        self.assertIs(catalog.get("prime_and", 30, 40, dict(p=13)), mask)
+        self.assertFalse(mask.flags.writeable)
+        stats = catalog.stats()
+        self.assertEqual((stats["misses"], stats["memory_hits"], stats["entries"]), (1, 1, 1))
+        with self.assertRaises(KeyError):
+            catalog.get("notaform", 30, 40, dict(p=13))
+
+    def test_evict(self):
+        catalog = MaskCatalog(max_bytes=2 * 30 * 40)
+        for p in [7, 11, 13]:
+            catalog.get("and", 30, 40, dict(p=p))
+        stats = catalog.stats()
+        self.assertEqual((stats["entries"], stats["evictions"]), (2, 1))
+        self.assertLessEqual(stats["bytes"], catalog.max_bytes)
+
+    def test_disk(self):
+        entries = toroidal.get_donutmath_catalog()
+        with tempfile.TemporaryDirectory() as d:
+            self.assertEqual(MaskCatalog(directory=d).warm(entries, 25, 35), len(entries))
+            catalog = MaskCatalog(directory=d)
+            self.assertEqual(catalog.warm(entries, 25, 35), 0)
+            self.assertEqual(catalog.stats()["disk_hits"], len(entries))
+            for form, params in entries:
+                self.assertEqual(
+                    catalog.get(form, 25, 35, params).tolist(),
+                    compute_expression_mask(form, 25, 35, params).tolist(),
+                )
+            self.assertEqual(catalog.stats()["disk_errors"], 0)
+
+    def test_maps(self):
+        """
+        Once warm, the math maps never compute a mask, and the maps do not
+        depend on the catalog
+        """
+        rows, cols = 50, 70
+        catalog = MaskCatalog()
+        catalog.warm(toroidal.get_donutmath_catalog(), rows, cols)
+        catalog.warm(rainbow.get_rainbowmath_catalog(), rows, cols)
+        misses = catalog.stats()["misses"]
+        set_mask_catalog(catalog)
+        maps = [self.render_math_maps(rows, cols, seed) for seed in range(40)]
+        self.assertEqual(catalog.stats()["misses"], misses)
+        set_mask_catalog(None)
+        for seed, expected in enumerate(maps):
+            self.assertEqual(self.render_math_maps(rows, cols, seed), expected)
+
+    def render_math_maps(self, rows, cols, seed):
+        return (
+            toroidal.donutmath_twocolor(rows, cols, seed=seed),
+            rainbow.rainbowmath_fourcolor(rows, cols, seed=seed),
+        )
@@ -0,0 +1,86 @@
+import unittest
+from gollyx_maps.maps import (
+    CUP_MODULES,
+    get_all_map_patterns,
+    get_feasible_patterns,
+    get_map_realization,
+    get_min_dimensions,
+    get_pattern_function_map,
+)
+from gollyx_maps.patterns import get_min_fit_dimension, get_min_pattern_size, get_min_safe_dimension
+from gollyx_maps.pool import RealizationPool
+from gollyx_maps.utils import get_retry_counts, reset_retry_counts
+from gollyx_maps.error import GollyXMapsError
+
+
+class FeasibilityTest(unittest.TestCase):
+    """
+    Test the minimum map dimensions of the map generators
+    """
+
+    def test_min_fit_dimension(self):
+        # A pattern of width 5 centered at offset 10 needs offsets 2 to n - 4
+        self.assertEqual(get_min_fit_dimension(5, lambda n: 10), 14)
+        self.assertEqual(get_min_fit_dimension(5, lambda n: 10, (-3, 0)), 11)
+        self.assertEqual(get_min_fit_dimension(5, lambda n: n // 2), 7)
+        self.assertEqual(get_min_pattern_size(["timebomb"]), (6, 15))
+        self.assertEqual(get_min_pattern_size(["timebomb"], rotated=True), (6, 6))
+
+    def test_default_dimensions(self):
+        # Every map can be rendered at its cup's default size
+        for cup in CUP_MODULES:
+            self.assertEqual(get_feasible_patterns(cup), get_all_map_patterns(cup))
+
+    def test_min_dimensions(self):
+        self.assertEqual(get_min_dimensions("hellmouth", "random"), (1, 1))
+        self.assertEqual(get_min_dimensions("hellmouth", "spiders")[0], 96)
+        self.assertEqual(get_min_dimensions("klein", "spiders"), get_min_dimensions("hellmouth", "spiders"))
+        self.assertNotIn("spiders", get_feasible_patterns("hellmouth", 60, 80))
+        self.assertIn("spiders", get_feasible_patterns("hellmouth", 96, 80))
+
+    def test_min_safe_dimension(self):
+        # A pattern of width 5 at offset 10 + j, for every -3 <= j <= 0, needs offsets 2 to n - 4
+        self.assertEqual(get_min_safe_dimension([(5, lambda n: 10, (-3, 0))]), 14)
+        # Every jitter must fit, not just one
+        self.assertEqual(get_min_fit_dimension(5, lambda n: n // 2, (-8, 8)), 6)
+        self.assertEqual(get_min_safe_dimension([(5, lambda n: n // 2, (-8, 8))]), 23)
+        # The jitter can depend on the grid, and an empty jitter range never fits
+        self.assertEqual(get_min_safe_dimension([(5, lambda n: 10, lambda n: (0, n - 14))]), 14)
+        self.assertEqual(get_min_safe_dimension([(5, lambda n: 10, (1, 0))], limit=50), 50)
+        # Offsets 1 and below never fit
+        self.assertEqual(get_min_safe_dimension([(5, lambda n: 10, (-9, 0))], limit=50), 50)
+        self.assertEqual(get_min_safe_dimension([(5, lambda n: 10, (-9, 0))], start=50, limit=50), 1)
+
+    def test_above_min_dimensions(self):
+        # At and above its minimum, a map generator places its patterns for every seed
+        generators = {}
+        for cup in CUP_MODULES:
+            for patternname, g in get_pattern_function_map(cup)().items():
+                if hasattr(g, "get_min_dimensions"):
+                    generators[g] = get_min_dimensions(cup, patternname)
+        self.assertGreaterEqual(len(generators), 15)
+        for g, (rows, columns) in generators.items():
+            for dims in [(rows, columns), (rows + 1, columns + 3), (rows + 7, columns + 11), (rows + 30, columns)]:
+                for seed in range(20):
+                    with self.subTest(generator=g.__name__, dims=dims, seed=seed):
+                        g(*dims, seed=seed)
+
+        # These fail for nearly every seed
+        self.assertNotIn("crabs", get_feasible_patterns("hellmouth", 30, 30))
+        self.assertNotIn("quadjustyna", get_feasible_patterns("hellmouth", 30, 120))
+        self.assertNotIn("twomultum", get_feasible_patterns("hellmouth", 12, 120))
+        self.assertNotIn("crabdonuts", get_feasible_patterns("toroidal", 20, 280))
+        self.assertNotIn("donutmultums", get_feasible_patterns("toroidal", 10, 280))
+        self.assertNotIn("timebomb", get_feasible_patterns("rainbow", 85, 180))
+
+    def test_reject(self):
+        reset_retry_counts()
+        with self.assertRaisesRegex(GollyXMapsError, "needs at least 96 rows"):
+            get_map_realization("hellmouth", "spiders", 60, 80)
+        self.assertNotIn("spiders_twocolor", get_retry_counts())
+        with self.assertRaises(GollyXMapsError):
+            get_map_realization("rainbow", "timebomb", 60, 180, seed=1)
+
+        with RealizationPool(workers=0) as pool:
+            with self.assertRaises(GollyXMapsError):
+                pool.add("hellmouth", "spiders", 60, 80)
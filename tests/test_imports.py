@@ -0,0 +1,54 @@
+import json
+import subprocess
+import sys
+import unittest
+
+
+LOADED_MODULES = """
+import sys
+import gollyx_maps.maps as maps
+if sys.argv[1]:
+    maps.get_map_realization(sys.argv[1], maps.get_all_map_patterns(sys.argv[1])[0], seed=1)
+print(__import__("json").dumps(sorted(m for m in sys.modules if m.startswith(("gollyx_maps.", "numpy")))))
+"""
+
+GENERATOR_MODULES = {
+    "gollyx_maps.hellmouth",
+    "gollyx_maps.pseudo",
+    "gollyx_maps.toroidal",
+    "gollyx_maps.dragon",
+    "gollyx_maps.rainbow",
+    "gollyx_maps.star",
+    "gollyx_maps.klein",
+    "gollyx_maps.ii",
+}
+
+
+def loaded_modules(cup=""):
+    proc = subprocess.run([sys.executable, "-c", LOADED_MODULES, cup], capture_output=True, text=True, check=True)
+    return set(json.loads(proc.stdout))
+
+
+class ImportsTest(unittest.TestCase):
+    """
+    Test that the maps module only imports map generators when they are used
+    """
+
+    def test_import_maps(self):
+        loaded = loaded_modules()
+        self.assertEqual(loaded & GENERATOR_MODULES, set())
+        self.assertNotIn("numpy", loaded)
+
+    def test_import_one_cup(self):
+        self.assertEqual(loaded_modules("dragon") & GENERATOR_MODULES, {"gollyx_maps.dragon"})
+        self.assertEqual(loaded_modules("starii") & GENERATOR_MODULES, {"gollyx_maps.star"})
+
+    def test_module_attributes(self):
+        from gollyx_maps import maps
+        from gollyx_maps.dragon import MAX_PARTS
+        from gollyx_maps.hellmouth import get_hellmouth_pattern_function_map
+
+        self.assertEqual(maps.MAX_PARTS, MAX_PARTS)
+        self.assertIs(maps.get_hellmouth_pattern_function_map, get_hellmouth_pattern_function_map)
+        with self.assertRaises(AttributeError):
+            maps.get_nonexistent_pattern_function_map
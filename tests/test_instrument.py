@@ -0,0 +1,80 @@
+import threading
+import unittest
+from gollyx_maps import instrument
+from gollyx_maps.instrument import RealizationProfile, add_collector, remove_collector
+from gollyx_maps.maps import get_map_realization
+from gollyx_maps.patterns import get_grid_pattern, pattern_union
+from gollyx_maps.utils import retry_on_failure
+from gollyx_maps.error import GollyXMapsError, GollyXPatternsError
+
+
+class InstrumentTest(unittest.TestCase):
+    """
+    Test the instrumentation of the realization pipeline
+    """
+
+    def test_collector(self):
+        events = []
+
+        def collector(kind, name, value):
+            events.append((kind, name))
+
+        add_collector(collector)
+        try:
+            get_map_realization("hellmouth", "random", seed=1)
+        finally:
+            remove_collector(collector)
+        self.assertIn(("span", "realization"), events)
+        self.assertIn(("span", "render_map"), events)
+        self.assertEqual(events.count(("span", "pattern2url")), 2)
+
+        # Nothing is reported once the collector is removed
+        events.clear()
+        get_map_realization("hellmouth", "random", seed=1)
+        self.assertEqual(events, [])
+        self.assertIs(instrument.span("x"), instrument.span("y"))
+
+    def test_profile(self):
+        with RealizationProfile() as profile:
+            a = get_grid_pattern("acorn", 20, 20, xoffset=10, yoffset=10)
+            b = get_grid_pattern("rabbit", 20, 20, xoffset=5, yoffset=5)
+            pattern_union([a, b])
+            with instrument.span("custom"):
+                instrument.count("things", 3)
+
+        self.assertEqual(profile.spans["get_grid_pattern"][0], 2)
+        self.assertEqual(profile.spans["load_pattern"][0], 2)
+        self.assertEqual(profile.spans["pattern_union"][0], 1)
+        self.assertEqual(profile.spans["custom"][0], 1)
+        self.assertEqual(profile.counters, {"things": 3})
+        self.assertGreaterEqual(profile.spans["get_grid_pattern"][1], profile.spans["load_pattern"][1])
+        self.assertEqual(set(profile.as_dict()), {"spans", "counters"})
+        self.assertIn("get_grid_pattern", profile.format())
+
+    def test_retries(self):
+        attempts = []
+
+        @retry_on_failure
+        def flaky(nfail):
+            attempts.append(1)
+            if len(attempts) <= nfail:
+                raise GollyXPatternsError("try again")
+            return "ok"
+
+        with RealizationProfile() as profile:
+            flaky(3)
+            attempts.clear()
+            with self.assertRaises(GollyXMapsError):
+                flaky(100)
+        self.assertEqual(profile.counters, {"retries": 13, "retry_failures": 1})
+        self.assertEqual(profile.spans["failed_attempts"][0], 13)
+
+    def test_profile_threads(self):
+        """
+        A profile only collects what its own thread reports
+        """
+        with RealizationProfile() as profile:
+            t = threading.Thread(target=get_grid_pattern, args=("acorn", 20, 20, 10, 10))
+            t.start()
+            t.join()
+        self.assertEqual(profile.spans, {})
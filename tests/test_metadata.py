@@ -0,0 +1,67 @@
+import json
+import os
+import unittest
+from gollyx_maps.maps import get_map_metadata, get_all_map_metadata
+from gollyx_maps.metadata import (
+    get_metadata_store,
+    invalidate_metadata_store,
+    get_cup_metadata,
+    get_season_maps,
+)
+
+
+HERE = os.path.split(os.path.abspath(__file__))[0]
+DATA = os.path.join(HERE, "..", "src", "data")
+
+
+class MetadataStoreTest(unittest.TestCase):
+    """
+    Test the map metadata store in gollyx_maps
+    """
+
+    def test_store(self):
+        store = get_metadata_store()
+        self.assertIs(get_metadata_store(), store)
+        self.assertIn("hellmouth", store)
+        with self.assertRaises(TypeError):
+            store["hellmouth"].maps[0]["mapName"] = "Renamed"
+        with self.assertRaises(Exception):
+            get_cup_metadata("nocup")
+
+        invalidate_metadata_store()
+        self.assertIsNot(get_metadata_store(), store)
+        self.assertEqual(get_metadata_store()["hellmouth"].maps, store["hellmouth"].maps)
+
+    def test_season_index(self):
+        """
+        The season index must match a scan of the data file
+        """
+        for cup in get_metadata_store():
+            with open(os.path.join(DATA, f"{cup}.json"), "r") as f:
+                mapdat = json.load(f)
+            for season in range(-1, 40):
+                expected = [
+                    m
+                    for m in mapdat
+                    if "mapStartSeason" in m
+                    and m["mapStartSeason"] <= season
+                    and not (m.get("mapEndSeason") is not None and m["mapEndSeason"] <= season)
+                ]
+                self.assertEqual([dict(m) for m in get_season_maps(cup, season)], expected)
+                self.assertEqual(get_all_map_metadata(cup, season), expected)
+            self.assertEqual(get_all_map_metadata(cup), mapdat)
+
+    def test_copies(self):
+        """
+        Callers get copies they can change without changing the store
+        """
+        m = get_map_metadata("hellmouth", "eightpi", zone_labels=False)
+        self.assertNotIn("mapZone1Name", m)
+        m["mapName"] = "Renamed"
+        m = get_map_metadata("hellmouth", "eightpi")
+        self.assertIn("mapZone1Name", m)
+        self.assertNotEqual(m["mapName"], "Renamed")
+
+        all_metadata = get_all_map_metadata("hellmouth", 0)
+        all_metadata[0].clear()
+        self.assertNotEqual(get_all_map_metadata("hellmouth", 0)[0], {})
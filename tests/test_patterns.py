@@ -4,9 +4,17 @@ from gollyx_maps.patterns import (
     get_patterns,
     get_pattern,
     get_pattern_size,
+    get_pattern_livecount,
+    get_pattern_registry,
+    invalidate_pattern_registry,
+    get_pattern_orientation,
+    get_pattern_orientations,
+    get_distinct_pattern_orientations,
     get_grid_pattern,
     pattern_union,
 )
+from gollyx_maps.geom import hflip_pattern, vflip_pattern, rot_pattern
+from gollyx_maps.error import GollyXPatternNotFoundError
 
 
 HERE = os.path.split(os.path.abspath(__file__))[0]
@@ -112,6 +120,77 @@ class PatternsTest(unittest.TestCase):
         for pattern_name in ALL_PATTERNS:
             self.assertIn(pattern_name, patterns)
 
+    def test_pattern_registry(self):
+        """
+        Check that the pattern registry is built once, holds immutable
+        patterns, and is rebuilt after it is invalidated.
+        """
+        registry = get_pattern_registry()
+        self.assertIs(registry, get_pattern_registry())
+        for pattern_name in ALL_PATTERNS:
+            self.assertIn(pattern_name, registry)
+            entry = registry[pattern_name]
+            self.assertIsInstance(entry.diagram, tuple)
+            self.assertEqual((entry.height, entry.width), get_pattern_size(pattern_name))
+            self.assertEqual(entry.livecount, "".join(entry.diagram).count("o"))
+            self.assertEqual(entry.livecount, get_pattern_livecount(pattern_name, rotdeg=90))
+
+        with self.assertRaises(TypeError):
+            registry["block"] = None
+
+        # Callers get their own copy of the pattern
+        block = get_pattern("block")
+        block[0] = "...."
+        self.assertEqual(get_pattern("block"), ["oo", "oo"])
+
+        with self.assertRaises(GollyXPatternNotFoundError):
+            get_pattern("notarealpattern")
+
+        invalidate_pattern_registry()
+        rebuilt = get_pattern_registry()
+        self.assertIsNot(registry, rebuilt)
+        self.assertEqual(dict(registry), dict(rebuilt))
+
+    def test_pattern_orientations(self):
+        """
+        Check the precomputed orientation table against the geom transforms,
+        and check that symmetric patterns are deduplicated.
+        """
+        for pattern_name in ALL_PATTERNS:
+            orientations = get_pattern_orientations(pattern_name)
+            self.assertEqual(len(orientations), 16)
+            base = list(get_pattern_registry()[pattern_name].diagram)
+            for (hflip, vflip, rotdeg), orientation in orientations.items():
+                expected = base
+                if hflip:
+                    expected = hflip_pattern(expected)
+                if vflip:
+                    expected = vflip_pattern(expected)
+                expected = rot_pattern(expected, rotdeg)
+                self.assertEqual(list(orientation.diagram), expected)
+                self.assertEqual(orientation.height, len(expected))
+                self.assertEqual(orientation.width, len(expected[0]))
+                for (iy, ix) in orientation.cells:
+                    self.assertEqual(expected[iy][ix], "o")
+                self.assertEqual(len(orientation.cells), "".join(expected).count("o"))
+
+            distinct = get_distinct_pattern_orientations(pattern_name)
+            self.assertLessEqual(len(distinct), 8)
+            self.assertEqual(len(distinct), len(set(o.diagram for o in distinct)))
+
+        self.assertEqual(len(get_distinct_pattern_orientations("block")), 1)
+        self.assertEqual(len(get_distinct_pattern_orientations("rpentomino")), 8)
+        self.assertIs(
+            get_pattern_orientation("block", hflip=True, rotdeg=90),
+            get_pattern_orientation("block"),
+        )
+        self.assertIs(
+            get_pattern_orientation("rpentomino", rotdeg=360),
+            get_pattern_orientation("rpentomino"),
+        )
+        with self.assertRaises(Exception):
+            get_pattern_orientation("rpentomino", rotdeg=111)
+
     def test_get_pattern(self):
         """
         Check the get_pattern() method and its arguments.
@@ -0,0 +1,87 @@
+import random
+import unittest
+from gollyx_maps.patterns import (
+    ORIENTATION_KEYS,
+    check_grid_pattern,
+    get_offset_range,
+    fit_placement,
+    draw_jitter,
+    get_placement_counts,
+    reset_placement_counts,
+)
+from gollyx_maps.hellmouth import spiders_twocolor, randommethuselahs_twocolor
+from gollyx_maps.utils import get_retry_counts, reset_retry_counts
+from gollyx_maps.error import GollyXPatternsError
+
+
+class PlacementTest(unittest.TestCase):
+    """
+    Test constraint-aware placement of patterns
+    """
+
+    def test_offset_range(self):
+        for name in ["crabstretcher", "rabbit", "acorn"]:
+            for hflip, vflip, rotdeg in ORIENTATION_KEYS:
+                xmin, xmax, ymin, ymax = get_offset_range(name, 30, 40, hflip, vflip, rotdeg)
+                for x in range(-5, 46):
+                    for y in (ymin, ymax):
+                        fits = xmin <= x <= xmax
+                        self.assertEqual(self._fits(name, 30, 40, x, y, hflip, vflip, rotdeg), fits)
+                for y in range(-5, 36):
+                    fits = ymin <= y <= ymax
+                    self.assertEqual(self._fits(name, 30, 40, xmin, y, hflip, vflip, rotdeg), fits)
+
+    def _fits(self, name, rows, columns, x, y, hflip, vflip, rotdeg):
+        try:
+            check_grid_pattern(name, rows, columns, xoffset=x, yoffset=y, hflip=hflip, vflip=vflip, rotdeg=rotdeg)
+            return True
+        except GollyXPatternsError:
+            return False
+
+    def test_fit_placement(self):
+        rng = random.Random(1)
+        placement = dict(xoffset=10, yoffset=10, hflip=False, vflip=False, rotdeg=0)
+
+        # A placement that fits is returned as is, without drawing
+        state = rng.getstate()
+        self.assertEqual(fit_placement("rabbit", 30, 30, placement, (5, 15), (5, 15), rng), placement)
+        self.assertEqual(rng.getstate(), state)
+
+        # An overflowing offset is drawn again, within the window and the grid
+        placement = dict(placement, xoffset=28)
+        for _ in range(50):
+            fitted = fit_placement("rabbit", 30, 30, placement, (20, 40), (5, 15), rng)
+            self.assertEqual(fitted["yoffset"], 10)
+            self.assertGreaterEqual(fitted["xoffset"], 20)
+            check_grid_pattern("rabbit", 30, 30, **fitted)
+
+        with self.assertRaises(GollyXPatternsError):
+            fit_placement("rabbit", 30, 30, placement, (28, 40), (5, 15), rng)
+
+    def test_draw_jitter(self):
+        # A feasible range covering [lo, hi] draws exactly like randint
+        rng = random.Random(3)
+        expected = random.Random(3)
+        for _ in range(20):
+            self.assertEqual(draw_jitter(0, 20, (-5, 25), rng), expected.randint(0, 20))
+
+        for _ in range(50):
+            self.assertTrue(5 <= draw_jitter(0, 20, (5, 8), rng) <= 8)
+        with self.assertRaises(GollyXPatternsError):
+            draw_jitter(0, 20, (21, 30), rng)
+
+    def test_spiders(self):
+        # These seeds used to fail on every attempt, with a crab off the edge of the map
+        reset_retry_counts()
+        reset_placement_counts()
+        for seed in [2, 6, 7, 10, 12]:
+            spiders_twocolor(100, 120, seed=seed)
+        self.assertEqual(get_retry_counts()["spiders_twocolor"]["retries"], 0)
+        self.assertGreater(get_placement_counts()["spiders_twocolor"]["resamples"], 0)
+
+    def test_methuselahs(self):
+        # These seeds used to fail with a methuselah off the edge of a small map
+        reset_retry_counts()
+        for seed in [9, 25, 28]:
+            randommethuselahs_twocolor(60, 80, seed=seed)
+        self.assertEqual(get_retry_counts()["randommethuselahs_twocolor"]["failures"], 0)
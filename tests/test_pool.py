@@ -0,0 +1,76 @@
+import unittest
+from gollyx_maps.maps import get_map_realization
+from gollyx_maps.pool import RealizationPool
+from gollyx_maps.error import GollyXMapsError
+
+
+class RealizationPoolTest(unittest.TestCase):
+    """
+    Test the prefetching realization pool in gollyx_maps
+    """
+
+    def test_fill_and_serve(self):
+        """
+        fill() tops each key up to its (weighted) high water mark,
+        get() serves hits from the pool and misses in the caller
+        """
+        with RealizationPool(high_water=3, low_water=1, workers=0, seed=1) as pool:
+            key = pool.add("hellmouth", "random")
+            self.assertEqual(key, ("hellmouth", "random", 100, 120))
+            pool.add("toroidal", "donutrandom", 40, 140, weight=2)
+            pool.fill()
+            stats = pool.stats()
+            self.assertEqual(stats["ready"], 3 + 6)
+            self.assertEqual(stats["refills"], 9)
+            self.assertEqual(stats["keys"][("toroidal", "donutrandom", 40, 140)]["high_water"], 6)
+
+            served = [pool.get("hellmouth", "random") for _ in range(4)]
+            stats = pool.stats()
+            self.assertEqual((stats["hits"], stats["misses"]), (3, 1))
+            self.assertEqual(stats["keys"][key]["ready"], 0)
+
+            # Same maps as get_map_realization with default dimensions
+            self.assertEqual(set(served[0].keys()), set(get_map_realization("hellmouth", "random", seed=1).keys()))
+            self.assertEqual((served[0]["rows"], served[0]["columns"]), (100, 120))
+
+            # Below low water: fill() refills this key back to high water
+            pool.fill()
+            self.assertEqual(pool.stats()["keys"][key]["ready"], 3)
+
+    def test_non_repeating(self):
+        """
+        Every realization gets a new seed, and seeded pools are reproducible
+        """
+        maps = []
+        for _ in range(2):
+            with RealizationPool(high_water=5, low_water=0, workers=0, seed=7) as pool:
+                pool.add("hellmouth", "random")
+                pool.fill()
+                maps.append([pool.get("hellmouth", "random")["initialConditions1"] for _ in range(8)])
+        self.assertEqual(maps[0], maps[1])
+        self.assertEqual(len(set(maps[0])), 8)
+
+    def test_background_refill(self):
+        for processes in [False, True]:
+            with RealizationPool(high_water=2, low_water=1, workers=2, processes=processes) as pool:
+                pool.add("pseudo", "random")
+                pool.add("star", "random")
+                self.assertTrue(pool.wait(timeout=60))
+                self.assertEqual(pool.stats()["ready"], 4)
+                pool.get("pseudo", "random")
+                pool.get("pseudo", "random")
+                self.assertTrue(pool.wait(timeout=60))
+                stats = pool.stats()
+                self.assertEqual((stats["hits"], stats["misses"], stats["ready"]), (2, 0, 4))
+                self.assertGreater(stats["refill_ms_mean"], 0)
+
+    def test_pool_errors(self):
+        with self.assertRaises(GollyXMapsError):
+            RealizationPool(high_water=2, low_water=2)
+        with self.assertRaises(GollyXMapsError):
+            RealizationPool(encoding="base64")
+        with RealizationPool(workers=0) as pool:
+            with self.assertRaises(GollyXMapsError):
+                pool.add("hellmouth", "notamap")
+            with self.assertRaises(GollyXMapsError):
+                pool.add("hellmouth", "random", weight=0)
@@ -0,0 +1,108 @@
+import random
+import threading
+import unittest
+from gollyx_maps.maps import (
+    get_all_map_patterns,
+    get_map_realization,
+    render_map,
+    render_dragon_map,
+)
+from gollyx_maps.utils import get_rng
+
+
+CUP_DIMS = {
+    "hellmouth": (100, 120),
+    "pseudo": (100, 120),
+    "toroidal": (40, 280),
+    "star": (160, 240),
+    "klein": (100, 200),
+    "ii": (100, 200),
+    "starii": (150, 230),
+    "rainbow": (120, 180),
+}
+
+
+def render(cup, pattern, seed=None, rng=None):
+    if cup == "dragon":
+        return render_dragon_map(pattern, 500, 200, 3, seed=seed, rng=rng)
+    rows, cols = CUP_DIMS[cup]
+    return tuple(render_map(cup, pattern, rows, cols, seed=seed, rng=rng))
+
+
+def all_cup_patterns():
+    for cup in list(CUP_DIMS) + ["dragon"]:
+        for pattern in get_all_map_patterns(cup):
+            yield cup, pattern
+
+
+class RngTest(unittest.TestCase):
+    """
+    Test that map generators draw from a per-call random number generator
+    """
+
+    def test_get_rng(self):
+        self.assertIs(get_rng(), random)
+        rng = random.Random(4)
+        self.assertIs(get_rng(rng=rng), rng)
+        self.assertIs(get_rng(4, rng), rng)
+        self.assertEqual(get_rng(4).random(), random.Random(4).random())
+        self.assertEqual(rng.random(), random.Random(4).random())
+
+    def test_seed_leaves_global_random_alone(self):
+        """
+        A seeded map must not draw from or reseed the global random generator,
+        and must not depend on its state
+        """
+        for cup, pattern in all_cup_patterns():
+            random.seed(1)
+            state = random.getstate()
+            try:
+                expected = render(cup, pattern, seed=5)
+            except Exception:
+                continue
+            self.assertEqual(random.getstate(), state, f"{cup} {pattern}")
+            random.seed(2)
+            self.assertEqual(render(cup, pattern, seed=5), expected, f"{cup} {pattern}")
+
+    def test_rng(self):
+        for cup, pattern in [("hellmouth", "spaceshipcrash"), ("toroidal", "donutmath"), ("dragon", "river")]:
+            self.assertEqual(
+                render(cup, pattern, rng=random.Random(11)),
+                render(cup, pattern, rng=random.Random(11)),
+            )
+
+    def test_threads(self):
+        """
+        Seeded realizations are reproducible while other threads use random
+        """
+        patterns = [("hellmouth", "random"), ("star", "random"), ("rainbow", "eights"), ("pseudo", "gaussian")]
+        expected = {
+            (cup, p, seed): get_map_realization(cup, p, seed=seed)
+            for (cup, p) in patterns
+            for seed in range(3)
+        }
+
+        done = threading.Event()
+
+        def noise():
+            while not done.is_set():
+                random.seed()
+                random.random()
+
+        results = {}
+
+        def worker(cup, p, seed):
+            results[(cup, p, seed)] = get_map_realization(cup, p, seed=seed)
+
+        noisy = threading.Thread(target=noise)
+        noisy.start()
+        try:
+            threads = [threading.Thread(target=worker, args=key) for key in expected]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        finally:
+            done.set()
+            noisy.join()
+        self.assertEqual(results, expected)
@@ -0,0 +1,103 @@
+import json
+import os
+import tempfile
+import unittest
+from gollyx_maps.maps import get_map_realization
+from gollyx_maps.season import (
+    ScheduleItem,
+    generate_season,
+    get_item_seed,
+    load_schedule,
+    make_season_schedule,
+    save_schedule,
+)
+from gollyx_maps.error import GollyXMapsError
+
+
+class SeasonTest(unittest.TestCase):
+    """
+    Test resumable season generation in gollyx_maps
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.d = self.tmp.name
+        self.schedule = make_season_schedule(5, ["hellmouth", "dragon"], 4)
+        self.schedule.append(ScheduleItem("bad-map", "hellmouth", "notamap", None, None))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read(self, path):
+        with open(path, "rb") as f:
+            return f.read()
+
+    def test_schedule(self):
+        self.assertEqual(len(self.schedule), 9)
+        self.assertEqual(self.schedule[0].id, "season5-hellmouth-0000")
+        path = os.path.join(self.d, "schedule.jsonl")
+        save_schedule(self.schedule, path)
+        self.assertEqual(load_schedule(path), self.schedule)
+        with self.assertRaises(GollyXMapsError):
+            generate_season(self.schedule + self.schedule[:1], os.path.join(self.d, "out.jsonl"), 1)
+
+    def test_deterministic(self):
+        """
+        The output only depends on the schedule and the season seed
+        """
+        outputs = []
+        for workers in [0, 2]:
+            path = os.path.join(self.d, f"season{workers}.jsonl")
+            report = generate_season(self.schedule, path, 42, workers=workers, chunksize=2)
+            self.assertEqual((report.total, report.generated, report.skipped, report.failed), (9, 9, 0, 1))
+            outputs.append(self.read(path))
+        self.assertEqual(outputs[0], outputs[1])
+
+        records = [json.loads(line) for line in outputs[0].splitlines()]
+        self.assertEqual([r["index"] for r in records], list(range(9)))
+        first = self.schedule[0]
+        seed = get_item_seed(42, first.id)
+        self.assertEqual(records[0]["realization"], get_map_realization(first.cup, first.patternname, seed=seed))
+        self.assertIn("error", records[8])
+
+        path = os.path.join(self.d, "other.jsonl")
+        generate_season(self.schedule, path, 43, workers=0)
+        self.assertNotEqual(self.read(path), outputs[0])
+
+    def test_resume(self):
+        """
+        A rerun after a crash only generates the missing items,
+        and ends with the same output as an uninterrupted run
+        """
+        expected = os.path.join(self.d, "expected.jsonl")
+        generate_season(self.schedule, expected, 7, workers=0)
+        data = self.read(expected)
+
+        # Crash in the middle of writing the 4th line
+        crashed = os.path.join(self.d, "crashed.jsonl")
+        cut = sum(len(line) + 1 for line in data.splitlines()[:3]) + 10
+        with open(crashed, "wb") as f:
+            f.write(data[:cut])
+        progress = []
+        report = generate_season(self.schedule, crashed, 7, workers=0, progress=progress.append)
+        self.assertEqual((report.generated, report.skipped), (6, 3))
+        self.assertEqual([p.done for p in progress], list(range(4, 10)))
+        self.assertEqual(progress[-1].eta, 0)
+        self.assertEqual(self.read(crashed), data)
+
+        with self.assertRaises(GollyXMapsError):
+            generate_season(self.schedule, crashed, 8, workers=0)
+
+    def test_shards(self):
+        expected = os.path.join(self.d, "expected.jsonl")
+        generate_season(self.schedule, expected, 7, workers=0)
+        shards = os.path.join(self.d, "shards")
+        generate_season(self.schedule, shards, 7, workers=0, shard_size=4)
+        names = sorted(os.listdir(shards))
+        self.assertEqual(names, ["shard-00000.jsonl", "shard-00001.jsonl", "shard-00002.jsonl"])
+        self.assertEqual(b"".join(self.read(os.path.join(shards, n)) for n in names), self.read(expected))
+
+        os.remove(os.path.join(shards, names[1]))
+        report = generate_season(self.schedule, shards, 7, workers=0, shard_size=4)
+        self.assertEqual((report.generated, report.skipped), (4, 5))
+        self.assertEqual(b"".join(self.read(os.path.join(shards, n)) for n in names), self.read(expected))
@@ -0,0 +1,112 @@
+import os
+import random
+import unittest
+from gollyx_maps.sparse import SparsePattern, sparse_union
+from gollyx_maps.patterns import get_pattern, get_grid_pattern, pattern_union
+from gollyx_maps.geom import hflip_pattern, vflip_pattern, rot_pattern
+from gollyx_maps.utils import pattern2url
+from gollyx_maps.error import GollyXPatternsError
+
+
+HERE = os.path.split(os.path.abspath(__file__))[0]
+
+
+PATTERN_NAMES = ["acorn", "justyna", "rabbit", "crabstretcher", "wickstretcher", "x66"]
+
+
+class SparsePatternTest(unittest.TestCase):
+    """
+    Test the sparse pattern representation in gollyx_maps
+    """
+
+    def test_from_pattern_name(self):
+        """
+        Placing a pattern sparsely must match get_grid_pattern(),
+        including patterns hanging off the edges.
+        """
+        rng = random.Random(7)
+        rows, cols = 40, 50
+        for pattern_name in PATTERN_NAMES:
+            for _ in range(50):
+                kwargs = dict(
+                    xoffset=rng.randint(-5, cols + 5),
+                    yoffset=rng.randint(-5, rows + 5),
+                    hflip=bool(rng.getrandbits(1)),
+                    vflip=bool(rng.getrandbits(1)),
+                    rotdeg=rng.choice([0, 90, 180, 270]),
+                    check_overflow=False,
+                )
+                sparse = SparsePattern.from_pattern_name(pattern_name, rows, cols, **kwargs)
+                dense = get_grid_pattern(pattern_name, rows, cols, **kwargs)
+                self.assertEqual(sparse.to_grid(), dense)
+                self.assertEqual(sparse, SparsePattern.from_grid(dense))
+                self.assertEqual(pattern2url(sparse), pattern2url(dense))
+                self.assertEqual(
+                    pattern2url(sparse, xoffset=3, yoffset=-2),
+                    pattern2url(dense, xoffset=3, yoffset=-2),
+                )
+
+        with self.assertRaises(GollyXPatternsError):
+            SparsePattern.from_pattern_name("justyna", 20, 20, xoffset=10, yoffset=10)
+
+    def test_transform(self):
+        """
+        Flips and rotations must match the geom transforms of the .o diagram
+        """
+        for pattern_name in PATTERN_NAMES:
+            base = SparsePattern.from_grid(get_pattern(pattern_name))
+            for hflip in [False, True]:
+                for vflip in [False, True]:
+                    for rotdeg in [0, 90, 180, 270, 360]:
+                        expected = get_pattern(pattern_name)
+                        if hflip:
+                            expected = hflip_pattern(expected)
+                        if vflip:
+                            expected = vflip_pattern(expected)
+                        expected = rot_pattern(expected, rotdeg)
+                        # Pattern files may have blank margins, so compare
+                        # the live cells relative to their bounding boxes
+                        expected = SparsePattern.from_grid(expected)
+                        (ymin, xmin, _, _) = expected.bbox
+                        expected = expected.translate(-ymin, -xmin)
+
+                        transformed = base.transform(hflip=hflip, vflip=vflip, rotdeg=rotdeg)
+                        (ymin, xmin, _, _) = transformed.bbox
+                        self.assertEqual((ymin, xmin), base.bbox[:2])
+                        transformed = transformed.translate(-ymin, -xmin)
+                        self.assertEqual(transformed.cells, expected.cells)
+
+        with self.assertRaises(GollyXPatternsError):
+            base.transform(rotdeg=111)
+
+    def test_translate_wrap_clip(self):
+        pattern = SparsePattern(4, 5, [(0, 0), (1, 4), (3, 2)])
+        self.assertEqual(pattern.bbox, (0, 0, 3, 4))
+
+        moved = pattern.translate(2, 3)
+        self.assertEqual(moved.cells, frozenset([(2, 3), (3, 7), (5, 5)]))
+
+        wrapped = moved.wrap()
+        self.assertEqual(wrapped.cells, frozenset([(2, 3), (3, 2), (1, 0)]))
+
+        clipped = moved.clip()
+        self.assertEqual(clipped.cells, frozenset([(2, 3)]))
+        self.assertEqual(moved.to_grid(), clipped.to_grid())
+        self.assertEqual(list(wrapped), [(1, 0), (2, 3), (3, 2)])
+
+    def test_union(self):
+        pattern1 = [".......ooo", ".......ooo", "...ooooooo", "...ooooooo"]
+        pattern2 = ["ooooooo...", "ooooooo...", "ooo.......", "ooo......."]
+        union = sparse_union([SparsePattern.from_grid(pattern1), SparsePattern.from_grid(pattern2)])
+        self.assertEqual(union.to_grid(), pattern_union([pattern1, pattern2]))
+        self.assertEqual(len(union), 40)
+
+        with self.assertRaises(GollyXPatternsError):
+            union.union(SparsePattern(2, 2))
+
+    def test_empty(self):
+        empty = SparsePattern(3, 3)
+        self.assertIsNone(empty.bbox)
+        self.assertEqual(empty.transform(rotdeg=90), empty)
+        self.assertEqual(pattern2url(empty), "[]")
+        self.assertEqual(empty.to_grid(), ["...", "...", "..."])
@@ -0,0 +1,155 @@
+import json
+import math
+import random
+import re
+import unittest
+from gollyx_maps.canvas import grid_to_plane
+from gollyx_maps.sparse import SparsePattern
+from gollyx_maps.patterns import get_grid_pattern
+from gollyx_maps.utils import (
+    pattern2url,
+    cells2url,
+    sample_cells,
+    random_twocolor_urls,
+    retry_on_failure,
+    get_retry_counts,
+    reset_retry_counts,
+)
+from gollyx_maps.error import GollyXMapsError, GollyXPatternsError
+
+
+def reference_pattern2url(pattern, xoffset=0, yoffset=0):
+    """
+    The original str()/split/re.sub listlife encoder
+    """
+    rows = len(pattern)
+    cols = len(pattern[0])
+    listLife = []
+    for i in range(rows):
+        listLifeRow = {}
+        for j in range(cols):
+            if pattern[i][j] == "o":
+                y = str(i + yoffset)
+                x = j + xoffset
+                if y in listLifeRow:
+                    listLifeRow[y].append(x)
+                else:
+                    listLifeRow[y] = [x]
+        if len(listLifeRow) > 0:
+            listLife.append(listLifeRow)
+    s = str(listLife)
+    s = "".join(s.split(" "))
+    return re.sub("'", '"', s)
+
+
+def url2cells(url):
+    """
+    Return the set of live (row, column) cells of a listlife string
+    """
+    return set((int(y), x) for row in json.loads(url) for y, xs in row.items() for x in xs)
+
+
+class UtilsTest(unittest.TestCase):
+    """
+    Test the listlife encoder in gollyx_maps
+    """
+
+    def test_pattern2url(self):
+        """
+        The single pass encoder must match the original encoder byte for byte,
+        for .o diagrams, bitplanes and sparse patterns
+        """
+        rng = random.Random(11)
+        for _ in range(50):
+            rows = rng.randint(1, 30)
+            cols = rng.randint(1, 30)
+            density = rng.random()
+            pattern = [
+                "".join("o" if rng.random() < density else "." for j in range(cols))
+                for i in range(rows)
+            ]
+            offsets = dict(xoffset=rng.randint(-10, 10), yoffset=rng.randint(-10, 10))
+            expected = reference_pattern2url(pattern)
+            self.assertEqual(pattern2url(pattern), expected)
+            self.assertEqual(pattern2url([list(row) for row in pattern]), expected)
+            self.assertEqual(pattern2url(grid_to_plane(pattern)), expected)
+            self.assertEqual(pattern2url(SparsePattern.from_grid(pattern)), expected)
+
+            expected = reference_pattern2url(pattern, **offsets)
+            self.assertEqual(pattern2url(pattern, **offsets), expected)
+            self.assertEqual(pattern2url(grid_to_plane(pattern), **offsets), expected)
+            self.assertEqual(pattern2url(SparsePattern.from_grid(pattern), **offsets), expected)
+
+        pattern = get_grid_pattern("justyna", 40, 60, xoffset=20, yoffset=15)
+        self.assertEqual(pattern2url(pattern), reference_pattern2url(pattern))
+        self.assertEqual(pattern2url(["...", "..."]), "[]")
+        self.assertEqual(pattern2url(["o.o", "..."]), '[{"0":[0,2]}]')
+
+    def test_cells2url(self):
+        pattern = ["o..o", "....", ".oo."]
+        cells = [y * 4 + x for y in range(3) for x in range(4) if pattern[y][x] == "o"]
+        self.assertEqual(cells2url(cells, 4), pattern2url(pattern))
+        self.assertEqual(cells2url([], 4), "[]")
+
+    def test_sample_cells(self):
+        rng = random.Random(4)
+        for ncells, k in [(10, 0), (10, 10), (1000, 120), (1, 1)]:
+            cells = sample_cells(ncells, k, rng)
+            self.assertEqual(len(cells), k)
+            self.assertTrue(all(0 <= cell < ncells for cell in cells))
+
+        # Every cell is drawn with probability k / ncells
+        ncells, k, trials = 20, 6, 20000
+        counts = [0] * ncells
+        for _ in range(trials):
+            for cell in sample_cells(ncells, k, rng):
+                counts[cell] += 1
+        p = k / ncells
+        sigma = math.sqrt(trials * p * (1 - p))
+        for count in counts:
+            self.assertLess(abs(count - trials * p), 5 * sigma)
+
+    def test_random_twocolor_urls(self):
+        rng = random.Random(5)
+        rows, cols = 30, 40
+        counts1 = [0] * (rows * cols)
+        for _ in range(300):
+            s1, s2 = random_twocolor_urls(rows, cols, rows * cols * 0.12, rng)
+            cells1 = url2cells(s1)
+            cells2 = url2cells(s2)
+            self.assertEqual(len(cells1), 72)
+            self.assertEqual(len(cells2), 72)
+            self.assertFalse(cells1 & cells2)
+            for y, x in cells1:
+                self.assertTrue(0 <= y < rows and 0 <= x < cols)
+                counts1[y * cols + x] += 1
+
+        # Team 1 gets its cells from anywhere on the grid, not by position
+        top = sum(counts1[: rows * cols // 2])
+        self.assertLess(abs(top - 300 * 36), 5 * math.sqrt(300 * 72 * 0.25))
+
+        # The number of cells is rounded up, and capped at the grid size
+        s1, s2 = random_twocolor_urls(3, 3, 4.5, rng)
+        self.assertEqual((len(url2cells(s1)), len(url2cells(s2))), (2, 3))
+        s1, s2 = random_twocolor_urls(3, 3, 100, rng)
+        self.assertEqual(len(url2cells(s1) | url2cells(s2)), 9)
+
+    def test_retry_counts(self):
+        attempts = []
+
+        @retry_on_failure
+        def flaky(nfail):
+            attempts.append(1)
+            if len(attempts) <= nfail:
+                raise GollyXPatternsError("try again")
+            return "ok"
+
+        reset_retry_counts()
+        self.assertEqual(flaky(2), "ok")
+        self.assertEqual(flaky.__name__, "flaky")
+        attempts.clear()
+        with self.assertRaises(GollyXMapsError):
+            flaky(100)
+        self.assertEqual(get_retry_counts()["flaky"], {"calls": 2, "retries": 12, "failures": 1})
+        reset_retry_counts()
+        self.assertEqual(get_retry_counts(), {})